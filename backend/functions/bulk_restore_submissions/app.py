@@ -0,0 +1,25 @@
+"""Restore many archived submissions in one request."""
+
+import json
+
+from shared.response import success, error
+from shared.identity import get_user_identity
+from shared.bulk_status import parse_submission_ids, change_statuses, summarize
+from shared.metrics import handler_metrics
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    get_user_identity(event)  # auth check
+
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except json.JSONDecodeError:
+        return error("Invalid JSON in request body")
+
+    try:
+        submission_ids = parse_submission_ids(body)
+    except ValueError as e:
+        return error(str(e))
+
+    return success(summarize(change_statuses(submission_ids, "archived", "active")))
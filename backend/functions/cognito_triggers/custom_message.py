@@ -4,7 +4,8 @@ import os
 import logging
 import urllib.parse
 
-import boto3
+from shared.aws import boto3
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
@@ -12,13 +13,15 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 CONFIRM_SIGNUP_FUNCTION_NAME = os.environ.get("CONFIRM_SIGNUP_FUNCTION_NAME", "")
 
 _confirm_signup_url_cache = None
-_lambda_client = boto3.client("lambda")
+_lambda_client = None  # created on first use; only confirmation emails need it
 
 
 def _get_confirm_signup_url() -> str:
     """Look up the ConfirmSignup Lambda Function URL and cache it."""
-    global _confirm_signup_url_cache
+    global _confirm_signup_url_cache, _lambda_client
     if _confirm_signup_url_cache is None:
+        if _lambda_client is None:
+            _lambda_client = boto3.client("lambda")
         resp = _lambda_client.get_function_url_config(
             FunctionName=CONFIRM_SIGNUP_FUNCTION_NAME
         )
@@ -107,6 +110,7 @@ def _forgot_password_email(code: str) -> tuple[str, str]:
     return subject, _email_wrapper(body)
 
 
+@handler_metrics
 def lambda_handler(event, context):
     """Route CustomMessage triggers to branded email templates."""
     trigger_source = event.get("triggerSource", "")
@@ -4,14 +4,26 @@ import os
 import logging
 from datetime import datetime, timezone
 
-import boto3
+from shared.aws import boto3
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
 USERS_TABLE = os.environ.get("USERS_TABLE", "")
 
+_table = None
 
+
+def _users_table():
+    """The users table, with boto3 imported on first use (password resets never need it)."""
+    global _table
+    if _table is None:
+        _table = boto3.resource("dynamodb").Table(USERS_TABLE)
+    return _table
+
+
+@handler_metrics
 def lambda_handler(event, context):
     """Write user record to DynamoDB on confirmed sign-up (not forgot-password)."""
     trigger_source = event.get("triggerSource", "")
@@ -28,7 +40,7 @@ def lambda_handler(event, context):
     name = attrs.get("name", "")
     now = datetime.now(timezone.utc).isoformat()
 
-    table = boto3.resource("dynamodb").Table(USERS_TABLE)
+    table = _users_table()
 
     # Idempotent: use condition to avoid overwriting an existing user
     try:
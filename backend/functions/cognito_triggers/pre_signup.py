@@ -3,6 +3,8 @@
 import os
 import logging
 
+from shared.metrics import handler_metrics
+
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
@@ -13,6 +15,7 @@ ALLOWED_DOMAINS = [
 ]
 
 
+@handler_metrics
 def lambda_handler(event, context):
     """Reject sign-ups from disallowed email domains."""
     email = event["request"]["userAttributes"].get("email", "")
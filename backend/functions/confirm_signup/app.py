@@ -8,7 +8,8 @@ import os
 import logging
 import urllib.parse
 
-import boto3
+from shared.aws import boto3
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
@@ -17,7 +18,16 @@ FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:8080")
 USER_POOL_CLIENT_ID = os.environ.get("USER_POOL_CLIENT_ID", "")
 USER_POOL_ID = os.environ.get("USER_POOL_ID", "")
 
-cognito = boto3.client("cognito-idp")
+# Created on first use: importing boto3 and loading the service model takes
+# about 0.3 s, which requests without a code or email never need
+cognito = None
+
+
+def _cognito():
+    global cognito
+    if cognito is None:
+        cognito = boto3.client("cognito-idp")
+    return cognito
 
 
 def _redirect(path: str, params: dict | None = None) -> dict:
@@ -32,6 +42,7 @@ def _redirect(path: str, params: dict | None = None) -> dict:
     }
 
 
+@handler_metrics
 def lambda_handler(event, context):
     """Confirm sign-up and redirect to the app."""
     # Lambda Function URL puts query params in event differently than API Gateway
@@ -44,9 +55,10 @@ def lambda_handler(event, context):
         return _redirect("/signin", {"error": "confirmation_failed"})
 
     logger.info("Confirming sign-up for %s", email)
+    client = _cognito()
 
     try:
-        cognito.confirm_sign_up(
+        client.confirm_sign_up(
             ClientId=USER_POOL_CLIENT_ID,
             Username=email,
             ConfirmationCode=code,
@@ -54,11 +66,11 @@ def lambda_handler(event, context):
         logger.info("Successfully confirmed %s", email)
         return _redirect("/signin", {"confirmed": "true"})
 
-    except cognito.exceptions.ExpiredCodeException:
+    except client.exceptions.ExpiredCodeException:
         # Code was already consumed — check if user is actually confirmed
         logger.warning("Expired confirmation code for %s", email)
         try:
-            user = cognito.admin_get_user(
+            user = client.admin_get_user(
                 UserPoolId=USER_POOL_ID, Username=email
             )
             if user.get("UserStatus") == "CONFIRMED":
@@ -68,12 +80,12 @@ def lambda_handler(event, context):
             logger.exception("Failed to check user status for %s", email)
         return _redirect("/signin", {"error": "code_expired"})
 
-    except cognito.exceptions.NotAuthorizedException:
+    except client.exceptions.NotAuthorizedException:
         # User already confirmed — treat as success (idempotent)
         logger.info("User %s already confirmed", email)
         return _redirect("/signin", {"confirmed": "true"})
 
-    except cognito.exceptions.CodeMismatchException:
+    except client.exceptions.CodeMismatchException:
         logger.warning("Invalid confirmation code for %s", email)
         return _redirect("/signin", {"error": "confirmation_failed"})
 
@@ -5,12 +5,17 @@ from datetime import datetime, timezone
 
 from shared.response import created, error, server_error
 from shared.identity import get_user_identity
+from shared.geography import normalize_geography
+from shared.content_hash import content_hash
+from shared.similarity import find_similar
 from shared.validator import validate_submission, ValidationError
-from shared.db import put_submission
+from shared.db import put_new_submission, StudyIdTakenError
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 
 
+@handler_metrics
 def lambda_handler(event, context):
     try:
         body = json.loads(event.get("body") or "{}")
@@ -21,6 +26,7 @@ def lambda_handler(event, context):
         validate_submission(body)
     except ValidationError as e:
         return error("Validation failed", 400, e.errors)
+    normalize_geography(body)
 
     user = get_user_identity(event)
     now = datetime.now(timezone.utc).isoformat()
@@ -35,10 +41,13 @@ def lambda_handler(event, context):
         "modifiedBy": user["user_id"],
         "createdAt": now,
         "updatedAt": now,
+        "contentHash": content_hash(body),
     }
 
     try:
-        put_submission(item)
+        put_new_submission(item)
+    except StudyIdTakenError as e:
+        return error(str(e), 409)
     except Exception:
         logger.exception("DynamoDB put failed")
         return server_error("Failed to save submission")
@@ -47,4 +56,6 @@ def lambda_handler(event, context):
         "submissionId": submission_id,
         "version": 1,
         "message": "Submission created successfully",
+        # A warning only: different centers often register the same study
+        "similar": find_similar(item, exclude=submission_id),
     })
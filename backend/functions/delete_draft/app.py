@@ -0,0 +1,22 @@
+import logging
+
+from shared.response import success, server_error
+from shared.identity import get_user_identity
+from shared.db import delete_draft
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    draft_key = event["pathParameters"]["key"]
+    user = get_user_identity(event)
+
+    try:
+        delete_draft(user["user_id"], draft_key)
+    except Exception:
+        logger.exception("DynamoDB delete failed")
+        return server_error("Failed to discard draft")
+
+    return success({"draftKey": draft_key, "message": "Draft discarded"})
@@ -1,22 +1,44 @@
 import logging
 
-from shared.response import success, not_found, server_error
-from shared.db import get_latest_active_version, update_submission_status
+from shared.response import success, error, not_found, server_error
+from shared.db import get_latest_active_version, archive_version, ConditionFailedError
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 
 
+@handler_metrics
 def lambda_handler(event, context):
     submission_id = event["pathParameters"]["id"]
-
-    current = get_latest_active_version(submission_id)
-    if not current:
-        return not_found(f"No active submission found with id {submission_id}")
-
-    version = int(current["version"])
+    params = event.get("queryStringParameters") or {}
+
+    # A client that knows the current version skips the latest-version query,
+    # but the archive then reads the version to find the studyId it releases.
+    # Either way it is one read, then one conditional write: an UpdateItem, or
+    # a transaction with the studyId release when the version has a studyId.
+    current = None
+    if params.get("expectedVersion") is not None:
+        try:
+            version = int(params["expectedVersion"])
+            if version <= 0:
+                raise ValueError
+        except (ValueError, TypeError):
+            return error("expectedVersion must be a positive integer")
+    else:
+        current = get_latest_active_version(submission_id)
+        if not current:
+            return not_found(f"No active submission found with id {submission_id}")
+        version = int(current["version"])
 
     try:
-        update_submission_status(submission_id, version, "archived")
+        archive_version(submission_id, version, current)
+    except ConditionFailedError as e:
+        if e.item is None:
+            return not_found(f"No submission found with id {submission_id} and version {version}")
+        return error(
+            f"Version {version} of submission {submission_id} is {e.item.get('status')}, not active",
+            409,
+        )
     except Exception:
         logger.exception("DynamoDB operation failed")
         return server_error("Failed to archive submission")
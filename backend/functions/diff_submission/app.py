@@ -0,0 +1,65 @@
+"""Field-level diff between two versions of a submission."""
+
+import logging
+from collections import OrderedDict
+
+from shared.response import success, error, not_found, server_error, IMMUTABLE_CACHE_CONTROL
+from shared.db import get_versions
+from shared.diff import diff_versions
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+# Form fields of a version are never rewritten (only status/updatedAt change
+# in place, and those are excluded from the diff), so a computed diff stays
+# valid for the lifetime of the container.
+MAX_CACHED_DIFFS = 256
+_diff_cache = OrderedDict()
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    submission_id = event["pathParameters"]["id"]
+    params = event.get("queryStringParameters") or {}
+
+    try:
+        from_version = int(params.get("from"))
+        to_version = int(params.get("to"))
+        if from_version <= 0 or to_version <= 0:
+            raise ValueError
+    except (ValueError, TypeError):
+        return error("from and to must be positive integers")
+
+    if from_version == to_version:
+        return error("from and to must be different versions")
+
+    cache_key = (submission_id, from_version, to_version)
+    body = _diff_cache.get(cache_key)
+    if body is not None:
+        _diff_cache.move_to_end(cache_key)
+    else:
+        try:
+            items = get_versions(submission_id, [from_version, to_version])
+        except Exception:
+            logger.exception("DynamoDB batch_get_item failed")
+            return server_error("Failed to diff submission versions")
+
+        missing = [v for v in (from_version, to_version) if v not in items]
+        if missing:
+            return not_found(
+                f"Version(s) {', '.join(map(str, missing))} not found for submission {submission_id}"
+            )
+
+        changes = diff_versions(items[from_version], items[to_version])
+        body = {
+            "submissionId": submission_id,
+            "from": from_version,
+            "to": to_version,
+            "changes": changes,
+            "count": len(changes),
+        }
+        _diff_cache[cache_key] = body
+        if len(_diff_cache) > MAX_CACHED_DIFFS:
+            _diff_cache.popitem(last=False)
+
+    return success(body, headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
@@ -0,0 +1,30 @@
+import logging
+
+from shared.response import success, not_found, server_error, NO_CACHE_CONTROL
+from shared.identity import get_user_identity
+from shared.db import get_draft
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    draft_key = event["pathParameters"]["key"]
+    user = get_user_identity(event)
+
+    try:
+        draft = get_draft(user["user_id"], draft_key)
+    except Exception:
+        logger.exception("DynamoDB get failed")
+        return server_error("Failed to load draft")
+
+    if not draft:
+        return not_found(f"No draft found for {draft_key}")
+
+    return success({
+        "draftKey": draft_key,
+        "revision": draft["revision"],
+        "updatedAt": draft["updatedAt"],
+        "data": draft["data"],
+    }, headers={"Cache-Control": NO_CACHE_CONTROL})
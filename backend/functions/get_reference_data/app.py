@@ -0,0 +1,54 @@
+"""Search a reference dataset (subnational units, W3/bilateral projects) by code or name."""
+
+import logging
+
+from shared.response import success, error, not_found, not_modified
+from shared.reference_data import load_indexes, DATASETS
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+MAX_QUERY_LENGTH = 200
+# The data only changes with a deploy, which changes the ETag
+CACHE_CONTROL = "public, max-age=86400"
+
+# Built during the init phase, so requests only pay for the lookup
+INDEXES, DATA_VERSION = load_indexes()
+
+
+def _header(event, name):
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    dataset = (event.get("pathParameters") or {}).get("dataset")
+    if dataset not in DATASETS:
+        return not_found(f"Unknown dataset {dataset}; expected one of: {', '.join(DATASETS)}")
+
+    params = event.get("queryStringParameters") or {}
+    query = params.get("q") or ""
+    if len(query) > MAX_QUERY_LENGTH:
+        return error(f"q must be at most {MAX_QUERY_LENGTH} characters")
+    try:
+        limit = int(params.get("limit", DEFAULT_LIMIT))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError
+    except (ValueError, TypeError):
+        return error(f"limit must be an integer between 1 and {MAX_LIMIT}")
+
+    # One ETag per data version: the answer to a given URL never changes within it
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": f'"{DATA_VERSION}"'}
+    if _header(event, "if-none-match") == headers["ETag"]:
+        return not_modified(headers)
+
+    results = INDEXES[dataset].search(query, limit)
+    return success(
+        {"dataset": dataset, "query": query, "results": results, "count": len(results)},
+        headers=headers,
+    )
@@ -0,0 +1,43 @@
+"""Near-duplicate studies for a submission, from the in-memory similarity index."""
+
+import logging
+
+from shared.response import success, error, not_found, server_error, NO_CACHE_CONTROL
+from shared.db import get_latest_active_version
+from shared.similarity import load_index, MAX_RESULTS
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+MAX_LIMIT = 50
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    submission_id = event["pathParameters"]["id"]
+    params = event.get("queryStringParameters") or {}
+
+    try:
+        limit = int(params.get("limit", MAX_RESULTS))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError
+    except (ValueError, TypeError):
+        return error(f"limit must be an integer between 1 and {MAX_LIMIT}")
+
+    try:
+        index = load_index()
+        similar = index.similar_to(submission_id, limit=limit)
+        if similar is None:
+            # Not indexed yet (the stream lags writes by a moment) or not active
+            current = get_latest_active_version(submission_id)
+            if not current:
+                return not_found(f"No active submission found with id {submission_id}")
+            similar = index.query(current, exclude=submission_id, limit=limit)
+    except Exception:
+        logger.exception("Similarity lookup failed")
+        return server_error("Failed to find similar submissions")
+
+    return success(
+        {"submissionId": submission_id, "similar": similar, "count": len(similar)},
+        headers={"Cache-Control": NO_CACHE_CONTROL},
+    )
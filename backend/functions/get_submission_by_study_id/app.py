@@ -0,0 +1,32 @@
+"""Resolve a studyId to its submission with a single GetItem on the studyId claim."""
+
+import logging
+from urllib.parse import unquote
+
+from shared.response import success, error, not_found, server_error, NO_CACHE_CONTROL
+from shared.db import get_study_id_claim
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    study_id = unquote((event.get("pathParameters") or {}).get("studyId") or "").strip()
+    if not study_id:
+        return error("studyId is required")
+
+    try:
+        claim = get_study_id_claim(study_id)
+    except Exception:
+        logger.exception("DynamoDB get_item failed")
+        return server_error("Failed to look up studyId")
+
+    if not claim:
+        return not_found(f"No active submission found with studyId {study_id}")
+
+    # The claim moves when a studyId is archived or renamed, so it must not be cached
+    return success(
+        {"studyId": claim["studyId"], "submissionId": claim["ownerSubmissionId"]},
+        headers={"Cache-Control": NO_CACHE_CONTROL},
+    )
@@ -1,13 +1,20 @@
 import logging
 
-from shared.response import success, not_found, server_error
-from shared.db import get_version_history
+from shared.response import success, error, not_found, server_error, NO_CACHE_CONTROL
+from shared.db import get_version_history, get_version_timeline
+from shared.pagination import encode_cursor, decode_cursor, parse_limit, InvalidCursorError
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 
 
+@handler_metrics
 def lambda_handler(event, context):
     submission_id = event["pathParameters"]["id"]
+    params = event.get("queryStringParameters") or {}
+
+    if params.get("view") == "timeline":
+        return _timeline(submission_id, params)
 
     try:
         items = get_version_history(submission_id)
@@ -23,3 +30,28 @@ def lambda_handler(event, context):
         "versions": items,
         "count": len(items),
     })
+
+
+def _timeline(submission_id, params):
+    """Metadata-only, cursor-paginated version list for the preview UI."""
+    try:
+        limit = parse_limit(params.get("limit"))
+        start_key = decode_cursor(params.get("cursor"), submission_id)
+    except (ValueError, InvalidCursorError) as e:
+        return error(str(e))
+
+    try:
+        items, last_key = get_version_timeline(submission_id, limit, start_key)
+    except Exception:
+        logger.exception("DynamoDB query failed")
+        return server_error("Failed to get submission history")
+
+    if not items and not start_key:
+        return not_found(f"No submission found with id {submission_id}")
+
+    return success({
+        "submissionId": submission_id,
+        "versions": items,
+        "count": len(items),
+        "nextCursor": encode_cursor(last_key),
+    }, headers={"Cache-Control": NO_CACHE_CONTROL})
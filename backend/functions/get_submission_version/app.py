@@ -0,0 +1,41 @@
+"""Fetch a single version of a submission with a direct key lookup."""
+
+import logging
+
+from shared.response import (
+    success, error, not_found, server_error,
+    IMMUTABLE_CACHE_CONTROL, NO_CACHE_CONTROL,
+)
+from shared.db import get_version
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    path_params = event.get("pathParameters") or {}
+    submission_id = path_params.get("id")
+
+    try:
+        version = int(path_params.get("version"))
+        if version <= 0:
+            raise ValueError
+    except (ValueError, TypeError):
+        return error("version must be a positive integer")
+
+    try:
+        item = get_version(submission_id, version)
+    except Exception:
+        logger.exception("DynamoDB get_item failed")
+        return server_error("Failed to get submission version")
+
+    if not item:
+        return not_found(f"No version {version} found for submission {submission_id}")
+
+    # Only superseded versions are frozen; the current one can still be
+    # archived/restored in place.
+    cache_control = (
+        IMMUTABLE_CACHE_CONTROL if item.get("status") == "superseded" else NO_CACHE_CONTROL
+    )
+    return success(item, headers={"Cache-Control": cache_control})
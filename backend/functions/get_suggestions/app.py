@@ -0,0 +1,45 @@
+"""Autocomplete for free-text and creatable fields: the most used values starting with a prefix."""
+
+import logging
+from urllib.parse import unquote
+
+from shared.response import success, error, server_error
+from shared.db import get_suggestions, SUGGEST_FIELDS
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MAX_PREFIX_LENGTH = 200
+# Counts move slowly and the form asks on every keystroke
+CACHE_CONTROL = "private, max-age=60"
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    field = unquote((event.get("pathParameters") or {}).get("field") or "")
+    if field not in SUGGEST_FIELDS:
+        return error(f"field must be one of: {', '.join(SUGGEST_FIELDS)}")
+
+    params = event.get("queryStringParameters") or {}
+    prefix = params.get("prefix") or ""
+    if len(prefix) > MAX_PREFIX_LENGTH:
+        return error(f"prefix must be at most {MAX_PREFIX_LENGTH} characters")
+    try:
+        limit = int(params.get("limit", DEFAULT_LIMIT))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError
+    except (ValueError, TypeError):
+        return error(f"limit must be an integer between 1 and {MAX_LIMIT}")
+
+    try:
+        suggestions = get_suggestions(field, prefix, limit)
+    except Exception:
+        logger.exception("DynamoDB query failed")
+        return server_error("Failed to load suggestions")
+
+    return success(
+        {"field": field, "prefix": prefix, "suggestions": suggestions},
+        headers={"Cache-Control": CACHE_CONTROL},
+    )
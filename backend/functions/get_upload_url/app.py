@@ -1,29 +1,34 @@
-"""Generate a presigned S3 PUT URL for file uploads."""
+"""Generate a presigned S3 PUT URL for file uploads.
+
+POST /submissions/{id}/upload-url issues keys under the submission's own
+prefix. POST /submissions/import/upload-url issues keys under the caller's
+imports/<userId>/ prefix, for a spreadsheet to pass to POST /submissions/import.
+"""
 
 import json
 import os
 import uuid
 import logging
 
-import boto3
-from botocore.config import Config
-
+from shared.aws import LazyClient
 from shared.response import success, error, not_found, server_error
 from shared.identity import get_user_identity
 from shared.db import get_latest_active_version
+from shared.spreadsheet import import_key_prefix
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
 AWS_REGION = os.environ.get("AWS_REGION", "eu-central-1")
 
-s3_client = boto3.client(
+s3_client = LazyClient(
     "s3",
     region_name=AWS_REGION,
-    config=Config(
-        signature_version="s3v4",
-        s3={"addressing_style": "virtual"},
-    ),
+    config={
+        "signature_version": "s3v4",
+        "s3": {"addressing_style": "virtual"},
+    },
 )
 
 FILES_BUCKET = os.environ["FILES_BUCKET"]
@@ -38,38 +43,52 @@ ALLOWED_CONTENT_TYPES = {
     "text/csv",
 }
 
+IMPORT_RESOURCE = "/submissions/import/upload-url"
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "xlsx",
+}
+
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 PRESIGNED_URL_EXPIRY = 300  # 5 minutes
 
 
+@handler_metrics
 def lambda_handler(event, context):
     try:
-        get_user_identity(event)  # auth check
+        user = get_user_identity(event)
+        importing = event.get("resource") == IMPORT_RESOURCE
 
-        submission_id = event.get("pathParameters", {}).get("id")
-        if not submission_id:
+        submission_id = (event.get("pathParameters") or {}).get("id")
+        if not submission_id and not importing:
             return error("Missing submission ID", 400)
 
         body = json.loads(event.get("body") or "{}")
         filename = body.get("filename", "").strip()
         content_type = body.get("contentType", "").strip()
+        allowed = IMPORT_CONTENT_TYPES if importing else ALLOWED_CONTENT_TYPES
 
         if not filename:
             return error("filename is required", 400)
         if not content_type:
             return error("contentType is required", 400)
-        if content_type not in ALLOWED_CONTENT_TYPES:
-            return error(f"Content type not allowed: {content_type}. Allowed: {', '.join(sorted(ALLOWED_CONTENT_TYPES))}", 400)
-
-        # Look up submission to get createdAt for S3 prefix
-        submission = get_latest_active_version(submission_id)
-        if not submission:
-            return not_found("Submission not found")
+        if content_type not in allowed:
+            return error(f"Content type not allowed: {content_type}. Allowed: {', '.join(sorted(allowed))}", 400)
 
-        created_at = str(submission.get("createdAt", ""))[:10]  # YYYY-MM-DD
         short_uuid = uuid.uuid4().hex[:8]
         safe_filename = filename.replace("/", "_").replace("\\", "_")
-        s3_key = f"{created_at}_{submission_id}/files/{short_uuid}_{safe_filename}"
+        if importing:
+            # The import picks the reader from the extension, so make it match the content type
+            safe_filename = f"{safe_filename.rsplit('.', 1)[0]}.{IMPORT_CONTENT_TYPES[content_type]}"
+            s3_key = f"{import_key_prefix(user['user_id'])}{short_uuid}_{safe_filename}"
+        else:
+            # Look up submission to get createdAt for S3 prefix
+            submission = get_latest_active_version(submission_id)
+            if not submission:
+                return not_found("Submission not found")
+
+            created_at = str(submission.get("createdAt", ""))[:10]  # YYYY-MM-DD
+            s3_key = f"{created_at}_{submission_id}/files/{short_uuid}_{safe_filename}"
 
         presigned_url = s3_client.generate_presigned_url(
             "put_object",
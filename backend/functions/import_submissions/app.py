@@ -0,0 +1,208 @@
+"""Bulk import of submissions from a CSV/XLSX spreadsheet stored in S3.
+
+The file must sit under the caller's own imports/<userId>/ prefix, where
+POST /submissions/import/upload-url issues upload URLs. Rows are streamed,
+validated one by one and written in parallel 25-row TransactWriteItems chunks,
+each row together with its studyId claim. A studyId that repeats within the
+file or already belongs to a submission fails its row. When the Lambda is
+about to run out of time the import stops at a row boundary and returns
+``nextRow``; calling again with ``resumeFrom`` continues from there without
+re-importing earlier rows.
+"""
+
+import io
+import json
+import os
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+
+from shared.aws import boto3
+from shared.response import success, error, not_found, server_error
+from shared.identity import get_user_identity
+from shared.geography import normalize_geography
+from shared.content_hash import content_hash
+from shared.validator import validate_submission, ValidationError
+from shared.db import put_new_submissions, study_id_key, TRANSACT_WRITE_ROWS
+from shared.spreadsheet import (
+    iter_csv_rows, iter_xlsx_rows, row_to_submission, import_key_prefix, SpreadsheetError,
+)
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+SUPPORTED_EXTENSIONS = {"csv", "xlsx"}
+FIRST_DATA_ROW = 2  # row 1 is the header
+
+FLUSH_SIZE = 500  # valid rows buffered before a parallel transactional write
+WRITE_WORKERS = 8
+# API Gateway cuts the connection at 29s, whatever the Lambda timeout is
+REQUEST_BUDGET_MS = 25000
+TIME_SAFETY_MARGIN_MS = 3000  # left over to flush the last buffer and respond
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    user = get_user_identity(event)
+
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except json.JSONDecodeError:
+        return error("Invalid JSON in request body")
+
+    key = str(body.get("key") or "").strip()
+    prefix = import_key_prefix(user["user_id"])
+    if not key.startswith(prefix) or ".." in key:
+        return error(f"key must be an S3 object key under {prefix}")
+    extension = key.rsplit(".", 1)[-1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        return error(f"Unsupported file type. Allowed: {', '.join(sorted(SUPPORTED_EXTENSIONS))}")
+
+    try:
+        resume_from = int(body.get("resumeFrom", FIRST_DATA_ROW))
+        if resume_from < FIRST_DATA_ROW:
+            raise ValueError
+    except (ValueError, TypeError):
+        return error(f"resumeFrom must be an integer >= {FIRST_DATA_ROW}")
+
+    try:
+        rows = _open_rows(key, extension)
+        report = _import_rows(rows, resume_from, user, context)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return not_found(f"Import file not found: {key}")
+        logger.exception("S3 read failed")
+        return server_error("Failed to read import file")
+    except SpreadsheetError as e:
+        return error(str(e))
+    except Exception:
+        logger.exception("Bulk import failed")
+        return server_error("Failed to import submissions")
+
+    return success({"key": key, **report})
+
+
+def _open_rows(key, extension):
+    s3 = boto3.client("s3")
+    obj = s3.get_object(Bucket=os.environ["FILES_BUCKET"], Key=key)
+    if extension == "csv":
+        return iter_csv_rows(obj["Body"].iter_lines(keepends=True))
+    # The zip central directory sits at the end of the file, so XLSX needs a seekable buffer
+    return iter_xlsx_rows(io.BytesIO(obj["Body"].read()))
+
+
+def _import_rows(rows, resume_from, user, context):
+    deadline = _deadline(context)
+    now = datetime.now(timezone.utc).isoformat()
+    errors = []
+    imported = 0
+    processed = 0
+    next_row = None
+    pending = []
+    seen_study_ids = {}  # claim key -> first row using it
+
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+        for row_number, row in rows:
+            if row_number < resume_from:
+                continue
+            if time.monotonic() >= deadline:
+                next_row = row_number
+                break
+            if not any(str(v).strip() for v in row.values() if v is not None):
+                continue  # blank line
+
+            processed += 1
+            data = row_to_submission(row)
+            try:
+                validate_submission(data)
+            except ValidationError as e:
+                errors.append({"row": row_number, "studyId": data.get("studyId"), "errors": e.errors})
+                continue
+
+            key = study_id_key(data["studyId"])["submissionId"]
+            if key in seen_study_ids:
+                errors.append(_row_error(
+                    row_number, data["studyId"],
+                    f"Duplicate studyId (also on row {seen_study_ids[key]})",
+                ))
+                continue
+            seen_study_ids[key] = row_number
+
+            pending.append((row_number, _new_item(normalize_geography(data), user, now)))
+            if len(pending) >= FLUSH_SIZE:
+                imported += _flush(pending, errors, executor)
+                pending = []
+
+        imported += _flush(pending, errors, executor)
+
+    errors.sort(key=lambda e: e["row"])
+    return {
+        "status": "partial" if next_row else "complete",
+        "processedRows": processed,
+        "imported": imported,
+        "failed": len(errors),
+        "errors": errors,
+        "nextRow": next_row,
+    }
+
+
+def _new_item(data, user, now):
+    return {
+        **data,
+        "submissionId": str(uuid.uuid4()),
+        "version": 1,
+        "status": "active",
+        "userId": user["user_id"],
+        "modifiedBy": user["user_id"],
+        "createdAt": now,
+        "updatedAt": now,
+        "contentHash": content_hash(data),
+    }
+
+
+def _row_error(row_number, study_id, message, field="studyId"):
+    return {"row": row_number, "studyId": study_id, "errors": [{"field": field, "message": message}]}
+
+
+def _flush(pending, errors, executor):
+    """Write pending (row_number, item) pairs in parallel chunks; returns the count written."""
+    if not pending:
+        return 0
+    chunks = [pending[i:i + TRANSACT_WRITE_ROWS] for i in range(0, len(pending), TRANSACT_WRITE_ROWS)]
+    futures = [
+        (chunk, executor.submit(put_new_submissions, [item for _, item in chunk]))
+        for chunk in chunks
+    ]
+    written = 0
+    for chunk, future in futures:
+        try:
+            taken, unprocessed = future.result()
+        except Exception:
+            logger.exception("TransactWriteItems failed")
+            taken, unprocessed = [], [item for _, item in chunk]
+        owners = {item["submissionId"]: owner for item, owner in taken}
+        failed = {item["submissionId"] for item in unprocessed}
+        for row_number, item in chunk:
+            if item["submissionId"] in owners:
+                errors.append(_row_error(
+                    row_number, item["studyId"],
+                    f"studyId {item['studyId']} is already used by submission {owners[item['submissionId']]}",
+                ))
+            elif item["submissionId"] in failed:
+                errors.append(_row_error(row_number, item["studyId"], "Failed to save row", field=None))
+            else:
+                written += 1
+    return written
+
+
+def _deadline(context):
+    """Monotonic time after which no new rows are started."""
+    budget_ms = REQUEST_BUDGET_MS
+    if context is not None:
+        budget_ms = min(budget_ms, context.get_remaining_time_in_millis())
+    return time.monotonic() + (budget_ms - TIME_SAFETY_MARGIN_MS) / 1000
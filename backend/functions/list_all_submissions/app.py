@@ -3,10 +3,12 @@ import logging
 from shared.response import success, server_error
 from shared.identity import get_user_identity
 from shared.db import list_all_submissions
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 
 
+@handler_metrics
 def lambda_handler(event, context):
     get_user_identity(event)  # require auth but don't filter by user
     params = event.get("queryStringParameters") or {}
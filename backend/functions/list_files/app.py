@@ -3,25 +3,24 @@
 import os
 import logging
 
-import boto3
-from botocore.config import Config
-
+from shared.aws import LazyClient
 from shared.response import success, error, not_found, server_error
 from shared.identity import get_user_identity
 from shared.db import get_latest_active_version
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
 AWS_REGION = os.environ.get("AWS_REGION", "eu-central-1")
 
-s3_client = boto3.client(
+s3_client = LazyClient(
     "s3",
     region_name=AWS_REGION,
-    config=Config(
-        signature_version="s3v4",
-        s3={"addressing_style": "virtual"},
-    ),
+    config={
+        "signature_version": "s3v4",
+        "s3": {"addressing_style": "virtual"},
+    },
 )
 
 FILES_BUCKET = os.environ["FILES_BUCKET"]
@@ -29,6 +28,7 @@ FILES_BUCKET = os.environ["FILES_BUCKET"]
 DOWNLOAD_URL_EXPIRY = 3600  # 1 hour
 
 
+@handler_metrics
 def lambda_handler(event, context):
     try:
         get_user_identity(event)  # auth check
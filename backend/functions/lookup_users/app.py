@@ -2,16 +2,17 @@ import json
 import logging
 import os
 
-import boto3
-
+from shared.aws import boto3
 from shared.identity import get_user_identity
 from shared.response import error, server_error, success
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 
 MAX_USER_IDS = 25
 
 
+@handler_metrics
 def lambda_handler(event, context):
     # Enforce authentication
     try:
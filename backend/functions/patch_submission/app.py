@@ -0,0 +1,93 @@
+"""Partial update of a submission (JSON merge patch); creates a new version.
+
+Only the sections touched by the patch are re-validated, plus any rule in
+another section that depends on them. A ``null`` value removes the field.
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+
+from shared.response import success, error, not_found, server_error
+from shared.identity import get_user_identity
+from shared.geography import normalize_geography
+from shared.validator import validate_sections, ValidationError, FIELD_SECTIONS
+from shared.constants import METADATA_FIELDS
+from shared.content_hash import content_hash, same_content
+from shared.db import get_latest_active_version, put_next_version, StudyIdTakenError
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    submission_id = event["pathParameters"]["id"]
+
+    try:
+        patch = json.loads(event.get("body") or "{}")
+    except json.JSONDecodeError:
+        return error("Invalid JSON in request body")
+
+    if not isinstance(patch, dict) or not patch:
+        return error("Request body must be a non-empty object of fields to change")
+    unknown = sorted(key for key in patch if key not in FIELD_SECTIONS)
+    if unknown:
+        return error(f"Unknown or read-only field(s): {', '.join(unknown)}")
+
+    current = get_latest_active_version(submission_id)
+    if not current:
+        return not_found(f"No active submission found with id {submission_id}")
+
+    merged = {k: v for k, v in current.items() if k not in METADATA_FIELDS}
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+
+    try:
+        validate_sections(merged, {FIELD_SECTIONS[key] for key in patch})
+    except ValidationError as e:
+        return error("Validation failed", 400, e.errors)
+    normalize_geography(merged)
+    digest = content_hash(merged)
+    if same_content(current, digest):
+        # Nothing changed: keep the current version rather than minting an identical one
+        return success({
+            "submissionId": submission_id,
+            "version": int(current["version"]),
+            "unchanged": True,
+            "message": "No changes to save",
+        })
+
+    user = get_user_identity(event)
+    now = datetime.now(timezone.utc).isoformat()
+    new_version = int(current["version"]) + 1
+
+    new_item = {
+        **merged,
+        "submissionId": submission_id,
+        "version": new_version,
+        "status": "active",
+        "userId": current["userId"],
+        "modifiedBy": user["user_id"],
+        "createdAt": now,
+        "updatedAt": now,
+        "contentHash": digest,
+    }
+
+    try:
+        put_next_version(current, new_item)
+    except StudyIdTakenError as e:
+        return error(str(e), 409)
+    except Exception:
+        logger.exception("DynamoDB operation failed")
+        return server_error("Failed to update submission")
+
+    return success({
+        "submissionId": submission_id,
+        "version": new_version,
+        "sections": sorted({FIELD_SECTIONS[key] for key in patch}),
+        "message": "Submission updated successfully",
+    })
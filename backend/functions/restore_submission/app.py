@@ -1,22 +1,48 @@
 import logging
 
-from shared.response import success, not_found, server_error
-from shared.db import get_latest_archived_version, update_submission_status
+from shared.response import success, error, not_found, server_error
+from shared.db import (
+    get_latest_archived_version, restore_version, ConditionFailedError, StudyIdTakenError,
+)
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 
 
+@handler_metrics
 def lambda_handler(event, context):
     submission_id = event["pathParameters"]["id"]
-
-    current = get_latest_archived_version(submission_id)
-    if not current:
-        return not_found(f"No archived submission found with id {submission_id}")
-
-    version = int(current["version"])
+    params = event.get("queryStringParameters") or {}
+
+    # A client that knows the current version skips the lookup, but the restore
+    # then reads the version to find the studyId it re-claims. Either way it is
+    # one read, then one conditional write: an UpdateItem, or a transaction with
+    # the studyId claim when the version has a studyId.
+    current = None
+    if params.get("expectedVersion") is not None:
+        try:
+            version = int(params["expectedVersion"])
+            if version <= 0:
+                raise ValueError
+        except (ValueError, TypeError):
+            return error("expectedVersion must be a positive integer")
+    else:
+        current = get_latest_archived_version(submission_id)
+        if not current:
+            return not_found(f"No archived submission found with id {submission_id}")
+        version = int(current["version"])
 
     try:
-        update_submission_status(submission_id, version, "active")
+        restore_version(submission_id, version, current)
+    except StudyIdTakenError as e:
+        return error(f"Cannot restore: {e}", 409)
+    except ConditionFailedError as e:
+        if e.item is None:
+            return not_found(f"No submission found with id {submission_id} and version {version}")
+        return error(
+            f"Version {version} of submission {submission_id} is {e.item.get('status')}, not archived",
+            409,
+        )
     except Exception:
         logger.exception("DynamoDB operation failed")
         return server_error("Failed to restore submission")
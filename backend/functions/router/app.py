@@ -0,0 +1,133 @@
+"""Single entry point for every API route (the ``ApiLayout=router`` deployment).
+
+API Gateway sends all requests to one function through a ``/{proxy+}``
+resource. The router matches the method and path against ROUTES, rebuilds the
+path parameters the route's own resource would have produced and calls that
+route's ``lambda_handler``. Handler modules are imported on first use, so a
+cold start only pays for the route that triggered it and one warm container
+serves the whole API.
+"""
+
+import logging
+import os
+from importlib import import_module
+
+from shared.response import error, not_found
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# (method, resource, handler module): the API events of the per-route functions
+# in template.yaml. /health and /hello keep their own unauthenticated functions.
+ROUTES = (
+    ("POST", "/submissions", "create_submission"),
+    ("GET", "/submissions", "list_submissions"),
+    ("GET", "/submissions/all", "list_all_submissions"),
+    ("PUT", "/submissions/{id}", "update_submission"),
+    ("PATCH", "/submissions/{id}", "patch_submission"),
+    ("DELETE", "/submissions/{id}", "delete_submission"),
+    ("POST", "/submissions/{id}/restore", "restore_submission"),
+    ("GET", "/submissions/{id}/history", "get_submission_history"),
+    ("GET", "/submissions/{id}/versions/{version}", "get_submission_version"),
+    ("GET", "/submissions/by-study-id/{studyId}", "get_submission_by_study_id"),
+    ("GET", "/submissions/{id}/diff", "diff_submission"),
+    ("POST", "/submissions/import", "import_submissions"),
+    ("POST", "/submissions/archive", "bulk_archive_submissions"),
+    ("POST", "/submissions/restore", "bulk_restore_submissions"),
+    ("POST", "/submissions/validate", "validate_submissions"),
+    ("GET", "/drafts/{key}", "get_draft"),
+    ("PUT", "/drafts/{key}", "save_draft"),
+    ("DELETE", "/drafts/{key}", "delete_draft"),
+    ("POST", "/drafts/{key}/submit", "submit_draft"),
+    ("GET", "/submissions/{id}/similar", "get_similar_submissions"),
+    ("GET", "/submissions/search", "search_submissions"),
+    ("GET", "/suggest/{field}", "get_suggestions"),
+    ("GET", "/reference/{dataset}", "get_reference_data"),
+    ("POST", "/users/lookup", "lookup_users"),
+    ("POST", "/submissions/{id}/upload-url", "get_upload_url"),
+    ("POST", "/submissions/import/upload-url", "get_upload_url"),
+    ("GET", "/submissions/{id}/files", "list_files"),
+    ("DELETE", "/submissions/{id}/files/{filename}", "delete_file"),
+)
+
+
+def _segments(path):
+    return [s for s in path.split("/") if s]
+
+
+def compile_routes(routes):
+    """Resources grouped by segment count, most specific first, with their methods.
+
+    API Gateway prefers a literal path part over a {param} at the same depth
+    (/submissions/search over /submissions/{id}); sorting on "is this segment
+    a parameter" gives the first matching resource the same precedence.
+    ``routes`` are (method, resource, target) triples, like ROUTES.
+    """
+    resources = {}
+    for method, resource, target in routes:
+        resources.setdefault(resource, {})[method] = target
+    table = {}
+    for resource, methods in resources.items():
+        parts = tuple(
+            (s[1:-1], True) if s.startswith("{") else (s, False)
+            for s in _segments(resource)
+        )
+        table.setdefault(len(parts), []).append((parts, resource, methods))
+    for candidates in table.values():
+        candidates.sort(key=lambda c: tuple(is_param for _, is_param in c[0]))
+    return table
+
+
+_TABLE = compile_routes(ROUTES)
+_handlers = {}
+
+
+def resolve(method, path, table=_TABLE):
+    """(resource, target, path parameters) for a request, or None for an unknown path.
+
+    Raises LookupError with the resource's methods when the path exists but
+    not for this method.
+    """
+    segments = _segments(path)
+    for parts, resource, methods in table.get(len(segments), ()):
+        params = {}
+        for (name, is_param), segment in zip(parts, segments):
+            if is_param:
+                params[name] = segment
+            elif name != segment:
+                break
+        else:
+            if method not in methods:
+                raise LookupError(sorted(methods))
+            return resource, methods[method], params
+    return None
+
+
+def _handler(module):
+    handler = _handlers.get(module)
+    if handler is None:
+        handler = _handlers[module] = import_module(f"{module}.app").lambda_handler
+        logger.debug("Loaded route handler %s", module)
+    return handler
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    method = (event.get("httpMethod") or "").upper()
+    # The proxy parameter is the path below the API root, without any stage
+    # or custom-domain base path that event["path"] may carry
+    proxy = (event.get("pathParameters") or {}).get("proxy")
+    path = f"/{proxy}" if proxy is not None else event.get("path") or ""
+    try:
+        match = resolve(method, path)
+    except LookupError as e:
+        response = error(f"Method {method} not allowed", 405)
+        response["headers"] = {**response["headers"], "Allow": ",".join(e.args[0])}
+        return response
+    if match is None:
+        return not_found("Route not found")
+
+    resource, module, params = match
+    routed = {**event, "resource": resource, "pathParameters": params or None}
+    return _handler(module)(routed, context)
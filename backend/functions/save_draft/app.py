@@ -0,0 +1,63 @@
+"""Autosave: overwrite the caller's draft in place.
+
+Each save must name the revision it was based on. Saves from two tabs or
+devices can't silently clobber each other: the stale one gets a 409 and the
+client reloads the draft.
+"""
+
+import json
+import logging
+
+from shared.response import success, error, server_error
+from shared.identity import get_user_identity
+from shared.validator import validate_draft, ValidationError, FIELD_SECTIONS
+from shared.db import put_draft, ConditionFailedError
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+MAX_DRAFT_KEY_LENGTH = 64
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    draft_key = event["pathParameters"]["key"]
+    if not draft_key or len(draft_key) > MAX_DRAFT_KEY_LENGTH:
+        return error(f"Draft key must be 1-{MAX_DRAFT_KEY_LENGTH} characters")
+
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except json.JSONDecodeError:
+        return error("Invalid JSON in request body")
+
+    data = body.get("data") if isinstance(body, dict) else None
+    if not isinstance(data, dict):
+        return error("data must be an object of form fields")
+    unknown = sorted(key for key in data if key not in FIELD_SECTIONS)
+    if unknown:
+        return error(f"Unknown or read-only field(s): {', '.join(unknown)}")
+
+    revision = body.get("revision", 0)
+    if isinstance(revision, bool) or not isinstance(revision, int) or revision < 0:
+        return error("revision must be a non-negative integer")
+
+    try:
+        validate_draft(data)
+    except ValidationError as e:
+        return error("Validation failed", 400, e.errors)
+
+    user = get_user_identity(event)
+    try:
+        item = put_draft(user["user_id"], draft_key, data, revision)
+    except ConditionFailedError as e:
+        current = int(e.item["revision"]) if e.item else 0
+        return error(f"Draft {draft_key} is at revision {current}, not {revision}", 409)
+    except Exception:
+        logger.exception("DynamoDB put failed")
+        return server_error("Failed to save draft")
+
+    return success({
+        "draftKey": draft_key,
+        "revision": item["revision"],
+        "updatedAt": item["updatedAt"],
+    })
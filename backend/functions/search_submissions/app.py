@@ -0,0 +1,40 @@
+"""Full-text search over active submissions, from the BM25 search index."""
+
+import logging
+
+from shared.response import success, error, server_error, NO_CACHE_CONTROL
+from shared.search import load_index, DEFAULT_LIMIT
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+MAX_LIMIT = 100
+MAX_QUERY_LENGTH = 200
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    params = event.get("queryStringParameters") or {}
+    query = (params.get("q") or "").strip()
+    if not query:
+        return error("q is required")
+    if len(query) > MAX_QUERY_LENGTH:
+        return error(f"q must be at most {MAX_QUERY_LENGTH} characters")
+
+    try:
+        limit = int(params.get("limit", DEFAULT_LIMIT))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError
+    except (ValueError, TypeError):
+        return error(f"limit must be an integer between 1 and {MAX_LIMIT}")
+
+    try:
+        results = load_index().search(query, limit=limit)
+    except Exception:
+        logger.exception("Search failed")
+        return server_error("Failed to search submissions")
+
+    return success(
+        {"query": query, "results": results, "count": len(results)},
+        headers={"Cache-Control": NO_CACHE_CONTROL},
+    )
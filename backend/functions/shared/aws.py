@@ -0,0 +1,212 @@
+"""boto3 and AWS clients, imported and created on first use.
+
+Importing boto3 takes about 0.2 s, and a container's first client another
+0.1 s to load its service model. Loading them when a request first needs AWS
+spares that cost to requests that never do: validation errors, the
+reference-data and validation endpoints, and the routes a router container
+never serves. Catching ``botocore.exceptions.ClientError`` is fine at import;
+that module takes under 10 ms.
+"""
+
+import importlib
+import logging
+import time
+
+logger = logging.getLogger()
+
+
+class LazyModule:
+    """A module imported on first attribute access; on_import(module) runs once, then."""
+
+    def __init__(self, name, on_import=None):
+        self._name = name
+        self._module = None
+        self._on_import = on_import
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_import:
+                self._on_import(module)
+            self._module = module
+        return getattr(self._module, attr)
+
+
+# --- Call hooks ---
+#
+# Sessions from here time every API call with botocore's before-call and
+# after-call events, and pass each call to the observers registered with
+# observe_calls (shared/metrics.py is one). A call is a dict of service,
+# operation, start (its time.perf_counter()), ms, status (the HTTP status,
+# None if no response came back), error (the exception's class name, or
+# None), response (the parsed response, or None), resource (the table,
+# bucket, function or user pool named in the request, or None), retries,
+# throttles (attempts the service throttled), request_bytes and
+# response_bytes (None when unknown, as for a streamed body). Every DynamoDB
+# operation that accepts it is sent with ReturnConsumedCapacity=INDEXES, so
+# responses carry the capacity consumed per table and index.
+
+_observers = []
+
+# Error codes of throttled requests, across the services the handlers call
+THROTTLING_CODES = frozenset({
+    "Throttling", "ThrottlingException", "ThrottledException", "RequestThrottledException",
+    "TooManyRequestsException", "ProvisionedThroughputExceededException", "RequestLimitExceeded",
+    "TransactionInProgressException", "LimitExceededException", "SlowDown", "RequestThrottled",
+})
+
+
+def observe_calls(callback):
+    """Run callback(call) after every AWS API call made through this module's sessions."""
+    if callback not in _observers:
+        _observers.append(callback)
+
+
+def _resource(params):
+    """The table(s), bucket, function or user pool an API call names, or None."""
+    for name in ("TableName", "Bucket", "FunctionName", "UserPoolId"):
+        if params.get(name):
+            return params[name]
+    tables = list(params.get("RequestItems") or ())
+    for item in params.get("TransactItems") or ():
+        for action in item.values():
+            if action.get("TableName") not in tables:
+                tables.append(action.get("TableName"))
+    return ",".join(t for t in tables if t) or None
+
+
+def _body_size(request):
+    length = request.get("headers", {}).get("Content-Length")
+    if length is not None:
+        return int(length)
+    body = request.get("body")
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    from botocore.utils import determine_content_length  # loaded with boto3 already
+    return determine_content_length(body)
+
+
+def _note_resource(params, context, **kwargs):
+    context["_resource"] = _resource(params)
+
+
+def _note_attempt(request_dict, attempts, response=None, **kwargs):
+    call = request_dict.get("context", {}).get("_call")
+    if call is None:
+        return None
+    call["attempts"] = attempts
+    if response is not None and response[1].get("Error", {}).get("Code") in THROTTLING_CODES:
+        call["throttles"] += 1
+    return None
+
+
+def _before_call(model, context, params=None, **kwargs):
+    context["_call"] = {
+        "service": model.service_model.service_name, "operation": model.name, "start": time.perf_counter(),
+        "resource": context.pop("_resource", None), "attempts": 1, "throttles": 0,
+        "request_bytes": _body_size(params or {}),
+    }
+
+
+def _response_size(model, http_response):
+    length = http_response.headers.get("content-length")
+    if length is not None:
+        return int(length)
+    if not model.has_streaming_output:
+        return len(http_response.content)
+    return None
+
+
+def _after_call(context, model=None, http_response=None, parsed=None, exception=None, **kwargs):
+    call = context.pop("_call", None)
+    if call is None:
+        return
+    call["ms"] = (time.perf_counter() - call["start"]) * 1000
+    call["status"] = http_response.status_code if http_response is not None else None
+    call["error"] = type(exception).__name__ if exception is not None else None
+    call["response"] = parsed
+    metadata = (parsed or getattr(exception, "response", None) or {}).get("ResponseMetadata", {})
+    call["retries"] = max(call.pop("attempts") - 1, metadata.get("RetryAttempts", 0))
+    call["response_bytes"] = _response_size(model, http_response) if http_response is not None else None
+    for observer in _observers:
+        try:
+            observer(call)
+        except Exception:
+            logger.exception("AWS call observer failed")
+
+
+def _return_consumed_capacity(params, model, **kwargs):
+    if "ReturnConsumedCapacity" in model.input_shape.members:
+        params.setdefault("ReturnConsumedCapacity", "INDEXES")
+
+
+def instrument(session):
+    """Register the call hooks on a boto3 session; clients created from it afterwards are timed."""
+    session.events.register(
+        "provide-client-params.dynamodb", _return_consumed_capacity, unique_id="shared.aws.consumed-capacity",
+    )
+    session.events.register("before-parameter-build", _note_resource, unique_id="shared.aws.resource")
+    # First, as botocore's retry handler ends the event when it asks for a retry
+    session.events.register_first("needs-retry", _note_attempt, unique_id="shared.aws.attempt")
+    session.events.register("before-call", _before_call, unique_id="shared.aws.before-call")
+    session.events.register("after-call", _after_call, unique_id="shared.aws.after-call")
+    session.events.register("after-call-error", _after_call, unique_id="shared.aws.after-call-error")
+    return session
+
+
+def _instrument_default_session(module):
+    # Also instrument any default session set up later (moto's mock_aws resets it)
+    setup = module.setup_default_session
+
+    def setup_default_session(**kwargs):
+        setup(**kwargs)
+        instrument(module.DEFAULT_SESSION)
+
+    module.setup_default_session = setup_default_session
+    if module.DEFAULT_SESSION is None:
+        module.setup_default_session()
+    else:
+        instrument(module.DEFAULT_SESSION)
+
+
+boto3 = LazyModule("boto3", on_import=_instrument_default_session)
+
+
+def session():
+    """A new boto3 session with the call hooks (a session is not thread-safe; use one per thread)."""
+    return instrument(boto3.session.Session())
+
+
+class LazyClient:
+    """A boto3 client created on first attribute access.
+
+    ``config`` holds botocore ``Config`` arguments; botocore.config is only
+    imported along with the client.
+    """
+
+    def __init__(self, service, config=None, **kwargs):
+        self._service = service
+        self._config = config
+        self._kwargs = kwargs
+        self._client = None
+
+    def __getattr__(self, attr):
+        if self._client is None:
+            kwargs = dict(self._kwargs)
+            if self._config:
+                from botocore.config import Config
+                kwargs["config"] = Config(**self._config)
+            self._client = boto3.client(self._service, **kwargs)
+        return getattr(self._client, attr)
+
+
+_types = LazyModule("boto3.dynamodb.types")
+_deserializer = None
+
+
+def deserialize(raw_item):
+    """Plain values of a low-level (typed) DynamoDB item, e.g. a stream image."""
+    global _deserializer
+    if _deserializer is None:
+        _deserializer = _types.TypeDeserializer()
+    return {k: _deserializer.deserialize(v) for k, v in raw_item.items()}
@@ -0,0 +1,69 @@
+"""Bulk archive/restore: resolve current versions and flip their status concurrently."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.db import (
+    get_latest_active_version, get_latest_archived_version,
+    archive_version, restore_version, ConditionFailedError,
+)
+
+logger = logging.getLogger()
+
+MAX_BULK_IDS = 500
+MAX_WORKERS = 16
+
+_CURRENT_VERSION_LOOKUPS = {
+    "active": get_latest_active_version,
+    "archived": get_latest_archived_version,
+}
+
+
+def parse_submission_ids(body):
+    """Return the de-duplicated submissionIds list from a request body, or raise ValueError."""
+    ids = body.get("submissionIds") if isinstance(body, dict) else None
+    if not isinstance(ids, list) or not ids:
+        raise ValueError("submissionIds must be a non-empty list")
+    if not all(isinstance(i, str) and i.strip() for i in ids):
+        raise ValueError("submissionIds items must be non-empty strings")
+    unique = list(dict.fromkeys(ids))
+    if len(unique) > MAX_BULK_IDS:
+        raise ValueError(f"Maximum {MAX_BULK_IDS} submission IDs per request")
+    return unique
+
+
+def change_statuses(submission_ids, from_status, to_status):
+    """Move each submission's current version from from_status to to_status.
+
+    Runs with bounded parallelism and a conditional write per item, so a
+    submission changed concurrently is reported as a conflict instead of being
+    overwritten. Returns one outcome dict per id, in input order.
+    """
+    workers = min(MAX_WORKERS, len(submission_ids))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda sid: _change_one(sid, from_status, to_status), submission_ids,
+        ))
+
+
+def summarize(results):
+    updated = sum(1 for r in results if r["result"] == "updated")
+    return {"results": results, "updated": updated, "failed": len(results) - updated}
+
+
+def _change_one(submission_id, from_status, to_status):
+    outcome = {"submissionId": submission_id}
+    try:
+        current = _CURRENT_VERSION_LOOKUPS[from_status](submission_id)
+        if not current:
+            return {**outcome, "result": "not_found"}
+        outcome["version"] = int(current["version"])
+        # Archiving releases the studyId; restoring re-claims it (a taken one is a conflict)
+        change = archive_version if to_status == "archived" else restore_version
+        change(submission_id, outcome["version"], current)
+    except ConditionFailedError:
+        return {**outcome, "result": "conflict"}
+    except Exception:
+        logger.exception("Status change failed for %s", submission_id)
+        return {**outcome, "result": "error"}
+    return {**outcome, "result": "updated"}
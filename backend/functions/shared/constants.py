@@ -62,8 +62,17 @@ MAX_STUDY_ID = 50
 MAX_STUDY_TITLE = 500
 MAX_LEAD_CENTER = 200
 MAX_CONTACT_NAME = 100
+MAX_CONTACT_EMAIL = 255
 MAX_RESEARCH_QUESTIONS = 2000
+MAX_TREATMENT_INTERVENTION = 500
 MAX_STUDY_INDICATORS = 2000
 MAX_FUNDING_SOURCE = 200
 MAX_COMMISSIONING_SOURCE = 200
 MAX_W3_BILATERAL = 500
+
+# Item attributes written by the backend rather than the form
+# (matching METADATA_KEYS in src/lib/transformSubmission.ts)
+METADATA_FIELDS = {
+    "submissionId", "version", "status", "userId",
+    "modifiedBy", "createdAt", "updatedAt", "contentHash",
+}
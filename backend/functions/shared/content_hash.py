@@ -0,0 +1,45 @@
+"""Canonical content hash of a submission's form fields.
+
+Two bodies hash the same when they differ only in key order, the order of
+array items (multi-selects are sets), number representation (JSON int/float
+vs DynamoDB Decimal), null fields, or system metadata.
+"""
+
+import hashlib
+import json
+from decimal import Decimal
+
+from shared.constants import METADATA_FIELDS
+
+
+def content_hash(data):
+    canonical = json.dumps(
+        {k: _normalize(v) for k, v in data.items() if k not in METADATA_FIELDS and v is not None},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def same_content(item, digest):
+    """True if a stored version has the given content hash.
+
+    Versions written before hashes were stored are hashed on the fly.
+    """
+    return (item.get("contentHash") or content_hash(item)) == digest
+
+
+def _normalize(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float, Decimal)):
+        # One spelling per number: 250000, 250000.0 and Decimal("250000") all match
+        number = Decimal(str(value))
+        return int(number) if number == number.to_integral_value() else float(number)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple, set)):
+        items = [_normalize(v) for v in value]
+        return sorted(items, key=lambda v: json.dumps(v, sort_keys=True))
+    return value
@@ -1,100 +1,348 @@
-"""DynamoDB operations for the submissions table."""
+"""Submissions, drafts and suggestions storage.
 
+The functions here are the interface handlers use. They run on the Store
+chosen by STORAGE_BACKEND: ``dynamodb`` (the default) or ``sqlite``, a file
+at SQLITE_PATH (in memory if unset) for tests, offline demos and local
+benchmarks. See shared/store.py.
+"""
+
+import heapq
+import logging
 import os
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+from shared.store import (  # noqa: F401 (re-exported)
+    ConditionFailedError, StudyIdTakenError, STUDY_ID_PREFIX, TIMELINE_ATTRIBUTES, study_id_key,
+)
+
+logger = logging.getLogger()
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The Store selected by STORAGE_BACKEND, created on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = os.environ.get("STORAGE_BACKEND", "dynamodb")
+            if backend == "dynamodb":
+                from shared.dynamodb_store import DynamoDBStore
+                _store = DynamoDBStore()
+            elif backend == "sqlite":
+                from shared.sqlite_store import SQLiteStore
+                _store = SQLiteStore(os.environ.get("SQLITE_PATH") or ":memory:")
+            else:
+                raise ValueError(f"Unknown STORAGE_BACKEND {backend!r}: use dynamodb or sqlite")
+        return _store
 
 
-def _get_table():
-    dynamodb = boto3.resource("dynamodb")
-    return dynamodb.Table(os.environ["SUBMISSIONS_TABLE"])
+def set_store(store):
+    """Use store from now on (None: STORAGE_BACKEND's on next use); returns the previous one."""
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+    return previous
 
 
 def put_submission(item):
-    table = _get_table()
-    table.put_item(Item=item)
+    get_store().put_submission(item)
     return item
 
 
 def get_latest_active_version(submission_id):
     """Get the current active version for a submissionId, or None."""
-    table = _get_table()
-    response = table.query(
-        KeyConditionExpression=Key("submissionId").eq(submission_id),
-        FilterExpression=Attr("status").eq("active"),
-        ScanIndexForward=False,
-        Limit=10,
-    )
-    items = response.get("Items", [])
-    return items[0] if items else None
+    return get_store().get_latest_version(submission_id, "active")
 
 
 def get_latest_archived_version(submission_id):
     """Get the current archived version for a submissionId, or None."""
-    table = _get_table()
-    response = table.query(
-        KeyConditionExpression=Key("submissionId").eq(submission_id),
-        FilterExpression=Attr("status").eq("archived"),
-        ScanIndexForward=False,
-        Limit=10,
-    )
-    items = response.get("Items", [])
-    return items[0] if items else None
+    return get_store().get_latest_version(submission_id, "archived")
 
 
 def list_user_submissions(user_id, status_filter="active"):
     """List submissions for a user via the ByUser GSI, filtered by status."""
-    table = _get_table()
-    response = table.query(
-        IndexName="ByUser",
-        KeyConditionExpression=Key("userId").eq(user_id),
-        FilterExpression=Attr("status").eq(status_filter),
-        ScanIndexForward=False,
-    )
-    return response.get("Items", [])
+    return get_store().list_user_submissions(user_id, status_filter)
 
 
 def get_version_history(submission_id):
     """Get all versions of a submission, newest first."""
-    table = _get_table()
-    response = table.query(
-        KeyConditionExpression=Key("submissionId").eq(submission_id),
-        ScanIndexForward=False,
-    )
-    return response.get("Items", [])
+    return get_store().get_version_history(submission_id)
+
+
+def get_version_timeline(submission_id, limit, exclusive_start_key=None):
+    """Get one page of version metadata (no form fields), newest first.
+
+    Returns (items, last_evaluated_key); last_evaluated_key is None on the last page.
+    """
+    return get_store().get_version_timeline(submission_id, limit, exclusive_start_key)
+
+
+def get_version(submission_id, version):
+    """Get a single version of a submission by its key, or None."""
+    return get_store().get_version(submission_id, version)
+
+
+def get_versions(submission_id, versions):
+    """Fetch several versions of a submission in one BatchGetItem.
+
+    Returns a dict of {version: item}; versions that don't exist are absent.
+    Unprocessed keys are retried with back-off, and RuntimeError is raised if
+    some are still unread after the last attempt.
+    """
+    return get_store().get_versions(submission_id, versions)
+
+
+BATCH_WRITE_SIZE = 25
+
+
+def batch_put_submissions(items):
+    """Write up to 25 items with BatchWriteItem, retrying unprocessed items.
+
+    Retries back off exponentially. Returns the items that were still
+    unprocessed after the last attempt (empty on full success). Safe to call
+    from worker threads.
+    """
+    if len(items) > BATCH_WRITE_SIZE:
+        raise ValueError(f"BatchWriteItem accepts at most {BATCH_WRITE_SIZE} items")
+    return get_store().batch_put_submissions(items)
 
 
 def mark_superseded(submission_id, version):
     """Mark a specific version as superseded."""
-    table = _get_table()
-    table.update_item(
-        Key={"submissionId": submission_id, "version": version},
-        UpdateExpression="SET #s = :s",
-        ExpressionAttributeNames={"#s": "status"},
-        ExpressionAttributeValues={":s": "superseded"},
-    )
+    get_store().mark_superseded(submission_id, version)
 
 
 def list_all_submissions(status_filter="active"):
     """List all submissions via the ByStatus GSI (not filtered by user)."""
-    table = _get_table()
-    response = table.query(
-        IndexName="ByStatus",
-        KeyConditionExpression=Key("status").eq(status_filter),
-        ScanIndexForward=False,
-    )
-    return response.get("Items", [])
+    return get_store().list_submissions(status_filter)
+
+
+def iter_all_submissions(status_filter="active", page_size=None):
+    """Yield every submission with the status, following the ByStatus index past its 1 MB pages.
 
+    For scripts that must see the whole table; unordered.
+    """
+    return get_store().iter_submissions(status_filter, page_size)
 
-def update_submission_status(submission_id, version, new_status):
-    """Update status and updatedAt in-place on an existing submission."""
-    from datetime import datetime, timezone
 
-    table = _get_table()
+def update_submission_status(submission_id, version, new_status, expected_status=None):
+    """Update status and updatedAt in-place on an existing submission.
+
+    With expected_status, the write only succeeds if the version still has that
+    status; otherwise ConditionFailedError is raised. Returns the updated item.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    return get_store().update_submission_status(submission_id, version, new_status, now, expected_status)
+
+
+def archive_version(submission_id, version, current=None):
+    """Archive the active version and release its studyId for reuse.
+
+    The status change and the release are one write. ConditionFailedError is
+    raised (and nothing written) if the version is missing or not active.
+    Pass the version as just read as current to skip re-reading its studyId.
+    """
     now = datetime.now(timezone.utc).isoformat()
-    table.update_item(
-        Key={"submissionId": submission_id, "version": version},
-        UpdateExpression="SET #s = :s, updatedAt = :u",
-        ExpressionAttributeNames={"#s": "status"},
-        ExpressionAttributeValues={":s": new_status, ":u": now},
-    )
+    item = get_store().archive_version(submission_id, version, now, current)
+    record_suggestions(removed=[item])
+    return item
+
+
+def restore_version(submission_id, version, current=None):
+    """Restore an archived version, re-claiming its studyId in the same write.
+
+    If another submission took the studyId while this one was archived,
+    StudyIdTakenError is raised and the version stays archived.
+    ConditionFailedError is raised if the version is missing or not archived.
+    current works as for archive_version.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    item = get_store().restore_version(submission_id, version, now, current)
+    record_suggestions(added=[item])
+    return item
+
+
+# --- studyId claims (see shared/store.py) ---
+
+TRANSACT_WRITE_ROWS = 25  # submissions per import transaction (2 actions each, limit 100)
+
+
+def get_study_id_claim(study_id):
+    """Get the claim item ({studyId, ownerSubmissionId}) for a studyId, or None."""
+    return get_store().get_study_id_claim(study_id)
+
+
+def claim_study_id(item):
+    """Claim item["studyId"] for item["submissionId"]; a no-op if it already owns it."""
+    get_store().claim_study_id(item)
+
+
+def release_study_id(item):
+    """Drop the studyId claim if item["submissionId"] owns it."""
+    if not item.get("studyId"):
+        return
+    get_store().release_study_id(item)
+
+
+def put_new_submission(item):
+    """Write version 1 of a submission together with its studyId claim.
+
+    Raises StudyIdTakenError (and writes nothing) if another submission owns
+    the studyId.
+    """
+    get_store().put_new_submission(item)
+    record_suggestions(added=[item])
+    return item
+
+
+def put_next_version(current, new_item):
+    """Supersede ``current`` and write ``new_item`` as the next version.
+
+    When the studyId changes, the old claim is released and the new one taken
+    in the same transaction; StudyIdTakenError leaves everything untouched.
+    """
+    get_store().put_next_version(current, new_item)
+    record_suggestions(added=[new_item], removed=[current])
+    return new_item
+
+
+def put_new_submissions(items):
+    """Import helper: write up to TRANSACT_WRITE_ROWS new submissions with their claims.
+
+    All rows go in one transaction. When it is cancelled, rows whose studyId
+    is taken are dropped and the rest retried, backing off on transaction
+    conflicts. Returns (taken, unprocessed): (item, owner submissionId) pairs
+    rejected for their studyId, and items still unwritten after the last attempt.
+    """
+    if len(items) > TRANSACT_WRITE_ROWS:
+        raise ValueError(f"At most {TRANSACT_WRITE_ROWS} submissions per transaction")
+    taken, pending = get_store().put_new_submissions(items)
+    not_written = {id(item) for item, _ in taken} | {id(item) for item in pending}
+    record_suggestions(added=[item for item in items if id(item) not in not_written])
+    return taken, pending
+
+
+# --- Suggestions: how many active submissions use each free-text value ---
+#
+# One item per (field, valueKey) in the suggestions table, where valueKey is
+# the case-folded, space-collapsed value, so "CIMMYT" and " cimmyt" share a
+# count and the first spelling seen is the one suggested. Prefix lookups are
+# a single begins_with query on the field's partition. Counts follow the
+# submission write helpers above: a new active version adds its values, and
+# superseding or archiving one subtracts them.
+
+SUGGEST_FIELDS = (
+    "leadCenter", "commissioningSource", "fundingSource", "unitOfAnalysis", "dataCollectionMethods",
+)
+
+
+def suggestion_key(value):
+    """Lookup key of a value: case-folded, with runs of whitespace collapsed."""
+    return " ".join(str(value).split()).casefold()
+
+
+def suggestion_values(item):
+    """{(field, valueKey): value} for the suggestible values of a submission."""
+    values = {}
+    for field in SUGGEST_FIELDS:
+        raw = item.get(field)
+        for value in raw if isinstance(raw, list) else [raw]:
+            if isinstance(value, str) and value.strip():
+                values.setdefault((field, suggestion_key(value)), " ".join(value.split()))
+    return values
+
+
+def record_suggestions(added=(), removed=()):
+    """Adjust suggestion counts for submissions that became active (added) or stopped being so.
+
+    Values present on both sides cancel out, so an edit that keeps them costs
+    nothing. Best effort: counts only rank suggestions, so a failure is logged
+    rather than failing the write that triggered it.
+    """
+    counts = Counter()
+    spelling = {}
+    for item in added:
+        for key, value in suggestion_values(item).items():
+            counts[key] += 1
+            spelling.setdefault(key, value)
+    for item in removed:
+        for key in suggestion_values(item):
+            counts[key] -= 1
+
+    store = get_store()
+    for (field, value_key), change in counts.items():
+        if not change:
+            continue
+        try:
+            store.add_suggestion_count(field, value_key, change, spelling.get((field, value_key)))
+        except Exception:
+            logger.exception("Failed to update suggestion count for %s %r", field, value_key)
+
+
+# Counts read per lookup, about 50 KB: DynamoDB cannot order a prefix range by
+# count, so a short prefix would otherwise read most of the field's partition
+# on every keystroke
+SUGGESTIONS_MAX_READ = 1000
+
+
+def get_suggestions(field, prefix="", limit=10):
+    """The most used values of a field starting with prefix, as [{value, count}].
+
+    Reads the prefix range of the field's counts, stopping after
+    SUGGESTIONS_MAX_READ of them, and ranks what it read. Under a prefix with
+    more values than that, the ranking covers only the first ones in key order
+    until the user types more.
+    """
+    values = get_store().query_suggestions(field, suggestion_key(prefix), SUGGESTIONS_MAX_READ)
+    top = heapq.nsmallest(limit, values, key=lambda v: (-v["count"], v["value"].casefold()))
+    return [{"value": v["value"], "count": int(v["count"])} for v in top]
+
+
+def put_suggestion_counts(counts, spellings):
+    """Overwrite suggestion counts with {(field, valueKey): count} (used by the rebuild script)."""
+    get_store().put_suggestion_counts(counts, spellings)
+
+
+def list_suggestion_keys(field):
+    """Every stored valueKey of a field."""
+    return get_store().list_suggestion_keys(field)
+
+
+def delete_suggestions(field, value_keys):
+    get_store().delete_suggestions(field, value_keys)
+
+
+# --- Drafts: one overwritable item per (userId, draftKey) ---
+
+DRAFT_TTL_DAYS = 90
+
+
+def get_draft(user_id, draft_key):
+    return get_store().get_draft(user_id, draft_key)
+
+
+def put_draft(user_id, draft_key, data, expected_revision):
+    """Overwrite a draft in place if it is still at expected_revision (0 = no draft yet).
+
+    Returns the stored item, with revision incremented. Raises ConditionFailedError,
+    carrying the current draft, when another save got there first.
+    """
+    now = datetime.now(timezone.utc)
+    item = {
+        "userId": user_id,
+        "draftKey": draft_key,
+        "revision": expected_revision + 1,
+        "data": data,
+        "updatedAt": now.isoformat(),
+        "expiresAt": int(now.timestamp()) + DRAFT_TTL_DAYS * 86400,
+    }
+    get_store().put_draft(item, expected_revision)
+    return item
+
+
+def delete_draft(user_id, draft_key):
+    get_store().delete_draft(user_id, draft_key)
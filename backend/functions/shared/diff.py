@@ -0,0 +1,60 @@
+"""Field-level diff between two versions of a submission."""
+
+from shared.constants import METADATA_FIELDS
+
+
+def diff_versions(old, new):
+    """Compare the form fields of two version items.
+
+    Returns a list of change dicts sorted by field name. Scalar and object
+    fields report ``from``/``to``; array fields report ``added``/``removed``
+    items (order-insensitive, so a reordered multi-select is not a change).
+    """
+    changes = []
+    fields = (set(old) | set(new)) - METADATA_FIELDS
+    for field in sorted(fields):
+        before = old.get(field)
+        after = new.get(field)
+        if isinstance(before, list) or isinstance(after, list):
+            change = _diff_array(field, before, after)
+        else:
+            change = _diff_value(field, before, after)
+        if change:
+            changes.append(change)
+    return changes
+
+
+def _kind(before, after):
+    if before is None:
+        return "added"
+    if after is None:
+        return "removed"
+    return "modified"
+
+
+def _diff_value(field, before, after):
+    if before == after:
+        return None
+    change = {"field": field, "change": _kind(before, after)}
+    if before is not None:
+        change["from"] = before
+    if after is not None:
+        change["to"] = after
+    return change
+
+
+def _diff_array(field, before, after):
+    if not isinstance(before, (list, type(None))) or not isinstance(after, (list, type(None))):
+        return _diff_value(field, before, after)
+    before_items = before or []
+    after_items = after or []
+    added = [v for v in after_items if v not in before_items]
+    removed = [v for v in before_items if v not in after_items]
+    if not added and not removed and (before is None) == (after is None):
+        return None
+    return {
+        "field": field,
+        "change": _kind(before, after),
+        "added": added,
+        "removed": removed,
+    }
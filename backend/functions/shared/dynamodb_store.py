@@ -0,0 +1,474 @@
+"""DynamoDB storage for the submissions, drafts and suggestions tables (from env vars)."""
+
+import logging
+import os
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+from shared.aws import deserialize, LazyModule, session
+from shared.store import (
+    ConditionFailedError, StudyIdTakenError, Store, TIMELINE_ATTRIBUTES, claim_item, study_id_key,
+)
+
+logger = logging.getLogger()
+
+_thread_local = threading.local()
+_conditions = LazyModule("boto3.dynamodb.conditions")
+
+BATCH_GET_MAX_ATTEMPTS = 5
+BATCH_WRITE_MAX_ATTEMPTS = 5
+TRANSACT_WRITE_MAX_ATTEMPTS = 5
+
+
+# Condition builders of boto3.dynamodb.conditions, imported on first use
+def Key(name):
+    return _conditions.Key(name)
+
+
+def Attr(name):
+    return _conditions.Attr(name)
+
+
+def _get_table():
+    return _get_thread_resource().Table(os.environ["SUBMISSIONS_TABLE"])
+
+
+def _get_drafts_table():
+    return _get_thread_resource().Table(os.environ["DRAFTS_TABLE"])
+
+
+def _get_suggestions_table():
+    return _get_thread_resource().Table(os.environ["SUGGESTIONS_TABLE"])
+
+
+def _deserialize(raw_item):
+    """Convert a low-level (typed) item from an error response into plain values."""
+    if not raw_item:
+        return None
+    return deserialize(raw_item)
+
+
+def _get_thread_resource():
+    """Per-thread DynamoDB resource (boto3 sessions are not thread-safe)."""
+    resource = getattr(_thread_local, "dynamodb", None)
+    if resource is None:
+        resource = session().resource("dynamodb")
+        _thread_local.dynamodb = resource
+    return resource
+
+
+def _owner_condition():
+    return "attribute_not_exists(submissionId) OR ownerSubmissionId = :owner"
+
+
+def _claim_action(item):
+    return {"Put": {
+        "TableName": os.environ["SUBMISSIONS_TABLE"],
+        "Item": claim_item(item),
+        "ConditionExpression": _owner_condition(),
+        "ExpressionAttributeValues": {":owner": item["submissionId"]},
+        "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+    }}
+
+
+def _release_action(item):
+    return {"Delete": {
+        "TableName": os.environ["SUBMISSIONS_TABLE"],
+        "Key": study_id_key(item["studyId"]),
+        "ConditionExpression": _owner_condition(),
+        "ExpressionAttributeValues": {":owner": item["submissionId"]},
+    }}
+
+
+def _put_action(item):
+    return {"Put": {"TableName": os.environ["SUBMISSIONS_TABLE"], "Item": item}}
+
+
+def _cancellation_codes(error):
+    """Per-action (code, item) pairs from a cancelled transaction, or None for other errors."""
+    if error.response["Error"]["Code"] != "TransactionCanceledException":
+        return None
+    return [
+        (reason.get("Code"), _deserialize(reason.get("Item")))
+        for reason in error.response.get("CancellationReasons", [])
+    ]
+
+
+def _transact(actions, claim_index, study_id):
+    """Run one transaction; a failed claim at claim_index becomes StudyIdTakenError."""
+    client = _get_thread_resource().meta.client
+    try:
+        client.transact_write_items(TransactItems=actions)
+    except ClientError as e:
+        reasons = _cancellation_codes(e)
+        if reasons and reasons[claim_index][0] == "ConditionalCheckFailed":
+            raise StudyIdTakenError(study_id, reasons[claim_index][1]) from e
+        raise
+
+
+class DynamoDBStore(Store):
+    """Tables named by SUBMISSIONS_TABLE, DRAFTS_TABLE and SUGGESTIONS_TABLE."""
+
+    def put_submission(self, item):
+        _get_table().put_item(Item=item)
+
+    def get_latest_version(self, submission_id, status):
+        response = _get_table().query(
+            KeyConditionExpression=Key("submissionId").eq(submission_id),
+            FilterExpression=Attr("status").eq(status),
+            ScanIndexForward=False,
+            Limit=10,
+        )
+        items = response.get("Items", [])
+        return items[0] if items else None
+
+    def list_user_submissions(self, user_id, status):
+        response = _get_table().query(
+            IndexName="ByUser",
+            KeyConditionExpression=Key("userId").eq(user_id),
+            FilterExpression=Attr("status").eq(status),
+            ScanIndexForward=False,
+        )
+        return response.get("Items", [])
+
+    def list_submissions(self, status):
+        response = _get_table().query(
+            IndexName="ByStatus",
+            KeyConditionExpression=Key("status").eq(status),
+            ScanIndexForward=False,
+        )
+        return response.get("Items", [])
+
+    def iter_submissions(self, status, page_size=None):
+        kwargs = {"IndexName": "ByStatus", "KeyConditionExpression": Key("status").eq(status)}
+        if page_size:
+            kwargs["Limit"] = page_size
+        table = _get_table()
+        while True:
+            response = table.query(**kwargs)
+            yield from response.get("Items", [])
+            if "LastEvaluatedKey" not in response:
+                return
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def get_version_history(self, submission_id):
+        response = _get_table().query(
+            KeyConditionExpression=Key("submissionId").eq(submission_id),
+            ScanIndexForward=False,
+        )
+        return response.get("Items", [])
+
+    def get_version_timeline(self, submission_id, limit, exclusive_start_key=None):
+        names = {f"#a{i}": attr for i, attr in enumerate(TIMELINE_ATTRIBUTES)}
+        kwargs = {
+            "KeyConditionExpression": Key("submissionId").eq(submission_id),
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+            "ScanIndexForward": False,
+            "Limit": limit,
+        }
+        if exclusive_start_key:
+            kwargs["ExclusiveStartKey"] = exclusive_start_key
+        response = _get_table().query(**kwargs)
+        return response.get("Items", []), response.get("LastEvaluatedKey")
+
+    def get_version(self, submission_id, version):
+        response = _get_table().get_item(Key={"submissionId": submission_id, "version": version})
+        return response.get("Item")
+
+    def get_versions(self, submission_id, versions):
+        """BatchGetItem, retrying unprocessed keys with exponential back-off."""
+        dynamodb = _get_thread_resource()
+        table_name = os.environ["SUBMISSIONS_TABLE"]
+        request = {
+            table_name: {
+                "Keys": [{"submissionId": submission_id, "version": v} for v in set(versions)],
+            }
+        }
+        found = {}
+        for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+            if not request:
+                return found
+            if attempt:
+                time.sleep(0.05 * 2 ** attempt)
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(table_name, []):
+                found[int(item["version"])] = item
+            request = response.get("UnprocessedKeys")
+        if request:
+            # Reporting the keys as missing would turn throttling into a 404
+            raise RuntimeError(f"BatchGetItem left keys unprocessed after {BATCH_GET_MAX_ATTEMPTS} attempts")
+        return found
+
+    def batch_put_submissions(self, items):
+        """BatchWriteItem, retrying unprocessed items with exponential back-off."""
+        dynamodb = _get_thread_resource()
+        table_name = os.environ["SUBMISSIONS_TABLE"]
+        requests = [{"PutRequest": {"Item": item}} for item in items]
+        for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+            if not requests:
+                break
+            if attempt:
+                time.sleep(0.05 * 2 ** attempt)
+            response = dynamodb.batch_write_item(RequestItems={table_name: requests})
+            requests = response.get("UnprocessedItems", {}).get(table_name, [])
+        return [r["PutRequest"]["Item"] for r in requests]
+
+    def mark_superseded(self, submission_id, version):
+        _get_table().update_item(
+            Key={"submissionId": submission_id, "version": version},
+            UpdateExpression="SET #s = :s",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={":s": "superseded"},
+        )
+
+    def update_submission_status(self, submission_id, version, new_status, updated_at, expected_status=None):
+        kwargs = {}
+        if expected_status:
+            kwargs["ConditionExpression"] = Attr("status").eq(expected_status)
+            kwargs["ReturnValuesOnConditionCheckFailure"] = "ALL_OLD"
+        try:
+            response = _get_table().update_item(
+                Key={"submissionId": submission_id, "version": version},
+                UpdateExpression="SET #s = :s, updatedAt = :u",
+                ExpressionAttributeNames={"#s": "status"},
+                ExpressionAttributeValues={":s": new_status, ":u": updated_at},
+                ReturnValues="ALL_NEW",
+                **kwargs,
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ConditionFailedError(
+                    f"{submission_id} v{version} is no longer {expected_status}",
+                    _deserialize(e.response.get("Item")),
+                ) from e
+            raise
+        return response["Attributes"]
+
+    def _move_status(self, submission_id, version, new_status, expected_status, updated_at, claim, current):
+        """Change the status of a version, conditional on expected_status, in one
+        transaction with the claim (claim=True) or release of its studyId.
+
+        current is the version as the caller last read it; only its studyId is
+        used, so passing it saves a GetItem. Without a studyId the change is a
+        single conditional UpdateItem.
+        """
+        if current is None:
+            current = self.get_version(submission_id, version)
+            if current is None or current.get("status") != expected_status:
+                raise ConditionFailedError(f"{submission_id} v{version} is no longer {expected_status}", current)
+        if not current.get("studyId"):
+            return self.update_submission_status(submission_id, version, new_status, updated_at, expected_status)
+
+        actions = [
+            {"Update": {
+                "TableName": os.environ["SUBMISSIONS_TABLE"],
+                "Key": {"submissionId": submission_id, "version": version},
+                "UpdateExpression": "SET #s = :s, updatedAt = :u",
+                "ConditionExpression": "#s = :expected",
+                "ExpressionAttributeNames": {"#s": "status"},
+                "ExpressionAttributeValues": {":s": new_status, ":u": updated_at, ":expected": expected_status},
+                "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+            }},
+            _claim_action(current) if claim else _release_action(current),
+        ]
+        try:
+            _get_thread_resource().meta.client.transact_write_items(TransactItems=actions)
+        except ClientError as e:
+            reasons = _cancellation_codes(e)
+            if not reasons:
+                raise
+            (status_code, status_item), (claim_code, claim_holder) = reasons
+            if status_code == "ConditionalCheckFailed":
+                raise ConditionFailedError(
+                    f"{submission_id} v{version} is no longer {expected_status}", status_item,
+                ) from e
+            if claim_code != "ConditionalCheckFailed":
+                raise
+            if claim:
+                raise StudyIdTakenError(current["studyId"], claim_holder) from e
+            # Another submission holds the studyId, so there is nothing to release
+            return self.update_submission_status(submission_id, version, new_status, updated_at, expected_status)
+        return {**current, "status": new_status, "updatedAt": updated_at}
+
+    def archive_version(self, submission_id, version, updated_at, current=None):
+        return self._move_status(submission_id, version, "archived", "active", updated_at, False, current)
+
+    def restore_version(self, submission_id, version, updated_at, current=None):
+        return self._move_status(submission_id, version, "active", "archived", updated_at, True, current)
+
+    def get_study_id_claim(self, study_id):
+        response = _get_table().get_item(Key=study_id_key(study_id))
+        return response.get("Item")
+
+    def claim_study_id(self, item):
+        try:
+            _get_table().put_item(
+                Item=claim_item(item),
+                ConditionExpression=_owner_condition(),
+                ExpressionAttributeValues={":owner": item["submissionId"]},
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise StudyIdTakenError(item["studyId"], _deserialize(e.response.get("Item"))) from e
+            raise
+
+    def release_study_id(self, item):
+        try:
+            _get_table().delete_item(
+                Key=study_id_key(item["studyId"]),
+                ConditionExpression=Attr("ownerSubmissionId").eq(item["submissionId"]),
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+    def put_new_submission(self, item):
+        _transact([_put_action(item), _claim_action(item)], 1, item["studyId"])
+
+    def put_next_version(self, current, new_item):
+        if study_id_key(current.get("studyId", "")) == study_id_key(new_item["studyId"]):
+            self.mark_superseded(current["submissionId"], int(current["version"]))
+            self.put_submission(new_item)
+            return
+
+        actions = [
+            {"Update": {
+                "TableName": os.environ["SUBMISSIONS_TABLE"],
+                "Key": {"submissionId": current["submissionId"], "version": current["version"]},
+                "UpdateExpression": "SET #s = :s",
+                "ExpressionAttributeNames": {"#s": "status"},
+                "ExpressionAttributeValues": {":s": "superseded"},
+            }},
+            _put_action(new_item),
+            _claim_action(new_item),
+        ]
+        if current.get("studyId"):
+            actions.append(_release_action(current))
+        _transact(actions, 2, new_item["studyId"])
+
+    def put_new_submissions(self, items):
+        """One transaction for all rows; when it is cancelled, rows whose studyId is
+        taken are dropped and the rest retried, backing off on transaction conflicts."""
+        client = _get_thread_resource().meta.client
+        pending = list(items)
+        taken = []
+        for attempt in range(TRANSACT_WRITE_MAX_ATTEMPTS):
+            if not pending:
+                break
+            if attempt:
+                time.sleep(0.05 * 2 ** attempt)
+            actions = [a for item in pending for a in (_put_action(item), _claim_action(item))]
+            try:
+                client.transact_write_items(TransactItems=actions)
+                pending = []
+            except ClientError as e:
+                reasons = _cancellation_codes(e)
+                if reasons is None:
+                    raise
+                rejected = {
+                    i // 2: (claim or {}).get("ownerSubmissionId")
+                    for i, (code, claim) in enumerate(reasons) if code == "ConditionalCheckFailed"
+                }
+                taken.extend((pending[i], owner) for i, owner in sorted(rejected.items()))
+                pending = [item for i, item in enumerate(pending) if i not in rejected]
+        return taken, pending
+
+    def add_suggestion_count(self, field, value_key, change, value):
+        table = _get_suggestions_table()
+        try:
+            if change > 0:
+                table.update_item(
+                    Key={"field": field, "valueKey": value_key},
+                    UpdateExpression="ADD #c :n SET #v = if_not_exists(#v, :v)",
+                    ExpressionAttributeNames={"#c": "count", "#v": "value"},
+                    ExpressionAttributeValues={":n": change, ":v": value},
+                )
+            else:
+                table.update_item(
+                    Key={"field": field, "valueKey": value_key},
+                    UpdateExpression="ADD #c :n",
+                    ConditionExpression="attribute_exists(#c)",
+                    ExpressionAttributeNames={"#c": "count"},
+                    ExpressionAttributeValues={":n": change},
+                )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+    def query_suggestions(self, field, key_prefix, max_read=None):
+        condition = Key("field").eq(field)
+        if key_prefix:
+            condition &= Key("valueKey").begins_with(key_prefix)
+        kwargs = {
+            "KeyConditionExpression": condition,
+            "FilterExpression": Attr("count").gt(0),
+            "ProjectionExpression": "#v, #c",
+            "ExpressionAttributeNames": {"#v": "value", "#c": "count"},
+        }
+        table = _get_suggestions_table()
+        values = []
+        remaining = max_read
+        while True:
+            if remaining is not None:
+                kwargs["Limit"] = remaining
+            response = table.query(**kwargs)
+            values.extend(response["Items"])
+            if remaining is not None:
+                remaining -= response["ScannedCount"]
+            if "LastEvaluatedKey" not in response or remaining == 0:
+                return values
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def put_suggestion_counts(self, counts, spellings):
+        with _get_suggestions_table().batch_writer() as batch:
+            for (field, value_key), count in counts.items():
+                batch.put_item(Item={
+                    "field": field, "valueKey": value_key,
+                    "value": spellings[(field, value_key)], "count": count,
+                })
+
+    def list_suggestion_keys(self, field):
+        table = _get_suggestions_table()
+        kwargs = {"KeyConditionExpression": Key("field").eq(field), "ProjectionExpression": "valueKey"}
+        keys = []
+        while True:
+            response = table.query(**kwargs)
+            keys.extend(item["valueKey"] for item in response["Items"])
+            if "LastEvaluatedKey" not in response:
+                return keys
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def delete_suggestions(self, field, value_keys):
+        with _get_suggestions_table().batch_writer() as batch:
+            for value_key in value_keys:
+                batch.delete_item(Key={"field": field, "valueKey": value_key})
+
+    def get_draft(self, user_id, draft_key):
+        response = _get_drafts_table().get_item(Key={"userId": user_id, "draftKey": draft_key})
+        return response.get("Item")
+
+    def put_draft(self, item, expected_revision):
+        if expected_revision:
+            condition = Attr("revision").eq(expected_revision)
+        else:
+            condition = Attr("userId").not_exists()
+        try:
+            _get_drafts_table().put_item(
+                Item=item,
+                ConditionExpression=condition,
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ConditionFailedError(
+                    f"Draft {item['draftKey']} is no longer at revision {expected_revision}",
+                    _deserialize(e.response.get("Item")),
+                ) from e
+            raise
+
+    def delete_draft(self, user_id, draft_key):
+        _get_drafts_table().delete_item(Key={"userId": user_id, "draftKey": draft_key})
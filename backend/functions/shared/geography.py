@@ -0,0 +1,75 @@
+"""CGIAR region / country / ISO 3166-2 reference index for geographic fields.
+
+The index is generated from the frontend data by scripts/generate_geography.py
+and loaded on first use, so handlers that never touch geography don't pay for
+it. Lookups are set/dict membership — O(1) per code.
+"""
+
+import json
+import os
+
+from shared.constants import VALID_CGIAR_REGIONS
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geography.json")
+
+_index = None
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        with open(INDEX_PATH, encoding="utf-8") as f:
+            raw = json.load(f)
+        subnational = frozenset(
+            f"{country}-{suffix}"
+            for country, suffixes in raw["subnational"].items()
+            for suffix in suffixes.split()
+        )
+        _index = (raw["countries"], subnational)
+    return _index
+
+
+def is_region(code):
+    return code in VALID_CGIAR_REGIONS
+
+
+def is_country(code):
+    return code in _load_index()[0]
+
+
+def is_subnational(code):
+    return code in _load_index()[1]
+
+
+def region_for_country(code):
+    """CGIAR region of a country, or None if it has none."""
+    return _load_index()[0].get(code)
+
+
+def country_for_subnational(code):
+    """Country prefix of an ISO 3166-2 code, e.g. 'KE-01' -> 'KE'."""
+    return code.split("-", 1)[0]
+
+
+def regions_for_countries(codes):
+    return sorted({region for region in map(region_for_country, codes) if region})
+
+
+def countries_for_subnational(codes):
+    return sorted({country_for_subnational(code) for code in codes})
+
+
+def normalize_geography(data):
+    """Derive studyCountries/studyRegions from the finer-grained field, as the form does.
+
+    national      regions come from the countries
+    sub_national  countries come from the subnational units, regions from those
+    Other scopes are left as submitted. Expects codes already validated.
+    Mutates and returns data.
+    """
+    scope = data.get("geographicScope")
+    if scope == "sub_national":
+        data["studyCountries"] = countries_for_subnational(data.get("studySubnational") or [])
+    if scope in ("national", "sub_national"):
+        data["studyRegions"] = regions_for_countries(data.get("studyCountries") or [])
+    return data
@@ -0,0 +1,269 @@
+"""Per-invocation handler metrics, logged in CloudWatch Embedded Metric Format.
+
+@handler_metrics wraps a lambda_handler. Each invocation prints one JSON
+line to stdout. CloudWatch Logs turns it into metrics in the METRICS_NAMESPACE
+namespace, with no API call: Duration, ResponseSize, ColdStart, Errors,
+AWSCalls, AWSTime, the DynamoDB capacity consumed (ReadCapacityUnits,
+WriteCapacityUnits) and the S3 requests by pricing class (S3ListRequests,
+S3PutRequests, S3GetRequests, S3DeleteRequests). The dimensions are Function,
+plus Route for an API request. The line also carries properties for Logs
+Insights: the status code, the request id, the AWS calls per operation
+(count, ms, errors), the capacity per table and index, and the S3 requests
+per class. AWS calls are timed by the hooks in shared/aws.py, which also ask
+DynamoDB for its consumed capacity. scripts/cost_report.py ranks routes by
+cost per call from these lines. With TRACE_AWS_CALLS set, each call is also
+logged as a span (shared/tracing.py) with the same correlationId.
+
+A handler called from another wrapped handler (a route served by the router)
+adds its route to the caller's invocation instead of logging its own line.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from shared import tracing
+from shared.aws import observe_calls
+
+NAMESPACE = os.environ.get("METRICS_NAMESPACE", "MeliafStocktake")
+
+_current = contextvars.ContextVar("invocation", default=None)
+_active = set()
+_active_lock = threading.Lock()
+_cold = True
+
+# Operations whose capacity is read capacity, when DynamoDB reports only CapacityUnits
+READ_OPERATIONS = frozenset({
+    "GetItem", "BatchGetItem", "Query", "Scan", "TransactGetItems", "ExecuteStatement", "BatchExecuteStatement",
+})
+
+# S3 request pricing classes; other operations count as "Other"
+S3_CLASSES = {
+    "ListObjects": "List", "ListObjectsV2": "List", "ListObjectVersions": "List", "ListBuckets": "List",
+    "ListMultipartUploads": "List", "ListParts": "List",
+    "PutObject": "Put", "CopyObject": "Put", "CreateMultipartUpload": "Put", "UploadPart": "Put",
+    "UploadPartCopy": "Put", "CompleteMultipartUpload": "Put",
+    "GetObject": "Get", "HeadObject": "Get", "GetObjectTagging": "Get",
+    "DeleteObject": "Delete", "DeleteObjects": "Delete", "AbortMultipartUpload": "Delete",
+}
+S3_METRICS = (("List", "S3ListRequests"), ("Put", "S3PutRequests"), ("Get", "S3GetRequests"),
+              ("Delete", "S3DeleteRequests"))
+
+
+class Invocation:
+    """What one handler invocation recorded."""
+
+    def __init__(self, function, route=None, correlation_id=None):
+        self.function = function
+        self.route = route
+        self.correlation_id = correlation_id
+        self.start = time.perf_counter()
+        self.calls = []
+        self.capacity = {}  # (table, index or None) -> [read units, write units]
+        self.s3 = Counter()
+        self._lock = threading.Lock()
+
+    def record_call(self, call, capacity=(), s3_class=None):
+        with self._lock:
+            self.calls.append(call)
+            for table, index, read, write in capacity:
+                units = self.capacity.setdefault((table, index), [0.0, 0.0])
+                units[0] += read
+                units[1] += write
+            if s3_class:
+                self.s3[s3_class] += 1
+
+
+def current():
+    """The invocation in progress, or None.
+
+    Calls made on worker threads (ThreadPoolExecutor does not carry context
+    variables) count toward the only invocation in progress, if there is just
+    one, as in Lambda.
+    """
+    invocation = _current.get()
+    if invocation is None:
+        with _active_lock:
+            if len(_active) == 1:
+                invocation = next(iter(_active))
+    return invocation
+
+
+def _units(block, read_operation):
+    """(read, write) units of a ConsumedCapacity block."""
+    read, write = block.get("ReadCapacityUnits"), block.get("WriteCapacityUnits")
+    if read is None and write is None:
+        units = float(block.get("CapacityUnits") or 0)
+        return (units, 0.0) if read_operation else (0.0, units)
+    return float(read or 0), float(write or 0)
+
+
+def consumed_capacity(operation, response):
+    """[(table, index or None, read, write)] of a DynamoDB response's ConsumedCapacity."""
+    consumed = (response or {}).get("ConsumedCapacity") or []
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    read_operation = operation in READ_OPERATIONS
+    entries = []
+    for entry in consumed:
+        table = entry.get("TableName")
+        blocks = [(None, entry["Table"])] if "Table" in entry else []
+        for kind in ("GlobalSecondaryIndexes", "LocalSecondaryIndexes"):
+            blocks.extend((entry.get(kind) or {}).items())
+        if not blocks:
+            # ReturnConsumedCapacity=TOTAL, or no per-index breakdown
+            blocks = [(None, entry)]
+        entries.extend((table, index, *_units(block, read_operation)) for index, block in blocks)
+    return entries
+
+
+def _record_call(call):
+    invocation = current()
+    if tracing.enabled():
+        tracing.emit(call, invocation)
+    if invocation is None:
+        return
+    capacity, s3_class = (), None
+    if call["service"] == "dynamodb":
+        capacity = consumed_capacity(call["operation"], call.get("response"))
+    elif call["service"] == "s3":
+        s3_class = S3_CLASSES.get(call["operation"], "Other")
+    invocation.record_call(
+        {k: call[k] for k in ("service", "operation", "ms", "status", "error")}, capacity, s3_class,
+    )
+
+
+observe_calls(_record_call)
+
+
+def _route(event):
+    if isinstance(event, dict) and event.get("httpMethod") and event.get("resource"):
+        return f"{event['httpMethod']} {event['resource']}"
+    return None
+
+
+def _response_size(result):
+    if isinstance(result, dict) and "statusCode" in result:
+        return len((result.get("body") or "").encode("utf-8"))
+    if result is None:
+        return 0
+    return len(json.dumps(result, default=str).encode("utf-8"))
+
+
+def _by_operation(calls):
+    """[{service, operation, count, ms, errors}] of the calls, slowest first (bounded, unlike the calls)."""
+    totals = {}
+    for call in calls:
+        entry = totals.setdefault((call["service"], call["operation"]), {
+            "service": call["service"], "operation": call["operation"], "count": 0, "ms": 0.0, "errors": 0,
+        })
+        entry["count"] += 1
+        entry["ms"] += call["ms"]
+        entry["errors"] += int(call["error"] is not None or (call["status"] or 0) >= 400)
+    return sorted(({**e, "ms": round(e["ms"], 2)} for e in totals.values()), key=lambda e: -e["ms"])
+
+
+def _by_table(capacity):
+    """[{table, index, read, write}] of the capacity consumed, most first."""
+    entries = [
+        {"table": table, "index": index, "read": round(read, 2), "write": round(write, 2)}
+        for (table, index), (read, write) in capacity.items()
+    ]
+    return sorted(entries, key=lambda e: -(e["read"] + e["write"]))
+
+
+def emf_record(invocation, duration_ms, cold, result=None, error=None):
+    """The EMF document of a finished invocation."""
+    status = result.get("statusCode") if isinstance(result, dict) else None
+    aws_ms = sum(call["ms"] for call in invocation.calls)
+    read_units = sum(read for read, _ in invocation.capacity.values())
+    write_units = sum(write for _, write in invocation.capacity.values())
+    dimensions = ["Function", "Route"] if invocation.route else ["Function"]
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": NAMESPACE,
+                "Dimensions": [dimensions],
+                "Metrics": [
+                    {"Name": "Duration", "Unit": "Milliseconds"},
+                    {"Name": "ResponseSize", "Unit": "Bytes"},
+                    {"Name": "ColdStart", "Unit": "Count"},
+                    {"Name": "Errors", "Unit": "Count"},
+                    {"Name": "AWSCalls", "Unit": "Count"},
+                    {"Name": "AWSTime", "Unit": "Milliseconds"},
+                    {"Name": "ReadCapacityUnits", "Unit": "Count"},
+                    {"Name": "WriteCapacityUnits", "Unit": "Count"},
+                    *({"Name": name, "Unit": "Count"} for _, name in S3_METRICS),
+                ],
+            }],
+        },
+        "Function": invocation.function,
+        "Duration": round(duration_ms, 2),
+        "ResponseSize": _response_size(result) if error is None else 0,
+        "ColdStart": int(cold),
+        "Errors": int(error is not None or (status or 0) >= 500),
+        "AWSCalls": len(invocation.calls),
+        "AWSTime": round(aws_ms, 2),
+        "ReadCapacityUnits": round(read_units, 2),
+        "WriteCapacityUnits": round(write_units, 2),
+        **{name: invocation.s3[op] for op, name in S3_METRICS},
+        "statusCode": status,
+        "awsCalls": _by_operation(invocation.calls),
+        "capacity": _by_table(invocation.capacity),
+        "s3": dict(invocation.s3),
+    }
+    if invocation.route:
+        record["Route"] = invocation.route
+    if invocation.correlation_id:
+        record["correlationId"] = invocation.correlation_id
+    if error is not None:
+        record["error"] = type(error).__name__
+    return record
+
+
+def handler_metrics(handler):
+    """Log the EMF metrics of every invocation of a Lambda handler."""
+    module = handler.__module__.rsplit(".", 1)[0] if handler.__module__ != "__main__" else handler.__name__
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        global _cold
+        outer = _current.get()
+        if outer is not None:
+            # Served by another wrapped handler (the router): name the route on its line
+            outer.route = _route(event) or outer.route
+            return handler(event, context)
+
+        cold, _cold = _cold, False
+        function = (getattr(context, "function_name", None)
+                    or os.environ.get("AWS_LAMBDA_FUNCTION_NAME") or module)
+        invocation = Invocation(function, _route(event), tracing.correlation_id(event, context))
+        token = _current.set(invocation)
+        with _active_lock:
+            _active.add(invocation)
+        result = error = None
+        try:
+            result = handler(event, context)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration = (time.perf_counter() - invocation.start) * 1000
+            with _active_lock:
+                _active.discard(invocation)
+            _current.reset(token)
+            record = emf_record(invocation, duration, cold, result, error)
+            request_id = getattr(context, "aws_request_id", None)
+            if request_id:
+                record["requestId"] = request_id
+            sys.stdout.write(json.dumps(record, default=str) + "\n")
+            sys.stdout.flush()
+
+    return wrapper
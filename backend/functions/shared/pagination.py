@@ -0,0 +1,59 @@
+"""Opaque cursor encoding for paginated DynamoDB queries."""
+
+import base64
+import json
+
+from shared.response import _serialize
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(last_evaluated_key):
+    """Encode a LastEvaluatedKey as a URL-safe cursor string, or None."""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, default=_serialize, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, submission_id=None):
+    """Decode a cursor produced by encode_cursor back into an ExclusiveStartKey.
+
+    The key must be a submissions table key ({submissionId, version}, version
+    a positive integer) and, given submission_id, one of that submission's.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+    if not isinstance(key, dict) or set(key) != {"submissionId", "version"}:
+        raise InvalidCursorError("Invalid pagination cursor")
+    version = key["version"]
+    if not isinstance(version, int) or isinstance(version, bool) or version <= 0:
+        raise InvalidCursorError("Invalid pagination cursor")
+    if not isinstance(key["submissionId"], str) or (
+        submission_id is not None and key["submissionId"] != submission_id
+    ):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return key
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse a ?limit= query parameter, clamped to [1, maximum]."""
+    if value in (None, ""):
+        return default
+    try:
+        limit = int(value)
+    except (ValueError, TypeError):
+        raise ValueError("limit must be a positive integer")
+    if limit <= 0:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, maximum)
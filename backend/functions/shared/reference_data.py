@@ -0,0 +1,138 @@
+"""Searchable reference datasets: ISO 3166-2 subnational units and W3/bilateral projects.
+
+The data is generated from the frontend files by
+scripts/generate_reference_data.py. Each dataset gets two indexes:
+
+- a prefix index: the folded codes and label words in one sorted list, so a
+  prefix is a bisect plus a scan of the matching range;
+- a trigram index: each label word padded as "  word " and cut into
+  trigrams, with postings per trigram. This finds names despite typos,
+  accents or missing words.
+
+A query scores entries by word similarity: the share of the query's
+trigrams found in the label. Code matches rank first, then label-word
+prefixes, then fuzzy matches.
+"""
+
+import array
+import hashlib
+import json
+import os
+from bisect import bisect_left
+from collections import Counter
+
+from shared.text import fold
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference_data.json")
+DATASETS = ("subnational", "w3-bilateral")
+FUZZY_THRESHOLD = 0.5  # share of the query's trigrams the label must contain
+
+# Match tiers, best first
+_EXACT_CODE, _CODE_PREFIX, _WORD_PREFIX, _FUZZY = 3, 2, 1, 0
+
+
+def _trigrams(folded):
+    grams = set()
+    for word in folded.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class ReferenceIndex:
+    """Prefix and trigram indexes over (value, label, group) entries."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self._codes = [fold(value) for value, _, _ in entries]
+
+        keys = set()
+        grams = {}
+        self._gram_counts = array.array("H")
+        for i, (value, label, _) in enumerate(entries):
+            keys.add((self._codes[i], i, _CODE_PREFIX))
+            folded = fold(label)
+            keys.update((word, i, _WORD_PREFIX) for word in folded.split())
+            label_grams = _trigrams(folded)
+            self._gram_counts.append(len(label_grams))
+            for gram in label_grams:
+                grams.setdefault(gram, array.array("I")).append(i)
+
+        keys = sorted(keys)
+        self._keys = [key for key, _, _ in keys]
+        self._key_entries = array.array("I", (i for _, i, _ in keys))
+        self._key_tiers = bytes(tier for _, _, tier in keys)
+        self._grams = grams
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _prefix_matches(self, prefix):
+        """{entry: best tier} of entries with a code or label word starting with prefix."""
+        matches = {}
+        for k in range(bisect_left(self._keys, prefix), len(self._keys)):
+            if not self._keys[k].startswith(prefix):
+                break
+            i = self._key_entries[k]
+            tier = self._key_tiers[k]
+            if tier == _CODE_PREFIX and self._keys[k] == prefix:
+                tier = _EXACT_CODE
+            if tier > matches.get(i, -1):
+                matches[i] = tier
+        return matches
+
+    def _fuzzy_matches(self, folded):
+        """{entry: word similarity} of entries sharing enough trigrams with the query."""
+        query_grams = _trigrams(folded)
+        if len(query_grams) < 3:
+            return {}
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._grams.get(gram, ()))
+        needed = FUZZY_THRESHOLD * len(query_grams)
+        return {i: n / len(query_grams) for i, n in shared.items() if n >= needed}
+
+    def search(self, query, limit):
+        """Best entries for a query, as {value, label, group}; the first entries when it is blank."""
+        folded = fold(query)
+        if not folded:
+            return [self._result(i) for i in range(min(limit, len(self.entries)))]
+
+        prefix = self._prefix_matches(folded)
+        fuzzy = self._fuzzy_matches(folded)
+        ranked = sorted(
+            prefix.keys() | fuzzy.keys(),
+            key=lambda i: (
+                -prefix.get(i, _FUZZY),
+                -fuzzy.get(i, 0.0),
+                self._codes[i] if prefix.get(i, _FUZZY) >= _CODE_PREFIX else "",
+                self._gram_counts[i],  # fewer other words: a closer match
+                self.entries[i][1],
+            ),
+        )
+        return [self._result(i) for i in ranked[:limit]]
+
+    def _result(self, i):
+        value, label, group = self.entries[i]
+        return {"value": value, "label": label, "group": group}
+
+
+_cache = {}
+
+
+def load_indexes():
+    """{dataset: ReferenceIndex} and the data's version tag, built once per container."""
+    if "indexes" not in _cache:
+        with open(DATA_PATH, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw)
+        _cache["version"] = hashlib.sha256(raw).hexdigest()[:16]
+        _cache["indexes"] = {
+            "subnational": ReferenceIndex(
+                [(code, label, code.split("-", 1)[0]) for code, label in data["subnational"]]
+            ),
+            "w3-bilateral": ReferenceIndex(
+                [(project, project, center) for project, center in data["w3-bilateral"]]
+            ),
+        }
+    return _cache["indexes"], _cache["version"]
@@ -8,7 +8,7 @@ CORS_HEADERS = {
     "Content-Type": "application/json",
     "Access-Control-Allow-Origin": "*",
     "Access-Control-Allow-Headers": "Content-Type,Authorization",
-    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
+    "Access-Control-Allow-Methods": "GET,POST,PUT,PATCH,DELETE,OPTIONS",
 }
 
 
@@ -19,14 +19,28 @@ def _serialize(obj):
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
-def success(body, status_code=200):
+# Superseded versions are never written again, so clients may cache them forever
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+NO_CACHE_CONTROL = "private, no-cache"
+
+
+def success(body, status_code=200, headers=None):
     return {
         "statusCode": status_code,
-        "headers": CORS_HEADERS,
+        "headers": {**CORS_HEADERS, **headers} if headers else CORS_HEADERS,
         "body": json.dumps(body, default=_serialize),
     }
 
 
+def not_modified(headers=None):
+    """304 for a conditional GET whose ETag still matches."""
+    return {
+        "statusCode": 304,
+        "headers": {**CORS_HEADERS, **headers} if headers else CORS_HEADERS,
+        "body": "",
+    }
+
+
 def created(body):
     return success(body, 201)
 
@@ -0,0 +1,481 @@
+"""BM25 full-text search over active submissions.
+
+A submission's document is its studyTitle, keyResearchQuestions,
+studyIndicators and commissioningSource, tokenized and stemmed by
+shared.text. Title and commissioning-source terms are counted more than once,
+a cheap stand-in for per-field BM25.
+
+The index is two objects in the files bucket:
+
+- The base segment. scripts/build_search_index.py builds it from a table
+  snapshot, and compaction rebuilds it. It is a flat binary file of
+  little-endian arrays: a document table sorted by submissionId, a sorted term
+  dictionary and a postings array per term. Readers decompress it into /tmp
+  once and mmap it. A query binary-searches the dictionary and reads only the
+  postings of its own terms, so nothing is parsed up front.
+- The delta. It holds the submissions changed since the base was written,
+  each as a replacement document or a removal. The update_search_index
+  stream consumer is its only writer. Once the delta reaches COMPACT_AT
+  entries, the consumer folds it into a new base.
+
+Readers re-check both ETags at most every REFRESH_SECONDS.
+"""
+
+import array
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from collections import Counter, defaultdict, namedtuple
+
+from botocore.exceptions import ClientError
+
+from shared.aws import boto3
+from shared.text import tokenize
+
+# Field → how many times each of its terms counts
+FIELD_WEIGHTS = (
+    ("studyTitle", 3),
+    ("keyResearchQuestions", 1),
+    ("studyIndicators", 1),
+    ("commissioningSource", 2),
+)
+K1 = 1.2
+B = 0.75
+DEFAULT_LIMIT = 20
+
+BASE_KEY = "indexes/search-base.bin"
+DELTA_KEY = "indexes/search-delta.bin"
+INDEX_FORMAT = 1
+COMPACT_AT = 200  # delta entries
+REFRESH_SECONDS = 30
+
+_MAGIC = b"MSRC"
+# magic, format, documents, terms, total length, then the offsets of the
+# lengths, record offsets, records, term offsets, terms, postings starts,
+# postings documents and postings frequencies sections
+_HEADER = struct.Struct("<4sIIId8I")
+_MAX_TF = 0xFFFF
+_SEP = b"\x1f"
+
+if sys.byteorder != "little":  # the base segment is read in place, without byte swapping
+    raise ImportError("shared.search requires a little-endian platform")
+
+Document = namedtuple("Document", "submissionId studyId studyTitle length terms")
+
+
+def document(item):
+    """The searchable document of a submission."""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for term in tokenize(item.get(field)):
+            terms[term] += weight
+    return Document(
+        item["submissionId"], item.get("studyId"), item.get("studyTitle"),
+        sum(terms.values()), dict(terms),
+    )
+
+
+# --- Base segment ---
+
+def _pad(buf):
+    buf.extend(b"\0" * (-len(buf) % 4))
+
+
+def _write(records, lengths, postings):
+    """Serialize a base segment.
+
+    records are (submissionId, studyId, studyTitle) sorted by submissionId,
+    lengths their document lengths, and postings (term bytes, documents,
+    frequencies) in term order.
+    """
+    record_offsets = array.array("I", [0])
+    record_blob = bytearray()
+    for submission_id, study_id, title in records:
+        record_blob += _SEP.join(
+            (submission_id.encode(), (study_id or "").encode(), (title or "").encode())
+        )
+        record_offsets.append(len(record_blob))
+
+    term_offsets = array.array("I", [0])
+    term_blob = bytearray()
+    starts = array.array("I", [0])
+    docs = array.array("I")
+    tfs = array.array("H")
+    for term, term_docs, term_tfs in postings:
+        term_blob += term
+        term_offsets.append(len(term_blob))
+        docs.extend(term_docs)
+        tfs.extend(term_tfs)
+        starts.append(len(docs))
+
+    body = bytearray()
+    offsets = []
+    for section in (array.array("I", lengths), record_offsets, record_blob,
+                    term_offsets, term_blob, starts, docs, tfs):
+        offsets.append(_HEADER.size + len(body))
+        body += section if isinstance(section, bytearray) else section.tobytes()
+        _pad(body)
+    header = _HEADER.pack(_MAGIC, INDEX_FORMAT, len(records), len(term_offsets) - 1,
+                          float(sum(lengths)), *offsets)
+    return header + bytes(body)
+
+
+def build_base(documents):
+    """A base segment (bytes) of documents."""
+    documents = sorted(documents, key=lambda d: d.submissionId.encode())
+    inverted = {}
+    for i, doc in enumerate(documents):
+        for term, tf in doc.terms.items():
+            entry = inverted.get(term)
+            if entry is None:
+                entry = inverted[term] = (array.array("I"), array.array("H"))
+            entry[0].append(i)
+            entry[1].append(min(tf, _MAX_TF))
+    postings = sorted((term.encode(), d, f) for term, (d, f) in inverted.items())
+    return _write(
+        [(d.submissionId, d.studyId, d.studyTitle) for d in documents],
+        [d.length for d in documents],
+        postings,
+    )
+
+
+class BaseSegment:
+    """Read-only view of a base segment held in bytes or an mmap."""
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        (magic, fmt, self.n_docs, self.n_terms, self.total_length,
+         *offsets) = _HEADER.unpack_from(view)
+        if magic != _MAGIC or fmt != INDEX_FORMAT:
+            raise ValueError("Not a search index base segment")
+        o_len, o_roff, o_rec, o_toff, o_term, o_start, o_docs, o_tfs = offsets
+
+        def ints(offset, count, code="I"):
+            return view[offset:offset + count * array.array(code).itemsize].cast(code)
+
+        self.lengths = ints(o_len, self.n_docs)
+        self._record_offsets = ints(o_roff, self.n_docs + 1)
+        self._records = view[o_rec:o_rec + self._record_offsets[self.n_docs]]
+        self._term_offsets = ints(o_toff, self.n_terms + 1)
+        self._terms = view[o_term:o_term + self._term_offsets[self.n_terms]]
+        self._starts = ints(o_start, self.n_terms + 1)
+        self._docs = ints(o_docs, self._starts[self.n_terms])
+        self._tfs = ints(o_tfs, self._starts[self.n_terms], "H")
+
+    @classmethod
+    def empty(cls):
+        return cls(build_base([]))
+
+    def record(self, i):
+        """(submissionId, studyId, studyTitle) of document i."""
+        raw = bytes(self._records[self._record_offsets[i]:self._record_offsets[i + 1]])
+        submission_id, study_id, title = raw.decode().split("\x1f", 2)
+        return submission_id, study_id or None, title or None
+
+    def _submission_id(self, i):
+        raw = bytes(self._records[self._record_offsets[i]:self._record_offsets[i + 1]])
+        return raw.split(_SEP, 1)[0]
+
+    def doc_index(self, submission_id):
+        """Position of a submission in the document table, or None."""
+        key = submission_id.encode()
+        lo, hi = 0, self.n_docs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._submission_id(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.n_docs and self._submission_id(lo) == key else None
+
+    def term(self, t):
+        return bytes(self._terms[self._term_offsets[t]:self._term_offsets[t + 1]])
+
+    def postings_at(self, t):
+        """(documents, frequencies) of term number t."""
+        start, end = self._starts[t], self._starts[t + 1]
+        return self._docs[start:end], self._tfs[start:end]
+
+    def postings(self, term):
+        """(documents, frequencies) of a term, or None if no document has it."""
+        key = term.encode()
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_terms and self.term(lo) == key:
+            return self.postings_at(lo)
+        return None
+
+
+# --- Delta ---
+
+class Delta:
+    """Submissions changed since the base: submissionId → Document, or None if removed."""
+
+    def __init__(self, changes=None):
+        self.changes = dict(changes or {})
+
+    def __len__(self):
+        return len(self.changes)
+
+    def put(self, doc):
+        self.changes[doc.submissionId] = doc
+
+    def remove(self, submission_id):
+        self.changes[submission_id] = None
+
+    def dumps(self):
+        return zlib.compress(json.dumps({
+            "format": INDEX_FORMAT,
+            "changes": {
+                sid: None if doc is None else [doc.studyId, doc.studyTitle, doc.length, doc.terms]
+                for sid, doc in self.changes.items()
+            },
+        }, separators=(",", ":")).encode())
+
+    @classmethod
+    def loads(cls, blob):
+        data = json.loads(zlib.decompress(blob))
+        if data.get("format") != INDEX_FORMAT:
+            raise ValueError("Search index delta was written in a different format")
+        return cls({
+            sid: None if entry is None else Document(sid, *entry)
+            for sid, entry in data["changes"].items()
+        })
+
+
+def compact(base, delta):
+    """A new base segment (bytes) with the delta folded in.
+
+    Works on the postings arrays directly: surviving base postings are
+    renumbered and the delta's documents are merged in, term by term.
+    """
+    order = [
+        (base._submission_id(i), i) for i in range(base.n_docs)
+        if base._submission_id(i).decode() not in delta.changes
+    ]
+    order.extend((sid.encode(), doc) for sid, doc in delta.changes.items() if doc is not None)
+    order.sort(key=lambda entry: entry[0])
+
+    remap = array.array("i", [-1]) * base.n_docs
+    records, lengths = [], []
+    extra = defaultdict(list)  # term bytes → [(new document, tf)]
+    for new, (_, source) in enumerate(order):
+        if isinstance(source, int):
+            remap[source] = new
+            records.append(base.record(source))
+            lengths.append(base.lengths[source])
+        else:
+            records.append((source.submissionId, source.studyId, source.studyTitle))
+            lengths.append(source.length)
+            for term, tf in source.terms.items():
+                extra[term.encode()].append((new, min(tf, _MAX_TF)))
+
+    terms = {base.term(t): t for t in range(base.n_terms)}
+    for term in extra:
+        terms.setdefault(term, None)
+
+    def merged():
+        for term in sorted(terms):
+            docs, tfs = array.array("I"), array.array("H")
+            if terms[term] is not None:
+                for d, tf in zip(*base.postings_at(terms[term])):
+                    if remap[d] >= 0:
+                        docs.append(remap[d])
+                        tfs.append(tf)
+            if term in extra:
+                pairs = sorted(list(zip(docs, tfs)) + extra[term])
+                docs = array.array("I", (d for d, _ in pairs))
+                tfs = array.array("H", (tf for _, tf in pairs))
+            if docs:
+                yield term, docs, tfs
+
+    return _write(records, lengths, merged())
+
+
+# --- Querying ---
+
+class SearchIndex:
+    """A base segment with a delta applied on top."""
+
+    def __init__(self, base, delta):
+        self.base = base
+        self.delta = delta
+        # Base documents the delta replaces or removes
+        self._hidden = set()
+        for sid in delta.changes:
+            i = base.doc_index(sid)
+            if i is not None:
+                self._hidden.add(i)
+        added = [doc for doc in delta.changes.values() if doc is not None]
+        self._delta_postings = defaultdict(list)
+        for doc in added:
+            for term, tf in doc.terms.items():
+                self._delta_postings[term].append((doc, tf))
+
+        self._count = base.n_docs - len(self._hidden) + len(added)
+        total = (base.total_length - sum(base.lengths[i] for i in self._hidden)
+                 + sum(doc.length for doc in added))
+        self._avgdl = total / self._count if self._count else 0.0
+        self._norms = None
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, submission_id):
+        if submission_id in self.delta.changes:
+            return self.delta.changes[submission_id] is not None
+        return self.base.doc_index(submission_id) is not None
+
+    def _norm(self, length):
+        return K1 * (1 - B + B * length / self._avgdl)
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Best-matching submissions for a free-text query, best first."""
+        terms = set(tokenize(query))
+        if not terms or not self._count:
+            return []
+        if self._norms is None:
+            self._norms = [self._norm(length) for length in self.base.lengths]
+        norms, hidden = self._norms, self._hidden
+
+        base_scores = defaultdict(float)
+        delta_scores = defaultdict(float)
+        for term in terms:
+            postings = self.base.postings(term) or ((), ())
+            delta_hits = self._delta_postings.get(term, ())
+            # Replaced base documents still count towards df until compaction
+            df = len(postings[0]) + len(delta_hits)
+            if not df:
+                continue
+            idf = math.log(1 + (max(self._count - df, 0) + 0.5) / (df + 0.5))
+            weight = idf * (K1 + 1)
+            for d, tf in zip(*postings):
+                if d not in hidden:
+                    base_scores[d] += weight * tf / (tf + norms[d])
+            for doc, tf in delta_hits:
+                delta_scores[doc.submissionId] += weight * tf / (tf + self._norm(doc.length))
+
+        candidates = [(score, self.base.record(d)) for d, score in heapq.nlargest(
+            limit, base_scores.items(), key=lambda entry: entry[1])]
+        changes = self.delta.changes
+        candidates.extend(
+            (score, (sid, changes[sid].studyId, changes[sid].studyTitle))
+            for sid, score in delta_scores.items()
+        )
+        candidates.sort(key=lambda c: (-c[0], c[1][0]))
+        return [
+            {"submissionId": sid, "studyId": study_id, "studyTitle": title, "score": round(score, 3)}
+            for score, (sid, study_id, title) in candidates[:limit]
+        ]
+
+
+# --- S3 persistence with a per-container copy ---
+
+_cache = {"index": None, "base": None, "base_etag": None,
+          "delta": None, "delta_etag": None, "checked": 0.0}
+
+
+def _s3():
+    client = _cache.get("s3")
+    if client is None:
+        client = _cache["s3"] = boto3.client("s3")
+    return client
+
+
+def _fetch(key, etag):
+    """GetObject response for key; False if it still matches etag, None if it doesn't exist."""
+    kwargs = {"Bucket": os.environ["FILES_BUCKET"], "Key": key}
+    if etag:
+        kwargs["IfNoneMatch"] = etag
+    try:
+        return _s3().get_object(**kwargs)
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code in ("304", "NotModified"):
+            return False
+        if code in ("NoSuchKey", "404"):
+            return None
+        raise
+
+
+def _map_base(body):
+    """Decompress a base segment into an unlinked /tmp file and mmap it."""
+    inflate = zlib.decompressobj()
+    with tempfile.TemporaryFile() as f:
+        for chunk in iter(lambda: body.read(1 << 20), b""):
+            f.write(inflate.decompress(chunk))
+        f.write(inflate.flush())
+        f.flush()
+        return BaseSegment(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def load_index(max_age=REFRESH_SECONDS):
+    """The current index, reusing this container's copy while it is fresh.
+
+    After max_age seconds both objects' ETags are re-checked with conditional
+    GETs, so only a part that changed is downloaded. Missing objects are an
+    empty base and an empty delta.
+    """
+    now = time.monotonic()
+    if _cache["index"] is not None and now - _cache["checked"] < max_age:
+        return _cache["index"]
+
+    base = _fetch(BASE_KEY, _cache["base_etag"] if _cache["base"] is not None else None)
+    if base is not False:
+        _cache["base"] = _map_base(base["Body"]) if base else BaseSegment.empty()
+        _cache["base_etag"] = base.get("ETag") if base else None
+    delta = _fetch(DELTA_KEY, _cache["delta_etag"] if _cache["delta"] is not None else None)
+    if delta is not False:
+        _cache["delta"] = Delta.loads(delta["Body"].read()) if delta else Delta()
+        _cache["delta_etag"] = delta.get("ETag") if delta else None
+
+    if base is not False or delta is not False or _cache["index"] is None:
+        _cache["index"] = SearchIndex(_cache["base"], _cache["delta"])
+    _cache["checked"] = now
+    return _cache["index"]
+
+
+def _put(key, body):
+    response = _s3().put_object(
+        Bucket=os.environ["FILES_BUCKET"], Key=key, Body=body,
+        ContentType="application/octet-stream",
+    )
+    return response.get("ETag")
+
+
+def save_base(data):
+    """Upload a base segment (bytes) and make it this container's current copy."""
+    etag = _put(BASE_KEY, zlib.compress(data))
+    _cache.update(base=BaseSegment(data), base_etag=etag)
+    _refresh_cached_index()
+
+
+def save_delta(delta):
+    """Upload the delta and make it this container's current copy."""
+    etag = _put(DELTA_KEY, delta.dumps())
+    _cache.update(delta=delta, delta_etag=etag)
+    _refresh_cached_index()
+
+
+def _refresh_cached_index():
+    if _cache["base"] is not None and _cache["delta"] is not None:
+        _cache["index"] = SearchIndex(_cache["base"], _cache["delta"])
+        _cache["checked"] = time.monotonic()
+
+
+def reset_cache():
+    """Forget this container's copy (tests, and after rebuilding the index)."""
+    _cache.update(index=None, base=None, base_etag=None, delta=None, delta_etag=None, checked=0.0)
+    _cache.pop("s3", None)
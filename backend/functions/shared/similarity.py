@@ -0,0 +1,303 @@
+"""MinHash/LSH index of active submissions for near-duplicate study detection.
+
+Each study is reduced to a set of features: character 4-grams of the
+normalized studyTitle, word pairs of keyResearchQuestions and its
+studyCountries. A 64-value MinHash signature of that set estimates the Jaccard
+similarity between two studies. Signatures are split into 16 bands of 4, and
+studies sharing any band become candidates, so a query scores only a handful
+of studies instead of all of them.
+
+The index is one compressed object in the files bucket. The
+update_similarity_index stream consumer is its only writer. Readers keep the
+loaded copy for the life of the container and re-check its ETag at most once a
+minute.
+"""
+
+import array
+import json
+import logging
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+
+from botocore.exceptions import ClientError
+
+from shared.aws import boto3
+from shared.text import normalize_words
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+TITLE_SHINGLE = 4  # characters; tolerant to typos, punctuation and plurals
+SIMILARITY_THRESHOLD = 0.5  # estimated Jaccard similarity
+MAX_RESULTS = 10
+
+INDEX_KEY = "indexes/similarity.bin"
+INDEX_FORMAT = 1
+REFRESH_SECONDS = 60
+
+logger = logging.getLogger()
+
+_MAGIC = b"MLSH"
+_PRIME = (1 << 61) - 1
+_MAX_HASH = 0xFFFFFFFF
+# Fixed seed: signatures must be comparable across containers and deploys
+_rng = random.Random(38)
+_PERMUTATIONS = tuple(
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+)
+
+
+def features(data):
+    """The feature set a study's signature is computed from."""
+    found = set()
+    title = " ".join(normalize_words(data.get("studyTitle")))
+    if title:
+        found.update(
+            "t:" + title[i:i + TITLE_SHINGLE]
+            for i in range(max(len(title) - TITLE_SHINGLE + 1, 1))
+        )
+    words = normalize_words(data.get("keyResearchQuestions"))
+    if len(words) == 1:
+        found.add("q:" + words[0])
+    found.update(f"q:{a} {b}" for a, b in zip(words, words[1:]))
+    countries = data.get("studyCountries")
+    if isinstance(countries, list):
+        found.update("c:" + c.upper() for c in countries if isinstance(c, str))
+    return found
+
+
+def signature(data):
+    """MinHash signature (array of NUM_PERM uint32) of a study, or None if it has no features."""
+    hashes = [zlib.crc32(f.encode()) for f in features(data)]
+    if not hashes:
+        return None
+    return array.array("I", (
+        min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ))
+
+
+def _band_keys(sig):
+    # Python's bytes hash is per-process, which is fine: band keys are never persisted.
+    # A colliding key only adds a candidate, which scoring then discards.
+    return [hash(sig[b * ROWS:(b + 1) * ROWS].tobytes()) ^ b for b in range(BANDS)]
+
+
+class SimilarityIndex:
+    """In-memory LSH index: submissionId → (signature, studyId, studyTitle).
+
+    Signatures live in one flat array, addressed by slot, so 50k studies take
+    a few MB plus the band buckets.
+    """
+
+    def __init__(self):
+        self._ids = []          # slot -> submissionId, None for a free slot
+        self._meta = []         # slot -> (studyId, studyTitle)
+        self._sigs = array.array("I")
+        self._slots = {}        # submissionId -> slot
+        self._free = []
+        self._buckets = {}      # band key -> slot, or list of slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, submission_id):
+        return submission_id in self._slots
+
+    def _signature_at(self, slot):
+        return self._sigs[slot * NUM_PERM:(slot + 1) * NUM_PERM]
+
+    def add(self, submission_id, data):
+        """Index (or re-index) a study; studies without features are dropped."""
+        self.remove(submission_id)
+        sig = signature(data)
+        if sig is not None:
+            self._insert(submission_id, sig, data.get("studyId"), data.get("studyTitle"))
+
+    def _insert(self, submission_id, sig, study_id, title):
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = submission_id
+            self._meta[slot] = (study_id, title)
+            self._sigs[slot * NUM_PERM:(slot + 1) * NUM_PERM] = sig
+        else:
+            slot = len(self._ids)
+            self._ids.append(submission_id)
+            self._meta.append((study_id, title))
+            self._sigs.extend(sig)
+        self._slots[submission_id] = slot
+        for key in _band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._buckets[key] = slot
+            elif isinstance(bucket, list):
+                bucket.append(slot)
+            else:
+                self._buckets[key] = [bucket, slot]
+
+    def remove(self, submission_id):
+        slot = self._slots.pop(submission_id, None)
+        if slot is None:
+            return
+        for key in _band_keys(self._signature_at(slot)):
+            bucket = self._buckets[key]
+            if isinstance(bucket, list):
+                bucket.remove(slot)
+                if len(bucket) == 1:
+                    self._buckets[key] = bucket[0]
+            else:
+                del self._buckets[key]
+        self._ids[slot] = None
+        self._meta[slot] = None
+        self._free.append(slot)
+
+    def similar_to(self, submission_id, **kwargs):
+        """Studies similar to an indexed one (itself excluded), or None if it isn't indexed."""
+        slot = self._slots.get(submission_id)
+        if slot is None:
+            return None
+        return self._query(self._signature_at(slot), exclude=submission_id, **kwargs)
+
+    def query(self, data, exclude=None, **kwargs):
+        """Studies similar to an arbitrary submission body, best match first."""
+        sig = signature(data)
+        if sig is None:
+            return []
+        return self._query(sig, exclude=exclude, **kwargs)
+
+    def _query(self, sig, exclude=None, limit=MAX_RESULTS, threshold=SIMILARITY_THRESHOLD):
+        candidates = set()
+        for key in _band_keys(sig):
+            bucket = self._buckets.get(key)
+            if isinstance(bucket, list):
+                candidates.update(bucket)
+            elif bucket is not None:
+                candidates.add(bucket)
+
+        scored = []
+        for slot in candidates:
+            if self._ids[slot] == exclude:
+                continue
+            other = self._signature_at(slot)
+            score = sum(1 for x, y in zip(sig, other) if x == y) / NUM_PERM
+            if score >= threshold:
+                scored.append((score, slot))
+        scored.sort(key=lambda s: (-s[0], self._ids[s[1]]))
+
+        return [
+            {
+                "submissionId": self._ids[slot],
+                "studyId": self._meta[slot][0],
+                "studyTitle": self._meta[slot][1],
+                "score": round(score, 2),
+            }
+            for score, slot in scored[:limit]
+        ]
+
+    # --- Persistence: MLSH | header length | JSON header | signatures, zlib-compressed ---
+
+    def dumps(self):
+        live = [slot for slot, sid in enumerate(self._ids) if sid is not None]
+        header = json.dumps({
+            "format": INDEX_FORMAT,
+            "numPerm": NUM_PERM,
+            "ids": [self._ids[s] for s in live],
+            "meta": [self._meta[s] for s in live],
+        }, separators=(",", ":")).encode()
+        sigs = array.array("I")
+        for slot in live:
+            sigs.extend(self._signature_at(slot))
+        if sys.byteorder == "big":
+            sigs.byteswap()
+        return zlib.compress(_MAGIC + struct.pack("<I", len(header)) + header + sigs.tobytes())
+
+    @classmethod
+    def loads(cls, blob):
+        raw = zlib.decompress(blob)
+        if raw[:4] != _MAGIC:
+            raise ValueError("Not a similarity index")
+        (header_len,) = struct.unpack_from("<I", raw, 4)
+        header = json.loads(raw[8:8 + header_len])
+        if header.get("format") != INDEX_FORMAT or header.get("numPerm") != NUM_PERM:
+            raise ValueError("Similarity index was built with different parameters")
+        sigs = array.array("I")
+        sigs.frombytes(raw[8 + header_len:])
+        if sys.byteorder == "big":
+            sigs.byteswap()
+
+        index = cls()
+        for i, (submission_id, (study_id, title)) in enumerate(zip(header["ids"], header["meta"])):
+            index._insert(submission_id, sigs[i * NUM_PERM:(i + 1) * NUM_PERM], study_id, title)
+        return index
+
+
+# --- S3 persistence with a per-container copy ---
+
+_cache = {"index": None, "etag": None, "checked": 0.0}
+
+
+def _s3():
+    client = _cache.get("s3")
+    if client is None:
+        client = _cache["s3"] = boto3.client("s3")
+    return client
+
+
+def load_index(max_age=REFRESH_SECONDS):
+    """The current index, reusing this container's copy while it is fresh.
+
+    After max_age seconds the object's ETag is re-checked with a conditional
+    GET, which only downloads the index when it changed. A missing object is
+    an empty index.
+    """
+    now = time.monotonic()
+    if _cache["index"] is not None and now - _cache["checked"] < max_age:
+        return _cache["index"]
+
+    kwargs = {"Bucket": os.environ["FILES_BUCKET"], "Key": INDEX_KEY}
+    if _cache["index"] is not None and _cache["etag"]:
+        kwargs["IfNoneMatch"] = _cache["etag"]
+    try:
+        obj = _s3().get_object(**kwargs)
+        _cache["index"] = SimilarityIndex.loads(obj["Body"].read())
+        _cache["etag"] = obj.get("ETag")
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code in ("304", "NotModified"):
+            pass
+        elif code in ("NoSuchKey", "404"):
+            _cache["index"], _cache["etag"] = SimilarityIndex(), None
+        else:
+            raise
+    _cache["checked"] = now
+    return _cache["index"]
+
+
+def save_index(index):
+    """Upload the index and make it this container's current copy."""
+    response = _s3().put_object(
+        Bucket=os.environ["FILES_BUCKET"],
+        Key=INDEX_KEY,
+        Body=index.dumps(),
+        ContentType="application/octet-stream",
+    )
+    _cache.update(index=index, etag=response.get("ETag"), checked=time.monotonic())
+
+
+def find_similar(data, exclude=None):
+    """Best-effort similar studies for a write response; [] when the index is unavailable."""
+    try:
+        return load_index().query(data, exclude=exclude)
+    except Exception:
+        logger.exception("Similarity lookup failed")
+        return []
+
+
+def reset_cache():
+    """Forget this container's copy (tests, and after rebuilding the index)."""
+    _cache.update(index=None, etag=None, checked=0.0)
+    _cache.pop("s3", None)
@@ -0,0 +1,230 @@
+"""Streaming CSV/XLSX row readers and row → submission conversion for bulk import.
+
+XLSX is read with the standard library (zipfile + iterparse) so the import
+Lambda needs no extra dependencies and never materialises the whole sheet.
+"""
+
+import codecs
+import csv
+import posixpath
+import zipfile
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from xml.etree import ElementTree
+
+# Spreadsheet columns use the API field names. YesNoWithLink fields take the
+# answer in `<field>` and the URL in `<field>.link`.
+TEXT_COLUMNS = (
+    "studyId", "studyTitle", "leadCenter", "contactName", "contactEmail",
+    "w3Bilateral", "studyType", "timing", "analyticalScope", "geographicScope",
+    "resultLevel", "causalityMode", "methodClass", "primaryIndicator",
+    "keyResearchQuestions", "treatmentIntervention", "powerCalculation",
+    "studyIndicators", "dataCollectionStatus", "analysisStatus", "funded",
+    "fundingSource", "commissioningSource",
+)
+ARRAY_COLUMNS = (
+    "otherCenters", "studyRegions", "studyCountries", "studySubnational",
+    "unitOfAnalysis", "dataCollectionMethods", "intendedPrimaryUser",
+)
+INT_COLUMNS = ("sampleSize", "dataCollectionRounds")
+NUMBER_COLUMNS = ("totalCostUSD",)
+DATE_COLUMNS = ("startDate", "expectedEndDate")
+YES_NO_LINK_COLUMNS = (
+    "preAnalysisPlan", "proposalAvailable", "manuscriptDeveloped",
+    "policyBriefDeveloped", "relatedToPastStudy",
+)
+
+ARRAY_SEPARATOR = ";"
+IMPORT_PREFIX = "imports/"  # S3 keys of import spreadsheets: imports/<userId>/<file>
+EXCEL_EPOCH = date(1899, 12, 30)
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+class SpreadsheetError(Exception):
+    pass
+
+
+def import_key_prefix(user_id):
+    """The S3 key prefix a user's import spreadsheets are uploaded to and read from."""
+    return f"{IMPORT_PREFIX}{user_id}/"
+
+
+# --- Readers ---
+
+def iter_csv_rows(lines):
+    """Yield (row_number, {column: value}) from an iterable of CSV byte lines.
+
+    Row numbers match the spreadsheet: the header is row 1.
+    """
+    reader = csv.DictReader(codecs.iterdecode(lines, "utf-8-sig"))
+    # Count records rather than reader.line_num, which a quoted multi-line cell would skew
+    for row_number, row in enumerate(reader, start=2):
+        yield row_number, row
+
+
+def iter_xlsx_rows(fileobj):
+    """Yield (row_number, {column: value}) from the first worksheet of an XLSX file."""
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise SpreadsheetError("File is not a valid XLSX workbook")
+
+    with archive:
+        try:
+            yield from _iter_sheet_rows(archive)
+        except ElementTree.ParseError:
+            raise SpreadsheetError("Workbook contains malformed XML")
+
+
+def _iter_sheet_rows(archive):
+    shared = _read_shared_strings(archive)
+    sheet_path = _first_sheet_path(archive)
+    header = None
+    row_number = 0
+    with archive.open(sheet_path) as sheet:
+        for _, elem in ElementTree.iterparse(sheet, events=("end",)):
+            if elem.tag != f"{_NS}row":
+                continue
+            row_number = int(elem.get("r") or row_number + 1)
+            cells = _read_row_cells(elem, shared)
+            elem.clear()
+            if header is None:
+                header = {col: str(val).strip() for col, val in cells.items()}
+                continue
+            yield row_number, {
+                name: cells.get(col, "") for col, name in header.items() if name
+            }
+
+
+def _read_shared_strings(archive):
+    try:
+        source = archive.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings = []
+    with source:
+        for _, elem in ElementTree.iterparse(source, events=("end",)):
+            if elem.tag == f"{_NS}si":
+                strings.append("".join(t.text or "" for t in elem.iter(f"{_NS}t")))
+                elem.clear()
+    return strings
+
+
+def _first_sheet_path(archive):
+    try:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        sheet = workbook.find(f"{_NS}sheets/{_NS}sheet")
+        rel_id = sheet.get(f"{_REL_NS}id")
+        for rel in rels.iter(f"{_PKG_REL_NS}Relationship"):
+            if rel.get("Id") == rel_id:
+                target = rel.get("Target")
+                if target.startswith("/"):
+                    return target.lstrip("/")
+                return posixpath.normpath(posixpath.join("xl", target))
+    except (KeyError, AttributeError, ElementTree.ParseError):
+        pass
+    sheets = sorted(n for n in archive.namelist() if n.startswith("xl/worksheets/sheet"))
+    if not sheets:
+        raise SpreadsheetError("Workbook has no worksheets")
+    return sheets[0]
+
+
+def _read_row_cells(row, shared):
+    cells = {}
+    for position, cell in enumerate(row.iter(f"{_NS}c")):
+        ref = cell.get("r")
+        col = "".join(ch for ch in ref if ch.isalpha()) if ref else _column_letter(position)
+        kind = cell.get("t")
+        if kind == "inlineStr":
+            value = "".join(t.text or "" for t in cell.iter(f"{_NS}t"))
+        else:
+            v = cell.find(f"{_NS}v")
+            value = v.text if v is not None and v.text is not None else ""
+            if kind == "s" and value:
+                value = shared[int(value)]
+            elif kind == "b":
+                value = "yes" if value == "1" else "no"
+        cells[col] = value
+    return cells
+
+
+def _column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+# --- Conversion ---
+
+def row_to_submission(row):
+    """Convert a raw spreadsheet row into a submission body.
+
+    Blank cells are omitted. Values that can't be converted are passed through
+    unchanged so validate_submission reports them against the right field.
+    """
+    def cell(name):
+        value = row.get(name)
+        return value.strip() if isinstance(value, str) else value
+
+    data = {}
+    for name in TEXT_COLUMNS:
+        if cell(name):
+            data[name] = cell(name)
+    for name in ARRAY_COLUMNS:
+        if cell(name):
+            data[name] = [v.strip() for v in cell(name).split(ARRAY_SEPARATOR) if v.strip()]
+    for name in INT_COLUMNS:
+        if cell(name):
+            data[name] = _to_int(cell(name))
+    for name in NUMBER_COLUMNS:
+        if cell(name):
+            data[name] = _to_decimal(cell(name))
+    for name in DATE_COLUMNS:
+        if cell(name):
+            data[name] = _to_iso_date(cell(name))
+    for name in YES_NO_LINK_COLUMNS:
+        answer = cell(name)
+        if answer:
+            value = {"answer": answer.lower()}
+            if cell(f"{name}.link"):
+                value["link"] = cell(f"{name}.link")
+            data[name] = value
+    return data
+
+
+def _to_int(value):
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        return value
+    if not number.is_finite() or number != number.to_integral_value():
+        return value
+    return int(number)
+
+
+def _to_decimal(value):
+    try:
+        number = Decimal(value.replace(",", ""))
+    except InvalidOperation:
+        return value
+    return number if number.is_finite() else value
+
+
+def _to_iso_date(value):
+    # XLSX stores dates as serial day numbers unless the cell is text
+    try:
+        serial = float(value)
+    except ValueError:
+        return value[:10]
+    try:
+        return (EXCEL_EPOCH + timedelta(days=int(serial))).isoformat()
+    except (ValueError, OverflowError):
+        # nan, inf or a serial outside the calendar: left for the validator to reject
+        return value
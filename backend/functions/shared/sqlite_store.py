@@ -0,0 +1,351 @@
+"""SQLite storage: the submissions, suggestions and drafts tables in one database file.
+
+Items are stored as JSON beside their key and index columns, and read back
+with numbers as Decimal, as from DynamoDB. ``by_user`` and ``by_status``
+mirror the ByUser and ByStatus indexes. They are partial indexes, sparse like
+the GSIs: items without the key attributes (studyId claims) are not in them.
+
+One connection serves every thread, behind a lock. Each write is one
+``BEGIN IMMEDIATE`` transaction, so claim checks hold even when several
+processes share the file.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+from shared.store import (
+    ConditionFailedError, StudyIdTakenError, Store, TIMELINE_ATTRIBUTES, claim_item, study_id_key,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    submission_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    user_id TEXT,
+    status TEXT,
+    created_at TEXT,
+    item TEXT NOT NULL,
+    PRIMARY KEY (submission_id, version)
+);
+CREATE INDEX IF NOT EXISTS by_user ON submissions (user_id, created_at)
+    WHERE user_id IS NOT NULL AND created_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS by_status ON submissions (status, created_at)
+    WHERE status IS NOT NULL AND created_at IS NOT NULL;
+CREATE TABLE IF NOT EXISTS suggestions (
+    field TEXT NOT NULL,
+    value_key TEXT NOT NULL,
+    value TEXT,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (field, value_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS drafts (
+    user_id TEXT NOT NULL,
+    draft_key TEXT NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (user_id, draft_key)
+);
+"""
+
+# Sorts after any character, for "starts with" as a range on an index
+_MAX_CHAR = "\U0010ffff"
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} is not storable")
+
+
+def dumps(item):
+    return json.dumps(item, default=_default, separators=(",", ":"))
+
+
+def loads(text):
+    return json.loads(text, parse_int=Decimal, parse_float=Decimal)
+
+
+def _row(item):
+    return (
+        item["submissionId"], int(item["version"]),
+        item.get("userId"), item.get("status"), item.get("createdAt"), dumps(item),
+    )
+
+
+class SQLiteStore(Store):
+    """A database file at path, created if missing (":memory:" for a private in-memory one)."""
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _read(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @contextmanager
+    def _write(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # --- Submissions ---
+
+    @staticmethod
+    def _get(conn, submission_id, version):
+        row = conn.execute(
+            "SELECT item FROM submissions WHERE submission_id = ? AND version = ?",
+            (submission_id, int(version)),
+        ).fetchone()
+        return loads(row[0]) if row else None
+
+    @staticmethod
+    def _put(conn, item):
+        conn.execute("INSERT OR REPLACE INTO submissions VALUES (?, ?, ?, ?, ?, ?)", _row(item))
+
+    def _set(self, conn, submission_id, version, **attributes):
+        """Set attributes of an item, creating it if missing (as UpdateItem does); returns it."""
+        item = self._get(conn, submission_id, version) or {
+            "submissionId": submission_id, "version": Decimal(int(version)),
+        }
+        item.update(attributes)
+        self._put(conn, item)
+        return loads(dumps(item))
+
+    def put_submission(self, item):
+        with self._write() as conn:
+            self._put(conn, item)
+
+    def get_latest_version(self, submission_id, status):
+        rows = self._read(
+            "SELECT item FROM submissions WHERE submission_id = ? AND status = ? "
+            "ORDER BY version DESC LIMIT 1",
+            (submission_id, status),
+        )
+        return loads(rows[0][0]) if rows else None
+
+    def list_user_submissions(self, user_id, status):
+        rows = self._read(
+            "SELECT item FROM submissions INDEXED BY by_user "
+            "WHERE user_id = ? AND created_at IS NOT NULL AND status = ? ORDER BY created_at DESC",
+            (user_id, status),
+        )
+        return [loads(item) for item, in rows]
+
+    def list_submissions(self, status):
+        rows = self._read(
+            "SELECT item FROM submissions INDEXED BY by_status "
+            "WHERE status = ? AND created_at IS NOT NULL ORDER BY created_at DESC",
+            (status,),
+        )
+        return [loads(item) for item, in rows]
+
+    def iter_submissions(self, status, page_size=None):
+        # A local database has no response size limit to page around
+        yield from self.list_submissions(status)
+
+    def get_version_history(self, submission_id):
+        rows = self._read(
+            "SELECT item FROM submissions WHERE submission_id = ? ORDER BY version DESC", (submission_id,),
+        )
+        return [loads(item) for item, in rows]
+
+    def get_version_timeline(self, submission_id, limit, exclusive_start_key=None):
+        before = int(exclusive_start_key["version"]) if exclusive_start_key else None
+        rows = self._read(
+            "SELECT item FROM submissions WHERE submission_id = ? AND (? IS NULL OR version < ?) "
+            "ORDER BY version DESC LIMIT ?",
+            (submission_id, before, before, limit + 1),
+        )
+        items = [loads(item) for item, in rows[:limit]]
+        page = [{k: item[k] for k in TIMELINE_ATTRIBUTES if k in item} for item in items]
+        last_key = None
+        if len(rows) > limit:
+            last_key = {"submissionId": submission_id, "version": items[-1]["version"]}
+        return page, last_key
+
+    def get_version(self, submission_id, version):
+        with self._lock:
+            return self._get(self._conn, submission_id, version)
+
+    def get_versions(self, submission_id, versions):
+        wanted = sorted({int(v) for v in versions})
+        if not wanted:
+            return {}
+        rows = self._read(
+            f"SELECT version, item FROM submissions WHERE submission_id = ? "
+            f"AND version IN ({', '.join('?' * len(wanted))})",
+            (submission_id, *wanted),
+        )
+        return {version: loads(item) for version, item in rows}
+
+    def batch_put_submissions(self, items):
+        with self._write() as conn:
+            conn.executemany("INSERT OR REPLACE INTO submissions VALUES (?, ?, ?, ?, ?, ?)", map(_row, items))
+        return []
+
+    def mark_superseded(self, submission_id, version):
+        with self._write() as conn:
+            self._set(conn, submission_id, version, status="superseded")
+
+    def update_submission_status(self, submission_id, version, new_status, updated_at, expected_status=None):
+        with self._write() as conn:
+            if expected_status:
+                current = self._get(conn, submission_id, version)
+                if current is None or current.get("status") != expected_status:
+                    raise ConditionFailedError(f"{submission_id} v{version} is no longer {expected_status}", current)
+            return self._set(conn, submission_id, version, status=new_status, updatedAt=updated_at)
+
+    def _move_status(self, submission_id, version, new_status, expected_status, updated_at, claim):
+        with self._write() as conn:
+            current = self._get(conn, submission_id, version)
+            if current is None or current.get("status") != expected_status:
+                raise ConditionFailedError(f"{submission_id} v{version} is no longer {expected_status}", current)
+            if current.get("studyId"):
+                (self._claim if claim else self._release)(conn, current)
+            return self._set(conn, submission_id, version, status=new_status, updatedAt=updated_at)
+
+    def archive_version(self, submission_id, version, updated_at, current=None):
+        return self._move_status(submission_id, version, "archived", "active", updated_at, claim=False)
+
+    def restore_version(self, submission_id, version, updated_at, current=None):
+        return self._move_status(submission_id, version, "active", "archived", updated_at, claim=True)
+
+    # --- studyId claims ---
+
+    def _claim(self, conn, item):
+        key = study_id_key(item["studyId"])
+        claim = self._get(conn, key["submissionId"], 0)
+        if claim is not None and claim.get("ownerSubmissionId") != item["submissionId"]:
+            raise StudyIdTakenError(item["studyId"], claim)
+        self._put(conn, claim_item(item))
+
+    def _release(self, conn, item):
+        key = study_id_key(item["studyId"])
+        claim = self._get(conn, key["submissionId"], 0)
+        if claim is not None and claim.get("ownerSubmissionId") == item["submissionId"]:
+            conn.execute("DELETE FROM submissions WHERE submission_id = ? AND version = 0", (key["submissionId"],))
+
+    def get_study_id_claim(self, study_id):
+        return self.get_version(study_id_key(study_id)["submissionId"], 0)
+
+    def claim_study_id(self, item):
+        with self._write() as conn:
+            self._claim(conn, item)
+
+    def release_study_id(self, item):
+        with self._write() as conn:
+            self._release(conn, item)
+
+    def put_new_submission(self, item):
+        with self._write() as conn:
+            self._claim(conn, item)
+            self._put(conn, item)
+
+    def put_next_version(self, current, new_item):
+        with self._write() as conn:
+            moved = study_id_key(current.get("studyId", "")) != study_id_key(new_item["studyId"])
+            if moved:
+                self._claim(conn, new_item)
+            self._set(conn, current["submissionId"], current["version"], status="superseded")
+            self._put(conn, new_item)
+            if moved and current.get("studyId"):
+                self._release(conn, current)
+
+    def put_new_submissions(self, items):
+        taken = []
+        with self._write() as conn:
+            for item in items:
+                try:
+                    self._claim(conn, item)
+                except StudyIdTakenError as e:
+                    taken.append((item, e.owner))
+                    continue
+                self._put(conn, item)
+        return taken, []
+
+    # --- Suggestion counts ---
+
+    def add_suggestion_count(self, field, value_key, change, value):
+        with self._write() as conn:
+            if change > 0:
+                conn.execute(
+                    "INSERT INTO suggestions VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (field, value_key) DO UPDATE SET count = count + excluded.count",
+                    (field, value_key, value, change),
+                )
+            else:
+                conn.execute(
+                    "UPDATE suggestions SET count = count + ? WHERE field = ? AND value_key = ?",
+                    (change, field, value_key),
+                )
+
+    def query_suggestions(self, field, key_prefix, max_read=None):
+        rows = self._read(
+            "SELECT value, count FROM (SELECT value, count FROM suggestions "
+            "WHERE field = ? AND value_key >= ? AND value_key < ? ORDER BY value_key LIMIT ?) WHERE count > 0",
+            (field, key_prefix, key_prefix + _MAX_CHAR, max_read or -1),
+        )
+        return [{"value": value, "count": Decimal(count)} for value, count in rows]
+
+    def put_suggestion_counts(self, counts, spellings):
+        with self._write() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO suggestions VALUES (?, ?, ?, ?)",
+                [(field, key, spellings[(field, key)], int(count)) for (field, key), count in counts.items()],
+            )
+
+    def list_suggestion_keys(self, field):
+        return [key for key, in self._read("SELECT value_key FROM suggestions WHERE field = ?", (field,))]
+
+    def delete_suggestions(self, field, value_keys):
+        with self._write() as conn:
+            conn.executemany(
+                "DELETE FROM suggestions WHERE field = ? AND value_key = ?", [(field, k) for k in value_keys],
+            )
+
+    # --- Drafts ---
+
+    def get_draft(self, user_id, draft_key):
+        rows = self._read("SELECT item FROM drafts WHERE user_id = ? AND draft_key = ?", (user_id, draft_key))
+        return loads(rows[0][0]) if rows else None
+
+    def put_draft(self, item, expected_revision):
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT item FROM drafts WHERE user_id = ? AND draft_key = ?", (item["userId"], item["draftKey"]),
+            ).fetchone()
+            current = loads(row[0]) if row else None
+            if expected_revision:
+                at_revision = current is not None and current.get("revision") == expected_revision
+            else:
+                at_revision = current is None
+            if not at_revision:
+                raise ConditionFailedError(
+                    f"Draft {item['draftKey']} is no longer at revision {expected_revision}", current,
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO drafts VALUES (?, ?, ?)", (item["userId"], item["draftKey"], dumps(item)),
+            )
+
+    def delete_draft(self, user_id, draft_key):
+        with self._write() as conn:
+            conn.execute("DELETE FROM drafts WHERE user_id = ? AND draft_key = ?", (user_id, draft_key))
@@ -0,0 +1,193 @@
+"""The storage interface behind shared/db.py, and what its implementations share.
+
+A Store holds the submissions (with their studyId claims), suggestion counts
+and drafts. shared/db.py picks one with STORAGE_BACKEND: ``dynamodb`` (the
+default, shared/dynamodb_store.py) or ``sqlite`` (shared/sqlite_store.py,
+for tests, offline demos and local benchmarks). Both return items as
+DynamoDB does, numbers as Decimal. Rules that do not depend on the storage,
+such as suggestion counting, stay in db.py.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class ConditionFailedError(Exception):
+    """A conditional write was rejected because the item changed underneath it.
+
+    ``item`` holds the item as it was when the write was rejected, or None if
+    it does not exist.
+    """
+
+    def __init__(self, message, item=None):
+        super().__init__(message)
+        self.item = item
+
+
+class StudyIdTakenError(ConditionFailedError):
+    """The studyId is already claimed by another submission (``item`` is the claim)."""
+
+    def __init__(self, study_id, item=None):
+        study_id = str(study_id).strip()
+        owner = (item or {}).get("ownerSubmissionId")
+        super().__init__(f"studyId {study_id} is already used by submission {owner}", item)
+        self.study_id = study_id
+        self.owner = owner
+
+
+# --- studyId uniqueness: one claim item per studyId in the submissions table ---
+#
+# The claim lives under submissionId "STUDYID#<STUDY-ID>", version 0, and maps
+# the studyId to the submission that owns it. It has no userId, status or
+# createdAt, so it never appears in the ByUser/ByStatus indexes. It is written
+# in the same transaction as the submission version that introduces the studyId.
+
+STUDY_ID_PREFIX = "STUDYID#"
+TIMELINE_ATTRIBUTES = ("submissionId", "version", "status", "modifiedBy", "updatedAt")
+
+
+def study_id_key(study_id):
+    """Key of the claim item for a studyId; matching ignores case and surrounding spaces."""
+    return {"submissionId": STUDY_ID_PREFIX + str(study_id).strip().upper(), "version": 0}
+
+
+def claim_item(item):
+    """The claim of item["studyId"] by item["submissionId"]."""
+    return {
+        **study_id_key(item["studyId"]),
+        "studyId": item["studyId"],
+        "ownerSubmissionId": item["submissionId"],
+    }
+
+
+class Store(ABC):
+    """Storage operations; shared/db.py documents the semantics of each.
+
+    Every method is abstract, so a store missing one fails at construction.
+    """
+
+    # Submissions
+
+    @abstractmethod
+    def put_submission(self, item):
+        ...
+
+    @abstractmethod
+    def get_latest_version(self, submission_id, status):
+        """The newest version of a submission with the given status, or None."""
+
+    @abstractmethod
+    def list_user_submissions(self, user_id, status):
+        """Submissions with userId and status (the ByUser index), newest createdAt first."""
+
+    @abstractmethod
+    def list_submissions(self, status):
+        """Submissions with status (the ByStatus index), newest createdAt first."""
+
+    @abstractmethod
+    def iter_submissions(self, status, page_size=None):
+        """Every submission with status, reading the ByStatus index page by page."""
+
+    @abstractmethod
+    def get_version_history(self, submission_id):
+        ...
+
+    @abstractmethod
+    def get_version_timeline(self, submission_id, limit, exclusive_start_key=None):
+        ...
+
+    @abstractmethod
+    def get_version(self, submission_id, version):
+        ...
+
+    @abstractmethod
+    def get_versions(self, submission_id, versions):
+        ...
+
+    @abstractmethod
+    def batch_put_submissions(self, items):
+        """Write items; returns those left unwritten."""
+
+    @abstractmethod
+    def mark_superseded(self, submission_id, version):
+        ...
+
+    @abstractmethod
+    def update_submission_status(self, submission_id, version, new_status, updated_at, expected_status=None):
+        ...
+
+    @abstractmethod
+    def archive_version(self, submission_id, version, updated_at, current=None):
+        """Archive an active version and release its studyId claim in one write; returns the item.
+
+        current is the version as the caller last read it, if it has one, so the
+        store does not read it again to find the studyId.
+        """
+
+    @abstractmethod
+    def restore_version(self, submission_id, version, updated_at, current=None):
+        """Reactivate an archived version and re-claim its studyId in one write; returns the item."""
+
+    # studyId claims
+
+    @abstractmethod
+    def get_study_id_claim(self, study_id):
+        ...
+
+    @abstractmethod
+    def claim_study_id(self, item):
+        ...
+
+    @abstractmethod
+    def release_study_id(self, item):
+        ...
+
+    @abstractmethod
+    def put_new_submission(self, item):
+        """Write item and its claim atomically; StudyIdTakenError writes nothing."""
+
+    @abstractmethod
+    def put_next_version(self, current, new_item):
+        """Supersede current and write new_item, moving the claim if the studyId changed."""
+
+    @abstractmethod
+    def put_new_submissions(self, items):
+        """Write new submissions with their claims; returns (taken, unprocessed)."""
+
+    # Suggestion counts
+
+    @abstractmethod
+    def add_suggestion_count(self, field, value_key, change, value):
+        """Add change to a count. A decrease of a missing count is ignored."""
+
+    @abstractmethod
+    def query_suggestions(self, field, key_prefix, max_read=None):
+        """[{value, count}] of a field's counts above zero whose valueKey starts with key_prefix.
+
+        With max_read, only the first max_read counts in valueKey order are read.
+        """
+
+    @abstractmethod
+    def put_suggestion_counts(self, counts, spellings):
+        ...
+
+    @abstractmethod
+    def list_suggestion_keys(self, field):
+        ...
+
+    @abstractmethod
+    def delete_suggestions(self, field, value_keys):
+        ...
+
+    # Drafts
+
+    @abstractmethod
+    def get_draft(self, user_id, draft_key):
+        ...
+
+    @abstractmethod
+    def put_draft(self, item, expected_revision):
+        """Write item if the draft is at expected_revision (0: absent); ConditionFailedError otherwise."""
+
+    @abstractmethod
+    def delete_draft(self, user_id, draft_key):
+        ...
@@ -0,0 +1,56 @@
+"""Text normalization shared by the similarity and search indexes."""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+STOPWORDS = frozenset(
+    "a an and are as at by for from how in into is of on or the to what which with".split()
+)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Longest match first; the replacement keeps related forms on one stem
+# (adoption/adopted/adopting → adopt, evaluation/evaluate → evaluat).
+_SUFFIXES = (
+    ("ational", "at"), ("tional", "t"), ("ations", "at"), ("ation", "at"),
+    ("tions", "t"), ("tion", "t"), ("ments", ""), ("ment", ""),
+    ("ings", ""), ("ing", ""), ("edly", ""), ("ed", ""), ("ies", "y"),
+    ("ly", ""), ("s", ""),
+)
+MIN_STEM = 3
+
+
+def fold(text):
+    """Lower-case, accent-free words of text, separated by single spaces."""
+    if not isinstance(text, str):
+        return ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def normalize_words(text):
+    """Lower-case, accent-free words of text, without stopwords."""
+    return [w for w in fold(text).split() if w not in STOPWORDS]
+
+
+@lru_cache(maxsize=1 << 16)
+def stem(word):
+    """Light suffix-stripping stemmer; applied identically to documents and queries."""
+    if len(word) <= MIN_STEM or word.isdigit():
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            if suffix == "s" and word.endswith(("ss", "us", "is")):
+                break
+            word = word[:-len(suffix)] + replacement
+            break
+    if word.endswith("e") and len(word) > MIN_STEM + 1:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Stemmed search terms of text."""
+    return [stem(w) for w in normalize_words(text)]
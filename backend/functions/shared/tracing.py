@@ -0,0 +1,55 @@
+"""Opt-in span logs of the AWS calls a handler makes.
+
+With TRACE_AWS_CALLS=true (the TraceAwsCalls template parameter), each AWS
+API call made through shared/aws.py sessions prints one JSON line to stdout,
+beside the handler's metrics line (shared/metrics.py). A span names the call
+(service, operation, and the table, bucket, function or user pool), when it
+started in the invocation and how long it took, its retries and throttled
+attempts, its status or error, and its request and response sizes. Spans
+and the metrics line share the correlationId, the API Gateway request id
+from requestContext, so a Logs Insights query on it shows an invocation's
+calls in order.
+"""
+
+import json
+import os
+import sys
+
+
+def enabled():
+    """Whether TRACE_AWS_CALLS is on (read per call, so it can be set after import)."""
+    return os.environ.get("TRACE_AWS_CALLS", "").lower() in ("1", "true", "yes")
+
+
+def correlation_id(event, context=None):
+    """The API Gateway request id of an event, else the Lambda request id, else None."""
+    request_context = event.get("requestContext") if isinstance(event, dict) else None
+    if isinstance(request_context, dict) and request_context.get("requestId"):
+        return request_context["requestId"]
+    return getattr(context, "aws_request_id", None)
+
+
+def span(call, invocation=None):
+    """The span log record of an AWS call, made during invocation (a metrics.Invocation) or outside one."""
+    return {
+        "span": "aws",
+        "correlationId": invocation.correlation_id if invocation else None,
+        "function": invocation.function if invocation else None,
+        "route": invocation.route if invocation else None,
+        "service": call["service"],
+        "operation": call["operation"],
+        "resource": call.get("resource"),
+        "offsetMs": round((call["start"] - invocation.start) * 1000, 2) if invocation else None,
+        "ms": round(call["ms"], 2),
+        "retries": call.get("retries", 0),
+        "throttles": call.get("throttles", 0),
+        "status": call["status"],
+        "error": call["error"],
+        "requestBytes": call.get("request_bytes"),
+        "responseBytes": call.get("response_bytes"),
+    }
+
+
+def emit(call, invocation=None):
+    sys.stdout.write(json.dumps(span(call, invocation), default=str) + "\n")
+    sys.stdout.flush()
@@ -0,0 +1,116 @@
+"""Declarative submission validation rules — the single source for both sides.
+
+shared/validator.py compiles RULES into check closures at import time, and
+backend/scripts/generate_validation_spec.py renders them into
+src/lib/validationSpec.generated.ts for the Zod schema in src/lib/formSchema.ts.
+
+Rules run in the order listed, which is also the order errors are reported in.
+Each rule has a ``rule`` kind, the ``field`` it reports errors against and the
+form ``section`` (A–F) it belongs to. Field rules take ``required``; kinds:
+
+  string           ``max`` length; blank counts as missing
+  email            valid address of at most ``max`` characters; blank counts
+                   as missing
+  enum             value in ``values``
+  date             ``YYYY-MM-DD`` prefix; blank counts as missing
+  string_array     list of strings; required arrays need ``min_items``
+                   non-blank items; ``codes`` (region, country or
+                   subnational) checks each item against shared/geography
+  enum_array       list of ``values`` members; required arrays need ``min_items``
+  positive_int     integer > 0
+  positive_number  number > 0
+  yes_no_link      ``{answer: yes|no, link}``; link required and a URL on yes
+
+Cross-field kinds:
+
+  date_order       ``field`` must not be before ``after``
+  required_if      ``field`` must be non-blank when ``when`` is in ``values``
+
+SECTION_DEPENDENCIES lists fields outside a section that its rules depend on,
+so section-scoped validation re-checks the section when they change.
+"""
+
+from shared.constants import (
+    VALID_STUDY_TYPES, VALID_TIMINGS, VALID_ANALYTICAL_SCOPES,
+    VALID_GEOGRAPHIC_SCOPES, VALID_RESULT_LEVELS, VALID_CAUSALITY_MODES,
+    VALID_METHOD_CLASSES, VALID_STATUS_TYPES, VALID_FUNDED_TYPES,
+    VALID_YES_NO_NA, VALID_PRIMARY_USER_TYPES, VALID_PRIMARY_INDICATORS,
+    MAX_W3_BILATERAL,
+    MAX_STUDY_ID, MAX_STUDY_TITLE, MAX_LEAD_CENTER, MAX_CONTACT_NAME, MAX_CONTACT_EMAIL,
+    MAX_RESEARCH_QUESTIONS, MAX_STUDY_INDICATORS, MAX_TREATMENT_INTERVENTION,
+    MAX_FUNDING_SOURCE, MAX_COMMISSIONING_SOURCE,
+)
+
+
+# Section C is only shown for causal or quantitative studies (SECTION_C_* in constants)
+SECTION_DEPENDENCIES = {
+    "C": ("causalityMode", "methodClass"),
+}
+
+
+def _field(section, field, rule, required, **params):
+    return {"section": section, "field": field, "rule": rule, "required": required, **params}
+
+
+RULES = (
+    # --- Section A: Basic Information ---
+    _field("A", "studyId", "string", True, max=MAX_STUDY_ID),
+    _field("A", "studyTitle", "string", True, max=MAX_STUDY_TITLE),
+    _field("A", "leadCenter", "string", True, max=MAX_LEAD_CENTER),
+    _field("A", "contactName", "string", True, max=MAX_CONTACT_NAME),
+    _field("A", "contactEmail", "email", True, max=MAX_CONTACT_EMAIL),
+    _field("A", "otherCenters", "string_array", True, min_items=1),
+    _field("A", "w3Bilateral", "string", False, max=MAX_W3_BILATERAL),
+
+    # --- Section B: Study Classification ---
+    _field("B", "studyType", "enum", True, values=VALID_STUDY_TYPES),
+    _field("B", "timing", "enum", True, values=VALID_TIMINGS),
+    _field("B", "analyticalScope", "enum", True, values=VALID_ANALYTICAL_SCOPES),
+    _field("B", "geographicScope", "enum", True, values=VALID_GEOGRAPHIC_SCOPES),
+    _field("B", "resultLevel", "enum", True, values=VALID_RESULT_LEVELS),
+    _field("B", "causalityMode", "enum", True, values=VALID_CAUSALITY_MODES),
+    _field("B", "methodClass", "enum", True, values=VALID_METHOD_CLASSES),
+    _field("B", "primaryIndicator", "enum", True, values=VALID_PRIMARY_INDICATORS),
+    _field("B", "studyRegions", "string_array", False, codes="region"),
+    _field("B", "studyCountries", "string_array", False, codes="country"),
+    _field("B", "studySubnational", "string_array", False, codes="subnational"),
+
+    # --- Section C: Research Details (validate types/lengths if present) ---
+    _field("C", "keyResearchQuestions", "string", False, max=MAX_RESEARCH_QUESTIONS),
+    _field("C", "unitOfAnalysis", "string_array", False),
+    _field("C", "treatmentIntervention", "string", False, max=MAX_TREATMENT_INTERVENTION),
+    _field("C", "sampleSize", "positive_int", False),
+    _field("C", "powerCalculation", "enum", False, values=VALID_YES_NO_NA),
+    _field("C", "dataCollectionMethods", "string_array", False),
+    _field("C", "studyIndicators", "string", True, max=MAX_STUDY_INDICATORS),
+    _field("C", "preAnalysisPlan", "yes_no_link", False),
+    _field("C", "dataCollectionRounds", "positive_int", False),
+
+    # --- Section D: Timeline & Status ---
+    _field("D", "startDate", "date", True),
+    _field("D", "expectedEndDate", "date", True),
+    _field("D", "dataCollectionStatus", "enum", True, values=VALID_STATUS_TYPES),
+    _field("D", "analysisStatus", "enum", True, values=VALID_STATUS_TYPES),
+    {
+        "section": "D", "field": "expectedEndDate", "rule": "date_order", "after": "startDate",
+        "message": "End date must be on or after start date",
+    },
+
+    # --- Section E: Funding & Resources ---
+    _field("E", "funded", "enum", True, values=VALID_FUNDED_TYPES),
+    {
+        "section": "E", "field": "fundingSource", "rule": "required_if",
+        "when": "funded", "values": {"yes", "partial"},
+        "message": "Required when funded is yes or partial",
+    },
+    _field("E", "fundingSource", "string", False, max=MAX_FUNDING_SOURCE),
+    _field("E", "totalCostUSD", "positive_number", True),
+    _field("E", "proposalAvailable", "yes_no_link", True),
+
+    # --- Section F: Outputs & Users ---
+    _field("F", "manuscriptDeveloped", "yes_no_link", True),
+    _field("F", "policyBriefDeveloped", "yes_no_link", True),
+    _field("F", "relatedToPastStudy", "yes_no_link", True),
+    _field("F", "intendedPrimaryUser", "enum_array", True, values=VALID_PRIMARY_USER_TYPES, min_items=1),
+    _field("F", "commissioningSource", "string", True, max=MAX_COMMISSIONING_SOURCE),
+)
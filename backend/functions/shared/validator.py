@@ -1,20 +1,21 @@
-"""Server-side validation mirroring the Zod schema in src/lib/formSchema.ts."""
+"""Server-side validation mirroring the Zod schema in src/lib/formSchema.ts.
+
+The rules live in shared/validation_spec.py. They are compiled once at import
+into a flat list of check closures with their error messages prebuilt, so
+validating a record is just a loop over those checks.
+"""
 
 import re
-from shared.constants import (
-    VALID_STUDY_TYPES, VALID_TIMINGS, VALID_ANALYTICAL_SCOPES,
-    VALID_GEOGRAPHIC_SCOPES, VALID_RESULT_LEVELS, VALID_CAUSALITY_MODES,
-    VALID_METHOD_CLASSES, VALID_STATUS_TYPES, VALID_FUNDED_TYPES,
-    VALID_YES_NO_NA, VALID_PRIMARY_USER_TYPES, VALID_PRIMARY_INDICATORS,
-    SECTION_C_CAUSALITY_MODES, SECTION_C_METHOD_CLASSES,
-    MAX_W3_BILATERAL,
-    MAX_STUDY_ID, MAX_STUDY_TITLE, MAX_LEAD_CENTER, MAX_CONTACT_NAME,
-    MAX_RESEARCH_QUESTIONS, MAX_STUDY_INDICATORS,
-    MAX_FUNDING_SOURCE, MAX_COMMISSIONING_SOURCE,
-)
+from shared import geography
+from shared.validation_spec import RULES, SECTION_DEPENDENCIES
 
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 URL_RE = re.compile(r"^https?://\S+$")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# Below this many records a process pool costs more to start than it saves
+PARALLEL_THRESHOLD = 5000
+CHUNKS_PER_WORKER = 4
 
 
 class ValidationError(Exception):
@@ -26,68 +27,8 @@ class ValidationError(Exception):
 def validate_submission(data):
     """Validate submission data. Returns data on success, raises ValidationError on failure."""
     errors = []
-
-    # --- Section A: Basic Information ---
-    _require_string(data, "studyId", MAX_STUDY_ID, errors)
-    _require_string(data, "studyTitle", MAX_STUDY_TITLE, errors)
-    _require_string(data, "leadCenter", MAX_LEAD_CENTER, errors)
-    _require_string(data, "contactName", MAX_CONTACT_NAME, errors)
-    _require_email(data, "contactEmail", errors)
-    _require_string_array(data, "otherCenters", 1, errors)
-
-    _optional_string(data, "w3Bilateral", MAX_W3_BILATERAL, errors)
-
-    # --- Section B: Study Classification ---
-    _require_enum(data, "studyType", VALID_STUDY_TYPES, errors)
-    _require_enum(data, "timing", VALID_TIMINGS, errors)
-    _require_enum(data, "analyticalScope", VALID_ANALYTICAL_SCOPES, errors)
-    _require_enum(data, "geographicScope", VALID_GEOGRAPHIC_SCOPES, errors)
-    _require_enum(data, "resultLevel", VALID_RESULT_LEVELS, errors)
-    _require_enum(data, "causalityMode", VALID_CAUSALITY_MODES, errors)
-    _require_enum(data, "methodClass", VALID_METHOD_CLASSES, errors)
-    _require_enum(data, "primaryIndicator", VALID_PRIMARY_INDICATORS, errors)
-    _optional_string_array(data, "studyRegions", errors)
-    _optional_string_array(data, "studyCountries", errors)
-    _optional_string_array(data, "studySubnational", errors)
-
-    # --- Section C: Research Details (validate types/lengths if present) ---
-    _optional_string(data, "keyResearchQuestions", MAX_RESEARCH_QUESTIONS, errors)
-    _optional_string_array(data, "unitOfAnalysis", errors)
-    _optional_string(data, "treatmentIntervention", 500, errors)
-    _optional_positive_int(data, "sampleSize", errors)
-    _optional_enum(data, "powerCalculation", VALID_YES_NO_NA, errors)
-    _optional_string_array(data, "dataCollectionMethods", errors)
-    _require_string(data, "studyIndicators", MAX_STUDY_INDICATORS, errors)
-    _optional_yes_no_with_link(data, "preAnalysisPlan", errors)
-    _optional_positive_int(data, "dataCollectionRounds", errors)
-
-    # --- Section D: Timeline & Status ---
-    _require_date(data, "startDate", errors)
-    _require_date(data, "expectedEndDate", errors)
-    _require_enum(data, "dataCollectionStatus", VALID_STATUS_TYPES, errors)
-    _require_enum(data, "analysisStatus", VALID_STATUS_TYPES, errors)
-    start = data.get("startDate", "")
-    end = data.get("expectedEndDate", "")
-    if start and end and end < start:
-        errors.append({"field": "expectedEndDate", "message": "End date must be on or after start date"})
-
-    # --- Section E: Funding & Resources ---
-    _require_enum(data, "funded", VALID_FUNDED_TYPES, errors)
-    funded = data.get("funded", "")
-    if funded in ("yes", "partial"):
-        fs = data.get("fundingSource")
-        if not fs or not str(fs).strip():
-            errors.append({"field": "fundingSource", "message": "Required when funded is yes or partial"})
-    _optional_string(data, "fundingSource", MAX_FUNDING_SOURCE, errors)
-    _optional_positive_number(data, "totalCostUSD", errors)
-    _require_yes_no_with_link(data, "proposalAvailable", errors)
-
-    # --- Section F: Outputs & Users ---
-    _require_yes_no_with_link(data, "manuscriptDeveloped", errors)
-    _require_yes_no_with_link(data, "policyBriefDeveloped", errors)
-    _require_yes_no_with_link(data, "relatedToPastStudy", errors)
-    _require_enum_array(data, "intendedPrimaryUser", VALID_PRIMARY_USER_TYPES, 1, errors)
-    _require_string(data, "commissioningSource", MAX_COMMISSIONING_SOURCE, errors)
+    for check in _CHECKS:
+        check(data, errors)
 
     if errors:
         raise ValidationError(errors)
@@ -95,118 +36,368 @@ def validate_submission(data):
     return data
 
 
-# --- Helpers ---
-
-def _require_string(data, field, max_len, errors):
-    val = data.get(field)
-    if not val or not isinstance(val, str) or not val.strip():
-        errors.append({"field": field, "message": f"{field} is required"})
-    elif len(val) > max_len:
-        errors.append({"field": field, "message": f"{field} must be at most {max_len} characters"})
-
-
-def _require_email(data, field, errors):
-    val = data.get(field)
-    if not val or not isinstance(val, str) or not val.strip():
-        errors.append({"field": field, "message": f"{field} is required"})
-    elif not EMAIL_RE.match(val):
-        errors.append({"field": field, "message": f"{field} must be a valid email"})
-
+def validate_sections(data, sections):
+    """Validate only the rules affected by a change to the given sections.
 
-def _require_enum(data, field, valid_values, errors):
-    val = data.get(field)
-    if not val:
-        errors.append({"field": field, "message": f"{field} is required"})
-    elif val not in valid_values:
-        errors.append({"field": field, "message": f"{field} must be one of: {', '.join(sorted(valid_values))}"})
-
-
-def _require_date(data, field, errors):
-    val = data.get(field)
-    if not val or not isinstance(val, str) or not val.strip():
-        errors.append({"field": field, "message": f"{field} is required"})
-        return
-    if not re.match(r"^\d{4}-\d{2}-\d{2}", val):
-        errors.append({"field": field, "message": f"{field} must be a valid date (YYYY-MM-DD)"})
-
-
-def _require_string_array(data, field, min_length, errors):
-    val = data.get(field)
-    if not isinstance(val, list) or len(val) < min_length:
-        errors.append({"field": field, "message": f"{field} must have at least {min_length} item(s)"})
-    elif not all(isinstance(v, str) and v.strip() for v in val):
-        errors.append({"field": field, "message": f"{field} items must be non-empty strings"})
-
-
-def _require_enum_array(data, field, valid_values, min_length, errors):
-    val = data.get(field)
-    if not isinstance(val, list) or len(val) < min_length:
-        errors.append({"field": field, "message": f"{field} must have at least {min_length} item(s)"})
-    elif not all(v in valid_values for v in val):
-        errors.append({"field": field, "message": f"{field} contains invalid values"})
+    Runs every rule in those sections, plus any rule elsewhere that reads a
+    field from them (cross-field rules and SECTION_DEPENDENCIES). Returns data
+    on success, raises ValidationError on failure.
+    """
+    sections = frozenset(sections)
+    changed_fields = set()
+    for section in sections:
+        changed_fields |= SECTION_FIELDS.get(section, frozenset())
 
+    errors = []
+    for section, reads, check in _SCOPED_CHECKS:
+        if section in sections or not reads.isdisjoint(changed_fields):
+            check(data, errors)
 
-def _require_yes_no_with_link(data, field, errors):
-    val = data.get(field)
-    if not isinstance(val, dict):
-        errors.append({"field": field, "message": f"{field} is required"})
-        return
-    answer = val.get("answer")
-    if answer not in ("yes", "no"):
-        errors.append({"field": field, "message": f"{field}.answer must be 'yes' or 'no'"})
-        return
-    if answer == "yes":
-        link = val.get("link", "")
-        if not link or not str(link).strip():
-            errors.append({"field": f"{field}.link", "message": f"Link is required when {field} is yes"})
-        elif not URL_RE.match(link):
-            errors.append({"field": f"{field}.link", "message": f"{field} link must be a valid URL"})
+    if errors:
+        raise ValidationError(errors)
 
+    return data
 
-def _optional_string(data, field, max_len, errors):
-    val = data.get(field)
-    if val is not None and isinstance(val, str) and len(val) > max_len:
-        errors.append({"field": field, "message": f"{field} must be at most {max_len} characters"})
 
+def validate_draft(data):
+    """Type and length checks only, for autosaved drafts.
 
-def _optional_enum(data, field, valid_values, errors):
-    val = data.get(field)
-    if val is not None and val not in valid_values:
-        errors.append({"field": field, "message": f"{field} must be one of: {', '.join(sorted(valid_values))}"})
+    Missing fields, blank values, half-typed emails/dates/links and
+    cross-field rules are all allowed; submitting the draft runs the full rules.
+    """
+    present = {k: v for k, v in data.items() if v is not None and v != ""}
+    errors = []
+    for check in _DRAFT_CHECKS:
+        check(present, errors)
 
+    if errors:
+        raise ValidationError(errors)
 
-def _optional_positive_int(data, field, errors):
-    val = data.get(field)
-    if val is not None:
-        try:
-            n = int(val)
-            if n <= 0:
-                errors.append({"field": field, "message": f"{field} must be a positive integer"})
-        except (ValueError, TypeError):
-            errors.append({"field": field, "message": f"{field} must be a positive integer"})
+    return data
 
 
-def _optional_positive_number(data, field, errors):
-    val = data.get(field)
-    if val is not None:
+def validate_many(records, workers=1):
+    """Validate a batch without raising. Returns one error list per record, in order.
+
+    An empty list means the record is valid. With workers > 1 and at least
+    PARALLEL_THRESHOLD records the batch is split across a process pool; where
+    processes can't be started (e.g. Lambda has no /dev/shm) it runs serially.
+    """
+    records = list(records)
+    if workers <= 1 or len(records) < PARALLEL_THRESHOLD:
+        return _validate_chunk(records)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunk_size = -(-len(records) // (workers * CHUNKS_PER_WORKER))
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return [errors for chunk in executor.map(_validate_chunk, chunks) for errors in chunk]
+    except (OSError, NotImplementedError):
+        return _validate_chunk(records)
+
+
+def _validate_chunk(records):
+    results = []
+    for data in records:
+        errors = []
+        if isinstance(data, dict):
+            for check in _CHECKS:
+                check(data, errors)
+        else:
+            errors.append({"field": None, "message": "Submission must be a JSON object"})
+        results.append(errors)
+    return results
+
+
+# --- Compilers: one per rule kind, each returning check(data, errors) ---
+
+def _compile_string(field, required, max):
+    required_err = {"field": field, "message": f"{field} is required"}
+    max_err = {"field": field, "message": f"{field} must be at most {max} characters"}
+
+    if required:
+        def check(data, errors):
+            val = data.get(field)
+            if not val or not isinstance(val, str) or not val.strip():
+                errors.append(dict(required_err))
+            elif len(val) > max:
+                errors.append(dict(max_err))
+    else:
+        def check(data, errors):
+            val = data.get(field)
+            if val is not None and isinstance(val, str) and len(val) > max:
+                errors.append(dict(max_err))
+    return check
+
+
+def _compile_email(field, required, max):
+    required_err = {"field": field, "message": f"{field} is required"}
+    format_err = {"field": field, "message": f"{field} must be a valid email"}
+    max_err = {"field": field, "message": f"{field} must be at most {max} characters"}
+    match = EMAIL_RE.match
+
+    if required:
+        def check(data, errors):
+            val = data.get(field)
+            if not val or not isinstance(val, str) or not val.strip():
+                errors.append(dict(required_err))
+            elif not match(val):
+                errors.append(dict(format_err))
+            elif len(val) > max:
+                errors.append(dict(max_err))
+    else:
+        def check(data, errors):
+            val = data.get(field)
+            if val is not None and (not isinstance(val, str) or (val.strip() and not match(val))):
+                errors.append(dict(format_err))
+            elif val is not None and len(val) > max:
+                errors.append(dict(max_err))
+    return check
+
+
+def _compile_enum(field, required, values):
+    valid = frozenset(values)
+    required_err = {"field": field, "message": f"{field} is required"}
+    value_err = {"field": field, "message": f"{field} must be one of: {', '.join(sorted(valid))}"}
+
+    if required:
+        def check(data, errors):
+            val = data.get(field)
+            if not val:
+                errors.append(dict(required_err))
+            elif not isinstance(val, str) or val not in valid:
+                errors.append(dict(value_err))
+    else:
+        def check(data, errors):
+            val = data.get(field)
+            if val is not None and (not isinstance(val, str) or val not in valid):
+                errors.append(dict(value_err))
+    return check
+
+
+def _compile_date(field, required):
+    required_err = {"field": field, "message": f"{field} is required"}
+    format_err = {"field": field, "message": f"{field} must be a valid date (YYYY-MM-DD)"}
+    match = DATE_RE.match
+
+    if required:
+        def check(data, errors):
+            val = data.get(field)
+            if not val or not isinstance(val, str) or not val.strip():
+                errors.append(dict(required_err))
+            elif not match(val):
+                errors.append(dict(format_err))
+    else:
+        def check(data, errors):
+            val = data.get(field)
+            if val is not None and (not isinstance(val, str) or (val.strip() and not match(val))):
+                errors.append(dict(format_err))
+    return check
+
+
+_CODE_CHECKS = {
+    "region": geography.is_region,
+    "country": geography.is_country,
+    "subnational": geography.is_subnational,
+}
+MAX_REPORTED_CODES = 5
+
+
+def _compile_string_array(field, required, min_items=1, codes=None):
+    known = _CODE_CHECKS[codes] if codes else None
+
+    if required:
+        length_err = {"field": field, "message": f"{field} must have at least {min_items} item(s)"}
+        items_err = {"field": field, "message": f"{field} items must be non-empty strings"}
+
+        def check(data, errors):
+            val = data.get(field)
+            if not isinstance(val, list) or len(val) < min_items:
+                errors.append(dict(length_err))
+            elif not all(isinstance(v, str) and v.strip() for v in val):
+                errors.append(dict(items_err))
+    else:
+        type_err = {"field": field, "message": f"{field} must be an array"}
+        items_err = {"field": field, "message": f"{field} items must be strings"}
+
+        def check(data, errors):
+            val = data.get(field)
+            if val is not None:
+                if not isinstance(val, list):
+                    errors.append(dict(type_err))
+                elif not all(isinstance(v, str) for v in val):
+                    errors.append(dict(items_err))
+                elif known is not None:
+                    unknown = [v for v in val if not known(v)]
+                    if unknown:
+                        errors.append({
+                            "field": field,
+                            "message": f"{field} contains unknown codes: "
+                                       f"{', '.join(unknown[:MAX_REPORTED_CODES])}",
+                        })
+    return check
+
+
+def _compile_enum_array(field, required, values, min_items):
+    valid = frozenset(values)
+    value_err = {"field": field, "message": f"{field} contains invalid values"}
+
+    if required:
+        length_err = {"field": field, "message": f"{field} must have at least {min_items} item(s)"}
+
+        def check(data, errors):
+            val = data.get(field)
+            if not isinstance(val, list) or len(val) < min_items:
+                errors.append(dict(length_err))
+            elif not all(isinstance(v, str) and v in valid for v in val):
+                errors.append(dict(value_err))
+    else:
+        type_err = {"field": field, "message": f"{field} must be an array"}
+
+        def check(data, errors):
+            val = data.get(field)
+            if val is not None:
+                if not isinstance(val, list):
+                    errors.append(dict(type_err))
+                elif not all(isinstance(v, str) and v in valid for v in val):
+                    errors.append(dict(value_err))
+    return check
+
+
+def _compile_positive(field, required, cast, message):
+    required_err = {"field": field, "message": f"{field} is required"}
+    err = {"field": field, "message": f"{field} must be a {message}"}
+
+    def check(data, errors):
+        val = data.get(field)
+        if val is None:
+            if required:
+                errors.append(dict(required_err))
+            return
         try:
-            n = float(val)
-            if n <= 0:
-                errors.append({"field": field, "message": f"{field} must be a positive number"})
+            if cast(val) <= 0:
+                errors.append(dict(err))
         except (ValueError, TypeError):
-            errors.append({"field": field, "message": f"{field} must be a positive number"})
-
-
-def _optional_string_array(data, field, errors):
-    val = data.get(field)
-    if val is not None:
-        if not isinstance(val, list):
-            errors.append({"field": field, "message": f"{field} must be an array"})
-        elif not all(isinstance(v, str) for v in val):
-            errors.append({"field": field, "message": f"{field} items must be strings"})
-
-
-def _optional_yes_no_with_link(data, field, errors):
-    val = data.get(field)
-    if val is not None:
-        _require_yes_no_with_link(data, field, errors)
+            errors.append(dict(err))
+    return check
+
+
+def _compile_yes_no_link(field, required):
+    required_err = {"field": field, "message": f"{field} is required"}
+    answer_err = {"field": field, "message": f"{field}.answer must be 'yes' or 'no'"}
+    link_required_err = {"field": f"{field}.link", "message": f"Link is required when {field} is yes"}
+    link_format_err = {"field": f"{field}.link", "message": f"{field} link must be a valid URL"}
+    match = URL_RE.match
+
+    def check(data, errors):
+        val = data.get(field)
+        if val is None and not required:
+            return
+        if not isinstance(val, dict):
+            errors.append(dict(required_err))
+            return
+        answer = val.get("answer")
+        if answer not in ("yes", "no"):
+            errors.append(dict(answer_err))
+            return
+        if answer == "yes":
+            link = val.get("link", "")
+            if not link or not str(link).strip():
+                errors.append(dict(link_required_err))
+            elif not isinstance(link, str) or not match(link):
+                errors.append(dict(link_format_err))
+    return check
+
+
+def _compile_type(field, types, message):
+    err = {"field": field, "message": f"{field} must be {message}"}
+
+    def check(data, errors):
+        val = data.get(field)
+        if val is not None and not isinstance(val, types):
+            errors.append(dict(err))
+    return check
+
+
+def _compile_date_order(field, after, message):
+    err = {"field": field, "message": message}
+
+    def check(data, errors):
+        start = data.get(after, "")
+        end = data.get(field, "")
+        if start and end and isinstance(start, str) and isinstance(end, str) and end < start:
+            errors.append(dict(err))
+    return check
+
+
+def _compile_required_if(field, when, values, message):
+    trigger = frozenset(values)
+    err = {"field": field, "message": message}
+
+    def check(data, errors):
+        if data.get(when, "") in trigger:
+            val = data.get(field)
+            if not val or not str(val).strip():
+                errors.append(dict(err))
+    return check
+
+
+_COMPILERS = {
+    "string": lambda r: _compile_string(r["field"], r["required"], r["max"]),
+    "email": lambda r: _compile_email(r["field"], r["required"], r["max"]),
+    "enum": lambda r: _compile_enum(r["field"], r["required"], r["values"]),
+    "date": lambda r: _compile_date(r["field"], r["required"]),
+    "string_array": lambda r: _compile_string_array(
+        r["field"], r["required"], r.get("min_items", 1), r.get("codes"),
+    ),
+    "enum_array": lambda r: _compile_enum_array(r["field"], r["required"], r["values"], r["min_items"]),
+    "positive_int": lambda r: _compile_positive(r["field"], r["required"], int, "positive integer"),
+    "positive_number": lambda r: _compile_positive(r["field"], r["required"], float, "positive number"),
+    "yes_no_link": lambda r: _compile_yes_no_link(r["field"], r["required"]),
+    "type": lambda r: _compile_type(r["field"], r["types"], r["message"]),
+    "date_order": lambda r: _compile_date_order(r["field"], r["after"], r["message"]),
+    "required_if": lambda r: _compile_required_if(r["field"], r["when"], r["values"], r["message"]),
+}
+
+
+def compile_rules(rules):
+    """Compile declarative rules into a list of check(data, errors) closures."""
+    return [_COMPILERS[rule["rule"]](rule) for rule in rules]
+
+
+def _reads(rule):
+    """Fields a rule looks at — its own, any cross-field partner, and its section's dependencies."""
+    fields = {rule["field"]}
+    fields.update(rule[key] for key in ("after", "when") if key in rule)
+    fields.update(SECTION_DEPENDENCIES.get(rule["section"], ()))
+    return frozenset(fields)
+
+
+def _draft_rules(rule):
+    """Relax a rule to the type/length checks a draft still has to pass."""
+    kind = rule["rule"]
+    if kind in ("date_order", "required_if"):
+        return []
+    if kind in ("string", "email", "date"):
+        relaxed = [{**rule, "rule": "type", "types": str, "message": "a string"}]
+        if "max" in rule:
+            relaxed.append({**rule, "rule": "string", "required": False})
+        return relaxed
+    if kind == "yes_no_link":
+        return [{**rule, "rule": "type", "types": dict, "message": "an object"}]
+    if kind == "enum_array":
+        return [{**rule, "rule": "string_array", "required": False}]
+    return [{**rule, "required": False}]
+
+
+_CHECKS = compile_rules(RULES)
+_DRAFT_CHECKS = compile_rules([relaxed for rule in RULES for relaxed in _draft_rules(rule)])
+_SCOPED_CHECKS = [(rule["section"], _reads(rule), check) for rule, check in zip(RULES, _CHECKS)]
+
+SECTION_FIELDS = {
+    section: frozenset(rule["field"] for rule in RULES if rule["section"] == section)
+    for section in dict.fromkeys(rule["section"] for rule in RULES)
+}
+FIELD_SECTIONS = {field: section for section, fields in SECTION_FIELDS.items() for field in fields}
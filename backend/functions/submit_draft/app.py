@@ -0,0 +1,118 @@
+"""Promote a draft to a real submission version, then discard the draft.
+
+The ``new`` draft becomes version 1 of a new submission; a draft keyed by a
+submissionId becomes the next version of that submission. Only here do the
+full validation rules apply.
+"""
+
+import uuid
+import logging
+from datetime import datetime, timezone
+
+from shared.response import success, created, error, not_found, server_error
+from shared.identity import get_user_identity
+from shared.geography import normalize_geography
+from shared.content_hash import content_hash, same_content
+from shared.similarity import find_similar
+from shared.validator import validate_submission, ValidationError
+from shared.db import (
+    get_draft, delete_draft, get_latest_active_version,
+    put_new_submission, put_next_version, StudyIdTakenError,
+)
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+
+NEW_DRAFT_KEY = "new"
+
+
+def _discard(user_id, draft_key):
+    try:
+        delete_draft(user_id, draft_key)
+    except Exception:
+        # The submission is saved; a leftover draft only means a stale autosave
+        logger.exception("Failed to discard submitted draft %s", draft_key)
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    draft_key = event["pathParameters"]["key"]
+    user = get_user_identity(event)
+
+    try:
+        draft = get_draft(user["user_id"], draft_key)
+    except Exception:
+        logger.exception("DynamoDB get failed")
+        return server_error("Failed to load draft")
+    if not draft:
+        return not_found(f"No draft found for {draft_key}")
+
+    data = {k: v for k, v in draft["data"].items() if v is not None and v != ""}
+    try:
+        validate_submission(data)
+    except ValidationError as e:
+        return error("Validation failed", 400, e.errors)
+    normalize_geography(data)
+    digest = content_hash(data)
+
+    now = datetime.now(timezone.utc).isoformat()
+    if draft_key == NEW_DRAFT_KEY:
+        submission_id = str(uuid.uuid4())
+        version = 1
+        owner = user["user_id"]
+        current = None
+    else:
+        try:
+            current = get_latest_active_version(draft_key)
+        except Exception:
+            logger.exception("DynamoDB query failed")
+            return server_error("Failed to submit draft")
+        if not current:
+            return not_found(f"No active submission found with id {draft_key}")
+        submission_id = draft_key
+        version = int(current["version"]) + 1
+        owner = current["userId"]
+        if same_content(current, digest):
+            _discard(user["user_id"], draft_key)
+            return success({
+                "submissionId": submission_id,
+                "version": int(current["version"]),
+                "unchanged": True,
+                "message": "No changes to save",
+            })
+
+    item = {
+        **data,
+        "submissionId": submission_id,
+        "version": version,
+        "status": "active",
+        "userId": owner,
+        "modifiedBy": user["user_id"],
+        "createdAt": now,
+        "updatedAt": now,
+        "contentHash": digest,
+    }
+
+    try:
+        if current:
+            put_next_version(current, item)
+        else:
+            put_new_submission(item)
+    except StudyIdTakenError as e:
+        # Keep the draft so the user can pick another studyId
+        return error(str(e), 409)
+    except Exception:
+        logger.exception("DynamoDB operation failed")
+        return server_error("Failed to submit draft")
+
+    _discard(user["user_id"], draft_key)
+
+    body = {
+        "submissionId": submission_id,
+        "version": version,
+        "message": "Draft submitted successfully",
+    }
+    if version == 1:
+        body["similar"] = find_similar(item, exclude=submission_id)
+        return created(body)
+    return success(body)
@@ -0,0 +1,55 @@
+"""DynamoDB stream consumer that keeps the full-text search index in S3 up to date.
+
+Runs with a reserved concurrency of 1, so it is the delta's only writer. A new
+active version replaces its submission's document, and archiving removes it.
+Superseded versions and studyId claims are ignored. Once the delta holds
+COMPACT_AT submissions it is folded into a new base segment. A failed batch
+raises, so the stream retries it.
+"""
+
+import logging
+import os
+
+from shared.aws import deserialize
+from shared.search import COMPACT_AT, Delta, compact, document, load_index, save_base, save_delta
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    # max_age=0: always start from the stored objects, even if a rebuild replaced them
+    index = load_index(max_age=0)
+    delta = Delta(index.delta.changes)
+    changed = 0
+
+    for record in event.get("Records", []):
+        image = record.get("dynamodb", {}).get("NewImage")
+        if record.get("eventName") == "REMOVE" or not image:
+            continue
+        item = deserialize(image)
+        if int(item.get("version", 0)) <= 0:
+            continue  # studyId claim
+        submission_id = item["submissionId"]
+        if item.get("status") == "active":
+            delta.put(document(item))
+            changed += 1
+        elif item.get("status") == "archived" and (
+            delta.changes.get(submission_id) is not None
+            or (submission_id not in delta.changes and index.base.doc_index(submission_id) is not None)
+        ):
+            delta.remove(submission_id)
+            changed += 1
+
+    compacted = False
+    if changed:
+        if len(delta) >= COMPACT_AT:
+            save_base(compact(index.base, delta))
+            delta = Delta()
+            compacted = True
+        save_delta(delta)
+    logger.info("Applied %d change(s); %d pending in the delta%s",
+                changed, len(delta), ", compacted" if compacted else "")
+    return {"changed": changed, "pending": len(delta), "compacted": compacted}
@@ -0,0 +1,43 @@
+"""DynamoDB stream consumer that keeps the similarity index in S3 up to date.
+
+Runs with a reserved concurrency of 1, so it is the index's only writer. A new
+active version (re-)indexes its submission, and archiving removes it.
+Superseded versions and studyId claims are ignored. A failed batch raises, so
+the stream retries it.
+"""
+
+import logging
+import os
+
+from shared.aws import deserialize
+from shared.similarity import load_index, save_index
+from shared.metrics import handler_metrics
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    # max_age=0: always start from the stored index, even if a rebuild replaced it
+    index = load_index(max_age=0)
+    changed = 0
+
+    for record in event.get("Records", []):
+        image = record.get("dynamodb", {}).get("NewImage")
+        if record.get("eventName") == "REMOVE" or not image:
+            continue
+        item = deserialize(image)
+        if int(item.get("version", 0)) <= 0:
+            continue  # studyId claim
+        if item.get("status") == "active":
+            index.add(item["submissionId"], item)
+            changed += 1
+        elif item.get("status") == "archived" and item["submissionId"] in index:
+            index.remove(item["submissionId"])
+            changed += 1
+
+    if changed:
+        save_index(index)
+    logger.info("Applied %d change(s); %d studies indexed", changed, len(index))
+    return {"changed": changed, "indexed": len(index)}
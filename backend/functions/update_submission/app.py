@@ -4,12 +4,16 @@ from datetime import datetime, timezone
 
 from shared.response import success, error, not_found, server_error
 from shared.identity import get_user_identity
+from shared.geography import normalize_geography
+from shared.content_hash import content_hash, same_content
 from shared.validator import validate_submission, ValidationError
-from shared.db import get_latest_active_version, put_submission, mark_superseded
+from shared.db import get_latest_active_version, put_next_version, StudyIdTakenError
+from shared.metrics import handler_metrics
 
 logger = logging.getLogger()
 
 
+@handler_metrics
 def lambda_handler(event, context):
     submission_id = event["pathParameters"]["id"]
 
@@ -22,10 +26,20 @@ def lambda_handler(event, context):
         validate_submission(body)
     except ValidationError as e:
         return error("Validation failed", 400, e.errors)
+    normalize_geography(body)
+    digest = content_hash(body)
 
     current = get_latest_active_version(submission_id)
     if not current:
         return not_found(f"No active submission found with id {submission_id}")
+    if same_content(current, digest):
+        # Nothing changed: keep the current version rather than minting an identical one
+        return success({
+            "submissionId": submission_id,
+            "version": int(current["version"]),
+            "unchanged": True,
+            "message": "No changes to save",
+        })
 
     user = get_user_identity(event)
     now = datetime.now(timezone.utc).isoformat()
@@ -40,11 +54,13 @@ def lambda_handler(event, context):
         "modifiedBy": user["user_id"],
         "createdAt": now,
         "updatedAt": now,
+        "contentHash": digest,
     }
 
     try:
-        mark_superseded(submission_id, int(current["version"]))
-        put_submission(new_item)
+        put_next_version(current, new_item)
+    except StudyIdTakenError as e:
+        return error(str(e), 409)
     except Exception:
         logger.exception("DynamoDB operation failed")
         return server_error("Failed to update submission")
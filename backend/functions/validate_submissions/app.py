@@ -0,0 +1,43 @@
+"""Dry-run validation of many submissions; nothing is written."""
+
+import json
+
+from shared.response import success, error
+from shared.identity import get_user_identity
+from shared.validator import validate_many
+from shared.metrics import handler_metrics
+
+MAX_RECORDS = 5000
+
+
+@handler_metrics
+def lambda_handler(event, context):
+    get_user_identity(event)  # auth check
+
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except json.JSONDecodeError:
+        return error("Invalid JSON in request body")
+
+    records = body.get("submissions") if isinstance(body, dict) else None
+    if not isinstance(records, list) or not records:
+        return error("submissions must be a non-empty array")
+    if len(records) > MAX_RECORDS:
+        return error(f"At most {MAX_RECORDS} submissions can be validated per request")
+
+    # Serial on purpose: Lambda can't run a process pool and the checks are pure Python
+    results = [
+        {
+            "index": index,
+            "studyId": record.get("studyId") if isinstance(record, dict) else None,
+            "valid": not errors,
+            "errors": errors,
+        }
+        for index, (record, errors) in enumerate(zip(records, validate_many(records)))
+    ]
+    invalid = sum(1 for r in results if not r["valid"])
+    return success({
+        "results": results,
+        "valid": len(results) - invalid,
+        "invalid": invalid,
+    })
@@ -0,0 +1,48 @@
+"""Create studyId claims for active submissions written before they existed.
+
+Claims every active submission's studyId (see shared/db.py), reading the
+ByStatus index page by page. Safe to re-run: a submission that already owns
+its claim is left alone. Studies sharing a studyId are reported, and the
+first one read keeps the claim. Exits 1 if
+any duplicates were found.
+
+Usage (from backend/, with AWS credentials and SUBMISSIONS_TABLE set):
+    python scripts/backfill_study_ids.py
+"""
+
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.db import iter_all_submissions, claim_study_id, StudyIdTakenError  # noqa: E402
+
+
+def backfill(submissions):
+    """Claim each submission's studyId; returns (claimed, duplicates) counts and messages."""
+    claimed = 0
+    duplicates = []
+    for item in submissions:
+        if not item.get("studyId"):
+            continue
+        try:
+            claim_study_id(item)
+            claimed += 1
+        except StudyIdTakenError as e:
+            duplicates.append(f"{item['submissionId']}: {e}")
+    return claimed, duplicates
+
+
+def main(argv=None):
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args(argv)
+    claimed, duplicates = backfill(iter_all_submissions("active"))
+    for line in duplicates:
+        print(line)
+    print(f"{claimed} studyId(s) claimed, {len(duplicates)} duplicate(s)")
+    return 1 if duplicates else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Compare cold starts of the per-route and router API layouts on a replayed request trace.
+
+Each layout is simulated the way Lambda scales it: a request goes to an idle
+warm container of its function, or starts a new one (a cold start).
+Containers are reclaimed after --idle-timeout seconds without a request.
+Init costs are measured by importing every route's handler in a fresh
+interpreter. A per-route container pays its handler's cold import, counted
+with boto3 since handlers load it on their first AWS call. A router container
+pays the cold import of the route that started it, then a warm import
+(shared modules and boto3 already loaded) for each other route on first use.
+
+A trace is JSON lines of {"t": seconds, "method": "GET", "path": "/submissions",
+"ms": 120}, where "ms" (handler time) is optional. Without --trace, a
+synthetic working day of form sessions is replayed.
+
+Usage (from backend/):
+    python scripts/benchmark_router.py [--trace FILE] [--users 40] [--idle-timeout 600]
+                                       [--write-trace FILE] [--no-measure]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FUNCTIONS_DIR = os.path.join(BACKEND_DIR, "functions")
+sys.path.insert(0, FUNCTIONS_DIR)
+
+from router.app import ROUTES, resolve  # noqa: E402
+
+DEFAULT_MS = 80
+ROUTE_MS = {
+    "import_submissions": 4000,
+    "validate_submissions": 800,
+    "submit_draft": 300,
+    "create_submission": 300,
+    "list_all_submissions": 400,
+    "search_submissions": 150,
+}
+# Used with --no-measure: typical arm64 import times of a handler, in seconds
+ASSUMED_COLD_S = 0.45
+ASSUMED_WARM_S = 0.03
+
+# Request flows of a form session: (method, path, repeats)
+FLOWS = {
+    "browse": [
+        ("GET", "/submissions", 1), ("GET", "/submissions/all", 1),
+        ("GET", "/submissions/{id}/history", 1), ("GET", "/submissions/{id}/versions/1", 1),
+        ("GET", "/submissions/{id}/diff", 1),
+    ],
+    "create": [
+        ("GET", "/submissions", 1), ("GET", "/drafts/new", 1), ("PUT", "/drafts/new", 6),
+        ("GET", "/suggest/fundingSource", 3), ("GET", "/reference/subnational", 4),
+        ("GET", "/reference/w3-bilateral", 2), ("PUT", "/drafts/new", 4),
+        ("POST", "/drafts/new/submit", 1), ("POST", "/submissions/{id}/upload-url", 1),
+        ("GET", "/submissions/{id}/files", 1),
+    ],
+    "edit": [
+        ("GET", "/submissions", 1), ("GET", "/submissions/{id}/similar", 1),
+        ("PUT", "/drafts/{id}", 4), ("GET", "/suggest/commissioningSource", 2),
+        ("PUT", "/submissions/{id}", 1), ("DELETE", "/drafts/{id}", 1),
+    ],
+    "search": [
+        ("GET", "/submissions/search", 3), ("GET", "/submissions/by-study-id/S-1", 1),
+        ("POST", "/users/lookup", 1),
+    ],
+    "admin": [
+        ("GET", "/submissions/all", 1), ("POST", "/submissions/validate", 1),
+        ("POST", "/submissions/import", 1), ("POST", "/submissions/archive", 1),
+        ("PATCH", "/submissions/{id}", 1), ("DELETE", "/submissions/{id}/files/report.pdf", 1),
+    ],
+}
+FLOW_WEIGHTS = {"browse": 4, "create": 2, "edit": 3, "search": 3, "admin": 1}
+THINK_SECONDS = 20  # mean pause between a session's requests
+
+
+def synthetic_trace(users, hours=8, sessions_per_user=4, seed=42):
+    """Sessions of the FLOWS spread over a working day, sorted by time."""
+    rng = random.Random(seed)
+    names = list(FLOW_WEIGHTS)
+    weights = [FLOW_WEIGHTS[n] for n in names]
+    trace = []
+    for _ in range(users * sessions_per_user):
+        t = rng.uniform(0, hours * 3600)
+        submission = f"sub-{rng.randrange(10_000)}"
+        for method, path, repeats in FLOWS[rng.choices(names, weights)[0]]:
+            for _ in range(repeats):
+                trace.append({"t": round(t, 3), "method": method, "path": path.replace("{id}", submission)})
+                t += rng.expovariate(1 / THINK_SECONDS)
+    trace.sort(key=lambda r: r["t"])
+    return trace
+
+
+def read_trace(path):
+    with open(path) as f:
+        return sorted((json.loads(line) for line in f if line.strip()), key=lambda r: r["t"])
+
+
+def _import_seconds(module, preload=(), then=()):
+    """Seconds to import a handler and the modules in then, in a fresh interpreter after preload."""
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {FUNCTIONS_DIR!r})\n"
+        f"for name in {list(preload)!r}: __import__(name)\n"
+        "start = time.perf_counter()\n"
+        f"for name in {[module + '.app', *then]!r}: __import__(name)\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    env = {
+        **os.environ,
+        "AWS_DEFAULT_REGION": "eu-central-1",
+        "SUBMISSIONS_TABLE": "bench", "DRAFTS_TABLE": "bench", "SUGGESTIONS_TABLE": "bench",
+        "USERS_TABLE": "bench", "FILES_BUCKET": "bench",
+    }
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout)
+
+
+def measure_init(modules, repeat):
+    """{module: (cold import seconds, warm import seconds)}, best of repeat runs."""
+    warm_preload = ("boto3", "shared.response", "shared.identity", "shared.db")
+    costs = {}
+    for module in sorted(modules):
+        cold = min(_import_seconds(module, then=("boto3",)) for _ in range(repeat))
+        warm = min(_import_seconds(module, warm_preload) for _ in range(repeat))
+        costs[module] = (cold, warm)
+        print(f"  {module:<28} cold {cold * 1000:7.1f}ms   warm {warm * 1000:7.1f}ms", file=sys.stderr)
+    return costs
+
+
+def simulate(requests, function_of, costs, idle_timeout):
+    """Replay (t, module, seconds) requests over containers grouped by function_of(module)."""
+    pools = {}
+    stats = {"functions": set(), "cold": 0, "lazy": 0, "init": 0.0, "peak": 0}
+    for t, module, duration in requests:
+        function = function_of(module)
+        stats["functions"].add(function)
+        # A container is [free at, loaded modules]; idle past the timeout, it is gone
+        pool = [c for c in pools.get(function, ()) if t - c[0] < idle_timeout]
+        idle = [c for c in pool if c[0] <= t]
+        if idle:
+            container = max(idle, key=lambda c: c[0])
+            init = 0.0
+            if module not in container[1]:
+                init = costs[module][1]
+                stats["lazy"] += 1
+        else:
+            container = [t, set()]
+            pool.append(container)
+            init = costs[module][0]
+            stats["cold"] += 1
+        container[1].add(module)
+        container[0] = t + init + duration
+        stats["init"] += init
+        pools[function] = pool
+        stats["peak"] = max(stats["peak"], sum(len(p) for p in pools.values()))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", help="JSON lines trace to replay")
+    parser.add_argument("--users", type=int, default=40, help="users of the synthetic trace")
+    parser.add_argument("--idle-timeout", type=float, default=600,
+                        help="seconds before an idle container is reclaimed")
+    parser.add_argument("--repeat", type=int, default=3, help="import measurements per handler")
+    parser.add_argument("--no-measure", action="store_true",
+                        help="use assumed import times instead of measuring them")
+    parser.add_argument("--write-trace", help="save the replayed trace as JSON lines")
+    args = parser.parse_args(argv)
+
+    trace = read_trace(args.trace) if args.trace else synthetic_trace(args.users)
+    if args.write_trace:
+        with open(args.write_trace, "w") as f:
+            f.writelines(json.dumps(r) + "\n" for r in trace)
+
+    requests, unmatched = [], 0
+    for r in trace:
+        try:
+            match = resolve(r["method"].upper(), r["path"])
+        except LookupError:
+            match = None
+        if match is None:
+            unmatched += 1
+            continue
+        module = match[1]
+        requests.append((r["t"], module, r.get("ms", ROUTE_MS.get(module, DEFAULT_MS)) / 1000))
+
+    modules = {module for _, _, module in ROUTES}
+    if args.no_measure:
+        costs = dict.fromkeys(modules, (ASSUMED_COLD_S, ASSUMED_WARM_S))
+    else:
+        print("Measuring handler import times...", file=sys.stderr)
+        costs = measure_init({m for _, m, _ in requests}, args.repeat)
+
+    print(f"{len(requests):,} requests replayed ({unmatched} unmatched), "
+          f"idle timeout {args.idle_timeout:.0f}s\n")
+    print(f"{'layout':<10} {'functions':>9} {'cold starts':>12} {'lazy loads':>11} "
+          f"{'init time':>10} {'peak containers':>16}")
+    for layout, function_of in (("per-route", lambda m: m), ("router", lambda m: "router")):
+        stats = simulate(requests, function_of, costs, args.idle_timeout)
+        print(f"{layout:<10} {len(stats['functions']):>9} {stats['cold']:>12,} {stats['lazy']:>11,} "
+              f"{stats['init']:>9.1f}s {stats['peak']:>16}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
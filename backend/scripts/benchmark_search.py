@@ -0,0 +1,102 @@
+"""Measure search index build, load, query and compaction times on synthetic studies.
+
+Usage (from backend/):
+    python scripts/benchmark_search.py [--studies 50000] [--queries 1000]
+"""
+
+import argparse
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.search import (  # noqa: E402
+    BaseSegment, COMPACT_AT, Delta, SearchIndex, build_base, compact, document,
+)
+
+WORDS = (
+    "adoption impact maize rice wheat drought tolerant varieties climate smart agriculture "
+    "gender youth nutrition livestock dairy fisheries aquaculture seed systems scaling "
+    "policy markets value chains soil health water irrigation resilience smallholder "
+    "farmers extension digital advisory insurance credit women empowerment diets "
+    "biofortified beans cassava sorghum millet agroforestry landscapes restoration "
+    "household income yields productivity poverty food security consumption prices "
+    "training uptake effectiveness evaluation outcomes institutions governance trade"
+).split()
+SOURCES = ("Gates Foundation", "USAID", "FCDO", "IFAD", "World Bank", "CGIAR Science Program",
+           "European Commission", "GIZ", "ACIAR", "Internal")
+
+
+def _text(rng, low, high):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def make_studies(count, seed=7):
+    rng = random.Random(seed)
+    return [{
+        "submissionId": f"sub-{i:06d}",
+        "studyId": f"S-{i}",
+        "studyTitle": _text(rng, 6, 12),
+        "keyResearchQuestions": _text(rng, 20, 80),
+        "studyIndicators": _text(rng, 10, 40),
+        "commissioningSource": rng.choice(SOURCES),
+    } for i in range(count)]
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {time.perf_counter() - start:8.2f}s")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--studies", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    studies = make_studies(args.studies)
+    docs = timed(f"tokenize ({args.studies:,})", lambda: [document(s) for s in studies])
+    data = timed("build base", lambda: build_base(docs))
+    compressed = zlib.compress(data)
+    print(f"{'base size':<28} {len(data) / 1e6:8.2f}MB ({len(compressed) / 1e6:.2f}MB compressed)")
+
+    with tempfile.TemporaryFile() as f:
+        def load():
+            f.write(zlib.decompress(compressed))
+            f.flush()
+            return BaseSegment(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        base = timed("decompress + mmap", load)
+
+    rng = random.Random(1)
+    queries = [" ".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(args.queries)]
+    index = SearchIndex(base, Delta())
+    index.search(queries[0])  # first query computes the length norms
+    start = time.perf_counter()
+    for q in queries:
+        index.search(q)
+    print(f"{'search (base only)':<28} {(time.perf_counter() - start) * 1000 / len(queries):8.3f}ms/query")
+
+    delta = Delta()
+    for study in make_studies(COMPACT_AT, seed=8):
+        delta.put(document({**study, "submissionId": rng.choice(studies)["submissionId"]}))
+    index = timed(f"apply delta ({len(delta)})", lambda: SearchIndex(base, delta))
+    index.search(queries[0])
+    start = time.perf_counter()
+    for q in queries:
+        index.search(q)
+    print(f"{'search (base + delta)':<28} {(time.perf_counter() - start) * 1000 / len(queries):8.3f}ms/query")
+
+    timed("compact", lambda: compact(base, delta))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
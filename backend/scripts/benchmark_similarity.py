@@ -0,0 +1,89 @@
+"""Measure similarity index build, load and query times on synthetic studies.
+
+Every tenth study is a reworded copy of an earlier one, so queries have real
+near-duplicates to find.
+
+Usage (from backend/):
+    python scripts/benchmark_similarity.py [--studies 50000] [--queries 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.similarity import SimilarityIndex  # noqa: E402
+
+WORDS = (
+    "adoption impact maize rice wheat drought tolerant varieties climate smart agriculture "
+    "gender youth nutrition livestock dairy fisheries aquaculture seed systems scaling "
+    "policy markets value chains soil health water irrigation resilience smallholder "
+    "farmers extension digital advisory insurance credit women empowerment diets "
+    "biofortified beans cassava sorghum millet agroforestry landscapes restoration"
+).split()
+COUNTRIES = ("KE", "UG", "TZ", "ET", "NG", "GH", "IN", "BD", "NP", "VN", "PE", "CO")
+
+
+def make_studies(count, seed=7):
+    rng = random.Random(seed)
+    studies = []
+    for i in range(count):
+        if i % 10 == 9:
+            base = studies[rng.randrange(len(studies))]
+            words = base["studyTitle"].split()
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+            title = " ".join(words)
+            countries = base["studyCountries"]
+        else:
+            title = " ".join(rng.sample(WORDS, rng.randint(6, 10)))
+            countries = rng.sample(COUNTRIES, rng.randint(1, 2))
+        studies.append({"studyId": f"S-{i}", "studyTitle": title, "studyCountries": countries})
+    return studies
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<24} {time.perf_counter() - start:8.2f}s")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--studies", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    studies = make_studies(args.studies)
+    index = SimilarityIndex()
+
+    def build():
+        for i, study in enumerate(studies):
+            index.add(f"sub-{i}", study)
+
+    timed(f"build ({args.studies:,})", build)
+    blob = timed("dumps", index.dumps)
+    print(f"{'index size':<24} {len(blob) / 1e6:8.2f}MB")
+    loaded = timed("loads", lambda: SimilarityIndex.loads(blob))
+
+    ids = [f"sub-{i}" for i in random.Random(1).sample(range(args.studies), args.queries)]
+    start = time.perf_counter()
+    found = sum(len(loaded.similar_to(sid)) for sid in ids)
+    by_id_ms = (time.perf_counter() - start) * 1000 / len(ids)
+
+    start = time.perf_counter()
+    for i in range(args.queries):
+        loaded.query(studies[i])
+    by_body_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    print(f"{'similar_to (by id)':<24} {by_id_ms:8.3f}ms/query ({found / len(ids):.1f} matches avg)")
+    print(f"{'query (by body)':<24} {by_body_ms:8.3f}ms/query")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
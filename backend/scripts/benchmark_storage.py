@@ -0,0 +1,126 @@
+"""Measure the SQLite store's load and query times on a synthetic submissions table.
+
+Writes --rows submission versions (1-4 per submission, the latest active or
+archived, older ones superseded) with their studyId claims to a database
+file, then times the shared.db read and write paths against it.
+
+Usage (from backend/):
+    python scripts/benchmark_storage.py [--rows 1000000] [--users 2000] [--calls 200] [--db FILE]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared import db  # noqa: E402
+from shared.sqlite_store import SQLiteStore  # noqa: E402
+from shared.store import claim_item  # noqa: E402
+
+CENTERS = ("CIAT", "CIMMYT", "CIP", "ICARDA", "IFPRI", "IITA", "ILRI", "IRRI", "IWMI", "WorldFish")
+LOAD_CHUNK = 10_000
+
+
+def make_rows(rows, users, seed=11):
+    """Submission versions and their claims, in lists of about LOAD_CHUNK items."""
+    rng = random.Random(seed)
+    chunk, written, n = [], 0, 0
+    while written < rows:
+        submission_id = f"sub-{n:07d}"
+        user_id = f"user-{rng.randrange(users):05d}"
+        center = rng.choice(CENTERS)
+        versions = min(rng.randint(1, 4), rows - written)
+        day = rng.randrange(1, 29)
+        for version in range(1, versions + 1):
+            latest = version == versions
+            status = ("archived" if rng.random() < 0.05 else "active") if latest else "superseded"
+            chunk.append({
+                "submissionId": submission_id, "version": version, "status": status,
+                "userId": user_id, "createdAt": f"2025-{rng.randint(1, 12):02d}-{day:02d}T00:00:00Z",
+                "studyId": f"S-{n}", "studyTitle": f"Study {n} of {center}", "leadCenter": center,
+            })
+        if chunk[-1]["status"] == "active":
+            chunk.append(claim_item(chunk[-1]))
+        written += versions
+        n += 1
+        if len(chunk) >= LOAD_CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def timed_calls(label, fn, args):
+    times = []
+    for arg in args:
+        start = time.perf_counter()
+        result = fn(arg)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    size = len(result) if isinstance(result, (list, tuple)) else ""
+    print(f"{label:<32} {len(times):>6} {sum(times) / len(times):>9.2f}ms "
+          f"{times[int(len(times) * 0.95) - 1 if len(times) > 1 else 0]:>9.2f}ms {size!s:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="submission versions to write")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=200, help="calls per timed operation")
+    parser.add_argument("--db", help="database file (default: a temporary one)")
+    args = parser.parse_args(argv)
+
+    tmp = None
+    path = args.db
+    if not path:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "benchmark.sqlite3")
+    store = SQLiteStore(path)
+    db.set_store(store)
+
+    start = time.perf_counter()
+    submissions = 0
+    counts, spellings = Counter(), {}
+    for chunk in make_rows(args.rows, args.users):
+        store.batch_put_submissions(chunk)
+        submissions += sum(1 for item in chunk if item["version"] == 1)
+        for item in chunk:
+            if item.get("status") == "active":
+                for key, value in db.suggestion_values(item).items():
+                    counts[key] += 1
+                    spellings.setdefault(key, value)
+    db.put_suggestion_counts(counts, spellings)
+    elapsed = time.perf_counter() - start
+    print(f"loaded {args.rows:,} versions of {submissions:,} submissions in {elapsed:.1f}s "
+          f"({args.rows / elapsed:,.0f}/s), {os.path.getsize(path) / 1e6:,.0f}MB\n")
+
+    rng = random.Random(3)
+    ids = [f"sub-{rng.randrange(submissions):07d}" for _ in range(args.calls)]
+    users = [f"user-{rng.randrange(args.users):05d}" for _ in range(args.calls)]
+    print(f"{'operation':<32} {'calls':>6} {'mean':>11} {'p95':>11} {'items':>8}")
+    timed_calls("get_latest_active_version", db.get_latest_active_version, ids)
+    timed_calls("get_version_history", db.get_version_history, ids)
+    timed_calls("get_version_timeline (10)", lambda sid: db.get_version_timeline(sid, 10)[0], ids)
+    timed_calls("get_study_id_claim", db.get_study_id_claim, [f"S-{sid[4:].lstrip('0') or 0}" for sid in ids])
+    timed_calls("list_user_submissions", db.list_user_submissions, users)
+    timed_calls("list_all_submissions", lambda _: db.list_all_submissions(), range(3))
+    timed_calls("get_suggestions", lambda c: db.get_suggestions("leadCenter", c[:2]), CENTERS)
+    timed_calls("put_new_submission", lambda i: db.put_new_submission({
+        "submissionId": f"new-{i}", "version": 1, "status": "active", "userId": users[0],
+        "createdAt": "2026-01-01T00:00:00Z", "studyId": f"NEW-{i}", "leadCenter": "CIAT",
+    }), range(args.calls))
+
+    store.close()
+    if tmp:
+        tmp.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Measure validate_many throughput, serial and across a process pool.
+
+Usage (from backend/):
+    python scripts/benchmark_validation.py [--records 100000] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.validator import validate_many  # noqa: E402
+
+VALID_RECORD = {
+    "studyId": "BENCH-001",
+    "studyTitle": "Benchmark Study",
+    "leadCenter": "CIAT",
+    "contactName": "Jane Doe",
+    "contactEmail": "jane@cgiar.org",
+    "otherCenters": ["IFPRI", "IITA"],
+    "studyType": "causal_impact",
+    "timing": "t2_endline",
+    "analyticalScope": "project_intervention",
+    "geographicScope": "national",
+    "resultLevel": "outcome",
+    "causalityMode": "c2_causal",
+    "methodClass": "experimental_quasi",
+    "primaryIndicator": "Innovation Use",
+    "studyIndicators": "Crop yield",
+    "startDate": "2025-01-15",
+    "expectedEndDate": "2026-06-30",
+    "dataCollectionStatus": "ongoing",
+    "analysisStatus": "planned",
+    "funded": "yes",
+    "fundingSource": "BMGF",
+    "totalCostUSD": 250000,
+    "proposalAvailable": {"answer": "yes", "link": "https://example.com/p"},
+    "manuscriptDeveloped": {"answer": "no"},
+    "policyBriefDeveloped": {"answer": "no"},
+    "relatedToPastStudy": {"answer": "no"},
+    "intendedPrimaryUser": ["program", "donor"],
+    "commissioningSource": "CGIAR",
+}
+INVALID_RECORD = {**VALID_RECORD, "studyType": "x", "timing": "y", "contactEmail": "nope"}
+
+
+def make_records(count):
+    """Every fifth record is invalid, roughly what a first-pass spreadsheet looks like."""
+    return [dict(INVALID_RECORD if i % 5 == 4 else VALID_RECORD) for i in range(count)]
+
+
+def run(records, workers):
+    start = time.perf_counter()
+    results = validate_many(records, workers=workers)
+    elapsed = time.perf_counter() - start
+    invalid = sum(1 for errors in results if errors)
+    print(f"workers={workers:<3} {len(records) / elapsed:>12,.0f} records/s  "
+          f"({elapsed:.2f}s, {invalid:,} invalid)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    records = make_records(args.records)
+    run(records, 1)
+    if args.workers > 1:
+        run(records, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Rebuild the search index base segment from a table snapshot and upload it.
+
+The snapshot is either every page of the ByStatus index for active
+submissions (the default) or a DynamoDB point-in-time export in DynamoDB
+JSON format, downloaded to a local directory, which reads nothing from the
+live table.
+
+The update_search_index stream consumer keeps the index current. Its delta is
+deliberately left in place: every entry holds the latest state of its
+submission, so replaying it over a newer base is harmless, and changes made
+while this script runs are not lost.
+
+Usage (from backend/, with AWS credentials, SUBMISSIONS_TABLE and FILES_BUCKET set):
+    python scripts/build_search_index.py [--export path/to/export/data]
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+
+from boto3.dynamodb.types import TypeDeserializer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.search import build_base, document, save_base, BASE_KEY  # noqa: E402
+
+
+def read_export(directory):
+    """Items of a DynamoDB JSON export (the *.json.gz files of its data/ directory)."""
+    deserializer = TypeDeserializer()
+    for path in sorted(glob.glob(os.path.join(directory, "*.json.gz"))):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    image = json.loads(line)["Item"]
+                    yield {k: deserializer.deserialize(v) for k, v in image.items()}
+
+
+def build(submissions):
+    """Base segment (bytes) of the active versions among submissions."""
+    return build_base(
+        document(item) for item in submissions
+        if item.get("status") == "active" and int(item.get("version", 0)) > 0
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--export", metavar="DIR",
+                        help="read a downloaded DynamoDB export instead of querying the table")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.export:
+        submissions = read_export(args.export)
+    else:
+        from shared.db import iter_all_submissions
+        submissions = iter_all_submissions("active")
+    data = build(submissions)
+    save_base(data)
+    print(f"{len(data) / 1e6:.1f}MB base segment written to s3://{os.environ['FILES_BUCKET']}/{BASE_KEY} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
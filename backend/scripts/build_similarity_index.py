@@ -0,0 +1,43 @@
+"""Rebuild the similarity index from every active submission and upload it.
+
+Reads every page of the ByStatus index, so the whole table is indexed.
+
+The update_similarity_index stream consumer keeps the index current. Run this
+once when enabling the feature, or after changing the index parameters in
+shared/similarity.py.
+
+Usage (from backend/, with AWS credentials, SUBMISSIONS_TABLE and FILES_BUCKET set):
+    python scripts/build_similarity_index.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.db import iter_all_submissions  # noqa: E402
+from shared.similarity import SimilarityIndex, save_index, INDEX_KEY  # noqa: E402
+
+
+def build(submissions):
+    index = SimilarityIndex()
+    for item in submissions:
+        index.add(item["submissionId"], item)
+    return index
+
+
+def main(argv=None):
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args(argv)
+    start = time.perf_counter()
+    index = build(iter_all_submissions("active"))
+    save_index(index)
+    print(f"{len(index)} studies indexed into s3://{os.environ['FILES_BUCKET']}/{INDEX_KEY} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
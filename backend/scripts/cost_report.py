@@ -0,0 +1,136 @@
+"""Rank API routes by their AWS request cost per call, from handler metric log lines.
+
+Reads the EMF lines that @handler_metrics prints (shared/metrics.py), from
+log files or stdin: CloudWatch Logs exports, `sam logs` output, or the
+dev server's stdout. Text before the JSON on a line (a timestamp, a request
+id) is skipped. Lines are grouped by Route, or by Function for non-API
+invocations. For each group the report shows the calls, the mean DynamoDB
+read and write units, the mean S3 requests by pricing class, and the
+estimated cost per call and in total, most expensive per call first.
+
+Prices are DynamoDB on-demand request units and S3 Standard requests in
+eu-central-1, in USD; override them for another region or tariff. S3
+DELETE requests are free. Lambda time is not included.
+
+Usage (from backend/):
+    python scripts/dev_server.py | tee run.log
+    python scripts/cost_report.py run.log [--by function] [--top 20]
+"""
+
+import argparse
+import json
+import sys
+
+# USD per request
+PRICES = {
+    "read_unit": 0.1525 / 1_000_000,
+    "write_unit": 0.7625 / 1_000_000,
+    "s3_put": 0.0054 / 1000,  # PUT, COPY, POST and LIST
+    "s3_get": 0.00043 / 1000,  # GET, HEAD and the rest
+}
+
+
+def parse_line(line):
+    """The metrics record on a log line, or None."""
+    start = line.find("{")
+    if start < 0 or '"_aws"' not in line:
+        return None
+    try:
+        record = json.loads(line[start:])
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) and "_aws" in record and "Function" in record else None
+
+
+def call_cost(record, prices=PRICES):
+    """The estimated AWS request cost of one invocation, in USD."""
+    s3 = record.get("s3") or {}
+    return (
+        record.get("ReadCapacityUnits", 0) * prices["read_unit"]
+        + record.get("WriteCapacityUnits", 0) * prices["write_unit"]
+        + (s3.get("Put", 0) + s3.get("List", 0)) * prices["s3_put"]
+        + (s3.get("Get", 0) + s3.get("Other", 0)) * prices["s3_get"]
+    )
+
+
+def summarize(records, by="route", prices=PRICES):
+    """[{name, calls, read, write, s3, duration, cost}] per group, means per call, costliest first."""
+    groups = {}
+    for record in records:
+        name = record.get("Route") if by == "route" else None
+        name = name or record["Function"]
+        group = groups.setdefault(name, {
+            "name": name, "calls": 0, "read": 0.0, "write": 0.0, "duration": 0.0, "cost": 0.0,
+            "s3": {"List": 0, "Put": 0, "Get": 0, "Delete": 0},
+        })
+        group["calls"] += 1
+        group["read"] += record.get("ReadCapacityUnits", 0)
+        group["write"] += record.get("WriteCapacityUnits", 0)
+        group["duration"] += record.get("Duration", 0)
+        group["cost"] += call_cost(record, prices)
+        for op, count in (record.get("s3") or {}).items():
+            group["s3"][op] = group["s3"].get(op, 0) + count
+
+    rows = []
+    for group in groups.values():
+        calls = group["calls"]
+        rows.append({
+            "name": group["name"], "calls": calls,
+            "read": group["read"] / calls, "write": group["write"] / calls,
+            "s3": {op: count / calls for op, count in group["s3"].items()},
+            "duration": group["duration"] / calls,
+            "cost": group["cost"] / calls, "total": group["cost"],
+        })
+    return sorted(rows, key=lambda r: (-r["cost"], -r["total"], r["name"]))
+
+
+def _lines(paths):
+    if not paths:
+        yield from sys.stdin
+        return
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            yield from f
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logs", nargs="*", help="log files (default: stdin)")
+    parser.add_argument("--by", choices=("route", "function"), default="route")
+    parser.add_argument("--top", type=int, default=0, help="show only the N costliest (default: all)")
+    parser.add_argument("--read-unit-price", type=float, default=PRICES["read_unit"] * 1e6,
+                        help="USD per million read request units")
+    parser.add_argument("--write-unit-price", type=float, default=PRICES["write_unit"] * 1e6,
+                        help="USD per million write request units")
+    parser.add_argument("--s3-put-price", type=float, default=PRICES["s3_put"] * 1000,
+                        help="USD per 1,000 S3 PUT/COPY/POST/LIST requests")
+    parser.add_argument("--s3-get-price", type=float, default=PRICES["s3_get"] * 1000,
+                        help="USD per 1,000 S3 GET requests")
+    args = parser.parse_args(argv)
+    prices = {
+        "read_unit": args.read_unit_price / 1e6, "write_unit": args.write_unit_price / 1e6,
+        "s3_put": args.s3_put_price / 1000, "s3_get": args.s3_get_price / 1000,
+    }
+
+    records = [r for r in map(parse_line, _lines(args.logs)) if r is not None]
+    if not records:
+        print("no handler metric lines found", file=sys.stderr)
+        return 1
+    rows = summarize(records, args.by, prices)
+    if args.top:
+        rows = rows[:args.top]
+
+    total = sum(row["total"] for row in rows)
+    print(f"{'route' if args.by == 'route' else 'function':<40} {'calls':>7} {'RCU':>7} {'WCU':>7} "
+          f"{'S3 L/P/G/D':>19} {'ms':>8} {'$/1M calls':>11} {'share':>6}")
+    for row in rows:
+        s3 = "/".join(f"{row['s3'].get(op, 0):.1f}" for op in ("List", "Put", "Get", "Delete"))
+        share = row["total"] / total * 100 if total else 0
+        print(f"{row['name']:<40} {row['calls']:>7} {row['read']:>7.2f} {row['write']:>7.2f} "
+              f"{s3:>19} {row['duration']:>8.1f} {row['cost'] * 1e6:>11.2f} {share:>5.1f}%")
+    print(f"\n{len(records)} invocations, ${total:.6g} in AWS requests")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
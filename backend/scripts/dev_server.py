@@ -0,0 +1,618 @@
+"""Local API server that runs every handler in template.yaml in one process.
+
+`sam local start-api` starts a container per invocation. This server reads
+the API routes, environment and tables from template.yaml and calls the
+handlers in-process from a thread pool. AWS is moto by default, or a local
+stand-in such as DynamoDB Local or LocalStack (--endpoint-url). Each request
+gets an API Gateway proxy event carrying Cognito claims for
+shared/identity.get_user_identity. Saving a file under functions/ reloads
+the handlers on the next request. The submissions table stream is polled and
+fed to the stream consumers, so the search and similarity indexes follow
+local writes.
+
+Every response has a Server-Timing header with the handler's duration.
+--profile DIR also writes a cProfile dump per request (read it with
+``python -m pstats``).
+
+Usage (from backend/):
+    python scripts/dev_server.py [--port 3001] [--layout per-route|router]
+                                 [--user-id ID] [--email EMAIL] [--claim KEY=VALUE ...]
+                                 [--no-auth] [--endpoint-url URL] [--sqlite FILE] [--workers 8]
+                                 [--profile DIR] [--no-reload] [--no-streams]
+
+Point the frontend at it with VITE_API_URL=http://localhost:3001. A request
+with an ``X-Dev-User: <sub>`` header acts as that user.
+"""
+
+import argparse
+import base64
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from importlib import import_module
+from urllib.parse import parse_qsl, urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FUNCTIONS_DIR = os.path.join(BACKEND_DIR, "functions")
+TEMPLATE = os.path.join(BACKEND_DIR, "template.yaml")
+sys.path.insert(0, FUNCTIONS_DIR)
+
+from router.app import compile_routes, resolve  # noqa: E402
+
+logger = logging.getLogger("dev_server")
+
+REGION = "eu-central-1"
+STAGE = "local"
+PROXY = "{proxy+}"
+PREFLIGHT_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Dev-User",
+    "Access-Control-Allow-Methods": "GET,POST,PUT,PATCH,DELETE,OPTIONS",
+}
+JSON_HEADERS = {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"}
+
+
+# --- template.yaml ---
+
+def load_template(path=TEMPLATE):
+    """The template as plain data, with short-form intrinsics (!Ref, !Sub...) as {"Ref": ...}/{"Fn::...": ...}."""
+    try:
+        import yaml
+    except ImportError:
+        raise SystemExit("The dev server reads template.yaml with PyYAML: pip install pyyaml")
+
+    class Loader(yaml.SafeLoader):
+        pass
+
+    def intrinsic(loader, tag, node):
+        if isinstance(node, yaml.ScalarNode):
+            value = loader.construct_scalar(node)
+        elif isinstance(node, yaml.SequenceNode):
+            value = loader.construct_sequence(node, deep=True)
+        else:
+            value = loader.construct_mapping(node, deep=True)
+        if tag == "Ref":
+            return {"Ref": value}
+        if tag == "GetAtt" and isinstance(value, str):
+            value = value.split(".", 1)
+        return {f"Fn::{tag}": value}
+
+    Loader.add_multi_constructor("!", intrinsic)
+    with open(path) as f:
+        return yaml.load(f, Loader=Loader)
+
+
+class Template:
+    """The functions, routes and tables of a SAM template, resolved for local use.
+
+    Parameters take their defaults unless overridden; a resource reference
+    resolves to its TableName, BucketName or FunctionName.
+    """
+
+    def __init__(self, doc, parameters=None):
+        self.resources = doc.get("Resources", {})
+        self.globals = doc.get("Globals", {}).get("Function", {})
+        self.parameters = {name: spec.get("Default") for name, spec in doc.get("Parameters", {}).items()}
+        self.parameters.update(parameters or {})
+        self.conditions = {name: self.resolve(expr) for name, expr in doc.get("Conditions", {}).items()}
+
+    def resolve(self, value):
+        if isinstance(value, dict) and len(value) == 1:
+            (key, arg), = value.items()
+            if key == "Ref":
+                return self._ref(arg)
+            if key == "Fn::Sub":
+                text = arg if isinstance(arg, str) else arg[0]
+                return re.sub(r"\$\{([^}]+)\}", lambda m: str(self._ref(m.group(1))), text)
+            if key == "Fn::Equals":
+                return self.resolve(arg[0]) == self.resolve(arg[1])
+            if key == "Fn::GetAtt":
+                return ".".join(arg)
+        if isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        return value
+
+    def _ref(self, name):
+        if name in self.parameters:
+            return self.parameters[name]
+        if name == "AWS::Region":
+            return REGION
+        resource = self.resources.get(name)
+        if resource is None:
+            return name  # pseudo parameters and attributes; nothing local needs them
+        properties = resource.get("Properties", {})
+        for key in ("TableName", "BucketName", "FunctionName"):
+            if key in properties:
+                return self.resolve(properties[key])
+        return name
+
+    def _of_type(self, type_):
+        return {
+            logical_id: resource for logical_id, resource in self.resources.items()
+            if resource.get("Type") == type_
+            and (resource.get("Condition") is None or self.conditions[resource["Condition"]])
+        }
+
+    def functions(self):
+        return self._of_type("AWS::Serverless::Function")
+
+    def handler(self, function_id):
+        """(module, attribute) of a function's handler, importable from functions/."""
+        properties = self.resources[function_id]["Properties"]
+        module, attr = properties["Handler"].rsplit(".", 1)
+        package = os.path.relpath(properties.get("CodeUri", "functions/").rstrip("/"), "functions")
+        if package != ".":
+            module = f"{package.replace(os.sep, '.')}.{module}"
+        return module, attr
+
+    def timeout(self, function_id):
+        return self.resources[function_id]["Properties"].get("Timeout", self.globals.get("Timeout", 3))
+
+    def environment(self):
+        """The environment variables of every function, merged (they agree on shared names)."""
+        env = dict(self.resolve(self.globals.get("Environment", {}).get("Variables", {})))
+        for resource in self.functions().values():
+            variables = resource["Properties"].get("Environment", {}).get("Variables", {})
+            env.update(self.resolve(variables))
+        return {k: ",".join(v) if isinstance(v, list) else str(v) for k, v in env.items()}
+
+    def _events(self, type_):
+        for function_id, resource in self.functions().items():
+            for event in (resource["Properties"].get("Events") or {}).values():
+                if event.get("Type") == type_:
+                    yield function_id, event.get("Properties", {})
+
+    def api_routes(self):
+        """(METHOD, path, function id, public) of every API event; public means no authorizer."""
+        return [
+            (
+                props["Method"].upper(), props["Path"], function_id,
+                (props.get("Auth") or {}).get("Authorizer") == "NONE",
+            )
+            for function_id, props in self._events("Api")
+        ]
+
+    def stream_consumers(self):
+        """(function id, table name) of every DynamoDB stream event."""
+        consumers = []
+        for function_id, props in self._events("DynamoDB"):
+            stream = props.get("Stream") or {}
+            table_id = (stream.get("Fn::GetAtt") or [None])[0]
+            if table_id in self.resources:
+                consumers.append((function_id, self._ref(table_id)))
+        return consumers
+
+    def tables(self):
+        """{table name: CreateTable arguments} of the DynamoDB tables."""
+        tables = {}
+        for resource in self._of_type("AWS::DynamoDB::Table").values():
+            properties = self.resolve(resource["Properties"])
+            kwargs = {
+                key: properties[key]
+                for key in ("AttributeDefinitions", "KeySchema", "GlobalSecondaryIndexes")
+                if key in properties
+            }
+            kwargs["BillingMode"] = "PAY_PER_REQUEST"
+            if "StreamSpecification" in properties:
+                kwargs["StreamSpecification"] = {"StreamEnabled": True, **properties["StreamSpecification"]}
+            tables[properties["TableName"]] = kwargs
+        return tables
+
+    def buckets(self):
+        return [self.resolve(r["Properties"]["BucketName"]) for r in self._of_type("AWS::S3::Bucket").values()]
+
+
+def create_resources(template, user=None):
+    """Create the template's tables and buckets where missing, and the dev user's record."""
+    import boto3
+
+    dynamodb = boto3.client("dynamodb", region_name=REGION)
+    existing = set(dynamodb.list_tables()["TableNames"])
+    for name, kwargs in template.tables().items():
+        if name not in existing:
+            dynamodb.create_table(TableName=name, **kwargs)
+            logger.info("Created table %s", name)
+
+    s3 = boto3.client("s3", region_name=REGION)
+    for name in template.buckets():
+        try:
+            s3.create_bucket(Bucket=name, CreateBucketConfiguration={"LocationConstraint": REGION})
+            logger.info("Created bucket %s", name)
+        except s3.exceptions.BucketAlreadyOwnedByYou:
+            pass
+
+    users_table = template.resolve({"Ref": "UsersTable"})
+    if user and users_table in template.tables():
+        boto3.resource("dynamodb", region_name=REGION).Table(users_table).put_item(Item={
+            "userId": user["sub"], "email": user.get("email", ""), "name": user.get("name", ""),
+        })
+
+
+# --- Events ---
+
+def build_event(method, path, query, headers, body, resource, path_parameters,
+                claims=None, source_ip="127.0.0.1"):
+    """An API Gateway REST proxy event for a request; headers is a list of (name, value)."""
+    single_headers, multi_headers = {}, {}
+    for name, value in headers:
+        single_headers[name] = value
+        multi_headers.setdefault(name, []).append(value)
+    multi_query = {}
+    for name, value in parse_qsl(query, keep_blank_values=True):
+        multi_query.setdefault(name, []).append(value)
+
+    is_base64 = False
+    if body is not None:
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            body, is_base64 = base64.b64encode(body).decode("ascii"), True
+
+    request_context = {
+        "resourcePath": resource,
+        "httpMethod": method,
+        "path": f"/{STAGE}{path}",
+        "stage": STAGE,
+        "requestId": str(uuid.uuid4()),
+        "requestTimeEpoch": int(time.time() * 1000),
+        "identity": {"sourceIp": source_ip},
+    }
+    if claims:
+        request_context["authorizer"] = {"claims": claims}
+    return {
+        "resource": resource,
+        "path": path,
+        "httpMethod": method,
+        "headers": single_headers or None,
+        "multiValueHeaders": multi_headers or None,
+        # API Gateway keeps the last value of a repeated parameter
+        "queryStringParameters": {k: v[-1] for k, v in multi_query.items()} or None,
+        "multiValueQueryStringParameters": multi_query or None,
+        "pathParameters": path_parameters or None,
+        "stageVariables": None,
+        "requestContext": request_context,
+        "body": body,
+        "isBase64Encoded": is_base64,
+    }
+
+
+class LambdaContext:
+    """The parts of the Lambda context object the handlers use."""
+
+    def __init__(self, function_id, timeout):
+        self.function_name = function_id
+        self.aws_request_id = str(uuid.uuid4())
+        self.memory_limit_in_mb = 0
+        self._deadline = time.monotonic() + timeout
+
+    def get_remaining_time_in_millis(self):
+        return max(int((self._deadline - time.monotonic()) * 1000), 0)
+
+
+# --- Dispatch ---
+
+class DevServer:
+    """Routes requests to the template's handlers, imported in this process."""
+
+    def __init__(self, template, claims=None, profile_dir=None):
+        self.template = template
+        self.claims = claims
+        self.profile_dir = profile_dir
+        routes = []
+        self._greedy = []
+        self._public = set()
+        for method, path, function_id, public in template.api_routes():
+            if path.endswith(PROXY):
+                self._greedy.append((path, function_id))
+            else:
+                routes.append((method, path, function_id))
+            if public:
+                self._public.add((method, path))
+        self._table = compile_routes(routes)
+        self._handlers = {}
+        self._lock = threading.Lock()
+        self._profile_lock = threading.Lock()
+        self._stale = False
+
+    def route(self, method, path):
+        """(resource, function id, path parameters), or None; LookupError for a wrong method."""
+        match = resolve(method, path, self._table)
+        if match is not None:
+            return match
+        # API Gateway tries {proxy+} resources only after the explicit ones
+        for resource, function_id in self._greedy:
+            prefix = resource[:-len(PROXY)]
+            if path.startswith(prefix) and len(path) > len(prefix):
+                return resource, function_id, {"proxy": path[len(prefix):]}
+        return None
+
+    def reload(self):
+        """Re-import every module under functions/ before the next invocation."""
+        with self._lock:
+            self._stale = True
+
+    def handler(self, function_id):
+        with self._lock:
+            if self._stale:
+                for name, module in list(sys.modules.items()):
+                    if (getattr(module, "__file__", None) or "").startswith(FUNCTIONS_DIR + os.sep):
+                        del sys.modules[name]
+                self._handlers.clear()
+                self._stale = False
+                logger.info("Reloaded handlers")
+            handler = self._handlers.get(function_id)
+            if handler is None:
+                module, attr = self.template.handler(function_id)
+                handler = self._handlers[function_id] = getattr(import_module(module), attr)
+        return handler
+
+    def invoke(self, function_id, event):
+        """(handler result, milliseconds) of one invocation."""
+        handler = self.handler(function_id)
+        context = LambdaContext(function_id, self.template.timeout(function_id))
+        if not self.profile_dir:
+            start = time.perf_counter()
+            result = handler(event, context)
+            return result, (time.perf_counter() - start) * 1000
+
+        # One profiler at a time: cProfile cannot profile concurrent calls
+        with self._profile_lock:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            try:
+                result = profiler.runcall(handler, event, context)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                name = f"{int(time.time() * 1000)}-{function_id}.prof"
+                profiler.dump_stats(os.path.join(self.profile_dir, name))
+        return result, elapsed
+
+    def dispatch(self, method, target, headers, body=None, source_ip="127.0.0.1"):
+        """(status, headers, body bytes) of one HTTP request; headers is a list of (name, value)."""
+        url = urlsplit(target)
+        path = url.path or "/"
+        if method == "OPTIONS":
+            return 204, PREFLIGHT_HEADERS, b""
+        try:
+            match = self.route(method, path)
+        except LookupError as e:
+            return 405, {**JSON_HEADERS, "Allow": ",".join(e.args[0])}, b'{"message": "Method not allowed"}'
+        if match is None:
+            return 404, JSON_HEADERS, b'{"message": "Route not found"}'
+
+        resource, function_id, params = match
+        claims = None
+        if self.claims is not None and (method, resource) not in self._public:
+            claims = dict(self.claims)
+            user = next((v for k, v in headers if k.lower() == "x-dev-user"), None)
+            if user:
+                claims["sub"] = user
+        event = build_event(method, path, url.query, headers, body, resource, params, claims, source_ip)
+        try:
+            result, ms = self.invoke(function_id, event)
+        except Exception:
+            logger.exception("%s %s: %s raised", method, path, function_id)
+            # What API Gateway answers when the function fails
+            return 502, JSON_HEADERS, b'{"message": "Internal server error"}'
+
+        status = int(result.get("statusCode", 200))
+        response_headers = dict(result.get("headers") or {})
+        response_headers["Server-Timing"] = f"handler;dur={ms:.1f}"
+        data = result.get("body") or ""
+        data = base64.b64decode(data) if result.get("isBase64Encoded") else data.encode("utf-8")
+        logger.info("%s %s %d %.1fms %s", method, target, status, ms, function_id)
+        return status, response_headers, data
+
+
+class StreamPoller:
+    """Feeds new stream records of the template's tables to their consumers, like the event source mapping."""
+
+    def __init__(self, server, interval=1.0):
+        self.server = server
+        self.interval = interval
+        self._iterators = []
+
+    def open(self):
+        """Start reading each consumer's stream from now on."""
+        import boto3
+
+        dynamodb = boto3.client("dynamodb", region_name=REGION)
+        self._streams = boto3.client("dynamodbstreams", region_name=REGION)
+        for function_id, table in self.server.template.stream_consumers():
+            arn = dynamodb.describe_table(TableName=table)["Table"].get("LatestStreamArn")
+            if not arn:
+                logger.warning("%s has no stream; %s will not run", table, function_id)
+                continue
+            for shard in self._streams.describe_stream(StreamArn=arn)["StreamDescription"]["Shards"]:
+                iterator = self._streams.get_shard_iterator(
+                    StreamArn=arn, ShardId=shard["ShardId"], ShardIteratorType="LATEST",
+                )["ShardIterator"]
+                self._iterators.append([function_id, iterator])
+
+    def poll_once(self):
+        """Invoke consumers with the records since the last poll; the number of records delivered."""
+        delivered = 0
+        for entry in self._iterators:
+            function_id, iterator = entry
+            response = self._streams.get_records(ShardIterator=iterator)
+            entry[1] = response.get("NextShardIterator") or iterator
+            records = response.get("Records") or []
+            if not records:
+                continue
+            delivered += len(records)
+            try:
+                _, ms = self.server.invoke(function_id, {"Records": records})
+                logger.info("stream %d record(s) %.1fms %s", len(records), ms, function_id)
+            except Exception:
+                # The real event source retries; locally the batch is dropped
+                logger.exception("%s failed on %d stream record(s)", function_id, len(records))
+        return delivered
+
+    def run(self):
+        while True:
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Stream polling failed")
+            time.sleep(self.interval)
+
+
+def watch(server, interval=1.0):
+    """Mark the handlers stale whenever a file under functions/ changes."""
+    def snapshot():
+        mtimes = {}
+        for root, _, files in os.walk(FUNCTIONS_DIR):
+            for name in files:
+                if name.endswith((".py", ".json")):
+                    path = os.path.join(root, name)
+                    mtimes[path] = os.stat(path).st_mtime_ns
+        return mtimes
+
+    last = snapshot()
+    while True:
+        time.sleep(interval)
+        current = snapshot()
+        if current != last:
+            last = current
+            server.reload()
+
+
+# --- HTTP ---
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """An HTTPServer that serves each connection on a fixed pool of worker threads."""
+
+    def __init__(self, address, handler_class, workers):
+        super().__init__(address, handler_class)
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="handler")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+def request_handler(server):
+    class RequestHandler(BaseHTTPRequestHandler):
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+            status, headers, data = server.dispatch(
+                self.command, self.path, list(self.headers.items()), body, self.client_address[0],
+            )
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _serve
+
+        def log_message(self, format, *args):
+            pass  # dispatch() logs each request with its timing
+
+    return RequestHandler
+
+
+def _pairs(values, option):
+    pairs = {}
+    for value in values:
+        key, sep, val = value.partition("=")
+        if not sep:
+            raise SystemExit(f"{option} expects KEY=VALUE, got {value!r}")
+        pairs[key] = val
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--layout", choices=("per-route", "router"), default="per-route",
+                        help="the ApiLayout template parameter")
+    parser.add_argument("--parameter", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a template parameter")
+    parser.add_argument("--user-id", default="dev-user-001", help="the sub claim")
+    parser.add_argument("--email", default="developer@cgiar.org")
+    parser.add_argument("--name", default="Local Developer")
+    parser.add_argument("--claim", action="append", default=[], metavar="KEY=VALUE",
+                        help="an extra Cognito claim")
+    parser.add_argument("--no-auth", action="store_true",
+                        help="send no claims (handlers fall back to their dev user)")
+    parser.add_argument("--endpoint-url", help="local AWS stand-in to use instead of moto")
+    parser.add_argument("--sqlite", metavar="FILE",
+                        help="keep submissions, drafts and suggestions in a SQLite file (no stream)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--profile", metavar="DIR", help="write a cProfile dump per request to DIR")
+    parser.add_argument("--no-reload", action="store_true")
+    parser.add_argument("--no-streams", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    template = Template(load_template(), {"ApiLayout": args.layout, **_pairs(args.parameter, "--parameter")})
+    os.environ.update(template.environment())
+    os.environ.setdefault("AWS_DEFAULT_REGION", REGION)
+    if args.sqlite:
+        os.environ.update(STORAGE_BACKEND="sqlite", SQLITE_PATH=os.path.abspath(args.sqlite))
+
+    if args.endpoint_url:
+        os.environ["AWS_ENDPOINT_URL"] = args.endpoint_url
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "local")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "local")
+    else:
+        try:
+            from moto import mock_aws
+        except ImportError:
+            raise SystemExit("Install moto (pip install moto), or pass --endpoint-url")
+        mock_aws().start()
+
+    claims = None
+    if not args.no_auth:
+        claims = {"sub": args.user_id, "email": args.email, "name": args.name,
+                  **_pairs(args.claim, "--claim")}
+    create_resources(template, claims)
+
+    server = DevServer(template, claims, args.profile)
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    if not args.no_reload:
+        threading.Thread(target=watch, args=(server,), daemon=True).start()
+    if not args.no_streams:
+        poller = StreamPoller(server)
+        poller.open()
+        threading.Thread(target=poller.run, daemon=True).start()
+
+    http = ThreadPoolHTTPServer((args.host, args.port), request_handler(server), args.workers)
+    logger.info("%d routes (%s layout) on http://%s:%d", len(template.api_routes()),
+                args.layout, args.host, args.port)
+    try:
+        http.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
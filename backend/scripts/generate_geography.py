@@ -0,0 +1,67 @@
+"""Build shared/geography.json from the frontend geography data.
+
+Reads CGIAR_COUNTRY_OPTIONS and COUNTRY_TO_REGION from
+src/data/cgiarGeography.ts and the ISO 3166-2 codes from
+src/data/subnationalUnits.ts, so the backend validates against exactly what
+the form offers.
+
+Usage (from backend/):
+    python scripts/generate_geography.py          # write the JSON index
+    python scripts/generate_geography.py --check  # exit 1 if it is stale
+"""
+
+import json
+import os
+import re
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BACKEND_DIR, "..", "src", "data")
+OUTPUT_PATH = os.path.join(BACKEND_DIR, "functions", "shared", "geography.json")
+
+
+def _block(text, name, end):
+    try:
+        return text.split(f"export const {name}", 1)[1].split(end, 1)[0]
+    except IndexError:
+        raise SystemExit(f"Could not find {name} in the frontend data files")
+
+
+def render():
+    with open(os.path.join(DATA_DIR, "cgiarGeography.ts"), encoding="utf-8") as f:
+        geography = f.read()
+    with open(os.path.join(DATA_DIR, "subnationalUnits.ts"), encoding="utf-8") as f:
+        subnational = f.read()
+
+    countries = re.findall(r"\{ value: '([A-Z]{2})'", _block(geography, "CGIAR_COUNTRY_OPTIONS", "];"))
+    regions = dict(re.findall(r"\b([A-Z]{2}): '([A-Z]+)'", _block(geography, "COUNTRY_TO_REGION", "};")))
+    units = re.findall(r"^  '([A-Z]{2})-([^']+)':", _block(subnational, "SUBNATIONAL_LOOKUP", "\n};"), re.M)
+
+    by_country = {}
+    for country, suffix in units:
+        by_country.setdefault(country, []).append(suffix)
+
+    index = {
+        # Countries the form offers, with their CGIAR region (null when unassigned)
+        "countries": {code: regions.get(code) for code in sorted(countries)},
+        # ISO 3166-2 suffixes per country, space-separated to keep the file small
+        "subnational": {code: " ".join(sorted(by_country[code])) for code in sorted(by_country)},
+    }
+    return json.dumps(index, separators=(",", ":"), sort_keys=True) + "\n"
+
+
+def main(argv):
+    rendered = render()
+    if "--check" in argv:
+        with open(OUTPUT_PATH, encoding="utf-8") as f:
+            if f.read() != rendered:
+                print(f"{os.path.relpath(OUTPUT_PATH)} is stale; run scripts/generate_geography.py")
+                return 1
+        return 0
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        f.write(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
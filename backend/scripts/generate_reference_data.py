@@ -0,0 +1,72 @@
+"""Build shared/reference_data.json from the frontend reference data.
+
+Reads SUBNATIONAL_LOOKUP from src/data/subnationalUnits.ts and
+W3_BILATERAL_PROJECTS from src/data/w3BilateralProjects.ts, so the reference
+service answers from exactly what the form offers.
+
+Usage (from backend/):
+    python scripts/generate_reference_data.py          # write the JSON file
+    python scripts/generate_reference_data.py --check  # exit 1 if it is stale
+"""
+
+import json
+import os
+import re
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BACKEND_DIR, "..", "src", "data")
+OUTPUT_PATH = os.path.join(BACKEND_DIR, "functions", "shared", "reference_data.json")
+
+_STRING = r"'((?:[^'\\]|\\.)*)'"
+
+
+def _block(text, name, end):
+    try:
+        return text.split(f"export const {name}", 1)[1].split(end, 1)[0]
+    except IndexError:
+        raise SystemExit(f"Could not find {name} in the frontend data files")
+
+
+def _unescape(value):
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def render():
+    with open(os.path.join(DATA_DIR, "subnationalUnits.ts"), encoding="utf-8") as f:
+        subnational = f.read()
+    with open(os.path.join(DATA_DIR, "w3BilateralProjects.ts"), encoding="utf-8") as f:
+        projects = f.read()
+
+    units = re.findall(rf"^  {_STRING}: {_STRING},", _block(subnational, "SUBNATIONAL_LOOKUP", "\n};"), re.M)
+    by_center = re.findall(rf"^  {_STRING}: \[\n(.*?)^  \],", _block(projects, "W3_BILATERAL_PROJECTS", "\n};"),
+                           re.M | re.S)
+
+    data = {
+        # [ISO 3166-2 code, "Name (Country)"]
+        "subnational": sorted([_unescape(code), _unescape(label)] for code, label in units),
+        # [project, lead center], in the form's order
+        "w3-bilateral": [
+            [_unescape(project), _unescape(center)]
+            for center, body in by_center
+            for project in re.findall(rf"^    {_STRING},", body, re.M)
+        ],
+    }
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def main(argv):
+    rendered = render()
+    if "--check" in argv:
+        with open(OUTPUT_PATH, encoding="utf-8") as f:
+            if f.read() != rendered:
+                print(f"{os.path.relpath(OUTPUT_PATH)} is stale; run scripts/generate_reference_data.py")
+                return 1
+        return 0
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        f.write(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,436 @@
+"""Generate synthetic, production-shaped submissions for scale tests.
+
+Each study gets a history of versions written the way the handlers write
+them: form fields plus submissionId, version, status, userId, modifiedBy,
+createdAt, updatedAt and contentHash. The latest version is active or
+archived, and the older ones are superseded. Active studies also get their
+studyId claim. Every version's form body passes validate_submission. Enum
+fields are drawn from shared/constants.py, and geography codes from
+shared/geography.
+
+Distributions are configurable:
+  --versions     weights of history depths, e.g. 1:55,2:25,3:12,4:8
+  --archive-rate share of studies whose latest version is archived
+  --users-per-center  submitters per lead center
+  --files        weights of file counts per study, e.g. 0:50,1:25,2:15,5:10
+  --text-length  mean length in characters of the long text fields
+
+Studies are generated in blocks of BLOCK, each from its own seed, so
+--processes spreads them over a process pool and the output is the same
+for any number of processes.
+
+Outputs (one or more):
+  --out FILE     NDJSON, one stored item per line
+  --store        batch writes through shared.db to SUBMISSIONS_TABLE and
+                 SUGGESTIONS_TABLE (DynamoDB, or --endpoint-url for DynamoDB
+                 Local or a moto server), or to SQLITE_PATH with --sqlite
+  --bucket NAME  each study's files, as small S3 objects at the keys
+                 get_upload_url uses
+  --files-out FILE  those file keys and sizes as NDJSON, instead of S3
+
+Usage (from backend/):
+    python scripts/generate_submissions.py --studies 100000 --out submissions.ndjson
+    python scripts/generate_submissions.py --studies 5000 --store --sqlite local.sqlite3
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared import constants, geography  # noqa: E402
+from shared.content_hash import content_hash  # noqa: E402
+from shared.store import claim_item  # noqa: E402
+from shared.validator import validate_submission  # noqa: E402
+
+CENTERS = (
+    "AfricaRice", "Alliance of Bioversity and CIAT", "CIFOR-ICRAF", "CIMMYT", "CIP", "ICARDA",
+    "ICRISAT", "IFPRI", "IITA", "ILRI", "IRRI", "IWMI", "WorldFish",
+)
+FUNDERS = (
+    "Bill & Melinda Gates Foundation", "CGIAR Trust Fund", "USAID", "FCDO", "BMZ/GIZ", "IFAD",
+    "European Commission", "World Bank", "ACIAR", "SDC", "Rockefeller Foundation",
+)
+COMMISSIONERS = (
+    "CGIAR System Board", "Science Program Management", "Portfolio Performance Unit", "Donor",
+    "Center Management", "Independent Advisory and Evaluation Service",
+)
+UNITS = ("Household", "Farm", "Plot", "Individual", "Community", "Market", "Firm", "District")
+COLLECTION_METHODS = (
+    "Household survey", "Key informant interviews", "Focus group discussions", "Remote sensing",
+    "Field trials", "Administrative data", "Phone survey", "Document review",
+)
+WORDS = (
+    "adoption", "yield", "climate", "resilience", "smallholder", "maize", "rice", "livestock",
+    "nutrition", "gender", "youth", "market", "seed", "soil", "water", "irrigation", "policy",
+    "scaling", "innovation", "income", "women", "value", "chain", "extension", "digital",
+    "advisory", "drought", "tolerant", "varieties", "landscape", "restoration", "fisheries",
+    "aquaculture", "dairy", "health", "diet", "quality", "impact", "evaluation", "trial",
+    "randomized", "village", "district", "program", "capacity", "institutions", "finance",
+    "insurance", "mechanization", "postharvest", "losses", "food", "security", "systems",
+)
+FIRST_NAMES = ("Amina", "Ben", "Chen", "Daniela", "Emeka", "Fatima", "Grace", "Hiro", "Ines", "Juma",
+               "Kavya", "Luis", "Maria", "Nadia", "Omar", "Priya", "Rafael", "Sara", "Tomas", "Wanjiru")
+LAST_NAMES = ("Abebe", "Banda", "Costa", "Diallo", "Evans", "Fofana", "Gupta", "Hassan", "Ito", "Kamau",
+              "Lopez", "Mensah", "Nguyen", "Okafor", "Perez", "Rahman", "Silva", "Tadesse", "Usman", "Wang")
+
+# Version histories of production studies are shallow: most are never edited
+DEFAULT_VERSIONS = {1: 55, 2: 25, 3: 12, 4: 6, 6: 2}
+DEFAULT_FILES = {0: 50, 1: 25, 2: 15, 5: 8, 12: 2}
+START = datetime(2024, 6, 1, tzinfo=timezone.utc)
+CHUNK = 5000  # items per NDJSON write and per store flush
+BLOCK = 1000  # studies per seed (and per task with --processes)
+
+
+def _sorted(values):
+    return tuple(sorted(values))
+
+
+STUDY_TYPES = _sorted(constants.VALID_STUDY_TYPES)
+TIMINGS = _sorted(constants.VALID_TIMINGS)
+ANALYTICAL_SCOPES = _sorted(constants.VALID_ANALYTICAL_SCOPES)
+GEOGRAPHIC_SCOPES = _sorted(constants.VALID_GEOGRAPHIC_SCOPES)
+RESULT_LEVELS = _sorted(constants.VALID_RESULT_LEVELS)
+CAUSALITY_MODES = _sorted(constants.VALID_CAUSALITY_MODES)
+METHOD_CLASSES = _sorted(constants.VALID_METHOD_CLASSES)
+STATUS_TYPES = ("planned", "ongoing", "complete")
+FUNDED_TYPES = _sorted(constants.VALID_FUNDED_TYPES)
+YES_NO_NA = _sorted(constants.VALID_YES_NO_NA)
+PRIMARY_USERS = _sorted(constants.VALID_PRIMARY_USER_TYPES)
+PRIMARY_INDICATORS = _sorted(constants.VALID_PRIMARY_INDICATORS)
+REGIONS = _sorted(constants.VALID_CGIAR_REGIONS)
+
+
+def parse_weights(text):
+    """{value: weight} of "1:55,2:25" (values are ints)."""
+    weights = {}
+    for part in text.split(","):
+        value, _, weight = part.partition(":")
+        weights[int(value)] = float(weight or 1)
+    if not weights or any(w < 0 for w in weights.values()) or not sum(weights.values()):
+        raise ValueError(f"bad weights: {text!r}")
+    return weights
+
+
+class Generator:
+    """Seeded study histories; the same arguments give the same items."""
+
+    def __init__(self, versions=None, archive_rate=0.05, users_per_center=40, files=None,
+                 text_length=300, seed=7, now=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.versions = versions or DEFAULT_VERSIONS
+        self.archive_rate = archive_rate
+        self.files = files or DEFAULT_FILES
+        self.text_length = text_length
+        self.now = now or datetime(2026, 6, 1, tzinfo=timezone.utc)
+        countries, subnational = geography._load_index()
+        self.countries = _sorted(code for code, region in countries.items() if region)
+        self.subnational = {}
+        for code in sorted(subnational):
+            self.subnational.setdefault(code.split("-", 1)[0], []).append(code)
+        self.subnational_countries = [c for c in self.countries if c in self.subnational]
+        self.users = {center: [self._person() for _ in range(users_per_center)] for center in CENTERS}
+
+    def _uuid(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _person(self):
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        return {"userId": self._uuid(), "name": f"{first} {last}",
+                "email": f"{first.lower()}.{last.lower()}{self.rng.randrange(100)}@cgiar.org"}
+
+    def _weighted(self, weights):
+        return self.rng.choices(list(weights), list(weights.values()))[0]
+
+    def _text(self, mean, limit):
+        """Words to about mean characters (exponentially distributed), at most limit."""
+        length = max(12, min(limit, int(self.rng.expovariate(1 / mean)) if mean else 12))
+        words = self.rng.choices(WORDS, k=length // 6 + 1)
+        return " ".join(words)[:limit].strip().capitalize()
+
+    def _link(self, p_yes):
+        if self.rng.random() < p_yes:
+            return {"answer": "yes", "link": f"https://cgspace.cgiar.org/items/{self._uuid()}"}
+        return {"answer": "no"}
+
+    def _geography(self, body):
+        scope = body["geographicScope"]
+        if scope == "regional":
+            body["studyRegions"] = self.rng.sample(REGIONS, self.rng.randint(1, 2))
+        elif scope in ("national", "site_specific"):
+            body["studyCountries"] = self.rng.sample(self.countries, self.rng.randint(1, 3))
+        elif scope == "sub_national":
+            country = self.rng.choice(self.subnational_countries)
+            units = self.subnational[country]
+            body["studySubnational"] = self.rng.sample(units, min(len(units), self.rng.randint(1, 3)))
+        geography.normalize_geography(body)
+
+    def body(self, n, center, person):
+        """The form fields of study n."""
+        rng = self.rng
+        start = date(2022, 1, 1) + timedelta(days=rng.randrange(4 * 365))
+        funded = rng.choice(FUNDED_TYPES)
+        body = {
+            "studyId": f"SYN-{n:07d}",
+            "studyTitle": self._text(70, constants.MAX_STUDY_TITLE),
+            "leadCenter": center,
+            "contactName": person["name"],
+            "contactEmail": person["email"],
+            "otherCenters": rng.sample([c for c in CENTERS if c != center], rng.randint(1, 3)),
+            "studyType": rng.choice(STUDY_TYPES),
+            "timing": rng.choice(TIMINGS),
+            "analyticalScope": rng.choice(ANALYTICAL_SCOPES),
+            "geographicScope": rng.choice(GEOGRAPHIC_SCOPES),
+            "resultLevel": rng.choice(RESULT_LEVELS),
+            "causalityMode": rng.choice(CAUSALITY_MODES),
+            "methodClass": rng.choice(METHOD_CLASSES),
+            "primaryIndicator": rng.choice(PRIMARY_INDICATORS),
+            "studyIndicators": self._text(self.text_length, constants.MAX_STUDY_INDICATORS),
+            "startDate": start.isoformat(),
+            "expectedEndDate": (start + timedelta(days=rng.randrange(90, 1500))).isoformat(),
+            "dataCollectionStatus": rng.choice(STATUS_TYPES),
+            "analysisStatus": rng.choice(STATUS_TYPES),
+            "funded": funded,
+            "totalCostUSD": rng.randrange(10, 5000) * 1000,
+            "proposalAvailable": self._link(0.4),
+            "manuscriptDeveloped": self._link(0.15),
+            "policyBriefDeveloped": self._link(0.1),
+            "relatedToPastStudy": self._link(0.2),
+            "intendedPrimaryUser": rng.sample(PRIMARY_USERS, rng.randint(1, 3)),
+            "commissioningSource": rng.choice(COMMISSIONERS),
+        }
+        if funded != "no":
+            body["fundingSource"] = rng.choice(FUNDERS)
+        if (body["causalityMode"] in constants.SECTION_C_CAUSALITY_MODES
+                or body["methodClass"] in constants.SECTION_C_METHOD_CLASSES):
+            body.update({
+                "keyResearchQuestions": self._text(self.text_length, constants.MAX_RESEARCH_QUESTIONS),
+                "unitOfAnalysis": rng.sample(UNITS, rng.randint(1, 2)),
+                "treatmentIntervention": self._text(self.text_length // 2, constants.MAX_TREATMENT_INTERVENTION),
+                "sampleSize": rng.randrange(50, 20000),
+                "powerCalculation": rng.choice(YES_NO_NA),
+                "dataCollectionMethods": rng.sample(COLLECTION_METHODS, rng.randint(1, 3)),
+                "preAnalysisPlan": self._link(0.3),
+                "dataCollectionRounds": rng.randint(1, 4),
+            })
+        self._geography(body)
+        return body
+
+    def edit(self, body):
+        """A later version: what people change when they come back to a study."""
+        body = dict(body)
+        field = self.rng.choice(("dataCollectionStatus", "analysisStatus", "studyTitle", "studyIndicators"))
+        if field in ("studyTitle", "studyIndicators"):
+            body[field] = self._text(70 if field == "studyTitle" else self.text_length,
+                                     constants.MAX_STUDY_INDICATORS if field == "studyIndicators"
+                                     else constants.MAX_STUDY_TITLE)
+        else:
+            body[field] = STATUS_TYPES[min(STATUS_TYPES.index(body[field]) + 1, 2)]
+            body["manuscriptDeveloped"] = self._link(0.3)
+        return body
+
+    def study(self, n):
+        """(items, files) of study n: its versions oldest first, its claim if active, and [(key, size)]."""
+        rng = self.rng
+        center = rng.choice(CENTERS)
+        owner = rng.choice(self.users[center])
+        submission_id = self._uuid()
+        depth = self._weighted(self.versions)
+        at = START + timedelta(seconds=rng.randrange(int((self.now - START).total_seconds())))
+        body = self.body(n, center, owner)
+        items = []
+        for version in range(1, depth + 1):
+            if version > 1:
+                body = self.edit(body)
+                at += timedelta(hours=rng.randrange(1, 24 * 60))
+            validate_submission(body)
+            editor = owner if rng.random() < 0.8 else rng.choice(self.users[center])
+            stamp = min(at, self.now).isoformat()
+            items.append({
+                **body,
+                "submissionId": submission_id,
+                "version": version,
+                "status": "superseded",
+                "userId": owner["userId"],
+                "modifiedBy": editor["userId"],
+                "createdAt": stamp,
+                "updatedAt": stamp,
+                "contentHash": content_hash(body),
+            })
+        latest = items[-1]
+        if rng.random() < self.archive_rate:
+            latest["status"] = "archived"
+            latest["updatedAt"] = min(at + timedelta(days=rng.randrange(1, 90)), self.now).isoformat()
+        else:
+            latest["status"] = "active"
+            items.append(claim_item(latest))
+
+        prefix = f"{latest['createdAt'][:10]}_{submission_id}/files/"
+        files = [
+            (f"{prefix}{self._uuid()[:8]}_{rng.choice(WORDS)}-{i + 1}.{rng.choice(('pdf', 'docx', 'xlsx'))}",
+             int(rng.lognormvariate(12, 1.2)))
+            for i in range(self._weighted(self.files))
+        ]
+        return items, files
+
+    def block(self, index, count):
+        """[(items, files)] of the studies in block index, of count studies in all."""
+        self.rng = random.Random(f"{self.seed}:{index}")
+        return [self.study(n) for n in range(index * BLOCK, min((index + 1) * BLOCK, count))]
+
+    def studies(self, count, processes=1):
+        """(items, files) of each study, in order."""
+        blocks = range((count + BLOCK - 1) // BLOCK)
+        if processes <= 1:
+            for index in blocks:
+                yield from self.block(index, count)
+            return
+        with multiprocessing.get_context("spawn").Pool(processes, _init_worker, (self,)) as pool:
+            for studies in pool.imap(_worker_block, ((index, count) for index in blocks)):
+                yield from studies
+
+
+_worker_generator = None
+
+
+def _init_worker(generator):
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _worker_block(args):
+    return _worker_generator.block(*args)
+
+
+# --- Sinks ---
+
+def write_ndjson(f, items):
+    f.write("".join(json.dumps(item, separators=(",", ":")) + "\n" for item in items))
+
+
+def write_store(items, workers=8):
+    """Batch-write items through shared.db, in parallel; returns the count left unprocessed."""
+    from shared import db
+
+    batches = [items[i:i + db.BATCH_WRITE_SIZE] for i in range(0, len(items), db.BATCH_WRITE_SIZE)]
+    if workers <= 1:
+        return sum(len(db.batch_put_submissions(batch)) for batch in batches)
+    with ThreadPoolExecutor(workers) as pool:
+        return sum(len(left) for left in pool.map(db.batch_put_submissions, batches))
+
+
+def put_files(bucket, files, workers=8):
+    """Put an empty object at each file key; clients, unlike sessions, are safe to share between threads."""
+    from shared.aws import session
+
+    client = session().client("s3")
+
+    def put(entry):
+        key, size = entry
+        client.put_object(Bucket=bucket, Key=key, Body=b"", Metadata={"synthetic-size": str(size)})
+
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(put, files))
+
+
+def count_suggestions(items, counts, spellings):
+    """Add the suggestible values of the active items to counts, as record_suggestions would."""
+    from shared.db import suggestion_values
+
+    for item in items:
+        if item.get("status") == "active" and int(item["version"]) > 0:
+            for key, value in suggestion_values(item).items():
+                counts[key] += 1
+                spellings.setdefault(key, value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--studies", type=int, default=100_000)
+    parser.add_argument("--versions", type=parse_weights, default=DEFAULT_VERSIONS,
+                        help="history depth weights, e.g. 1:55,2:25,3:12,4:8")
+    parser.add_argument("--archive-rate", type=float, default=0.05)
+    parser.add_argument("--users-per-center", type=int, default=40)
+    parser.add_argument("--files", type=parse_weights, default=DEFAULT_FILES,
+                        help="file count weights, e.g. 0:50,1:25,2:15,5:10")
+    parser.add_argument("--text-length", type=int, default=300, help="mean characters of long text fields")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="NDJSON file of the stored items")
+    parser.add_argument("--store", action="store_true", help="batch-write the items through shared.db")
+    parser.add_argument("--sqlite", metavar="FILE", help="with --store: a SQLite file instead of DynamoDB")
+    parser.add_argument("--endpoint-url", help="with --store or --bucket: DynamoDB Local, a moto server...")
+    parser.add_argument("--bucket", help="put each study's files in this S3 bucket")
+    parser.add_argument("--files-out", help="NDJSON file of the file keys and sizes")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="processes generating studies")
+    parser.add_argument("--workers", type=int, default=8, help="threads for store and S3 writes")
+    args = parser.parse_args(argv)
+    if not (args.out or args.store or args.bucket or args.files_out):
+        parser.error("choose an output: --out, --store, --bucket or --files-out")
+    if args.sqlite:
+        os.environ.update(STORAGE_BACKEND="sqlite", SQLITE_PATH=os.path.abspath(args.sqlite))
+    if args.endpoint_url:
+        os.environ["AWS_ENDPOINT_URL"] = args.endpoint_url
+
+    generator = Generator(args.versions, args.archive_rate, args.users_per_center, args.files,
+                          args.text_length, args.seed)
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    files_out = open(args.files_out, "w", encoding="utf-8") if args.files_out else None
+    counts, spellings = Counter(), {}
+    totals = Counter()
+    items, files = [], []
+
+    def flush():
+        if out:
+            write_ndjson(out, items)
+        if args.store:
+            totals["unprocessed"] += write_store(items, args.workers)
+            count_suggestions(items, counts, spellings)
+        if files_out:
+            write_ndjson(files_out, ({"key": key, "size": size} for key, size in files))
+        if args.bucket:
+            put_files(args.bucket, files, args.workers)
+        items.clear()
+        files.clear()
+
+    start = time.perf_counter()
+    for study_items, study_files in generator.studies(args.studies, args.processes):
+        items.extend(study_items)
+        files.extend(study_files)
+        totals["items"] += len(study_items)
+        totals["versions"] += sum(1 for item in study_items if item["version"])
+        totals["archived"] += sum(1 for item in study_items if item.get("status") == "archived")
+        totals["files"] += len(study_files)
+        if len(items) >= CHUNK:
+            flush()
+    flush()
+    if args.store:
+        from shared import db
+        db.put_suggestion_counts(counts, spellings)
+    for f in (out, files_out):
+        if f:
+            f.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{args.studies:,} studies, {totals['versions']:,} versions ({totals['archived']:,} archived), "
+          f"{totals['items']:,} items, {totals['files']:,} files in {elapsed:.1f}s "
+          f"({args.studies / elapsed:,.0f} studies/s)")
+    if totals["unprocessed"]:
+        print(f"{totals['unprocessed']:,} items were left unprocessed by BatchWriteItem", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
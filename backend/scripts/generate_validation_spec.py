@@ -0,0 +1,81 @@
+"""Render shared/validation_spec.py into src/lib/validationSpec.generated.ts.
+
+Usage (from backend/):
+    python scripts/generate_validation_spec.py          # write the TS file
+    python scripts/generate_validation_spec.py --check  # exit 1 if it is stale
+"""
+
+import json
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.constants import SECTION_C_CAUSALITY_MODES, SECTION_C_METHOD_CLASSES  # noqa: E402
+from shared.validation_spec import RULES  # noqa: E402
+
+OUTPUT_PATH = os.path.join(BACKEND_DIR, "..", "src", "lib", "validationSpec.generated.ts")
+
+HEADER = """\
+// AUTO-GENERATED by backend/scripts/generate_validation_spec.py from
+// backend/functions/shared/validation_spec.py — do not edit by hand.
+"""
+
+CROSS_FIELD_KINDS = {"date_order", "required_if"}
+
+
+def _ts(value):
+    """Render a Python value as a TS literal (strings single-quoted like the rest of src/)."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (set, frozenset)):
+        value = sorted(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_ts(v) for v in value) + "]"
+    if isinstance(value, str):
+        return "'" + json.dumps(value)[1:-1].replace("'", "\\'").replace('\\"', '"') + "'"
+    return json.dumps(value)
+
+
+def _object(rule, keys):
+    return "{ " + ", ".join(f"{k}: {_ts(rule[k])}" for k in keys if k in rule) + " }"
+
+
+def render():
+    lines = [HEADER, "export const FIELD_RULES = {"]
+    for rule in RULES:
+        if rule["rule"] in CROSS_FIELD_KINDS:
+            continue
+        keys = ("section", "rule", "required", "max", "values", "min_items")
+        lines.append(f"  {rule['field']}: {_object(rule, keys)},")
+    lines.append("} as const;")
+    lines.append("")
+    lines.append("export const CROSS_FIELD_RULES = [")
+    for rule in RULES:
+        if rule["rule"] not in CROSS_FIELD_KINDS:
+            continue
+        keys = ("section", "field", "rule", "after", "when", "values", "message")
+        lines.append(f"  {_object(rule, keys)},")
+    lines.append("] as const;")
+    lines.append("")
+    lines.append(f"export const SECTION_C_CAUSALITY_MODES = {_ts(SECTION_C_CAUSALITY_MODES)} as const;")
+    lines.append(f"export const SECTION_C_METHOD_CLASSES = {_ts(SECTION_C_METHOD_CLASSES)} as const;")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv):
+    rendered = render()
+    if "--check" in argv:
+        with open(OUTPUT_PATH, encoding="utf-8") as f:
+            if f.read() != rendered:
+                print(f"{os.path.relpath(OUTPUT_PATH)} is stale; run scripts/generate_validation_spec.py")
+                return 1
+        return 0
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        f.write(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
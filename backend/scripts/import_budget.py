@@ -0,0 +1,145 @@
+"""Measure every Lambda handler's import time and memory against its budget.
+
+Each handler module is imported in a fresh interpreter run with
+``-X importtime``. Its import time is the cumulative time of the top-level
+modules in that report, minus those the interpreter imports on its own. Its
+memory is the peak RSS after the import, minus that of an interpreter that
+imports nothing. A handler also fails if it imports any of FORBIDDEN:
+boto3 and AWS clients are loaded on first use, through shared/aws.py.
+
+Usage (from backend/):
+    python scripts/import_budget.py [--repeat 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FUNCTIONS_DIR = os.path.join(BACKEND_DIR, "functions")
+
+FORBIDDEN = ("boto3", "botocore.client", "botocore.session")
+
+# (milliseconds, MB) allowed for a handler's import. Handlers measure 5-55 ms
+# and under 7 MB; the headroom absorbs slow CI machines, while boto3 alone
+# (about 180 ms) would still trip the time budget.
+DEFAULT_BUDGET = (100, 16)
+BUDGETS = {
+    # Builds its prefix and trigram indexes at import, on purpose
+    "get_reference_data.app": (600, 40),
+}
+
+ENV = {
+    "AWS_DEFAULT_REGION": "eu-central-1",
+    "SUBMISSIONS_TABLE": "budget", "DRAFTS_TABLE": "budget", "SUGGESTIONS_TABLE": "budget",
+    "USERS_TABLE": "budget", "FILES_BUCKET": "budget",
+}
+
+_PROBE = (
+    "import resource, sys\n"
+    "sys.path.insert(0, {functions!r})\n"
+    "{imports}\n"
+    "rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    "print(rss // 1024 if sys.platform == 'darwin' else rss)\n"
+)
+
+
+def handlers():
+    """Every handler module: <function>/app.py and the Cognito triggers."""
+    found = []
+    for name in sorted(os.listdir(FUNCTIONS_DIR)):
+        if os.path.isfile(os.path.join(FUNCTIONS_DIR, name, "app.py")):
+            found.append(f"{name}.app")
+    triggers = os.path.join(FUNCTIONS_DIR, "cognito_triggers")
+    found += sorted(
+        f"cognito_triggers.{f[:-3]}" for f in os.listdir(triggers)
+        if f.endswith(".py") and f != "__init__.py"
+    )
+    return found
+
+
+def parse_importtime(stderr):
+    """{module: cumulative microseconds} of the top-level imports in a -X importtime report."""
+    top = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header
+        name = parts[2]
+        if name.startswith(" ") and not name.startswith("  "):
+            top[name.strip()] = int(parts[1])
+    return top
+
+
+def _all_imported(stderr):
+    return {line.split("|")[2].strip() for line in stderr.splitlines()
+            if line.startswith("import time:") and line.count("|") == 2}
+
+
+def _probe(module=None):
+    code = _PROBE.format(functions=FUNCTIONS_DIR, imports=f"import {module}" if module else "")
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env={**os.environ, **ENV}, capture_output=True, text=True, check=True,
+    )
+    return out.stderr, int(out.stdout)
+
+
+def measure(module, repeat=1, baseline=None):
+    """(import ms, RSS MB, imported module names) of a handler, best of repeat runs."""
+    base_stderr, base_rss = baseline or _probe()
+    startup = set(parse_importtime(base_stderr))
+    best_ms = best_mb = None
+    for _ in range(repeat):
+        stderr, rss = _probe(module)
+        ms = sum(us for name, us in parse_importtime(stderr).items() if name not in startup) / 1000
+        mb = max(rss - base_rss, 0) / 1024
+        best_ms = ms if best_ms is None else min(best_ms, ms)
+        best_mb = mb if best_mb is None else min(best_mb, mb)
+    return best_ms, best_mb, _all_imported(stderr)
+
+
+def _problems(module, ms, mb, imported):
+    budget_ms, budget_mb = BUDGETS.get(module, DEFAULT_BUDGET)
+    problems = []
+    if ms > budget_ms:
+        problems.append(f"{module}: import takes {ms:.0f}ms, budget {budget_ms}ms")
+    if mb > budget_mb:
+        problems.append(f"{module}: import adds {mb:.1f}MB RSS, budget {budget_mb}MB")
+    eager = sorted(set(FORBIDDEN) & imported)
+    if eager:
+        problems.append(f"{module}: imports {', '.join(eager)} at import time")
+    return problems
+
+
+def check(module, repeat=1, baseline=None):
+    """Problems with a handler's import, as messages; [] when it is within budget."""
+    return _problems(module, *measure(module, repeat, baseline))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per handler; the best counts")
+    args = parser.parse_args(argv)
+
+    baseline = _probe()
+    problems = []
+    print(f"{'handler':<36} {'import':>8} {'budget':>8} {'RSS':>8} {'budget':>8}")
+    for module in handlers():
+        ms, mb, imported = measure(module, args.repeat, baseline)
+        budget_ms, budget_mb = BUDGETS.get(module, DEFAULT_BUDGET)
+        print(f"{module:<36} {ms:>6.1f}ms {budget_ms:>6}ms {mb:>6.1f}MB {budget_mb:>6}MB")
+        problems += _problems(module, ms, mb, imported)
+    print()
+    for problem in problems:
+        print(problem)
+    print(f"{len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
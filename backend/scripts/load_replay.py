@@ -0,0 +1,468 @@
+"""Replay a mixed API workload concurrently and report latency percentiles per route.
+
+The workload mixes what the frontend does (--mix name:weight,...):
+
+  dashboard  GET /submissions/all          mine     GET /submissions
+  create     POST /submissions             update   PUT /submissions/{id}
+  archive    DELETE /submissions/{id}      files    GET /submissions/{id}/files
+  upload     POST /submissions/{id}/upload-url
+
+Each request acts as one of --users users. The workload keeps the studies it
+created, so updates, archives and file requests target real ones; --preload
+creates some before the clock starts. Bodies come from the synthetic
+generator (scripts/generate_submissions.py) and pass validation.
+--save-trace FILE records the requests sent, and --trace FILE replays such a
+file (NDJSON of {t, method, path, body, user, route}) at its own pace,
+against a target that holds the same studies.
+
+Targets: by default the template's handlers in this process, as the local
+API server runs them (scripts/dev_server.py). Submissions are kept in an
+in-memory SQLite store (--sqlite FILE for a file), and S3 is moto. moto's
+DynamoDB copies a table on every transaction and is not thread-safe, so
+--storage dynamodb is only meaningful with --endpoint-url (DynamoDB Local,
+LocalStack) or --concurrency 1. The handlers' metric lines go to
+--metrics-log for scripts/cost_report.py. With
+--url, an HTTP endpoint instead, such as the dev server or a deployed stage
+(pass its token with --header "Authorization: Bearer ...").
+
+A pool of --concurrency threads sends the requests. With --rate, requests
+arrive on a Poisson schedule (open loop), and latency counts from the
+scheduled time, so queueing behind a saturated pool shows. Without it, each
+thread sends back to back (closed loop). The report gives throughput, the
+p50/p95/p99 latency per route, the 4xx count and the error rate (5xx and
+failed connections).
+
+Usage (from backend/):
+    python scripts/load_replay.py [--requests 2000 | --duration 60] [--concurrency 16] [--rate 50]
+                                  [--mix dashboard:30,mine:25,...] [--users 20] [--preload 200]
+                                  [--url URL [--header NAME:VALUE ...]] [--storage dynamodb]
+                                  [--trace FILE] [--save-trace FILE]
+                                  [--json FILE] [--metrics-log FILE]
+"""
+
+import argparse
+import contextlib
+import http.client
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import generate_submissions  # noqa: E402
+
+OPERATIONS = {
+    "dashboard": ("GET", "/submissions/all"),
+    "mine": ("GET", "/submissions"),
+    "create": ("POST", "/submissions"),
+    "update": ("PUT", "/submissions/{id}"),
+    "archive": ("DELETE", "/submissions/{id}"),
+    "files": ("GET", "/submissions/{id}/files"),
+    "upload": ("POST", "/submissions/{id}/upload-url"),
+}
+DEFAULT_MIX = {"dashboard": 30, "mine": 25, "create": 10, "update": 10, "archive": 5, "files": 15, "upload": 5}
+
+Request = namedtuple("Request", "op route method path body user")
+Result = namedtuple("Result", "route status ms error")
+
+
+def parse_mix(text):
+    """{operation: weight} of "dashboard:30,mine:25"."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition(":")
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    if not sum(mix.values()):
+        raise ValueError(f"bad mix: {text!r}")
+    return mix
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))]
+
+
+# --- Workload ---
+
+class Workload:
+    """Requests of a mixed trace, tracking the studies created so later requests have targets.
+
+    A study is checked out while a request on it is in flight, so two
+    requests never race on the same one.
+    """
+
+    timed = False
+
+    def __init__(self, mix=None, users=20, seed=11, prefix=None):
+        self.mix = mix or DEFAULT_MIX
+        self.rng = random.Random(seed)
+        self.generator = generate_submissions.Generator(seed=seed, users_per_center=2)
+        self.users = [f"load-user-{i:03d}" for i in range(users)]
+        self.prefix = prefix or f"LOAD-{int(time.time()) % 100000:05d}"
+        self._idle = []  # submission ids free to use
+        self._bodies = {}  # submission id -> latest body
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def _body(self):
+        n = next(self._counter)
+        center = self.rng.choice(generate_submissions.CENTERS)
+        body = self.generator.body(n, center, self.rng.choice(self.generator.users[center]))
+        body["studyId"] = f"{self.prefix}-{n:07d}"
+        return body
+
+    def _checkout(self):
+        if not self._idle:
+            return None
+        i = self.rng.randrange(len(self._idle))
+        self._idle[i], self._idle[-1] = self._idle[-1], self._idle[i]
+        return self._idle.pop()
+
+    def next(self):
+        """(None, the next Request): the workload has no schedule of its own."""
+        return None, self.request()
+
+    def request(self, op=None):
+        """The next Request; an operation that needs a study creates one while there are none."""
+        with self._lock:
+            if op is None:
+                op = self.rng.choices(list(self.mix), list(self.mix.values()))[0]
+            submission_id = None
+            if "{id}" in OPERATIONS[op][1]:
+                submission_id = self._checkout()
+                if submission_id is None:
+                    op = "create"
+            user = self.rng.choice(self.users)
+            if op == "create":
+                body = self._body()
+            elif op == "update":
+                body = self.generator.edit(self._bodies[submission_id])
+            elif op == "upload":
+                body = {"filename": f"report-{next(self._counter)}.pdf", "contentType": "application/pdf"}
+            else:
+                body = None
+        method, route_path = OPERATIONS[op]
+        path = route_path.replace("{id}", submission_id or "")
+        if op == "dashboard":
+            path += "?status=active"
+        return Request(op, f"{method} {route_path}", method, path, body, user)
+
+    def done(self, request, status, data):
+        """Record a request's outcome (status None: sending failed), returning its study to the pool."""
+        submission_id = None
+        if request.op == "create":
+            if status == 201:
+                submission_id = json.loads(data)["submissionId"]
+        elif "{id}" in OPERATIONS[request.op][1]:
+            submission_id = request.path.split("/")[2]
+            if request.op == "archive" and status == 200:
+                with self._lock:
+                    self._bodies.pop(submission_id, None)
+                return
+        if submission_id is None:
+            return
+        with self._lock:
+            if request.op in ("create", "update") and status in (200, 201):
+                self._bodies[submission_id] = request.body
+            self._idle.append(submission_id)
+
+
+class Trace:
+    """The requests of a saved trace file, sent at their times (t, in seconds) divided by speed."""
+
+    def __init__(self, path, speed=1.0):
+        self.entries = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                e = json.loads(line)
+                route = e.get("route") or f"{e['method']} {e['path'].split('?')[0]}"
+                t = e["t"] / speed if e.get("t") is not None else None
+                self.entries.append((t, Request(None, route, e["method"], e["path"], e.get("body"), e.get("user"))))
+        self.timed = any(t is not None for t, _ in self.entries)
+        self._iter = iter(self.entries)
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            return next(self._iter, None)
+
+    def done(self, request, status, data):
+        pass
+
+
+# --- Targets ---
+
+class InProcessTarget:
+    """A dev_server.DevServer: the template's handlers, called in this process."""
+
+    def __init__(self, server):
+        self.server = server
+
+    def send(self, method, path, body=None, user=None):
+        headers = [("Content-Type", "application/json")]
+        if user:
+            headers.append(("X-Dev-User", user))
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        status, _, raw = self.server.dispatch(method, path, headers, data)
+        return status, raw
+
+
+def local_target(layout="per-route", storage="sqlite", sqlite_path=None, endpoint_url=None, parameters=None):
+    """An InProcessTarget on moto (or endpoint_url), with the template's tables and bucket.
+
+    With storage "sqlite", submissions, drafts and suggestions are kept in a
+    SQLite store at sqlite_path (in memory by default) instead.
+    """
+    import dev_server
+
+    template = dev_server.Template(dev_server.load_template(), {"ApiLayout": layout, **(parameters or {})})
+    os.environ.update(template.environment())
+    os.environ.setdefault("AWS_DEFAULT_REGION", dev_server.REGION)
+    os.environ["STORAGE_BACKEND"] = storage
+    if sqlite_path:
+        os.environ["SQLITE_PATH"] = os.path.abspath(sqlite_path)
+    if endpoint_url:
+        os.environ["AWS_ENDPOINT_URL"] = endpoint_url
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "local")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "local")
+    else:
+        from moto import mock_aws
+        mock_aws().start()
+    claims = {"sub": "load-user-000", "email": "load@cgiar.org", "name": "Load Test"}
+    dev_server.create_resources(template, claims)
+    return InProcessTarget(dev_server.DevServer(template, claims))
+
+
+class HttpTarget:
+    """An HTTP endpoint, one keep-alive connection per thread."""
+
+    def __init__(self, url, headers=None, timeout=30):
+        parts = urlsplit(url)
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._netloc = parts.netloc
+        self._base = parts.path.rstrip("/")
+        self._headers = {"Content-Type": "application/json", **(headers or {})}
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def send(self, method, path, body=None, user=None):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connection_class(self._netloc, timeout=self._timeout)
+        headers = dict(self._headers)
+        if user:
+            headers["X-Dev-User"] = user
+        try:
+            connection.request(method, self._base + path,
+                               body=json.dumps(body) if body is not None else None, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            self._local.connection = None
+            raise
+
+
+# --- Driver ---
+
+def execute(target, source, request, scheduled):
+    """Send one request; its Result, with latency counted from scheduled (a perf_counter time)."""
+    status = data = error = None
+    try:
+        status, data = target.send(request.method, request.path, request.body, request.user)
+    except Exception as e:
+        error = type(e).__name__
+    ms = (time.perf_counter() - scheduled) * 1000
+    source.done(request, status, data)
+    return Result(request.route, status, ms, error)
+
+
+def run(target, source, concurrency=16, rate=0, count=None, duration=None, seed=5, on_send=None):
+    """[Result] of sending source's requests until count are sent, duration passes or it runs out.
+
+    source.next() gives (t, Request), t being when to send it in seconds from
+    the start (or None), or None when there are no more; source.done(request,
+    status, body) hears each outcome, with status None when sending failed. With a rate, or a timed source, requests
+    are sent on schedule (open loop); otherwise each of the concurrency
+    threads sends its next one when the last returns (closed loop).
+    on_send(t, request) sees each request as it is sent.
+    """
+    rng = random.Random(seed)
+    results = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+    sent = itertools.count()
+
+    def more():
+        return (count is None or next(sent) < count) and (duration is None or time.perf_counter() - start < duration)
+
+    def send(request, scheduled):
+        result = execute(target, source, request, scheduled)
+        with lock:
+            results.append(result)
+
+    if rate or source.timed:
+        at = 0.0
+        with ThreadPoolExecutor(concurrency) as pool:
+            while more():
+                item = source.next()
+                if item is None:
+                    break
+                t, request = item
+                at = t if t is not None else at + (rng.expovariate(rate) if rate else 0)
+                delay = start + at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if on_send:
+                    on_send(at, request)
+                pool.submit(send, request, start + at)
+        return results
+
+    def worker():
+        while True:
+            with lock:
+                item = source.next() if more() else None
+            if item is None:
+                return
+            request = item[1]
+            now = time.perf_counter()
+            if on_send:
+                on_send(now - start, request)
+            send(request, now)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summarize(results, elapsed):
+    """{route: {count, rps, p50, p95, p99, max, client_errors, errors}} plus "total"."""
+    by_route = {}
+    for result in results:
+        by_route.setdefault(result.route, []).append(result)
+    by_route["total"] = results
+
+    summary = {}
+    for route, group in by_route.items():
+        latencies = sorted(r.ms for r in group)
+        errors = sum(1 for r in group if r.status is None or r.status >= 500)
+        summary[route] = {
+            "count": len(group),
+            "rps": len(group) / elapsed if elapsed else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+            "client_errors": sum(1 for r in group if r.status is not None and 400 <= r.status < 500),
+            "errors": errors,
+            "error_rate": errors / len(group) if group else 0.0,
+        }
+    return summary
+
+
+def print_report(summary, elapsed, out=sys.stdout):
+    print(f"{'route':<42} {'count':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} "
+          f"{'4xx':>5} {'errors':>7}", file=out)
+    routes = sorted((r for r in summary if r != "total"), key=lambda r: -summary[r]["count"])
+    for route in routes + ["total"]:
+        s = summary[route]
+        if route == "total":
+            print(file=out)
+        print(f"{route:<42} {s['count']:>7} {s['rps']:>8.1f} {s['p50'] or 0:>6.1f}ms {s['p95'] or 0:>6.1f}ms "
+              f"{s['p99'] or 0:>6.1f}ms {s['max'] or 0:>6.1f}ms {s['client_errors']:>5} "
+              f"{s['error_rate'] * 100:>6.2f}%", file=out)
+    print(f"\n{summary['total']['count']} requests in {elapsed:.1f}s", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, help="stop after this many (default: 1000 without --duration)")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=0, help="arrivals per second (default: closed loop)")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="operation weights, e.g. dashboard:30,mine:25")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--preload", type=int, default=100, help="studies to create before the clock starts")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--url", help="HTTP endpoint (default: the handlers in this process)")
+    parser.add_argument("--header", action="append", default=[], metavar="NAME:VALUE",
+                        help="extra header for --url requests")
+    parser.add_argument("--layout", choices=("per-route", "router"), default="per-route",
+                        help="in-process: the ApiLayout template parameter")
+    parser.add_argument("--storage", choices=("sqlite", "dynamodb"), default="sqlite",
+                        help="in-process: where submissions are kept")
+    parser.add_argument("--sqlite", metavar="FILE", help="in-process: a SQLite file (default: in memory)")
+    parser.add_argument("--endpoint-url", help="in-process: a local AWS stand-in instead of moto")
+    parser.add_argument("--metrics-log", help="in-process: write the handlers' metric lines here")
+    parser.add_argument("--trace", help="replay this trace file instead of generating a workload")
+    parser.add_argument("--speed", type=float, default=1.0, help="--trace: time scale (2 replays twice as fast)")
+    parser.add_argument("--save-trace", help="write the requests sent to this trace file")
+    parser.add_argument("--json", help="write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+    if args.requests is None and args.duration is None:
+        args.requests = 1000
+
+    if args.url:
+        headers = (h.split(":", 1) for h in args.header)
+        target = HttpTarget(args.url, {name.strip(): value.strip() for name, value in headers})
+        handler_output = None
+    else:
+        target = local_target(args.layout, args.storage, args.sqlite, args.endpoint_url)
+        # The handlers print a metrics line per invocation
+        handler_output = open(args.metrics_log or os.devnull, "w", encoding="utf-8")
+    saved = open(args.save_trace, "w", encoding="utf-8") if args.save_trace else None
+    save_lock = threading.Lock()
+
+    def on_send(t, request):
+        if saved:
+            line = json.dumps({"t": round(t, 4), "method": request.method, "path": request.path,
+                               "body": request.body, "user": request.user, "route": request.route})
+            with save_lock:
+                saved.write(line + "\n")
+
+    redirect = contextlib.redirect_stdout(handler_output) if handler_output else contextlib.nullcontext()
+    with redirect:
+        if args.trace:
+            source = Trace(args.trace, args.speed)
+        else:
+            source = Workload(args.mix, args.users, args.seed)
+            preload = [source.request("create") for _ in range(args.preload)]
+            with ThreadPoolExecutor(args.concurrency) as pool:
+                list(pool.map(lambda r: execute(target, source, r, time.perf_counter()), preload))
+
+        start = time.perf_counter()
+        results = run(target, source, args.concurrency, args.rate, args.requests, args.duration,
+                      args.seed, on_send)
+        elapsed = time.perf_counter() - start
+
+    for f in (handler_output, saved):
+        if f:
+            f.close()
+    summary = summarize(results, elapsed)
+    print_report(summary, elapsed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"elapsed": elapsed, "routes": summary}, f, indent=2)
+    return 1 if summary["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Recount suggestion values from every active submission.
+
+Write helpers keep the counts current (see shared/db.py). Run this once when
+enabling suggestions, or to repair counts after a failed update. Every page
+of the ByStatus index is read, and values no longer used by any active
+submission are deleted.
+
+Usage (from backend/, with AWS credentials, SUBMISSIONS_TABLE and SUGGESTIONS_TABLE set):
+    python scripts/rebuild_suggestions.py
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.db import (  # noqa: E402
+    SUGGEST_FIELDS, delete_suggestions, iter_all_submissions, list_suggestion_keys,
+    put_suggestion_counts, suggestion_values,
+)
+
+
+def count(submissions):
+    """({(field, valueKey): count}, {(field, valueKey): oldest spelling}) of submissions.
+
+    The oldest submission's spelling wins, as it does for counts kept on write.
+    """
+    counts = Counter()
+    oldest = {}  # (field, valueKey) -> (createdAt, spelling)
+    for item in submissions:
+        created_at = item.get("createdAt", "")
+        for key, value in suggestion_values(item).items():
+            counts[key] += 1
+            if key not in oldest or created_at < oldest[key][0]:
+                oldest[key] = (created_at, value)
+    return counts, {key: value for key, (_, value) in oldest.items()}
+
+
+def main(argv=None):
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args(argv)
+    counts, spellings = count(iter_all_submissions("active"))
+    put_suggestion_counts(counts, spellings)
+    stale = 0
+    for field in SUGGEST_FIELDS:
+        unused = [k for k in list_suggestion_keys(field) if (field, k) not in counts]
+        delete_suggestions(field, unused)
+        stale += len(unused)
+    print(f"{len(counts)} value(s) counted, {stale} unused value(s) deleted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Pre-check a CSV/XLSX import file against the submission rules.
+
+Uses the same row conversion and rules as POST /submissions/import, without
+touching AWS, including the check for a studyId repeated within the file.
+Whether a studyId already belongs to a stored submission is only known at
+import time. Exits 1 if any row is invalid.
+
+Usage (from backend/):
+    python scripts/validate_spreadsheet.py studies.xlsx [--json] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "functions"))
+
+from shared.spreadsheet import (  # noqa: E402
+    iter_csv_rows, iter_xlsx_rows, row_to_submission, SpreadsheetError,
+)
+from shared.store import study_id_key  # noqa: E402
+from shared.validator import validate_many  # noqa: E402
+
+
+def read_rows(path):
+    """Return [(row_number, submission)] for every non-blank row in the file."""
+    extension = path.rsplit(".", 1)[-1].lower()
+    with open(path, "rb") as f:
+        if extension == "csv":
+            rows = list(iter_csv_rows(f))
+        elif extension == "xlsx":
+            rows = list(iter_xlsx_rows(f))
+        else:
+            raise SpreadsheetError("Unsupported file type. Allowed: csv, xlsx")
+    return [
+        (row_number, row_to_submission(row))
+        for row_number, row in rows
+        if any(str(v).strip() for v in row.values() if v is not None)
+    ]
+
+
+def check_file(path, workers=1):
+    rows = read_rows(path)
+    results = validate_many([data for _, data in rows], workers=workers)
+    seen_study_ids = {}  # claim key -> first valid row using it, as the import does
+    for (row_number, data), errors in zip(rows, results):
+        if errors:
+            continue
+        key = study_id_key(data["studyId"])["submissionId"]
+        if key in seen_study_ids:
+            errors.append({"field": "studyId", "message": f"Duplicate studyId (also on row {seen_study_ids[key]})"})
+        else:
+            seen_study_ids[key] = row_number
+    return [
+        {"row": row_number, "studyId": data.get("studyId"), "errors": errors}
+        for (row_number, data), errors in zip(rows, results)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="CSV or XLSX file using the API field names as headers")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes to validate large files with (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = check_file(args.path, workers=args.workers)
+    except (OSError, SpreadsheetError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    invalid = [r for r in report if r["errors"]]
+    if args.json:
+        print(json.dumps({"rows": len(report), "invalid": len(invalid), "errors": invalid}, indent=2))
+    else:
+        for r in invalid:
+            for err in r["errors"]:
+                print(f"row {r['row']} ({r['studyId'] or 'no studyId'}): {err['field']}: {err['message']}")
+        print(f"{len(report)} row(s) checked, {len(invalid)} invalid")
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
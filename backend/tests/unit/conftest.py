@@ -9,6 +9,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "function
 # Set required env vars before any handler imports
 os.environ["SUBMISSIONS_TABLE"] = "test-submissions"
 os.environ["USERS_TABLE"] = "test-users"
+os.environ["DRAFTS_TABLE"] = "test-drafts"
+os.environ["SUGGESTIONS_TABLE"] = "test-suggestions"
 os.environ["ALLOWED_EMAIL_DOMAINS"] = "cgiar.org,synapsis-analytics.com"
 os.environ["ENVIRONMENT"] = "test"
 os.environ["LOG_LEVEL"] = "DEBUG"
@@ -74,9 +76,55 @@ def mock_dynamodb():
             ],
             BillingMode="PAY_PER_REQUEST",
         )
+        # Counts kept by the submission write helpers in shared/db.py
+        client.create_table(
+            TableName="test-suggestions",
+            KeySchema=[
+                {"AttributeName": "field", "KeyType": "HASH"},
+                {"AttributeName": "valueKey", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "field", "AttributeType": "S"},
+                {"AttributeName": "valueKey", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
         yield
 
 
+@pytest.fixture
+def mock_drafts_dynamodb(mock_dynamodb):
+    """Add the Drafts table to the mocked account (alongside Submissions)."""
+    import boto3
+    client = boto3.client("dynamodb", region_name="eu-central-1")
+    client.create_table(
+        TableName="test-drafts",
+        KeySchema=[
+            {"AttributeName": "userId", "KeyType": "HASH"},
+            {"AttributeName": "draftKey", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "userId", "AttributeType": "S"},
+            {"AttributeName": "draftKey", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    yield
+
+
+@pytest.fixture
+def sqlite_store():
+    """Run shared.db on an in-memory SQLite store instead of (mocked) DynamoDB."""
+    from shared import db
+    from shared.sqlite_store import SQLiteStore
+
+    store = SQLiteStore()
+    previous = db.set_store(store)
+    yield store
+    db.set_store(previous)
+    store.close()
+
+
 @pytest.fixture
 def mock_users_dynamodb():
     """Create a mocked DynamoDB Users table."""
@@ -0,0 +1,46 @@
+"""Tests for scripts/backfill_study_ids.py — claims for pre-existing submissions."""
+
+import importlib.util
+import os
+
+import pytest
+
+from shared.db import put_submission, get_study_id_claim
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "scripts", "backfill_study_ids.py"
+)
+
+
+@pytest.fixture(scope="module")
+def cli():
+    spec = importlib.util.spec_from_file_location("backfill_study_ids", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _legacy(submission_id, study_id, created_at):
+    return {
+        "submissionId": submission_id, "version": 1, "status": "active",
+        "userId": "user-1", "createdAt": created_at, "studyId": study_id,
+    }
+
+
+class TestBackfillStudyIds:
+    def test_claims_and_reports_duplicates(self, mock_dynamodb, cli, capsys):
+        put_submission(_legacy("sub-1", "S-1", "2025-01-01T00:00:00Z"))
+        put_submission(_legacy("sub-2", "S-2", "2025-01-02T00:00:00Z"))
+        put_submission(_legacy("sub-3", "s-1", "2025-01-03T00:00:00Z"))
+
+        assert cli.main([]) == 1
+        out = capsys.readouterr().out
+        assert "2 studyId(s) claimed, 1 duplicate(s)" in out
+        assert get_study_id_claim("S-2")["ownerSubmissionId"] == "sub-2"
+        assert get_study_id_claim("S-1")["ownerSubmissionId"] in {"sub-1", "sub-3"}
+
+    def test_rerun_is_a_no_op(self, mock_dynamodb, cli):
+        put_submission(_legacy("sub-1", "S-1", "2025-01-01T00:00:00Z"))
+        assert cli.main([]) == 0
+        assert cli.main([]) == 0
+        assert get_study_id_claim("S-1")["ownerSubmissionId"] == "sub-1"
@@ -0,0 +1,64 @@
+import json
+from unittest.mock import patch
+
+from create_submission.app import lambda_handler as create_handler
+from bulk_archive_submissions.app import lambda_handler as bulk_archive_handler
+from bulk_restore_submissions.app import lambda_handler as bulk_restore_handler
+from shared.bulk_status import MAX_BULK_IDS
+from shared.db import get_version_history, ConditionFailedError
+
+
+def _create(api_gw_event, body, n):
+    ids = []
+    for i in range(n):
+        api_gw_event["body"] = json.dumps({**body, "studyId": f"S-{i}"})
+        ids.append(json.loads(create_handler(api_gw_event, None)["body"])["submissionId"])
+    return ids
+
+
+def _call(handler, api_gw_event, payload):
+    api_gw_event["body"] = json.dumps(payload)
+    response = handler(api_gw_event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+class TestBulkArchive:
+    def test_archives_all_and_reports_per_id(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        ids = _create(api_gw_event, valid_submission_body, 3)
+
+        status, body = _call(bulk_archive_handler, api_gw_event, {"submissionIds": ids + ["missing-id"]})
+        assert status == 200
+        assert body["updated"] == 3
+        assert body["failed"] == 1
+        assert [r["submissionId"] for r in body["results"]] == ids + ["missing-id"]
+        assert body["results"][0] == {"submissionId": ids[0], "version": 1, "result": "updated"}
+        assert body["results"][3]["result"] == "not_found"
+        assert all(get_version_history(i)[0]["status"] == "archived" for i in ids)
+
+    def test_deduplicates_ids(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        ids = _create(api_gw_event, valid_submission_body, 1)
+        _, body = _call(bulk_archive_handler, api_gw_event, {"submissionIds": ids * 3})
+        assert len(body["results"]) == 1
+
+    def test_reports_conflict_on_concurrent_change(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        ids = _create(api_gw_event, valid_submission_body, 1)
+        with patch("shared.bulk_status.archive_version", side_effect=ConditionFailedError("changed")):
+            _, body = _call(bulk_archive_handler, api_gw_event, {"submissionIds": ids})
+        assert body["results"][0]["result"] == "conflict"
+        assert body["failed"] == 1
+
+    def test_rejects_bad_payloads(self, mock_dynamodb, api_gw_event):
+        for payload in ({}, {"submissionIds": []}, {"submissionIds": [""]}, [],
+                        {"submissionIds": [f"id-{i}" for i in range(MAX_BULK_IDS + 1)]}):
+            status, _ = _call(bulk_archive_handler, api_gw_event, payload)
+            assert status == 400
+
+
+class TestBulkRestore:
+    def test_restores_archived_only(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        ids = _create(api_gw_event, valid_submission_body, 2)
+        _call(bulk_archive_handler, api_gw_event, {"submissionIds": ids[:1]})
+
+        _, body = _call(bulk_restore_handler, api_gw_event, {"submissionIds": ids})
+        assert [r["result"] for r in body["results"]] == ["updated", "not_found"]
+        assert get_version_history(ids[0])[0]["status"] == "active"
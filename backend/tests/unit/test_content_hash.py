@@ -0,0 +1,42 @@
+"""Tests for shared.content_hash — canonical hashing of form fields."""
+
+from decimal import Decimal
+
+from shared.content_hash import content_hash, same_content
+
+
+class TestContentHash:
+    def test_key_order_does_not_matter(self):
+        assert content_hash({"a": "1", "b": "2"}) == content_hash({"b": "2", "a": "1"})
+
+    def test_array_order_does_not_matter(self):
+        assert content_hash({"otherCenters": ["IITA", "CIAT"]}) == content_hash({"otherCenters": ["CIAT", "IITA"]})
+
+    def test_numbers_match_across_json_and_dynamodb(self):
+        assert content_hash({"totalCostUSD": 250000}) == content_hash({"totalCostUSD": Decimal("250000")})
+        assert content_hash({"totalCostUSD": 2.5}) == content_hash({"totalCostUSD": Decimal("2.50")})
+
+    def test_metadata_and_nulls_ignored(self):
+        body = {"studyTitle": "T", "proposalAvailable": {"answer": "no", "link": None}}
+        item = {
+            "studyTitle": "T", "proposalAvailable": {"answer": "no"}, "w3Bilateral": None,
+            "submissionId": "x", "version": Decimal("3"), "status": "active", "contentHash": "old",
+        }
+        assert content_hash(body) == content_hash(item)
+
+    def test_detects_real_changes(self):
+        base = {"studyTitle": "T", "otherCenters": ["CIAT"], "sampleSize": 10}
+        assert content_hash(base) != content_hash({**base, "studyTitle": "U"})
+        assert content_hash(base) != content_hash({**base, "otherCenters": ["CIAT", "IITA"]})
+        assert content_hash(base) != content_hash({**base, "sampleSize": "10"})
+        assert content_hash(base) != content_hash({**base, "w3Bilateral": ""})
+
+
+class TestSameContent:
+    def test_uses_stored_hash(self):
+        assert same_content({"contentHash": "abc"}, "abc")
+        assert not same_content({"contentHash": "abc"}, "def")
+
+    def test_hashes_legacy_versions_on_the_fly(self):
+        item = {"studyTitle": "T", "version": Decimal("1")}
+        assert same_content(item, content_hash({"studyTitle": "T"}))
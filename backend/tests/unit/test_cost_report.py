@@ -0,0 +1,58 @@
+"""Cost per call ranking from handler metric logs (scripts/cost_report.py)."""
+
+import importlib.util
+import json
+import os
+
+_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "cost_report.py")
+_spec = importlib.util.spec_from_file_location("cost_report", _PATH)
+cost_report = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cost_report)
+
+PRICES = {"read_unit": 1.0, "write_unit": 10.0, "s3_put": 100.0, "s3_get": 1000.0}
+
+
+def _line(function, route=None, read=0, write=0, s3=None, prefix="2026-01-01T00:00:00Z\tr-1\t"):
+    record = {"_aws": {}, "Function": function, "Duration": 10, "ReadCapacityUnits": read,
+              "WriteCapacityUnits": write, "s3": s3 or {}}
+    if route:
+        record["Route"] = route
+    return prefix + json.dumps(record)
+
+
+class TestCostReport:
+    def test_parse_line_skips_prefix_and_other_lines(self):
+        assert cost_report.parse_line(_line("f"))["Function"] == "f"
+        assert cost_report.parse_line("START RequestId: r-1 Version: $LATEST") is None
+        assert cost_report.parse_line('{"_aws": broken') is None
+        assert cost_report.parse_line('{"message": "no metrics"}') is None
+
+    def test_call_cost(self):
+        record = json.loads(_line("f", read=2, write=1, s3={"Put": 1, "List": 1, "Get": 1, "Delete": 5}, prefix=""))
+        assert cost_report.call_cost(record, PRICES) == 2 + 10 + 200 + 1000
+
+    def test_summarize_ranks_by_cost_per_call(self):
+        records = [cost_report.parse_line(line) for line in (
+            _line("list", "GET /submissions", read=4),
+            _line("list", "GET /submissions", read=2),
+            _line("create", "POST /submissions", write=3),
+            _line("stream"),
+        )]
+        rows = cost_report.summarize(records, prices=PRICES)
+        assert [(r["name"], r["calls"], r["cost"]) for r in rows] == [
+            ("POST /submissions", 1, 30), ("GET /submissions", 2, 3), ("stream", 1, 0),
+        ]
+        assert rows[1]["total"] == 6
+
+    def test_main_reads_files(self, tmp_path, capsys):
+        log = tmp_path / "run.log"
+        log.write_text("\n".join([_line("create", "POST /submissions", write=2), "noise"]) + "\n")
+        assert cost_report.main([str(log), "--by", "function"]) == 0
+        out = capsys.readouterr().out
+        assert "create" in out and "1 invocations" in out
+        assert cost_report.main([str(tmp_path / "run.log"), "--top", "0"]) == 0
+
+    def test_main_without_records_fails(self, tmp_path):
+        log = tmp_path / "empty.log"
+        log.write_text("nothing here\n")
+        assert cost_report.main([str(log)]) == 1
@@ -1,5 +1,6 @@
 import json
 from create_submission.app import lambda_handler
+from shared.db import list_all_submissions, get_study_id_claim
 
 
 class TestCreateSubmission:
@@ -10,6 +11,7 @@ class TestCreateSubmission:
         body = json.loads(response["body"])
         assert "submissionId" in body
         assert body["version"] == 1
+        assert get_study_id_claim("TEST-001")["ownerSubmissionId"] == body["submissionId"]
 
     def test_rejects_invalid_json(self, api_gw_event):
         api_gw_event["body"] = "not json"
@@ -35,3 +37,26 @@ class TestCreateSubmission:
         api_gw_event["body"] = json.dumps(valid_submission_body)
         response = lambda_handler(api_gw_event, None)
         assert response["headers"]["Access-Control-Allow-Origin"] == "*"
+
+    def test_derives_countries_and_regions_from_subnational(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        from shared.db import get_latest_active_version
+        valid_submission_body.update({
+            "geographicScope": "sub_national",
+            "studySubnational": ["KE-01", "NG-AB"],
+            "studyCountries": [],
+            "studyRegions": [],
+        })
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        response = lambda_handler(api_gw_event, None)
+        saved = get_latest_active_version(json.loads(response["body"])["submissionId"])
+        assert saved["studyCountries"] == ["KE", "NG"]
+        assert saved["studyRegions"] == ["ESA", "WCA"]
+
+    def test_duplicate_study_id_conflicts(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        lambda_handler(api_gw_event, None)
+        api_gw_event["body"] = json.dumps({**valid_submission_body, "studyId": "test-001"})
+        response = lambda_handler(api_gw_event, None)
+        assert response["statusCode"] == 409
+        assert "already used" in json.loads(response["body"])["error"]
+        assert len(list_all_submissions()) == 1
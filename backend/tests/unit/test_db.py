@@ -1,14 +1,31 @@
 """Tests for shared.db — DynamoDB operations for submissions table."""
 
+from unittest.mock import MagicMock, patch
+
+import pytest
+
 from shared.db import (
     put_submission,
     get_latest_active_version,
     get_latest_archived_version,
     list_user_submissions,
     get_version_history,
+    get_version_timeline,
+    get_version,
+    get_versions,
+    batch_put_submissions,
     mark_superseded,
     list_all_submissions,
     update_submission_status,
+    ConditionFailedError,
+    put_new_submission,
+    put_next_version,
+    put_new_submissions,
+    archive_version,
+    restore_version,
+    get_suggestions,
+    record_suggestions,
+    suggestion_values,
 )
 
 
@@ -111,6 +128,107 @@ class TestGetVersionHistory:
         assert results == []
 
 
+class TestGetVersionTimeline:
+    def test_projects_metadata_only(self, mock_dynamodb):
+        put_submission(_make_item("sub-1", 1))
+        items, last_key = get_version_timeline("sub-1", 10)
+        assert len(items) == 1
+        assert "studyTitle" not in items[0]
+        assert items[0]["status"] == "active"
+        assert last_key is None
+
+    def test_pages_newest_first(self, mock_dynamodb):
+        for v in (1, 2, 3):
+            put_submission(_make_item("sub-1", v))
+        first, last_key = get_version_timeline("sub-1", 2)
+        assert [i["version"] for i in first] == [3, 2]
+        second, last_key = get_version_timeline("sub-1", 2, last_key)
+        assert [i["version"] for i in second] == [1]
+
+
+class TestGetVersion:
+    def test_returns_exact_version(self, mock_dynamodb):
+        put_submission(_make_item("sub-1", 1, status="superseded"))
+        put_submission(_make_item("sub-1", 2))
+        assert get_version("sub-1", 1)["studyTitle"] == "Study v1"
+
+    def test_returns_none_when_missing(self, mock_dynamodb):
+        assert get_version("sub-1", 7) is None
+
+
+class TestGetVersions:
+    def test_returns_requested_versions_by_number(self, mock_dynamodb):
+        for v in (1, 2, 3):
+            put_submission(_make_item("sub-1", v))
+        found = get_versions("sub-1", [1, 3])
+        assert set(found) == {1, 3}
+        assert found[3]["studyTitle"] == "Study v3"
+
+    def test_omits_missing_versions(self, mock_dynamodb):
+        put_submission(_make_item("sub-1", 1))
+        assert set(get_versions("sub-1", [1, 2])) == {1}
+
+    def test_retries_unprocessed_keys(self, mock_dynamodb):
+        put_submission(_make_item("sub-1", 1))
+        put_submission(_make_item("sub-1", 2))
+        resource = MagicMock()
+        resource.batch_get_item.side_effect = [
+            {"Responses": {"test-submissions": [_make_item("sub-1", 1)]},
+             "UnprocessedKeys": {"test-submissions": {"Keys": [{"submissionId": "sub-1", "version": 2}]}}},
+            {"Responses": {"test-submissions": [_make_item("sub-1", 2)]}, "UnprocessedKeys": {}},
+        ]
+        with patch("shared.dynamodb_store._get_thread_resource", return_value=resource), \
+                patch("shared.dynamodb_store.time.sleep") as sleep:
+            assert set(get_versions("sub-1", [1, 2])) == {1, 2}
+        assert sleep.call_count == 1
+
+    def test_raises_when_keys_stay_unprocessed(self, mock_dynamodb):
+        resource = MagicMock()
+        resource.batch_get_item.side_effect = lambda RequestItems: {"UnprocessedKeys": RequestItems}
+        with patch("shared.dynamodb_store._get_thread_resource", return_value=resource), \
+                patch("shared.dynamodb_store.time.sleep"):
+            with pytest.raises(RuntimeError):
+                get_versions("sub-1", [1])
+        assert resource.batch_get_item.call_count == 5
+
+
+class TestBatchPutSubmissions:
+    def test_writes_all_items(self, mock_dynamodb):
+        items = [_make_item(f"sub-{i}", 1) for i in range(25)]
+        assert batch_put_submissions(items) == []
+        assert len(list_all_submissions()) == 25
+
+    def test_rejects_more_than_25_items(self, mock_dynamodb):
+        with pytest.raises(ValueError):
+            batch_put_submissions([_make_item(f"sub-{i}", 1) for i in range(26)])
+
+    def test_retries_unprocessed_items(self, mock_dynamodb):
+        items = [_make_item("sub-1", 1), _make_item("sub-2", 1)]
+        calls = []
+
+        def flaky(RequestItems):
+            calls.append(RequestItems)
+            requests = RequestItems["test-submissions"]
+            if len(calls) == 1:
+                return {"UnprocessedItems": {"test-submissions": requests[1:]}}
+            return {"UnprocessedItems": {}}
+
+        resource = MagicMock(batch_write_item=flaky)
+        with patch("shared.dynamodb_store._get_thread_resource", return_value=resource), \
+                patch("shared.dynamodb_store.time.sleep"):
+            assert batch_put_submissions(items) == []
+        assert len(calls) == 2
+        assert calls[1]["test-submissions"][0]["PutRequest"]["Item"]["submissionId"] == "sub-2"
+
+    def test_returns_items_still_unprocessed(self, mock_dynamodb):
+        items = [_make_item("sub-1", 1)]
+        resource = MagicMock()
+        resource.batch_write_item.side_effect = lambda RequestItems: {"UnprocessedItems": RequestItems}
+        with patch("shared.dynamodb_store._get_thread_resource", return_value=resource), \
+                patch("shared.dynamodb_store.time.sleep"):
+            assert batch_put_submissions(items) == items
+
+
 class TestMarkSuperseded:
     def test_updates_status_to_superseded(self, mock_dynamodb):
         put_submission(_make_item("sub-1", 1, status="active"))
@@ -144,3 +262,119 @@ class TestUpdateSubmissionStatus:
         history = get_version_history("sub-1")
         assert history[0]["status"] == "archived"
         assert "updatedAt" in history[0]
+
+    def test_expected_status_guards_the_write(self, mock_dynamodb):
+        put_submission(_make_item("sub-1", 1, status="superseded"))
+        with pytest.raises(ConditionFailedError):
+            update_submission_status("sub-1", 1, "archived", expected_status="active")
+        assert get_version_history("sub-1")[0]["status"] == "superseded"
+
+    def test_expected_status_fails_for_missing_item(self, mock_dynamodb):
+        with pytest.raises(ConditionFailedError):
+            update_submission_status("nope", 1, "archived", expected_status="active")
+
+
+class TestArchiveRestore:
+    def test_failed_transaction_writes_nothing(self, mock_dynamodb):
+        from botocore.exceptions import ClientError
+        from shared.db import get_study_id_claim
+        from shared.dynamodb_store import _get_thread_resource
+
+        put_new_submission({**_make_item("sub-1", 1), "studyId": "A-1"})
+
+        def throttle(**kwargs):
+            raise ClientError({"Error": {"Code": "ThrottlingException"}}, "TransactWriteItems")
+
+        events = _get_thread_resource().meta.client.meta.events
+        events.register("before-call.dynamodb.TransactWriteItems", throttle)
+        try:
+            with pytest.raises(ClientError):
+                archive_version("sub-1", 1)
+        finally:
+            events.unregister("before-call.dynamodb.TransactWriteItems", throttle)
+        assert get_version("sub-1", 1)["status"] == "active"
+        assert get_study_id_claim("A-1")["ownerSubmissionId"] == "sub-1"
+
+    @pytest.fixture
+    def calls(self, mock_dynamodb):
+        from shared.dynamodb_store import _get_thread_resource
+
+        names = []
+
+        def record(model, **kwargs):
+            names.append(model.name)
+
+        events = _get_thread_resource().meta.client.meta.events
+        events.register("before-call.dynamodb", record)
+        yield names
+        events.unregister("before-call.dynamodb", record)
+
+    def test_current_item_saves_the_read(self, calls):
+        from shared.db import get_study_id_claim
+
+        current = put_new_submission({**_make_item("sub-1", 1), "studyId": "A-1"})
+        calls.clear()
+        archive_version("sub-1", 1, current)
+        assert calls == ["TransactWriteItems"]
+        assert get_study_id_claim("A-1") is None
+
+        calls.clear()
+        restore_version("sub-1", 1, {**current, "status": "archived"})
+        assert calls == ["TransactWriteItems"]
+        assert get_study_id_claim("A-1")["ownerSubmissionId"] == "sub-1"
+
+    def test_version_without_study_id_is_one_update(self, calls):
+        current = _make_item("sub-1", 1)
+        put_submission(current)
+        calls.clear()
+        assert archive_version("sub-1", 1, current)["status"] == "archived"
+        assert calls == ["UpdateItem"]
+
+
+class TestSuggestions:
+    def _submission(self, submission_id, study_id, **fields):
+        return {**_make_item(submission_id, 1), "studyId": study_id, **fields}
+
+    def test_values_are_keyed_case_and_space_insensitively(self):
+        values = suggestion_values({"leadCenter": "  CIMMYT ", "dataCollectionMethods": ["Survey", "survey", ""],
+                                    "fundingSource": None, "studyTitle": "Not suggestible"})
+        assert values == {("leadCenter", "cimmyt"): "CIMMYT", ("dataCollectionMethods", "survey"): "Survey"}
+
+    def test_write_helpers_keep_counts(self, mock_dynamodb):
+        first = self._submission("sub-1", "A-1", leadCenter="CIMMYT", dataCollectionMethods=["Survey", "Interviews"])
+        second = self._submission("sub-2", "B-2", leadCenter="cimmyt", dataCollectionMethods=["Survey"])
+        put_new_submission(first)
+        taken, pending = put_new_submissions([second, {**second, "submissionId": "sub-3", "studyId": "A-1"}])
+        assert len(taken) == 1 and pending == []
+
+        assert get_suggestions("leadCenter", "cim") == [{"value": "CIMMYT", "count": 2}]
+        assert get_suggestions("dataCollectionMethods") == [
+            {"value": "Survey", "count": 2}, {"value": "Interviews", "count": 1},
+        ]
+
+        put_next_version(first, {**first, "version": 2, "leadCenter": "IFPRI"})
+        assert get_suggestions("leadCenter") == [
+            {"value": "CIMMYT", "count": 1}, {"value": "IFPRI", "count": 1},
+        ]
+
+        archive_version("sub-2", 1)
+        assert get_suggestions("leadCenter") == [{"value": "IFPRI", "count": 1}]
+        assert get_suggestions("dataCollectionMethods", "SUR") == [{"value": "Survey", "count": 1}]
+        restore_version("sub-2", 1)
+        assert get_suggestions("leadCenter", "c") == [{"value": "CIMMYT", "count": 1}]
+
+    def test_limit_and_prefix(self, mock_dynamodb):
+        record_suggestions(added=[{"commissioningSource": s} for s in ("USAID", "USDA", "USDA", "FCDO")])
+        assert get_suggestions("commissioningSource", "us", limit=1) == [{"value": "USDA", "count": 2}]
+        assert get_suggestions("commissioningSource", "x") == []
+
+    def test_removing_unknown_values_creates_nothing(self, mock_dynamodb):
+        record_suggestions(removed=[{"leadCenter": "Legacy"}])
+        assert get_suggestions("leadCenter") == []
+
+    def test_failures_do_not_fail_the_write(self, mock_dynamodb):
+        with patch("shared.dynamodb_store._get_suggestions_table") as table:
+            table.return_value.update_item.side_effect = __import__("botocore").exceptions.ClientError(
+                {"Error": {"Code": "ResourceNotFoundException"}}, "UpdateItem")
+            put_new_submission(self._submission("sub-1", "A-1", leadCenter="CIMMYT"))
+        assert get_latest_active_version("sub-1")["leadCenter"] == "CIMMYT"
@@ -1,6 +1,8 @@
 import json
+from unittest.mock import patch
 from create_submission.app import lambda_handler as create_handler
 from delete_submission.app import lambda_handler as delete_handler
+from update_submission.app import lambda_handler as update_handler
 from shared.db import get_version_history
 
 
@@ -30,3 +32,52 @@ class TestDeleteSubmission:
         api_gw_event["pathParameters"] = {"id": "nonexistent-id"}
         response = delete_handler(api_gw_event, None)
         assert response["statusCode"] == 404
+
+    def test_archives_with_expected_version_without_lookup(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        sub_id = json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["queryStringParameters"] = {"expectedVersion": "1"}
+        api_gw_event["body"] = None
+        with patch("delete_submission.app.get_latest_active_version") as lookup:
+            response = delete_handler(api_gw_event, None)
+        lookup.assert_not_called()
+        assert response["statusCode"] == 200
+        assert get_version_history(sub_id)[0]["status"] == "archived"
+
+    def test_stale_expected_version_conflicts(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        sub_id = json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["body"] = json.dumps({**valid_submission_body, "studyTitle": "Revised"})
+        update_handler(api_gw_event, None)  # v1 is now superseded
+
+        api_gw_event["queryStringParameters"] = {"expectedVersion": "1"}
+        api_gw_event["body"] = None
+        response = delete_handler(api_gw_event, None)
+        assert response["statusCode"] == 409
+        statuses = {int(v["version"]): v["status"] for v in get_version_history(sub_id)}
+        assert statuses == {1: "superseded", 2: "active"}
+
+    def test_already_archived_conflicts(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        sub_id = json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["queryStringParameters"] = {"expectedVersion": "1"}
+        api_gw_event["body"] = None
+        delete_handler(api_gw_event, None)
+        response = delete_handler(api_gw_event, None)
+        assert response["statusCode"] == 409
+
+    def test_unknown_expected_version_not_found(self, mock_dynamodb, api_gw_event):
+        api_gw_event["pathParameters"] = {"id": "nonexistent-id"}
+        api_gw_event["queryStringParameters"] = {"expectedVersion": "4"}
+        response = delete_handler(api_gw_event, None)
+        assert response["statusCode"] == 404
+
+    def test_invalid_expected_version(self, mock_dynamodb, api_gw_event):
+        api_gw_event["pathParameters"] = {"id": "some-id"}
+        api_gw_event["queryStringParameters"] = {"expectedVersion": "latest"}
+        response = delete_handler(api_gw_event, None)
+        assert response["statusCode"] == 400
@@ -0,0 +1,147 @@
+"""Tests for the local API server (scripts/dev_server.py)."""
+
+import importlib.util
+import json
+import os
+
+import pytest
+
+pytest.importorskip("yaml")
+
+_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "dev_server.py")
+_spec = importlib.util.spec_from_file_location("dev_server", _PATH)
+dev_server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dev_server)
+
+from shared import search  # noqa: E402
+
+CLAIMS = {"sub": "dev-user-001", "email": "dev@cgiar.org", "name": "Dev"}
+# The table names conftest gives the handlers
+TEST_TABLES = {
+    "SubmissionsTable": "test-submissions",
+    "DraftsTable": "test-drafts",
+    "SuggestionsTable": "test-suggestions",
+    "UsersTable": "test-users",
+}
+
+
+def _template(**parameters):
+    doc = dev_server.load_template()
+    for logical_id, name in TEST_TABLES.items():
+        doc["Resources"][logical_id]["Properties"]["TableName"] = name
+    return dev_server.Template(doc, parameters)
+
+
+class TestTemplate:
+    def test_per_route_layout(self):
+        template = dev_server.Template(dev_server.load_template())
+        routes = {(m, p): f for m, p, f, _ in template.api_routes()}
+        assert routes[("POST", "/submissions")] == "CreateSubmissionFunction"
+        assert routes[("GET", "/health")] == "HealthFunction"
+        assert "RouterFunction" not in template.functions()
+        public = {(m, p) for m, p, _, public in template.api_routes() if public}
+        assert ("GET", "/health") in public
+        assert ("GET", "/submissions") not in public
+
+    def test_router_layout(self):
+        template = dev_server.Template(dev_server.load_template(), {"ApiLayout": "router"})
+        routes = {(m, p): f for m, p, f, _ in template.api_routes()}
+        assert routes[("ANY", "/{proxy+}")] == "RouterFunction"
+        assert "CreateSubmissionFunction" not in template.functions()
+
+    def test_resolves_names_and_handlers(self):
+        template = dev_server.Template(dev_server.load_template(), {"Environment": "staging"})
+        env = template.environment()
+        assert env["SUBMISSIONS_TABLE"] == "meliaf-submissions-staging"
+        assert env["FILES_BUCKET"] == "meliaf-stocktake-files-staging"
+        assert template.handler("CreateSubmissionFunction") == ("create_submission.app", "lambda_handler")
+        assert template.handler("HealthFunction") == ("health.app", "lambda_handler")
+        assert ("UpdateSearchIndexFunction", "meliaf-submissions-staging") in template.stream_consumers()
+        assert "StreamViewType" in template.tables()["meliaf-submissions-staging"]["StreamSpecification"]
+
+
+class TestBuildEvent:
+    def test_proxy_event(self):
+        event = dev_server.build_event(
+            "GET", "/submissions/abc", "limit=5&tag=a&tag=b", [("X-Test", "1")], None,
+            "/submissions/{id}", {"id": "abc"}, CLAIMS,
+        )
+        assert event["queryStringParameters"] == {"limit": "5", "tag": "b"}
+        assert event["multiValueQueryStringParameters"]["tag"] == ["a", "b"]
+        assert event["pathParameters"] == {"id": "abc"}
+        assert event["requestContext"]["authorizer"]["claims"]["sub"] == "dev-user-001"
+        assert event["requestContext"]["resourcePath"] == "/submissions/{id}"
+
+    def test_binary_body_is_base64(self):
+        event = dev_server.build_event("POST", "/x", "", [], b"\xff\x00", "/x", None)
+        assert event["isBase64Encoded"] is True
+        assert "authorizer" not in event["requestContext"]
+
+
+class TestDispatch:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        from moto import mock_aws
+
+        monkeypatch.setenv("FILES_BUCKET", "test-files-bucket")
+        with mock_aws():
+            template = _template()
+            dev_server.create_resources(template, CLAIMS)
+            import boto3
+            boto3.client("s3", region_name="eu-central-1").create_bucket(
+                Bucket="test-files-bucket",
+                CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+            )
+            search.reset_cache()
+            self.template = template
+            self.server = dev_server.DevServer(template, CLAIMS)
+            yield
+            search.reset_cache()
+
+    def _request(self, method, target, body=None, headers=()):
+        data = json.dumps(body).encode() if body is not None else None
+        status, headers, raw = self.server.dispatch(method, target, list(headers), data)
+        return status, headers, json.loads(raw) if raw else None
+
+    def test_create_then_list(self, valid_submission_body):
+        status, headers, body = self._request("POST", "/submissions", valid_submission_body)
+        assert status == 201
+        assert headers["Server-Timing"].startswith("handler;dur=")
+
+        status, _, body = self._request("GET", "/submissions")
+        assert status == 200
+        assert body["count"] == 1
+
+    def test_dev_user_header_switches_identity(self, valid_submission_body):
+        self._request("POST", "/submissions", valid_submission_body)
+        _, _, body = self._request("GET", "/submissions", headers=[("X-Dev-User", "someone-else")])
+        assert body["count"] == 0
+
+    def test_unknown_route_and_method(self):
+        assert self._request("GET", "/nope")[0] == 404
+        status, headers, _ = self._request("POST", "/health")
+        assert status == 405
+        assert headers["Allow"] == "GET"
+
+    def test_preflight(self):
+        status, headers, _ = self._request("OPTIONS", "/submissions")
+        assert status == 204
+        assert "X-Dev-User" in headers["Access-Control-Allow-Headers"]
+
+    def test_router_layout(self):
+        server = dev_server.DevServer(_template(ApiLayout="router"), CLAIMS)
+        status, _, raw = server.dispatch("GET", "/reference/subnational?q=KE-01", [])
+        assert status == 200
+        assert json.loads(raw)["results"][0]["value"] == "KE-01"
+        assert server.dispatch("GET", "/health", [])[0] == 200
+
+    def test_stream_consumers_follow_writes(self, valid_submission_body):
+        poller = dev_server.StreamPoller(self.server)
+        poller.open()
+        valid_submission_body["studyTitle"] = "Drought tolerant maize adoption"
+        assert self._request("POST", "/submissions", valid_submission_body)[0] == 201
+
+        assert poller.poll_once() > 0
+        search.reset_cache()
+        _, _, body = self._request("GET", "/submissions/search?q=maize")
+        assert body["count"] == 1
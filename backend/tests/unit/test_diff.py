@@ -0,0 +1,59 @@
+"""Tests for shared.diff — field-level version diff."""
+
+from shared.diff import diff_versions
+
+
+def _by_field(changes):
+    return {c["field"]: c for c in changes}
+
+
+class TestDiffVersions:
+    def test_identical_versions_have_no_changes(self):
+        item = {"studyTitle": "A", "studyCountries": ["KE"]}
+        assert diff_versions(item, dict(item)) == []
+
+    def test_ignores_metadata_fields(self):
+        old = {"version": 1, "status": "superseded", "updatedAt": "x", "studyTitle": "A"}
+        new = {"version": 2, "status": "active", "updatedAt": "y", "studyTitle": "A"}
+        assert diff_versions(old, new) == []
+
+    def test_scalar_modified(self):
+        changes = diff_versions({"studyTitle": "A"}, {"studyTitle": "B"})
+        assert changes == [{"field": "studyTitle", "change": "modified", "from": "A", "to": "B"}]
+
+    def test_scalar_added_and_removed(self):
+        changes = _by_field(diff_versions({"sampleSize": 10}, {"fundingSource": "GF"}))
+        assert changes["sampleSize"] == {"field": "sampleSize", "change": "removed", "from": 10}
+        assert changes["fundingSource"] == {"field": "fundingSource", "change": "added", "to": "GF"}
+
+    def test_array_add_remove(self):
+        changes = diff_versions(
+            {"studyCountries": ["KE", "TZ"]},
+            {"studyCountries": ["KE", "UG", "RW"]},
+        )
+        assert changes == [{
+            "field": "studyCountries", "change": "modified",
+            "added": ["UG", "RW"], "removed": ["TZ"],
+        }]
+
+    def test_array_reorder_is_not_a_change(self):
+        assert diff_versions(
+            {"intendedPrimaryUser": ["program", "donor"]},
+            {"intendedPrimaryUser": ["donor", "program"]},
+        ) == []
+
+    def test_array_field_added(self):
+        changes = diff_versions({}, {"studyRegions": ["ESA"]})
+        assert changes == [{"field": "studyRegions", "change": "added", "added": ["ESA"], "removed": []}]
+
+    def test_nested_object_reported_as_value(self):
+        changes = diff_versions(
+            {"manuscriptDeveloped": {"answer": "no"}},
+            {"manuscriptDeveloped": {"answer": "yes", "link": "https://x.org"}},
+        )
+        assert changes[0]["from"] == {"answer": "no"}
+        assert changes[0]["to"] == {"answer": "yes", "link": "https://x.org"}
+
+    def test_changes_sorted_by_field(self):
+        changes = diff_versions({"b": 1, "a": 1}, {"b": 2, "a": 2})
+        assert [c["field"] for c in changes] == ["a", "b"]
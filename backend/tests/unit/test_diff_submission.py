@@ -0,0 +1,70 @@
+import json
+import pytest
+from create_submission.app import lambda_handler as create_handler
+from update_submission.app import lambda_handler as update_handler
+from diff_submission import app as diff_app
+from shared.response import IMMUTABLE_CACHE_CONTROL
+
+
+@pytest.fixture(autouse=True)
+def clear_diff_cache():
+    diff_app._diff_cache.clear()
+    yield
+    diff_app._diff_cache.clear()
+
+
+def _create_two_versions(api_gw_event, valid_submission_body):
+    api_gw_event["body"] = json.dumps(valid_submission_body)
+    response = create_handler(api_gw_event, None)
+    sub_id = json.loads(response["body"])["submissionId"]
+
+    api_gw_event["pathParameters"] = {"id": sub_id}
+    api_gw_event["body"] = json.dumps({
+        **valid_submission_body,
+        "studyTitle": "Updated Title",
+        "intendedPrimaryUser": ["program", "researchers"],
+    })
+    update_handler(api_gw_event, None)
+    api_gw_event["body"] = None
+    return sub_id
+
+
+class TestDiffSubmission:
+    def test_returns_field_level_changes(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_two_versions(api_gw_event, valid_submission_body)
+
+        api_gw_event["queryStringParameters"] = {"from": "1", "to": "2"}
+        response = diff_app.lambda_handler(api_gw_event, None)
+        assert response["statusCode"] == 200
+        assert response["headers"]["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        body = json.loads(response["body"])
+        assert body["submissionId"] == sub_id
+        changes = {c["field"]: c for c in body["changes"]}
+        assert set(changes) == {"studyTitle", "intendedPrimaryUser"}
+        assert changes["studyTitle"]["to"] == "Updated Title"
+        assert changes["intendedPrimaryUser"]["added"] == ["researchers"]
+        assert changes["intendedPrimaryUser"]["removed"] == ["donor"]
+
+    def test_caches_result(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        _create_two_versions(api_gw_event, valid_submission_body)
+        api_gw_event["queryStringParameters"] = {"from": "1", "to": "2"}
+        first = diff_app.lambda_handler(api_gw_event, None)
+        assert len(diff_app._diff_cache) == 1
+        second = diff_app.lambda_handler(api_gw_event, None)
+        assert first["body"] == second["body"]
+
+    def test_missing_version_is_not_found(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        _create_two_versions(api_gw_event, valid_submission_body)
+        api_gw_event["queryStringParameters"] = {"from": "1", "to": "9"}
+        response = diff_app.lambda_handler(api_gw_event, None)
+        assert response["statusCode"] == 404
+        assert diff_app._diff_cache == {}
+
+    @pytest.mark.parametrize("params", [
+        None, {"from": "1"}, {"from": "a", "to": "2"}, {"from": "0", "to": "2"}, {"from": "2", "to": "2"},
+    ])
+    def test_invalid_params(self, mock_dynamodb, api_gw_event, params):
+        api_gw_event["pathParameters"] = {"id": "some-id"}
+        api_gw_event["queryStringParameters"] = params
+        response = diff_app.lambda_handler(api_gw_event, None)
+        assert response["statusCode"] == 400
@@ -0,0 +1,145 @@
+"""Tests for the draft Lambda handlers (get/save/delete/submit)."""
+
+import json
+
+from create_submission.app import lambda_handler as create_handler
+from get_draft.app import lambda_handler as get_handler
+from save_draft.app import lambda_handler as save_handler
+from delete_draft.app import lambda_handler as delete_handler
+from submit_draft.app import lambda_handler as submit_handler
+from shared.db import get_draft, get_version_history, list_user_submissions
+
+
+def _call(handler, api_gw_event, key, payload=None):
+    api_gw_event["pathParameters"] = {"key": key}
+    api_gw_event["body"] = json.dumps(payload) if payload is not None else None
+    response = handler(api_gw_event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def _save(api_gw_event, key, data, revision=0):
+    return _call(save_handler, api_gw_event, key, {"data": data, "revision": revision})
+
+
+class TestSaveDraft:
+    def test_first_save_creates_revision_1(self, mock_drafts_dynamodb, api_gw_event):
+        status, body = _save(api_gw_event, "new", {"studyTitle": "Half-typed"})
+        assert status == 200
+        assert body["revision"] == 1
+        assert get_draft("dev-user-001", "new")["data"] == {"studyTitle": "Half-typed"}
+
+    def test_overwrites_in_place(self, mock_drafts_dynamodb, api_gw_event):
+        _save(api_gw_event, "new", {"studyTitle": "One"})
+        status, body = _save(api_gw_event, "new", {"studyTitle": "Two"}, revision=1)
+        assert status == 200
+        assert body["revision"] == 2
+        draft = get_draft("dev-user-001", "new")
+        assert draft["data"] == {"studyTitle": "Two"}
+        assert draft["expiresAt"] > 0
+
+    def test_stale_revision_conflicts(self, mock_drafts_dynamodb, api_gw_event):
+        _save(api_gw_event, "new", {"studyTitle": "One"})
+        _save(api_gw_event, "new", {"studyTitle": "Two"}, revision=1)
+        status, body = _save(api_gw_event, "new", {"studyTitle": "Stale"}, revision=1)
+        assert status == 409
+        assert body["error"] == "Draft new is at revision 2, not 1"
+        assert get_draft("dev-user-001", "new")["data"] == {"studyTitle": "Two"}
+
+    def test_creating_over_existing_draft_conflicts(self, mock_drafts_dynamodb, api_gw_event):
+        _save(api_gw_event, "new", {"studyTitle": "One"})
+        status, body = _save(api_gw_event, "new", {"studyTitle": "Other tab"})
+        assert status == 409
+        assert body["error"] == "Draft new is at revision 1, not 0"
+
+    def test_incomplete_values_allowed(self, mock_drafts_dynamodb, api_gw_event):
+        data = {"contactEmail": "jane@", "sampleSize": "", "proposalAvailable": {"answer": "yes"}}
+        assert _save(api_gw_event, "new", data)[0] == 200
+
+    def test_types_and_lengths_still_checked(self, mock_drafts_dynamodb, api_gw_event):
+        status, body = _save(api_gw_event, "new", {"studyId": "x" * 51, "studyTitle": 5})
+        assert status == 400
+        assert [d["field"] for d in body["details"]] == ["studyId", "studyTitle"]
+
+    def test_rejects_unknown_fields_and_bad_revision(self, mock_drafts_dynamodb, api_gw_event):
+        assert _save(api_gw_event, "new", {"userId": "x"})[0] == 400
+        assert _save(api_gw_event, "new", {}, revision=-1)[0] == 400
+        assert _call(save_handler, api_gw_event, "new", {"revision": 0})[0] == 400
+
+    def test_does_not_touch_submissions(self, mock_drafts_dynamodb, api_gw_event):
+        _save(api_gw_event, "new", {"studyTitle": "Draft only"})
+        assert list_user_submissions("dev-user-001") == []
+
+
+class TestGetAndDeleteDraft:
+    def test_get_returns_data_and_revision(self, mock_drafts_dynamodb, api_gw_event):
+        _save(api_gw_event, "new", {"studyTitle": "Mine"})
+        status, body = _call(get_handler, api_gw_event, "new")
+        assert status == 200
+        assert body["revision"] == 1
+        assert body["data"] == {"studyTitle": "Mine"}
+
+    def test_get_missing_is_404(self, mock_drafts_dynamodb, api_gw_event):
+        assert _call(get_handler, api_gw_event, "new")[0] == 404
+
+    def test_delete(self, mock_drafts_dynamodb, api_gw_event):
+        _save(api_gw_event, "new", {"studyTitle": "Mine"})
+        assert _call(delete_handler, api_gw_event, "new")[0] == 200
+        assert get_draft("dev-user-001", "new") is None
+
+
+class TestSubmitDraft:
+    def test_new_draft_becomes_version_1(self, mock_drafts_dynamodb, api_gw_event, valid_submission_body):
+        _save(api_gw_event, "new", valid_submission_body)
+        status, body = _call(submit_handler, api_gw_event, "new")
+        assert status == 201
+        assert body["version"] == 1
+        history = get_version_history(body["submissionId"])
+        assert history[0]["studyTitle"] == valid_submission_body["studyTitle"]
+        assert get_draft("dev-user-001", "new") is None
+
+    def test_edit_draft_becomes_next_version(self, mock_drafts_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        sub_id = json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+
+        _save(api_gw_event, sub_id, {**valid_submission_body, "studyTitle": "Edited"})
+        status, body = _call(submit_handler, api_gw_event, sub_id)
+        assert status == 200
+        assert body["version"] == 2
+        history = get_version_history(sub_id)
+        assert [(h["version"], h["status"]) for h in history] == [(2, "active"), (1, "superseded")]
+        assert history[0]["studyTitle"] == "Edited"
+
+    def test_unchanged_edit_draft_keeps_current_version(self, mock_drafts_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        sub_id = json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+
+        _save(api_gw_event, sub_id, valid_submission_body)
+        status, body = _call(submit_handler, api_gw_event, sub_id)
+        assert status == 200
+        assert body["unchanged"] is True
+        assert len(get_version_history(sub_id)) == 1
+        assert get_draft("dev-user-001", sub_id) is None
+
+    def test_incomplete_draft_fails_full_validation(self, mock_drafts_dynamodb, api_gw_event):
+        _save(api_gw_event, "new", {"studyTitle": "Only a title"})
+        status, body = _call(submit_handler, api_gw_event, "new")
+        assert status == 400
+        assert any(d["field"] == "studyId" for d in body["details"])
+        assert get_draft("dev-user-001", "new") is not None
+
+    def test_missing_draft_or_submission(self, mock_drafts_dynamodb, api_gw_event, valid_submission_body):
+        assert _call(submit_handler, api_gw_event, "new")[0] == 404
+        _save(api_gw_event, "gone-id", valid_submission_body)
+        assert _call(submit_handler, api_gw_event, "gone-id")[0] == 404
+
+    def test_store_failures_are_500(self, mock_drafts_dynamodb, api_gw_event, valid_submission_body):
+        from unittest.mock import patch
+
+        with patch("submit_draft.app.get_draft", side_effect=RuntimeError("throttled")):
+            status, body = _call(submit_handler, api_gw_event, "new")
+        assert (status, body["error"]) == (500, "Failed to load draft")
+
+        _save(api_gw_event, "sub-1", valid_submission_body)
+        with patch("submit_draft.app.get_latest_active_version", side_effect=RuntimeError("throttled")):
+            assert _call(submit_handler, api_gw_event, "sub-1")[0] == 500
+        assert get_draft("dev-user-001", "sub-1") is not None
@@ -0,0 +1,100 @@
+"""Synthetic submission generator (scripts/generate_submissions.py)."""
+
+import importlib.util
+import json
+import os
+from collections import Counter
+
+import pytest
+
+from shared import constants
+from shared.validator import validate_submission
+
+_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "generate_submissions.py")
+_spec = importlib.util.spec_from_file_location("generate_submissions", _PATH)
+generate_submissions = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(generate_submissions)
+
+Generator = generate_submissions.Generator
+
+
+def _form(item):
+    return {k: v for k, v in item.items() if k not in constants.METADATA_FIELDS}
+
+
+def _studies(count=300, **kwargs):
+    return list(Generator(**kwargs).studies(count))
+
+
+class TestGenerator:
+    def test_every_version_is_valid(self):
+        for items, _ in _studies():
+            for item in items:
+                if item["version"]:
+                    validate_submission(_form(item))
+                    assert item["studyType"] in constants.VALID_STUDY_TYPES
+                    assert set(item["intendedPrimaryUser"]) <= constants.VALID_PRIMARY_USER_TYPES
+
+    def test_history_statuses_and_claims(self):
+        for items, _ in _studies():
+            versions = [item for item in items if item["version"]]
+            assert [item["version"] for item in versions] == list(range(1, len(versions) + 1))
+            assert {item["status"] for item in versions[:-1]} <= {"superseded"}
+            assert len({item["submissionId"] for item in versions}) == 1
+            claims = [item for item in items if not item["version"]]
+            if versions[-1]["status"] == "active":
+                assert [claim["ownerSubmissionId"] for claim in claims] == [versions[-1]["submissionId"]]
+            else:
+                assert versions[-1]["status"] == "archived" and not claims
+
+    def test_distributions_are_configurable(self):
+        studies = _studies(100, versions={3: 1}, archive_rate=1.0, users_per_center=1, files={2: 1})
+        for items, files in studies:
+            assert [item["version"] for item in items] == [1, 2, 3]
+            assert items[-1]["status"] == "archived"
+            prefix = f"{items[-1]['createdAt'][:10]}_{items[-1]['submissionId']}/files/"
+            assert len(files) == 2 and all(key.startswith(prefix) for key, _ in files)
+        owners = {items[0]["userId"] for items, _ in studies}
+        assert len(owners) <= len(generate_submissions.CENTERS)
+
+    def test_text_length(self):
+        short = _studies(200, text_length=20)
+        long = _studies(200, text_length=1000)
+        mean = lambda studies: sum(len(s[0][0]["studyIndicators"]) for s in studies) / len(studies)  # noqa: E731
+        assert mean(short) < 100 < mean(long) <= constants.MAX_STUDY_INDICATORS
+
+    def test_same_seed_same_items(self):
+        count = generate_submissions.BLOCK + 10
+        assert list(Generator(seed=3).studies(count)) == list(Generator(seed=3).studies(count))
+        assert _studies(5, seed=3) != _studies(5, seed=4)
+
+    def test_parse_weights(self):
+        assert generate_submissions.parse_weights("1:55,2:25,3") == {1: 55, 2: 25, 3: 1}
+        with pytest.raises(ValueError):
+            generate_submissions.parse_weights("1:0")
+
+
+class TestOutputs:
+    def test_ndjson(self, tmp_path, capsys):
+        out, files_out = tmp_path / "items.ndjson", tmp_path / "files.ndjson"
+        assert generate_submissions.main([
+            "--studies", "50", "--out", str(out), "--files-out", str(files_out), "--processes", "1",
+        ]) == 0
+        items = [json.loads(line) for line in out.read_text().splitlines()]
+        assert len({item["submissionId"] for item in items if item["version"]}) == 50
+        assert all("key" in json.loads(line) for line in files_out.read_text().splitlines())
+        assert "50 studies" in capsys.readouterr().out
+
+    def test_store(self, mock_dynamodb, capsys):
+        from shared import db
+
+        assert generate_submissions.main(["--studies", "40", "--store", "--processes", "1", "--workers", "2"]) == 0
+        active = db.list_all_submissions()
+        archived = db.list_all_submissions("archived")
+        assert len(active) + len(archived) == 40
+        study_id = active[0]["studyId"]
+        assert db.get_study_id_claim(study_id)["ownerSubmissionId"] == active[0]["submissionId"]
+        centers = Counter(item["leadCenter"] for item in active)
+        prefix = db.suggestion_key(active[0]["leadCenter"])[:3]
+        suggested = {s["value"]: s["count"] for s in db.get_suggestions("leadCenter", prefix)}
+        assert suggested[active[0]["leadCenter"]] == centers[active[0]["leadCenter"]]
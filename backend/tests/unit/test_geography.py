@@ -0,0 +1,72 @@
+"""Tests for shared.geography — the region/country/subnational reference index."""
+
+import importlib.util
+import os
+
+import pytest
+from shared import geography
+from shared.geography import (
+    is_region, is_country, is_subnational, region_for_country,
+    regions_for_countries, countries_for_subnational, normalize_geography,
+)
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "generate_geography.py")
+
+
+class TestIndex:
+    def test_loaded_lazily_and_once(self, monkeypatch):
+        monkeypatch.setattr(geography, "_index", None)
+        assert is_country("KE")
+        index = geography._index
+        assert index is not None
+        assert is_subnational("KE-01")
+        assert geography._index is index
+
+    def test_lookups(self):
+        assert is_region("ESA")
+        assert not is_region("MARS")
+        assert is_country("KE")
+        assert not is_country("XX")
+        assert is_subnational("KE-47")
+        assert not is_subnational("KE-99")
+        assert not is_subnational("KE")
+
+    def test_region_for_country(self):
+        assert region_for_country("KE") == "ESA"
+        assert region_for_country("HK") is None  # offered in the form, no CGIAR region
+        assert region_for_country("XX") is None
+
+    def test_index_covers_all_subnational_units(self):
+        assert len(geography._load_index()[1]) == 5020
+
+    def test_generated_index_is_up_to_date(self):
+        spec = importlib.util.spec_from_file_location("generate_geography", SCRIPT_PATH)
+        generator = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(generator)
+        with open(generator.OUTPUT_PATH, encoding="utf-8") as f:
+            assert f.read() == generator.render(), (
+                "shared/geography.json is stale; run python scripts/generate_geography.py"
+            )
+
+
+class TestDerivation:
+    def test_regions_for_countries(self):
+        assert regions_for_countries(["UG", "KE", "IN", "HK"]) == ["ESA", "SA"]
+
+    def test_countries_for_subnational(self):
+        assert countries_for_subnational(["KE-01", "UG-314", "KE-02"]) == ["KE", "UG"]
+
+    def test_national_derives_regions(self):
+        data = {"geographicScope": "national", "studyCountries": ["KE", "IN"], "studyRegions": ["LAC"]}
+        assert normalize_geography(data)["studyRegions"] == ["ESA", "SA"]
+
+    def test_sub_national_derives_countries_and_regions(self):
+        data = {"geographicScope": "sub_national", "studySubnational": ["NG-AB", "KE-01"]}
+        normalize_geography(data)
+        assert data["studyCountries"] == ["KE", "NG"]
+        assert data["studyRegions"] == ["ESA", "WCA"]
+
+    @pytest.mark.parametrize("scope", ["global", "regional", "site_specific", None])
+    def test_other_scopes_untouched(self, scope):
+        data = {"geographicScope": scope, "studyRegions": ["LAC"], "studyCountries": ["KE"]}
+        assert normalize_geography(dict(data)) == data
@@ -0,0 +1,48 @@
+"""Tests for get_reference_data Lambda handler."""
+
+import json
+
+import pytest
+
+from get_reference_data.app import lambda_handler
+
+
+class TestGetReferenceData:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_gw_event):
+        self.event = api_gw_event
+
+    def _get(self, dataset, params=None, headers=None):
+        self.event["pathParameters"] = {"dataset": dataset}
+        self.event["queryStringParameters"] = params
+        self.event["headers"] = headers or {}
+        return lambda_handler(self.event, None)
+
+    def test_searches_subnational_units(self):
+        response = self._get("subnational", {"q": "baringo", "limit": "1"})
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {
+            "dataset": "subnational", "query": "baringo", "count": 1,
+            "results": [{"value": "KE-01", "label": "Baringo (Kenya)", "group": "KE"}],
+        }
+        assert response["headers"]["Cache-Control"] == "public, max-age=86400"
+        assert response["headers"]["ETag"].startswith('"')
+
+    def test_searches_projects(self):
+        body = json.loads(self._get("w3-bilateral", {"q": "bluetech"})["body"])
+        assert body["results"][0]["group"] == "WorldFish"
+
+    def test_matching_etag_returns_304(self):
+        etag = self._get("subnational", {"q": "KE"})["headers"]["ETag"]
+        response = self._get("subnational", {"q": "KE"}, {"If-None-Match": etag})
+        assert response["statusCode"] == 304
+        assert response["body"] == ""
+
+    def test_unknown_dataset(self):
+        assert self._get("countries")["statusCode"] == 404
+
+    @pytest.mark.parametrize("params", [
+        {"q": "x" * 201}, {"limit": "0"}, {"limit": "101"}, {"limit": "ten"},
+    ])
+    def test_rejects_bad_parameters(self, params):
+        assert self._get("subnational", params)["statusCode"] == 400
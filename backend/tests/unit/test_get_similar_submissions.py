@@ -0,0 +1,73 @@
+import json
+import os
+
+import boto3
+import pytest
+
+from shared import similarity
+from create_submission.app import lambda_handler as create_handler
+from get_similar_submissions.app import lambda_handler as similar_handler
+
+os.environ["FILES_BUCKET"] = "test-files-bucket"
+
+
+class TestGetSimilarSubmissions:
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        boto3.client("s3", region_name="eu-central-1").create_bucket(
+            Bucket="test-files-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        similarity.reset_cache()
+        self.event = api_gw_event
+        self.body = valid_submission_body
+        yield
+        similarity.reset_cache()
+
+    def _create(self, **changes):
+        self.event["body"] = json.dumps({**self.body, **changes})
+        return json.loads(create_handler(self.event, None)["body"])
+
+    def _similar(self, submission_id, params=None):
+        self.event["pathParameters"] = {"id": submission_id}
+        self.event["queryStringParameters"] = params
+        response = similar_handler(self.event, None)
+        return response["statusCode"], json.loads(response["body"])
+
+    def _index(self, *created):
+        index = similarity.SimilarityIndex()
+        for submission_id, changes in created:
+            index.add(submission_id, {**self.body, **changes})
+        similarity.save_index(index)
+
+    def test_returns_indexed_neighbours(self):
+        first = self._create()["submissionId"]
+        second = self._create(studyId="TEST-002", studyTitle="Test study title (2)")["submissionId"]
+        self._index((first, {}), (second, {"studyId": "TEST-002", "studyTitle": "Test study title (2)"}))
+
+        status, body = self._similar(first)
+        assert status == 200
+        assert body["count"] == 1
+        assert body["similar"][0]["submissionId"] == second
+        assert body["similar"][0]["studyId"] == "TEST-002"
+
+    def test_falls_back_to_stored_version_when_not_indexed_yet(self):
+        first = self._create()["submissionId"]
+        self._index(("other", {"studyId": "TEST-009"}))
+        status, body = self._similar(first)
+        assert status == 200
+        assert [s["submissionId"] for s in body["similar"]] == ["other"]
+
+    def test_unknown_submission(self):
+        status, _ = self._similar("missing")
+        assert status == 404
+
+    def test_rejects_bad_limit(self):
+        for limit in ("0", "51", "many"):
+            status, _ = self._similar("x", {"limit": limit})
+            assert status == 400
+
+    def test_create_warns_about_similar_studies(self):
+        self._index(("existing", {"studyId": "OLD-1"}))
+        body = self._create()
+        assert [s["studyId"] for s in body["similar"]] == ["OLD-1"]
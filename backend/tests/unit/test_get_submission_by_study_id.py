@@ -0,0 +1,47 @@
+import json
+from create_submission.app import lambda_handler as create_handler
+from delete_submission.app import lambda_handler as delete_handler
+from get_submission_by_study_id.app import lambda_handler as lookup_handler
+
+
+def _create(api_gw_event, body):
+    api_gw_event["body"] = json.dumps(body)
+    return json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+
+
+def _lookup(api_gw_event, study_id):
+    api_gw_event["pathParameters"] = {"studyId": study_id}
+    api_gw_event["body"] = None
+    response = lookup_handler(api_gw_event, None)
+    return response, json.loads(response["body"])
+
+
+class TestGetSubmissionByStudyId:
+    def test_resolves_study_id(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create(api_gw_event, valid_submission_body)
+        response, body = _lookup(api_gw_event, "TEST-001")
+        assert response["statusCode"] == 200
+        assert body == {"studyId": "TEST-001", "submissionId": sub_id}
+        assert response["headers"]["Cache-Control"] == "private, no-cache"
+
+    def test_matching_ignores_case_and_spaces(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create(api_gw_event, valid_submission_body)
+        _, body = _lookup(api_gw_event, "%20test-001")
+        assert body["submissionId"] == sub_id
+
+    def test_not_found(self, mock_dynamodb, api_gw_event):
+        response, _ = _lookup(api_gw_event, "NOPE-1")
+        assert response["statusCode"] == 404
+
+    def test_archived_submission_releases_study_id(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create(api_gw_event, valid_submission_body)
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["body"] = None
+        delete_handler(api_gw_event, None)
+
+        response, _ = _lookup(api_gw_event, "TEST-001")
+        assert response["statusCode"] == 404
+
+    def test_blank_study_id(self, mock_dynamodb, api_gw_event):
+        response, _ = _lookup(api_gw_event, " ")
+        assert response["statusCode"] == 400
@@ -1,4 +1,7 @@
 import json
+
+import pytest
+
 from create_submission.app import lambda_handler as create_handler
 from update_submission.app import lambda_handler as update_handler
 from get_submission_history.app import lambda_handler as history_handler
@@ -31,3 +34,69 @@ class TestGetSubmissionHistory:
         api_gw_event["pathParameters"] = {"id": "nonexistent-id"}
         response = history_handler(api_gw_event, None)
         assert response["statusCode"] == 404
+
+    def test_timeline_view_returns_metadata_only(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        response = create_handler(api_gw_event, None)
+        sub_id = json.loads(response["body"])["submissionId"]
+
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["body"] = None
+        api_gw_event["queryStringParameters"] = {"view": "timeline"}
+        response = history_handler(api_gw_event, None)
+        assert response["statusCode"] == 200
+        body = json.loads(response["body"])
+        assert body["count"] == 1
+        assert body["nextCursor"] is None
+        assert set(body["versions"][0]) == {"submissionId", "version", "status", "modifiedBy", "updatedAt"}
+
+    def test_timeline_view_paginates_with_cursor(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        response = create_handler(api_gw_event, None)
+        sub_id = json.loads(response["body"])["submissionId"]
+
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        for title in ("Second", "Third"):
+            api_gw_event["body"] = json.dumps({**valid_submission_body, "studyTitle": title})
+            update_handler(api_gw_event, None)
+
+        api_gw_event["body"] = None
+        seen = []
+        cursor = None
+        while True:
+            params = {"view": "timeline", "limit": "2"}
+            if cursor:
+                params["cursor"] = cursor
+            api_gw_event["queryStringParameters"] = params
+            body = json.loads(history_handler(api_gw_event, None)["body"])
+            seen.extend(v["version"] for v in body["versions"])
+            cursor = body["nextCursor"]
+            if not cursor:
+                break
+        assert seen == [3, 2, 1]
+
+    def test_timeline_rejects_bad_cursor(self, mock_dynamodb, api_gw_event):
+        api_gw_event["pathParameters"] = {"id": "some-id"}
+        api_gw_event["queryStringParameters"] = {"view": "timeline", "cursor": "not-a-cursor!"}
+        response = history_handler(api_gw_event, None)
+        assert response["statusCode"] == 400
+
+    @pytest.mark.parametrize("key", [
+        {"submissionId": "some-id", "version": "abc"},
+        {"foo": 1},
+        {"submissionId": "other-id", "version": 2},
+    ])
+    def test_timeline_rejects_tampered_cursor(self, mock_dynamodb, api_gw_event, key):
+        from shared.pagination import encode_cursor
+
+        api_gw_event["pathParameters"] = {"id": "some-id"}
+        api_gw_event["queryStringParameters"] = {"view": "timeline", "cursor": encode_cursor(key)}
+        response = history_handler(api_gw_event, None)
+        assert response["statusCode"] == 400
+        assert json.loads(response["body"])["error"] == "Invalid pagination cursor"
+
+    def test_timeline_not_found(self, mock_dynamodb, api_gw_event):
+        api_gw_event["pathParameters"] = {"id": "nonexistent-id"}
+        api_gw_event["queryStringParameters"] = {"view": "timeline"}
+        response = history_handler(api_gw_event, None)
+        assert response["statusCode"] == 404
@@ -0,0 +1,51 @@
+import json
+from create_submission.app import lambda_handler as create_handler
+from update_submission.app import lambda_handler as update_handler
+from get_submission_version.app import lambda_handler as version_handler
+from shared.response import IMMUTABLE_CACHE_CONTROL, NO_CACHE_CONTROL
+
+
+def _create_with_update(api_gw_event, valid_submission_body):
+    api_gw_event["body"] = json.dumps(valid_submission_body)
+    response = create_handler(api_gw_event, None)
+    sub_id = json.loads(response["body"])["submissionId"]
+
+    valid_submission_body["studyTitle"] = "Updated Title"
+    api_gw_event["pathParameters"] = {"id": sub_id}
+    api_gw_event["body"] = json.dumps(valid_submission_body)
+    update_handler(api_gw_event, None)
+    api_gw_event["body"] = None
+    return sub_id
+
+
+class TestGetSubmissionVersion:
+    def test_returns_superseded_version_as_immutable(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_with_update(api_gw_event, valid_submission_body)
+
+        api_gw_event["pathParameters"] = {"id": sub_id, "version": "1"}
+        response = version_handler(api_gw_event, None)
+        assert response["statusCode"] == 200
+        assert response["headers"]["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        body = json.loads(response["body"])
+        assert body["version"] == 1
+        assert body["status"] == "superseded"
+        assert body["studyTitle"] == "Test Study Title"
+
+    def test_active_version_is_not_cached(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_with_update(api_gw_event, valid_submission_body)
+
+        api_gw_event["pathParameters"] = {"id": sub_id, "version": "2"}
+        response = version_handler(api_gw_event, None)
+        assert response["statusCode"] == 200
+        assert response["headers"]["Cache-Control"] == NO_CACHE_CONTROL
+        assert json.loads(response["body"])["studyTitle"] == "Updated Title"
+
+    def test_not_found(self, mock_dynamodb, api_gw_event):
+        api_gw_event["pathParameters"] = {"id": "nonexistent-id", "version": "1"}
+        response = version_handler(api_gw_event, None)
+        assert response["statusCode"] == 404
+
+    def test_invalid_version(self, mock_dynamodb, api_gw_event):
+        api_gw_event["pathParameters"] = {"id": "some-id", "version": "abc"}
+        response = version_handler(api_gw_event, None)
+        assert response["statusCode"] == 400
@@ -0,0 +1,52 @@
+"""Tests for get_suggestions Lambda handler."""
+
+import json
+
+import pytest
+
+from create_submission.app import lambda_handler as create_handler
+from get_suggestions.app import lambda_handler
+
+
+class TestGetSuggestions:
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        self.event = api_gw_event
+        self.body = valid_submission_body
+
+    def _create(self, **changes):
+        self.event["body"] = json.dumps({**self.body, **changes})
+        assert create_handler(self.event, None)["statusCode"] == 201
+
+    def _suggest(self, field, params=None):
+        self.event["pathParameters"] = {"field": field}
+        self.event["queryStringParameters"] = params
+        response = lambda_handler(self.event, None)
+        return response["statusCode"], json.loads(response["body"]), response["headers"]
+
+    def test_returns_most_used_values_for_prefix(self):
+        self._create()
+        self._create(studyId="TEST-002", commissioningSource="CGIAR Science Program")
+        self._create(studyId="TEST-003", commissioningSource="cgiar  science program")
+
+        status, body, headers = self._suggest("commissioningSource", {"prefix": "CGIAR"})
+        assert status == 200
+        assert body == {"field": "commissioningSource", "prefix": "CGIAR", "suggestions": [
+            {"value": "CGIAR Science Program", "count": 2},
+            {"value": "CGIAR System Board", "count": 1},
+        ]}
+        assert headers["Cache-Control"] == "private, max-age=60"
+
+    def test_without_prefix_returns_top_values(self):
+        self._create()
+        _, body, _ = self._suggest("fundingSource", {"limit": "1"})
+        assert body["suggestions"] == [{"value": "Bill & Melinda Gates Foundation", "count": 1}]
+
+    @pytest.mark.parametrize("field, params", [
+        ("studyTitle", None), ("", None),
+        ("leadCenter", {"prefix": "x" * 201}),
+        ("leadCenter", {"limit": "0"}), ("leadCenter", {"limit": "51"}), ("leadCenter", {"limit": "x"}),
+    ])
+    def test_rejects_bad_requests(self, field, params):
+        status, _, _ = self._suggest(field, params)
+        assert status == 400
@@ -76,3 +76,23 @@ class TestGetUploadUrl:
         }
         response = lambda_handler(event, None)
         assert response["statusCode"] == 404
+
+    @patch("get_upload_url.app.s3_client")
+    def test_import_url_is_under_the_callers_prefix(self, mock_s3, api_gw_event):
+        from get_upload_url.app import lambda_handler
+
+        mock_s3.generate_presigned_url.return_value = "https://s3.amazonaws.com/presigned-url"
+
+        event = {
+            **api_gw_event,
+            "httpMethod": "POST",
+            "resource": "/submissions/import/upload-url",
+            "body": json.dumps({"filename": "studies.txt", "contentType": "text/csv"}),
+        }
+        response = lambda_handler(event, None)
+        assert response["statusCode"] == 200
+        key = json.loads(response["body"])["key"]
+        assert key.startswith("imports/dev-user-001/") and key.endswith("_studies.csv")
+
+        event["body"] = json.dumps({"filename": "photo.png", "contentType": "image/png"})
+        assert lambda_handler(event, None)["statusCode"] == 400
@@ -0,0 +1,48 @@
+"""Import-time and memory budgets of the Lambda handlers (scripts/import_budget.py)."""
+
+import importlib.util
+import os
+
+import pytest
+
+_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "import_budget.py")
+_spec = importlib.util.spec_from_file_location("import_budget", _PATH)
+import_budget = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(import_budget)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       202 |        202 |   _io
+import time:       435 |       1129 | _frozen_importlib_external
+import time:      2323 |       5273 |     botocore.exceptions
+import time:       274 |      40132 | create_submission.app
+"""
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return import_budget._probe()
+
+
+class TestImportBudget:
+    def test_parse_importtime_keeps_top_level_modules(self):
+        assert import_budget.parse_importtime(SAMPLE) == {
+            "_frozen_importlib_external": 1129,
+            "create_submission.app": 40132,
+        }
+
+    def test_handlers_cover_functions_and_triggers(self):
+        found = import_budget.handlers()
+        assert "create_submission.app" in found
+        assert "router.app" in found
+        assert "cognito_triggers.custom_message" in found
+        assert "shared.app" not in found
+
+    @pytest.mark.parametrize("module", import_budget.handlers())
+    def test_handler_within_budget(self, module, baseline):
+        assert import_budget.check(module, repeat=2, baseline=baseline) == []
+
+    def test_eager_boto3_import_is_reported(self, baseline, monkeypatch):
+        monkeypatch.setitem(import_budget.BUDGETS, "boto3", (10_000, 10_000))
+        problems = import_budget.check("boto3", baseline=baseline)
+        assert problems == ["boto3: imports boto3, botocore.client, botocore.session at import time"]
@@ -0,0 +1,146 @@
+"""Tests for import_submissions Lambda handler."""
+
+import csv
+import io
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import boto3
+import pytest
+
+from shared.db import list_all_submissions
+from tests.unit.test_spreadsheet import build_xlsx
+
+os.environ["FILES_BUCKET"] = "test-files-bucket"
+
+
+def _to_row(body):
+    """Flatten a submission body into spreadsheet columns."""
+    row = {}
+    for field, value in body.items():
+        if isinstance(value, list):
+            row[field] = ";".join(value)
+        elif isinstance(value, dict):
+            row[field] = value["answer"]
+            if "link" in value:
+                row[f"{field}.link"] = value["link"]
+        else:
+            row[field] = str(value)
+    return row
+
+
+def _csv_bytes(rows):
+    columns = sorted({c for r in rows for c in r})
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=columns)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode()
+
+
+class TestImportSubmissions:
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_dynamodb, api_gw_event):
+        self.s3 = boto3.client("s3", region_name="eu-central-1")
+        self.s3.create_bucket(
+            Bucket="test-files-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        self.event = {**api_gw_event, "httpMethod": "POST", "path": "/submissions/import"}
+        # moto's TransactWriteItems is not thread-safe; real DynamoDB is
+        with patch("import_submissions.app.WRITE_WORKERS", 1):
+            yield
+
+    def _invoke(self, body, context=None):
+        from import_submissions.app import lambda_handler
+        self.event["body"] = json.dumps(body)
+        response = lambda_handler(self.event, context)
+        return response["statusCode"], json.loads(response["body"])
+
+    def test_imports_valid_rows_and_reports_invalid(self, valid_submission_body):
+        good = _to_row(valid_submission_body)
+        bad = {**good, "studyId": "BAD-1", "contactEmail": "not-an-email"}
+        self.s3.put_object(Bucket="test-files-bucket", Key="imports/dev-user-001/batch.csv",
+                           Body=_csv_bytes([good, bad, {**good, "studyId": "TEST-002"}]))
+
+        status, body = self._invoke({"key": "imports/dev-user-001/batch.csv"})
+        assert status == 200
+        assert body["status"] == "complete"
+        assert body["processedRows"] == 3
+        assert body["imported"] == 2
+        assert body["failed"] == 1
+        assert body["errors"][0]["row"] == 3
+        assert body["errors"][0]["studyId"] == "BAD-1"
+        assert body["errors"][0]["errors"][0]["field"] == "contactEmail"
+
+        stored = list_all_submissions()
+        assert {s["studyId"] for s in stored} == {"TEST-001", "TEST-002"}
+        assert stored[0]["intendedPrimaryUser"] == ["program", "donor"]
+        assert stored[0]["version"] == 1
+
+    def test_imports_xlsx(self, valid_submission_body):
+        row = _to_row(valid_submission_body)
+        columns = sorted(row)
+        buf = build_xlsx([columns, [row[c] for c in columns]])
+        self.s3.put_object(Bucket="test-files-bucket", Key="imports/dev-user-001/batch.xlsx", Body=buf.getvalue())
+
+        status, body = self._invoke({"key": "imports/dev-user-001/batch.xlsx"})
+        assert status == 200
+        assert body["imported"] == 1
+        assert body["errors"] == []
+
+    def test_imports_many_rows_in_chunks(self, valid_submission_body):
+        row = _to_row(valid_submission_body)
+        rows = [{**row, "studyId": f"S-{i}"} for i in range(60)]
+        self.s3.put_object(Bucket="test-files-bucket", Key="imports/dev-user-001/many.csv", Body=_csv_bytes(rows))
+
+        status, body = self._invoke({"key": "imports/dev-user-001/many.csv"})
+        assert body["imported"] == 60
+        assert len(list_all_submissions()) == 60
+
+    def test_checkpoints_when_out_of_time_and_resumes(self, valid_submission_body):
+        row = _to_row(valid_submission_body)
+        rows = [{**row, "studyId": f"S-{i}"} for i in range(5)]
+        self.s3.put_object(Bucket="test-files-bucket", Key="imports/dev-user-001/slow.csv", Body=_csv_bytes(rows))
+
+        no_time = SimpleNamespace(get_remaining_time_in_millis=lambda: 0)
+        status, body = self._invoke({"key": "imports/dev-user-001/slow.csv", "resumeFrom": 4}, no_time)
+        assert body["status"] == "partial"
+        assert body["nextRow"] == 4
+        assert body["imported"] == 0
+
+        status, body = self._invoke({"key": "imports/dev-user-001/slow.csv", "resumeFrom": body["nextRow"]})
+        assert body["status"] == "complete"
+        assert body["imported"] == 3
+        assert {s["studyId"] for s in list_all_submissions()} == {"S-2", "S-3", "S-4"}
+
+    def test_missing_file(self):
+        status, _ = self._invoke({"key": "imports/dev-user-001/missing.csv"})
+        assert status == 404
+
+    @pytest.mark.parametrize("body", [
+        {}, {"key": "other/batch.csv"}, {"key": "imports/dev-user-001/batch.pdf"},
+        {"key": "imports/dev-user-001/../secret.csv"}, {"key": "imports/dev-user-001/batch.csv", "resumeFrom": 1},
+        {"key": "imports/batch.csv"}, {"key": "imports/other-user/batch.csv"},
+    ])
+    def test_rejects_bad_requests(self, body):
+        status, _ = self._invoke(body)
+        assert status == 400
+
+    def test_rejects_duplicate_and_taken_study_ids(self, valid_submission_body):
+        row = _to_row(valid_submission_body)
+        rows = [row, {**row, "studyId": "test-001"}, {**row, "studyId": "TEST-002"}]
+        self.s3.put_object(Bucket="test-files-bucket", Key="imports/dev-user-001/dupes.csv", Body=_csv_bytes(rows))
+        _, body = self._invoke({"key": "imports/dev-user-001/dupes.csv"})
+        assert body["imported"] == 2
+        assert body["errors"][0]["row"] == 3
+        assert "also on row 2" in body["errors"][0]["errors"][0]["message"]
+
+        # A second import of the same file clashes with the stored claims
+        _, body = self._invoke({"key": "imports/dev-user-001/dupes.csv"})
+        assert body["imported"] == 0
+        assert [e["row"] for e in body["errors"]] == [2, 3, 4]
+        assert "already used" in body["errors"][0]["errors"][0]["message"]
+        assert len(list_all_submissions()) == 2
@@ -13,7 +13,7 @@ class TestListAllSubmissions:
         event_b = {**api_gw_event, "requestContext": {
             "authorizer": {"claims": {"sub": "user-b", "email": "b@cgiar.org"}}
         }}
-        event_b["body"] = json.dumps({**valid_submission_body, "studyTitle": "User B Study"})
+        event_b["body"] = json.dumps({**valid_submission_body, "studyId": "TEST-002", "studyTitle": "User B Study"})
         create_handler(event_b, None)
 
         # List all — should see both
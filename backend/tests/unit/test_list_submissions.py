@@ -8,6 +8,7 @@ class TestListSubmissions:
         # Create two submissions
         api_gw_event["body"] = json.dumps(valid_submission_body)
         create_handler(api_gw_event, None)
+        api_gw_event["body"] = json.dumps({**valid_submission_body, "studyId": "TEST-002"})
         create_handler(api_gw_event, None)
 
         # List
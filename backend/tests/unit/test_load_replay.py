@@ -0,0 +1,162 @@
+"""Tests for the load-replay harness (scripts/load_replay.py)."""
+
+import importlib.util
+import json
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("yaml")
+
+_SCRIPTS = os.path.join(os.path.dirname(__file__), "..", "..", "scripts")
+_spec = importlib.util.spec_from_file_location("load_replay", os.path.join(_SCRIPTS, "load_replay.py"))
+load_replay = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(load_replay)
+_spec = importlib.util.spec_from_file_location("dev_server", os.path.join(_SCRIPTS, "dev_server.py"))
+dev_server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dev_server)
+
+from shared.validator import validate_submission  # noqa: E402
+
+CLAIMS = {"sub": "load-user-000", "email": "load@cgiar.org", "name": "Load Test"}
+TEST_TABLES = {
+    "SubmissionsTable": "test-submissions",
+    "DraftsTable": "test-drafts",
+    "SuggestionsTable": "test-suggestions",
+    "UsersTable": "test-users",
+}
+NO_FILES = {"dashboard": 3, "mine": 3, "create": 2, "update": 2, "archive": 1}
+
+
+class FakeTarget:
+    """Answers every request at once: 201 with a new id for creates, else 200."""
+
+    def __init__(self, fail_route=None):
+        self.fail_route = fail_route
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, method, path, body=None, user=None):
+        with self._lock:
+            self.sent.append((method, path))
+            n = len(self.sent)
+        if self.fail_route and path.startswith(self.fail_route):
+            raise ConnectionResetError()
+        if method == "POST" and path == "/submissions":
+            return 201, json.dumps({"submissionId": f"sub-{n}"}).encode()
+        return 200, b"{}"
+
+
+class TestHelpers:
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert load_replay.percentile(values, 50) == 50
+        assert load_replay.percentile(values, 99) == 99
+        assert load_replay.percentile([7], 95) == 7
+        assert load_replay.percentile([], 50) is None
+
+    def test_parse_mix(self):
+        assert load_replay.parse_mix("dashboard:3,create") == {"dashboard": 3.0, "create": 1.0}
+        with pytest.raises(ValueError):
+            load_replay.parse_mix("nope:1")
+        with pytest.raises(ValueError):
+            load_replay.parse_mix("mine:0")
+
+
+class TestWorkload:
+    def test_id_operations_create_until_there_are_studies(self):
+        workload = load_replay.Workload(users=3, prefix="T")
+        request = workload.request("update")
+        assert (request.op, request.method, request.path) == ("create", "POST", "/submissions")
+        validate_submission(request.body)
+        assert request.body["studyId"] == "T-0000000"
+        assert request.user.startswith("load-user-")
+
+    def test_studies_are_checked_out_and_returned(self):
+        workload = load_replay.Workload(prefix="T")
+        create = workload.request("create")
+        workload.done(create, 201, json.dumps({"submissionId": "s1"}))
+
+        update = workload.request("update")
+        assert (update.route, update.path) == ("PUT /submissions/{id}", "/submissions/s1")
+        validate_submission(update.body)
+        # Checked out while in flight
+        assert workload.request("files").op == "create"
+        workload.done(update, 200, b"{}")
+
+        archive = workload.request("archive")
+        assert archive.path == "/submissions/s1"
+        workload.done(archive, 200, b"{}")
+        assert workload.request("upload").op == "create"
+
+    def test_failed_requests_return_their_study(self):
+        workload = load_replay.Workload(prefix="T")
+        workload.done(workload.request("create"), 201, json.dumps({"submissionId": "s1"}))
+        archive = workload.request("archive")
+        workload.done(archive, None, None)
+        assert workload.request("update").path == "/submissions/s1"
+
+    def test_dashboard_lists_active_studies(self):
+        request = load_replay.Workload().request("dashboard")
+        assert (request.route, request.path) == ("GET /submissions/all", "/submissions/all?status=active")
+
+
+class TestRun:
+    def test_closed_loop_summary(self):
+        target = FakeTarget(fail_route="/submissions/all")
+        source = load_replay.Workload({"dashboard": 1, "create": 1, "update": 1}, seed=3)
+        results = load_replay.run(target, source, concurrency=4, count=200)
+        assert len(results) == len(target.sent) == 200
+
+        summary = load_replay.summarize(results, elapsed=2.0)
+        total, dashboard = summary["total"], summary["GET /submissions/all"]
+        assert total["count"] == 200 and total["rps"] == 100.0
+        assert dashboard["errors"] == dashboard["count"] > 0
+        assert summary["POST /submissions"]["error_rate"] == 0.0
+        assert total["p50"] <= total["p95"] <= total["p99"] <= total["max"]
+
+    def test_connection_errors_keep_the_mix(self):
+        target = FakeTarget(fail_route="/submissions/sub-")
+        source = load_replay.Workload({"create": 1, "update": 3}, seed=3)
+        results = load_replay.run(target, source, concurrency=4, count=200)
+        updates = [r for r in results if r.route == "PUT /submissions/{id}"]
+        assert len(updates) > 100 and all(r.error == "ConnectionResetError" for r in updates)
+
+    def test_saved_trace_replays_on_schedule(self, tmp_path):
+        path = tmp_path / "trace.ndjson"
+        entries = [{"t": i * 0.01, "method": "GET", "path": "/submissions?limit=5", "user": "u"} for i in range(5)]
+        path.write_text("".join(json.dumps(e) + "\n" for e in entries))
+        trace = load_replay.Trace(str(path), speed=2.0)
+        assert trace.timed
+        target = FakeTarget()
+        sent = []
+        results = load_replay.run(target, trace, concurrency=2, on_send=lambda t, r: sent.append(t))
+        assert [r.route for r in results] == ["GET /submissions"] * 5
+        assert sent == [0.0, 0.005, 0.01, 0.015, 0.02]
+
+
+class TestInProcess:
+    @pytest.fixture
+    def target(self, sqlite_store):
+        from moto import mock_aws
+
+        doc = dev_server.load_template()
+        for logical_id, name in TEST_TABLES.items():
+            doc["Resources"][logical_id]["Properties"]["TableName"] = name
+        with mock_aws():
+            template = dev_server.Template(doc)
+            dev_server.create_resources(template, CLAIMS)
+            yield load_replay.InProcessTarget(dev_server.DevServer(template, CLAIMS))
+
+    def test_workload_against_handlers(self, target, capsys):
+        source = load_replay.Workload(NO_FILES, users=4, seed=5)
+        for _ in range(10):
+            load_replay.execute(target, source, source.request("create"), 0)
+        results = load_replay.run(target, source, concurrency=4, count=80)
+        capsys.readouterr()
+
+        assert {r.status for r in results} <= {200, 201}, [r for r in results if r.status not in (200, 201)]
+        summary = load_replay.summarize(results, 1.0)
+        assert summary["total"]["errors"] == 0
+        assert {"GET /submissions/all", "POST /submissions", "PUT /submissions/{id}"} <= set(summary)
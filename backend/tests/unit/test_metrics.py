@@ -0,0 +1,140 @@
+"""Tests for the EMF handler metrics (shared/metrics.py)."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from shared import metrics
+from shared.metrics import handler_metrics
+
+
+def _emf_lines(capsys):
+    """The EMF documents printed so far."""
+    lines = capsys.readouterr().out.splitlines()
+    return [json.loads(line) for line in lines if line.startswith("{") and '"_aws"' in line]
+
+
+def _metric_names(record):
+    return [m["Name"] for m in record["_aws"]["CloudWatchMetrics"][0]["Metrics"]]
+
+
+class TestHandlerMetrics:
+    def test_api_invocation(self, mock_dynamodb, api_gw_event, valid_submission_body, capsys, monkeypatch):
+        from create_submission.app import lambda_handler
+
+        monkeypatch.setattr(metrics, "_cold", True)
+        api_gw_event.update(httpMethod="POST", resource="/submissions", body=json.dumps(valid_submission_body))
+        response = lambda_handler(api_gw_event, SimpleNamespace(function_name="meliaf-create", aws_request_id="r-1"))
+
+        [record] = _emf_lines(capsys)
+        assert record["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Function", "Route"]]
+        assert set(_metric_names(record)) <= set(record)
+        assert record["Function"] == "meliaf-create"
+        assert record["Route"] == "POST /submissions"
+        assert record["requestId"] == "r-1"
+        assert record["statusCode"] == 201
+        assert record["ColdStart"] == 1
+        assert record["Errors"] == 0
+        assert record["ResponseSize"] == len(response["body"])
+        operations = {(c["service"], c["operation"]) for c in record["awsCalls"]}
+        assert ("dynamodb", "TransactWriteItems") in operations
+        assert record["AWSCalls"] == sum(c["count"] for c in record["awsCalls"])
+        assert 0 < record["AWSTime"] <= record["Duration"]
+
+    def test_warm_invocation_without_aws_calls(self, api_gw_event, capsys, monkeypatch):
+        from create_submission.app import lambda_handler
+
+        monkeypatch.setattr(metrics, "_cold", False)
+        api_gw_event["body"] = "not json"
+        lambda_handler(api_gw_event, None)
+        [record] = _emf_lines(capsys)
+        assert record["Function"] == "create_submission"
+        assert record["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Function"]]
+        assert (record["ColdStart"], record["statusCode"], record["AWSCalls"]) == (0, 400, 0)
+
+    def test_exception_is_logged_and_raised(self, capsys):
+        @handler_metrics
+        def failing(event, context):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            failing({"Records": []}, None)
+        [record] = _emf_lines(capsys)
+        assert record["Errors"] == 1
+        assert record["error"] == "RuntimeError"
+
+    def test_router_logs_one_line_with_the_route(self, api_gw_event, capsys):
+        from router.app import lambda_handler
+
+        api_gw_event.update(
+            httpMethod="GET", path="/reference/subnational", resource="/{proxy+}",
+            pathParameters={"proxy": "reference/subnational"}, queryStringParameters={"q": "KE-01"},
+        )
+        lambda_handler(api_gw_event, None)
+        [record] = _emf_lines(capsys)
+        assert record["Function"] == "router"
+        assert record["Route"] == "GET /reference/{dataset}"
+
+    def test_calls_on_worker_threads_count(self, mock_dynamodb, api_gw_event, valid_submission_body, capsys):
+        from bulk_archive_submissions.app import lambda_handler as archive
+        from create_submission.app import lambda_handler as create
+
+        api_gw_event.update(httpMethod="POST", body=json.dumps(valid_submission_body))
+        submission_id = json.loads(create(api_gw_event, None)["body"])["submissionId"]
+        capsys.readouterr()
+
+        api_gw_event["body"] = json.dumps({"submissionIds": [submission_id]})
+        assert archive(api_gw_event, None)["statusCode"] == 200
+        [record] = _emf_lines(capsys)
+        assert "UpdateItem" in {c["operation"] for c in record["awsCalls"]}
+
+    def test_consumed_capacity_per_table_and_index(self, mock_dynamodb, api_gw_event, capsys):
+        from list_submissions.app import lambda_handler
+
+        api_gw_event.update(httpMethod="GET", resource="/submissions")
+        lambda_handler(api_gw_event, None)
+        [record] = _emf_lines(capsys)
+        indexes = {(c["table"], c["index"]) for c in record["capacity"]}
+        assert ("test-submissions", "ByUser") in indexes
+        assert record["ReadCapacityUnits"] == sum(c["read"] for c in record["capacity"]) > 0
+        assert record["WriteCapacityUnits"] == 0
+
+    def test_s3_requests_by_class(self, capsys):
+        from moto import mock_aws
+
+        from shared.aws import boto3
+
+        @handler_metrics
+        def handler(event, context):
+            s3 = boto3.client("s3", region_name="us-east-1")
+            s3.create_bucket(Bucket="files-bucket")
+            s3.put_object(Bucket="files-bucket", Key="k", Body=b"x")
+            s3.get_object(Bucket="files-bucket", Key="k")
+            s3.list_objects_v2(Bucket="files-bucket")
+            s3.delete_object(Bucket="files-bucket", Key="k")
+
+        with mock_aws():
+            handler({}, None)
+        [record] = _emf_lines(capsys)
+        assert record["s3"] == {"Other": 1, "Put": 1, "Get": 1, "List": 1, "Delete": 1}
+        assert [record[f"S3{op}Requests"] for op in ("List", "Put", "Get", "Delete")] == [1, 1, 1, 1]
+
+
+class TestConsumedCapacity:
+    def test_split_read_and_write_units(self):
+        response = {"ConsumedCapacity": [{
+            "TableName": "t", "CapacityUnits": 3.0,
+            "Table": {"ReadCapacityUnits": 0.5, "WriteCapacityUnits": 1.0},
+            "GlobalSecondaryIndexes": {"ByUser": {"WriteCapacityUnits": 1.5}},
+        }]}
+        assert metrics.consumed_capacity("TransactWriteItems", response) == [
+            ("t", None, 0.5, 1.0), ("t", "ByUser", 0.0, 1.5),
+        ]
+
+    def test_total_only_is_classified_by_operation(self):
+        assert metrics.consumed_capacity("Query", {"ConsumedCapacity": {"TableName": "t", "CapacityUnits": 2}}) \
+            == [("t", None, 2.0, 0.0)]
+        assert metrics.consumed_capacity("UpdateItem", {"ConsumedCapacity": {"TableName": "t", "CapacityUnits": 1}}) \
+            == [("t", None, 0.0, 1.0)]
+        assert metrics.consumed_capacity("GetItem", None) == []
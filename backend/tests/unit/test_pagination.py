@@ -0,0 +1,62 @@
+"""Tests for shared.pagination — cursor encoding and limit parsing."""
+
+import base64
+import decimal
+import pytest
+from shared.pagination import (
+    encode_cursor, decode_cursor, parse_limit, InvalidCursorError, MAX_PAGE_SIZE,
+)
+
+
+class TestCursor:
+    def test_round_trips_key_with_decimal(self):
+        key = {"submissionId": "sub-1", "version": decimal.Decimal("3")}
+        assert decode_cursor(encode_cursor(key)) == {"submissionId": "sub-1", "version": 3}
+
+    def test_empty_key_encodes_to_none(self):
+        assert encode_cursor(None) is None
+        assert encode_cursor({}) is None
+
+    def test_missing_cursor_decodes_to_none(self):
+        assert decode_cursor(None) is None
+        assert decode_cursor("") is None
+
+    def test_rejects_garbage(self):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("%%%")
+
+    def test_rejects_non_object_payload(self):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(base64.urlsafe_b64encode(b"[1, 2]").decode())
+
+    @pytest.mark.parametrize("key", [
+        {"foo": 1},
+        {"submissionId": "sub-1", "version": "abc"},
+        {"submissionId": "sub-1", "version": 1.5},
+        {"submissionId": "sub-1", "version": True},
+        {"submissionId": "sub-1", "version": 0},
+        {"submissionId": 7, "version": 1},
+        {"submissionId": "sub-1", "version": 1, "extra": "x"},
+    ])
+    def test_rejects_keys_that_are_not_submission_keys(self, key):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(encode_cursor(key))
+
+    def test_rejects_another_submissions_key(self):
+        cursor = encode_cursor({"submissionId": "sub-2", "version": 4})
+        assert decode_cursor(cursor, "sub-2") == {"submissionId": "sub-2", "version": 4}
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "sub-1")
+
+
+class TestParseLimit:
+    def test_defaults_when_missing(self):
+        assert parse_limit(None, default=10) == 10
+
+    def test_clamps_to_maximum(self):
+        assert parse_limit("100000") == MAX_PAGE_SIZE
+
+    @pytest.mark.parametrize("value", ["0", "-1", "abc"])
+    def test_rejects_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_limit(value)
@@ -0,0 +1,78 @@
+"""Tests for patch_submission Lambda handler."""
+
+import json
+
+from create_submission.app import lambda_handler as create_handler
+from patch_submission.app import lambda_handler as patch_handler
+from shared.db import get_latest_active_version
+
+
+def _create_submission(api_gw_event, valid_submission_body):
+    api_gw_event["body"] = json.dumps(valid_submission_body)
+    response = create_handler(api_gw_event, None)
+    return json.loads(response["body"])["submissionId"]
+
+
+def _patch(api_gw_event, sub_id, patch):
+    api_gw_event["httpMethod"] = "PATCH"
+    api_gw_event["pathParameters"] = {"id": sub_id}
+    api_gw_event["body"] = patch if isinstance(patch, str) else json.dumps(patch)
+    response = patch_handler(api_gw_event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+class TestPatchSubmission:
+    def test_merges_changes_into_new_version(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_submission(api_gw_event, valid_submission_body)
+
+        status, body = _patch(api_gw_event, sub_id, {"studyTitle": "Patched Title"})
+        assert status == 200
+        assert body["version"] == 2
+        assert body["sections"] == ["A"]
+
+        latest = get_latest_active_version(sub_id)
+        assert latest["version"] == 2
+        assert latest["studyTitle"] == "Patched Title"
+        assert latest["leadCenter"] == valid_submission_body["leadCenter"]
+        assert latest["userId"] == "dev-user-001"
+
+    def test_null_removes_field(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_submission(api_gw_event, {**valid_submission_body, "w3Bilateral": "P-1"})
+        status, _ = _patch(api_gw_event, sub_id, {"w3Bilateral": None})
+        assert status == 200
+        assert "w3Bilateral" not in get_latest_active_version(sub_id)
+
+    def test_validates_merged_section(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_submission(api_gw_event, valid_submission_body)
+        status, body = _patch(api_gw_event, sub_id, {"studyTitle": None})
+        assert status == 400
+        assert body["details"] == [{"field": "studyTitle", "message": "studyTitle is required"}]
+        assert get_latest_active_version(sub_id)["version"] == 1
+
+    def test_enforces_cross_field_rule(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_submission(api_gw_event, {**valid_submission_body, "funded": "no", "fundingSource": ""})
+        status, body = _patch(api_gw_event, sub_id, {"funded": "partial"})
+        assert status == 400
+        assert body["details"][0]["field"] == "fundingSource"
+
+    def test_rejects_metadata_and_unknown_fields(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_submission(api_gw_event, valid_submission_body)
+        status, body = _patch(api_gw_event, sub_id, {"userId": "someone-else", "bogus": 1})
+        assert status == 400
+        assert body["error"] == "Unknown or read-only field(s): bogus, userId"
+
+    def test_rejects_empty_or_non_object_body(self, mock_dynamodb, api_gw_event):
+        assert _patch(api_gw_event, "any-id", {})[0] == 400
+        assert _patch(api_gw_event, "any-id", [1])[0] == 400
+        assert _patch(api_gw_event, "any-id", "{not json")[0] == 400
+
+    def test_not_found(self, mock_dynamodb, api_gw_event):
+        status, _ = _patch(api_gw_event, "nonexistent-id", {"studyTitle": "x"})
+        assert status == 404
+
+    def test_patch_to_same_value_is_a_no_op(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_submission(api_gw_event, valid_submission_body)
+        status, body = _patch(api_gw_event, sub_id, {"studyTitle": valid_submission_body["studyTitle"]})
+        assert status == 200
+        assert body["unchanged"] is True
+        assert get_latest_active_version(sub_id)["version"] == 1
@@ -0,0 +1,37 @@
+"""Tests for scripts/rebuild_suggestions.py."""
+
+import importlib.util
+import os
+
+from shared.db import get_suggestions, put_submission, record_suggestions
+
+_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "rebuild_suggestions.py")
+_spec = importlib.util.spec_from_file_location("rebuild_suggestions", _PATH)
+rebuild_suggestions = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(rebuild_suggestions)
+
+
+def _active(submission_id, created_at, **fields):
+    return {"submissionId": submission_id, "version": 1, "status": "active", "userId": "u",
+            "createdAt": created_at, **fields}
+
+
+class TestRebuildSuggestions:
+    def test_recounts_active_submissions_and_drops_unused_values(self, mock_dynamodb, capsys):
+        put_submission(_active("sub-1", "2025-01-01", leadCenter="CIMMYT"))
+        put_submission(_active("sub-2", "2025-01-02", leadCenter="cimmyt", fundingSource="IFAD"))
+        put_submission({**_active("sub-3", "2025-01-03", leadCenter="ILRI"), "status": "archived"})
+        record_suggestions(added=[{"leadCenter": "Stale"}, {"leadCenter": "CIMMYT"}])
+
+        assert rebuild_suggestions.main([]) == 0
+        assert "2 value(s) counted, 1 unused value(s) deleted" in capsys.readouterr().out
+        assert get_suggestions("leadCenter") == [{"value": "CIMMYT", "count": 2}]
+        assert get_suggestions("fundingSource") == [{"value": "IFAD", "count": 1}]
+
+    def test_oldest_spelling_wins_in_any_order(self):
+        counts, spellings = rebuild_suggestions.count([
+            _active("sub-2", "2025-01-02", leadCenter="cimmyt"),
+            _active("sub-1", "2025-01-01", leadCenter="CIMMYT"),
+        ])
+        assert counts[("leadCenter", "cimmyt")] == 2
+        assert spellings[("leadCenter", "cimmyt")] == "CIMMYT"
@@ -0,0 +1,67 @@
+"""Tests for shared.reference_data — subnational unit and W3/bilateral project indexes."""
+
+import importlib.util
+import os
+
+from shared.reference_data import ReferenceIndex, load_indexes
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "generate_reference_data.py")
+
+
+def _values(results):
+    return [r["value"] for r in results]
+
+
+class TestReferenceIndex:
+    index = ReferenceIndex([
+        ("KE-01", "Baringo (Kenya)", "KE"),
+        ("KE-10", "Kajiado (Kenya)", "KE"),
+        ("KE-02", "Bomet (Kenya)", "KE"),
+        ("CI-AB", "Abidjan (Côte d'Ivoire)", "CI"),
+        ("TZ-04", "Iringa (Tanzania, United Republic)", "TZ"),
+    ])
+
+    def test_exact_code_then_code_prefix_in_code_order(self):
+        assert _values(self.index.search("KE-0", 10)) == ["KE-01", "KE-02"]
+        assert _values(self.index.search("ke 10", 10)) == ["KE-10"]
+
+    def test_label_word_prefix(self):
+        assert _values(self.index.search("bar", 10)) == ["KE-01"]
+        # Equal matches: shorter labels first
+        assert _values(self.index.search("kenya", 10)) == ["KE-02", "KE-10", "KE-01"]
+
+    def test_fuzzy_name_matches_typos_and_accents(self):
+        assert _values(self.index.search("Barnigo", 10)) == ["KE-01"]
+        assert _values(self.index.search("cote divoire", 10)) == ["CI-AB"]
+        assert _values(self.index.search("iringa tanzania", 10))[0] == "TZ-04"
+
+    def test_blank_query_lists_entries_and_misses_are_empty(self):
+        assert len(self.index.search("  ", 3)) == 3
+        assert self.index.search("zzzz", 10) == []
+
+    def test_results_carry_label_and_group(self):
+        assert self.index.search("KE-01", 1) == [{"value": "KE-01", "label": "Baringo (Kenya)", "group": "KE"}]
+
+
+class TestDatasets:
+    def test_loads_both_datasets_once(self):
+        indexes, version = load_indexes()
+        assert len(indexes["subnational"]) == 5020
+        assert len(indexes["w3-bilateral"]) == 280
+        assert load_indexes()[0] is indexes
+        assert len(version) == 16
+
+    def test_projects_match_by_code_prefix(self):
+        indexes, _ = load_indexes()
+        results = indexes["w3-bilateral"].search("A-AG1014", 5)
+        assert results[0] == {"value": "A-AG10140-KAFACI Phase 3", "label": "A-AG10140-KAFACI Phase 3",
+                            "group": "AfricaRice"}
+
+    def test_generated_data_is_up_to_date(self):
+        spec = importlib.util.spec_from_file_location("generate_reference_data", SCRIPT_PATH)
+        generator = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(generator)
+        with open(generator.OUTPUT_PATH, encoding="utf-8") as f:
+            assert f.read() == generator.render(), (
+                "shared/reference_data.json is stale; run python scripts/generate_reference_data.py"
+            )
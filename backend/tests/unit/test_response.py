@@ -3,7 +3,9 @@
 import json
 import decimal
 import pytest
-from shared.response import success, created, error, not_found, server_error, _serialize, CORS_HEADERS
+from shared.response import (
+    success, created, error, not_found, not_modified, server_error, _serialize, CORS_HEADERS,
+)
 
 
 class TestSerialize:
@@ -41,6 +43,12 @@ class TestSuccess:
         body = json.loads(resp["body"])
         assert body["item"]["price"] == 19.99
 
+    def test_merges_extra_headers_with_cors(self):
+        resp = success({}, headers={"Cache-Control": "no-cache"})
+        assert resp["headers"]["Cache-Control"] == "no-cache"
+        assert resp["headers"]["Access-Control-Allow-Origin"] == "*"
+        assert "Cache-Control" not in CORS_HEADERS
+
 
 class TestCreated:
     def test_returns_201(self):
@@ -49,6 +57,15 @@ class TestCreated:
         assert json.loads(resp["body"]) == {"id": "abc"}
 
 
+class TestNotModified:
+    def test_returns_304_with_headers_and_empty_body(self):
+        resp = not_modified({"ETag": '"v1"'})
+        assert resp["statusCode"] == 304
+        assert resp["headers"]["ETag"] == '"v1"'
+        assert resp["headers"]["Access-Control-Allow-Origin"] == "*"
+        assert resp["body"] == ""
+
+
 class TestError:
     def test_returns_400_with_error_message(self):
         resp = error("Bad input")
@@ -35,3 +35,40 @@ class TestRestoreSubmission:
         api_gw_event["pathParameters"] = {"id": "nonexistent-id"}
         response = restore_handler(api_gw_event, None)
         assert response["statusCode"] == 404
+
+    def test_restores_with_expected_version(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        sub_id = json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["body"] = None
+        delete_handler(api_gw_event, None)
+
+        api_gw_event["queryStringParameters"] = {"expectedVersion": "1"}
+        response = restore_handler(api_gw_event, None)
+        assert response["statusCode"] == 200
+        assert get_version_history(sub_id)[0]["status"] == "active"
+
+    def test_restoring_active_submission_conflicts(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        sub_id = json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["queryStringParameters"] = {"expectedVersion": "1"}
+        api_gw_event["body"] = None
+        response = restore_handler(api_gw_event, None)
+        assert response["statusCode"] == 409
+
+    def test_restore_conflicts_when_study_id_was_reused(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        sub_id = json.loads(create_handler(api_gw_event, None)["body"])["submissionId"]
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["body"] = None
+        delete_handler(api_gw_event, None)
+
+        # The archived submission released TEST-001, so a new one can take it
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        assert create_handler(api_gw_event, None)["statusCode"] == 201
+
+        api_gw_event["body"] = None
+        response = restore_handler(api_gw_event, None)
+        assert response["statusCode"] == 409
+        assert get_version_history(sub_id)[0]["status"] == "archived"
@@ -0,0 +1,116 @@
+"""Tests for the single-function router."""
+
+import json
+import os
+
+import pytest
+
+from router import app as router
+from router.app import lambda_handler, resolve, ROUTES
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "..", "template.yaml")
+
+
+def _template_routes():
+    """(method, path, module) of every API event of a PerRouteApi function."""
+    yaml = pytest.importorskip("yaml")
+
+    class Loader(yaml.SafeLoader):
+        pass
+
+    # CloudFormation short-form tags (!Ref, !Sub, ...) as plain values
+    Loader.add_multi_constructor("!", lambda loader, suffix, node: None)
+    with open(TEMPLATE) as f:
+        resources = yaml.load(f, Loader=Loader)["Resources"]
+
+    routes = set()
+    for resource in resources.values():
+        if resource.get("Condition") != "PerRouteApi":
+            continue
+        module = resource["Properties"]["Handler"].split(".")[0]
+        for event in resource["Properties"]["Events"].values():
+            if event["Type"] == "Api":
+                routes.add((event["Properties"]["Method"].upper(), event["Properties"]["Path"], module))
+    return routes
+
+
+class TestRoutes:
+    def test_routes_match_per_route_functions_in_template(self):
+        assert set(ROUTES) == _template_routes()
+
+    def test_literal_segment_wins_over_parameter(self):
+        assert resolve("GET", "/submissions/search") == ("/submissions/search", "search_submissions", {})
+        assert resolve("GET", "/submissions/all")[1] == "list_all_submissions"
+        assert resolve("POST", "/submissions/restore")[1] == "bulk_restore_submissions"
+
+    def test_parameters_extracted(self):
+        assert resolve("GET", "/submissions/abc/versions/3") == (
+            "/submissions/{id}/versions/{version}", "get_submission_version", {"id": "abc", "version": "3"},
+        )
+        assert resolve("GET", "/submissions/by-study-id/S-1")[2] == {"studyId": "S-1"}
+        assert resolve("DELETE", "/submissions/abc/files/a.pdf")[2] == {"id": "abc", "filename": "a.pdf"}
+
+    def test_unknown_path(self):
+        assert resolve("GET", "/nope") is None
+        assert resolve("GET", "/submissions/abc/unknown") is None
+
+    def test_known_path_with_other_method(self):
+        with pytest.raises(LookupError) as e:
+            resolve("GET", "/submissions/abc")
+        assert e.value.args[0] == ["DELETE", "PATCH", "PUT"]
+
+    def test_literal_resource_does_not_fall_through_to_parameter(self):
+        # API Gateway answers DELETE /submissions/search from the search resource
+        with pytest.raises(LookupError):
+            resolve("DELETE", "/submissions/search")
+
+
+class TestLambdaHandler:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_gw_event, monkeypatch):
+        self.event = api_gw_event
+        self.imported = []
+        real_import = router.import_module
+
+        def recording_import(name):
+            self.imported.append(name)
+            return real_import(name)
+
+        monkeypatch.setattr(router, "import_module", recording_import)
+        monkeypatch.setattr(router, "_handlers", {})
+
+    def _request(self, method, path, params=None):
+        self.event.update(
+            httpMethod=method,
+            path=f"/dev{path}",
+            resource="/{proxy+}",
+            pathParameters={"proxy": path.lstrip("/")},
+            queryStringParameters=params,
+        )
+        return lambda_handler(self.event, None)
+
+    def test_dispatches_with_rebuilt_path_parameters(self):
+        response = self._request("GET", "/reference/subnational", {"q": "KE-01"})
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"])["results"][0]["value"] == "KE-01"
+
+    def test_handler_imported_once_on_first_use(self):
+        self._request("GET", "/suggest/bogus")
+        response = self._request("GET", "/suggest/bogus")
+        assert response["statusCode"] == 400
+        assert self.imported == ["get_suggestions.app"]
+
+    def test_unknown_route_is_404_without_imports(self):
+        response = self._request("GET", "/nope")
+        assert response["statusCode"] == 404
+        assert self.imported == []
+
+    def test_wrong_method_is_405_with_allow(self):
+        response = self._request("POST", "/reference/subnational")
+        assert response["statusCode"] == 405
+        assert response["headers"]["Allow"] == "GET"
+        assert response["headers"]["Access-Control-Allow-Origin"] == "*"
+
+    def test_path_without_proxy_parameter(self):
+        self.event.update(httpMethod="GET", path="/suggest/bogus", pathParameters=None)
+        assert lambda_handler(self.event, None)["statusCode"] == 400
@@ -0,0 +1,200 @@
+"""Tests for shared.search — BM25 full-text search index."""
+
+import gzip
+import importlib.util
+import json
+import os
+
+import boto3
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+from shared import search
+from shared.search import (
+    BaseSegment, Delta, SearchIndex, build_base, compact, document, load_index,
+    save_base, save_delta, BASE_KEY,
+)
+from shared.text import stem, tokenize
+
+os.environ["FILES_BUCKET"] = "test-files-bucket"
+
+MAIZE = {"submissionId": "sub-1", "studyId": "A-1",
+         "studyTitle": "Adoption of drought-tolerant maize varieties in Kenya",
+         "keyResearchQuestions": "Who adopts improved seed, and why?",
+         "commissioningSource": "Gates Foundation"}
+FISH = {"submissionId": "sub-2", "studyId": "B-2",
+        "studyTitle": "Gender norms in aquaculture value chains",
+        "studyIndicators": "Women's income from fish farming; adoption of improved strains",
+        "commissioningSource": "USAID"}
+RICE = {"submissionId": "sub-3", "studyId": "C-3",
+        "studyTitle": "Evaluating rice extension in Bangladesh",
+        "keyResearchQuestions": "Does digital advisory raise yields?",
+        "commissioningSource": "World Bank"}
+
+
+@pytest.fixture
+def s3_bucket(mock_dynamodb):
+    boto3.client("s3", region_name="eu-central-1").create_bucket(
+        Bucket="test-files-bucket",
+        CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+    )
+    search.reset_cache()
+    yield
+    search.reset_cache()
+
+
+def _base(*items):
+    return BaseSegment(build_base(document(item) for item in items))
+
+
+def _ids(results):
+    return [r["submissionId"] for r in results]
+
+
+class TestText:
+    @pytest.mark.parametrize("words, expected", [
+        (("adoption", "adopted", "adopting", "adopts"), "adopt"),
+        (("evaluation", "evaluating", "evaluate"), "evaluat"),
+        (("policies", "policy"), "policy"),
+        (("processes", "process"), "process"),
+    ])
+    def test_stems_related_forms_together(self, words, expected):
+        assert {stem(w) for w in words} == {expected}
+
+    def test_leaves_short_words_and_numbers(self):
+        assert [stem(w) for w in ("gas", "2025", "is")] == ["gas", "2025", "is"]
+
+    def test_tokenize_normalizes_and_drops_stopwords(self):
+        assert tokenize("The Évaluation of Crops") == ["evaluat", "crop"]
+
+
+class TestSearchIndex:
+    def test_ranks_by_bm25_with_title_boost(self):
+        index = SearchIndex(_base(MAIZE, FISH, RICE), Delta())
+        results = index.search("adoption")
+        assert _ids(results) == ["sub-1", "sub-2"]
+        assert results[0]["studyTitle"] == MAIZE["studyTitle"]
+        assert results[0]["score"] > results[1]["score"] > 0
+
+    def test_matches_stemmed_forms_and_commissioning_source(self):
+        index = SearchIndex(_base(MAIZE, FISH, RICE), Delta())
+        assert _ids(index.search("evaluation")) == ["sub-3"]
+        assert _ids(index.search("usaid")) == ["sub-2"]
+
+    def test_no_match_stopwords_only_and_limit(self):
+        index = SearchIndex(_base(MAIZE, FISH, RICE), Delta())
+        assert index.search("sorghum") == []
+        assert index.search("the of") == []
+        assert len(index.search("adoption rice gender", limit=2)) == 2
+
+    def test_empty_index(self):
+        assert SearchIndex(BaseSegment.empty(), Delta()).search("maize") == []
+
+    def test_doc_index_looks_up_submissions(self):
+        base = _base(RICE, MAIZE, FISH)
+        assert [base.doc_index(s) for s in ("sub-1", "sub-2", "sub-3")] == [0, 1, 2]
+        assert base.doc_index("sub-0") is None
+        assert base.record(0) == ("sub-1", "A-1", MAIZE["studyTitle"])
+
+    def test_delta_replaces_and_removes_base_documents(self):
+        delta = Delta()
+        delta.put(document({**MAIZE, "studyTitle": "Sorghum markets"}))
+        delta.remove("sub-2")
+        delta.put(document({**RICE, "submissionId": "sub-4", "studyId": "D-4"}))
+        index = SearchIndex(_base(MAIZE, FISH, RICE), delta)
+
+        assert len(index) == 3
+        assert "sub-2" not in index and "sub-4" in index
+        assert _ids(index.search("sorghum")) == ["sub-1"]
+        assert _ids(index.search("drought")) == []
+        assert _ids(index.search("gender")) == []
+        assert sorted(_ids(index.search("rice"))) == ["sub-3", "sub-4"]
+
+    def test_compaction_equals_a_fresh_build(self):
+        delta = Delta()
+        changed = {**MAIZE, "studyTitle": "Sorghum markets"}
+        added = {**RICE, "submissionId": "sub-0", "studyId": "D-0"}
+        delta.put(document(changed))
+        delta.put(document(added))
+        delta.remove("sub-2")
+        compacted = compact(_base(MAIZE, FISH, RICE), delta)
+        assert compacted == build_base(document(item) for item in (changed, RICE, added))
+
+    def test_delta_round_trips(self):
+        delta = Delta()
+        delta.put(document(MAIZE))
+        delta.remove("sub-2")
+        loaded = Delta.loads(delta.dumps())
+        assert loaded.changes == delta.changes
+
+    def test_rejects_foreign_data(self):
+        with pytest.raises(ValueError):
+            BaseSegment(b"\0" * 64)
+
+
+class TestPersistence:
+    def test_missing_objects_are_an_empty_index(self, s3_bucket):
+        index = load_index()
+        assert len(index) == 0
+        assert index.search("maize") == []
+
+    def test_saved_index_is_memory_mapped_by_other_containers(self, s3_bucket):
+        save_base(build_base(document(item) for item in (MAIZE, FISH)))
+        delta = Delta()
+        delta.put(document(RICE))
+        save_delta(delta)
+
+        search.reset_cache()
+        index = load_index()
+        assert len(index) == 3
+        assert type(index.base._docs.obj).__name__ == "mmap"
+        assert _ids(index.search("rice adoption")) == ["sub-3", "sub-1", "sub-2"]
+
+    def test_refresh_downloads_only_changed_objects(self, s3_bucket):
+        save_base(build_base([document(MAIZE)]))
+        search.reset_cache()
+        first = load_index()
+        assert load_index() is first  # still fresh
+
+        delta = Delta()
+        delta.put(document(FISH))
+        save_delta(delta)
+        search._cache["delta"] = None  # as if another container wrote it
+        refreshed = load_index(max_age=0)
+        assert refreshed.base is first.base
+        assert len(refreshed) == 2
+
+
+class TestBuildScript:
+    @pytest.fixture
+    def cli(self):
+        path = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "build_search_index.py")
+        spec = importlib.util.spec_from_file_location("build_search_index", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_builds_from_table_scan(self, s3_bucket, cli, capsys):
+        from shared.db import put_submission
+        for i, item in enumerate((MAIZE, FISH)):
+            put_submission({**item, "version": 1, "status": "active", "userId": "u",
+                            "createdAt": f"2025-01-0{i + 1}"})
+        assert cli.main([]) == 0
+        assert BASE_KEY in capsys.readouterr().out
+        search.reset_cache()
+        assert _ids(load_index().search("adoption")) == ["sub-1", "sub-2"]
+
+    def test_builds_from_export_keeping_active_versions(self, s3_bucket, cli, tmp_path):
+        serializer = TypeSerializer()
+        rows = [
+            {**MAIZE, "version": 1, "status": "active"},
+            {**FISH, "version": 1, "status": "archived"},
+            {"submissionId": "STUDYID#A-1", "version": 0, "ownerSubmissionId": "sub-1"},
+        ]
+        with gzip.open(tmp_path / "part-0.json.gz", "wt") as f:
+            for row in rows:
+                f.write(json.dumps({"Item": {k: serializer.serialize(v) for k, v in row.items()}}) + "\n")
+
+        assert cli.main(["--export", str(tmp_path)]) == 0
+        search.reset_cache()
+        assert _ids(load_index().search("adoption")) == ["sub-1"]
@@ -0,0 +1,61 @@
+"""Tests for search_submissions Lambda handler."""
+
+import json
+import os
+
+import boto3
+import pytest
+
+from shared import search
+from shared.search import Delta, build_base, document, save_base, save_delta
+from search_submissions.app import lambda_handler
+
+os.environ["FILES_BUCKET"] = "test-files-bucket"
+
+
+class TestSearchSubmissions:
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_dynamodb, api_gw_event):
+        boto3.client("s3", region_name="eu-central-1").create_bucket(
+            Bucket="test-files-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        search.reset_cache()
+        self.event = {**api_gw_event, "path": "/submissions/search"}
+        yield
+        search.reset_cache()
+
+    def _search(self, params):
+        self.event["queryStringParameters"] = params
+        response = lambda_handler(self.event, None)
+        return response["statusCode"], json.loads(response["body"]), response["headers"]
+
+    def test_returns_ranked_matches_from_base_and_delta(self):
+        save_base(build_base([document({"submissionId": "sub-1", "studyId": "A-1",
+                                        "studyTitle": "Maize seed systems"})]))
+        delta = Delta()
+        delta.put(document({"submissionId": "sub-2", "studyId": "B-2",
+                            "studyTitle": "Maize seed adoption and seed prices",
+                            "keyResearchQuestions": "Which seed do farmers buy?"}))
+        save_delta(delta)
+
+        status, body, headers = self._search({"q": "seeds", "limit": "5"})
+        assert status == 200
+        assert body["query"] == "seeds"
+        assert [r["submissionId"] for r in body["results"]] == ["sub-2", "sub-1"]
+        assert body["results"][0]["studyId"] == "B-2"
+        assert body["count"] == 2
+        assert headers["Cache-Control"] == "private, no-cache"
+
+    def test_empty_index_returns_no_results(self):
+        status, body, _ = self._search({"q": "maize"})
+        assert status == 200
+        assert body == {"query": "maize", "results": [], "count": 0}
+
+    @pytest.mark.parametrize("params", [
+        None, {"q": "  "}, {"q": "x" * 201}, {"q": "maize", "limit": "0"},
+        {"q": "maize", "limit": "101"}, {"q": "maize", "limit": "many"},
+    ])
+    def test_rejects_bad_parameters(self, params):
+        status, _, _ = self._search(params)
+        assert status == 400
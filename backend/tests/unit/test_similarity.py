@@ -0,0 +1,135 @@
+"""Tests for shared.similarity — MinHash/LSH near-duplicate index."""
+
+import os
+
+import boto3
+import pytest
+
+from shared import similarity
+from shared.similarity import (
+    SimilarityIndex, normalize_words, features, signature, load_index, save_index,
+    find_similar, INDEX_KEY, NUM_PERM,
+)
+
+os.environ["FILES_BUCKET"] = "test-files-bucket"
+
+MAIZE = {"studyId": "A-1", "studyTitle": "Impact of drought-tolerant maize adoption in Kenya",
+         "studyCountries": ["KE"]}
+MAIZE_REWORDED = {"studyId": "B-7", "studyTitle": "Impact of drought tolerant maize adoption, Kenya",
+                  "studyCountries": ["KE"]}
+FISH = {"studyId": "C-3", "studyTitle": "Gender norms in aquaculture value chains in Bangladesh",
+        "studyCountries": ["BD"]}
+
+
+@pytest.fixture
+def s3_bucket(mock_dynamodb):
+    boto3.client("s3", region_name="eu-central-1").create_bucket(
+        Bucket="test-files-bucket",
+        CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+    )
+    similarity.reset_cache()
+    yield
+    similarity.reset_cache()
+
+
+def _index(*studies):
+    index = SimilarityIndex()
+    for i, study in enumerate(studies):
+        index.add(f"sub-{i}", study)
+    return index
+
+
+class TestFeatures:
+    def test_normalizes_case_accents_punctuation_and_stopwords(self):
+        assert normalize_words("The Café-Owners of Côte d'Ivoire") == ["cafe", "owners", "cote", "d", "ivoire"]
+
+    def test_combines_title_questions_and_countries(self):
+        found = features({"studyTitle": "Maize", "keyResearchQuestions": "Does it pay?",
+                          "studyCountries": ["ke"]})
+        assert {"t:maiz", "t:aize", "q:does it", "q:it pay", "c:KE"} <= found
+
+    def test_signature_is_deterministic(self):
+        assert signature(MAIZE) == signature(dict(MAIZE))
+        assert len(signature(MAIZE)) == NUM_PERM
+
+    def test_no_features_means_no_signature(self):
+        assert signature({"studyTitle": "  the  "}) is None
+
+
+class TestSimilarityIndex:
+    def test_finds_reworded_study_and_skips_unrelated(self):
+        index = _index(MAIZE, MAIZE_REWORDED, FISH)
+        similar = index.similar_to("sub-0")
+        assert [s["submissionId"] for s in similar] == ["sub-1"]
+        assert similar[0]["studyId"] == "B-7"
+        assert similar[0]["score"] >= 0.8
+
+    def test_query_by_body_excludes_given_id(self):
+        index = _index(MAIZE, FISH)
+        assert index.query(MAIZE, exclude="sub-0") == []
+        assert index.query(MAIZE)[0]["submissionId"] == "sub-0"
+
+    def test_unknown_id_returns_none(self):
+        assert _index(MAIZE).similar_to("missing") is None
+
+    def test_remove_and_reindex_reuse_slots(self):
+        index = _index(MAIZE, MAIZE_REWORDED)
+        index.remove("sub-1")
+        assert "sub-1" not in index
+        assert index.similar_to("sub-0") == []
+        index.add("sub-2", MAIZE_REWORDED)
+        assert len(index) == 2
+        assert [s["submissionId"] for s in index.similar_to("sub-0")] == ["sub-2"]
+        index.add("sub-2", FISH)  # re-indexing replaces the old signature
+        assert index.similar_to("sub-0") == []
+
+    def test_round_trips_through_bytes(self):
+        index = _index(MAIZE, MAIZE_REWORDED, FISH)
+        index.remove("sub-2")
+        loaded = SimilarityIndex.loads(index.dumps())
+        assert len(loaded) == 2
+        assert loaded.similar_to("sub-0") == index.similar_to("sub-0")
+
+    def test_rejects_foreign_blobs(self):
+        import zlib
+        with pytest.raises(ValueError):
+            SimilarityIndex.loads(zlib.compress(b"nope"))
+
+
+class TestIndexStorage:
+    def test_missing_object_is_an_empty_index(self, s3_bucket):
+        assert len(load_index()) == 0
+
+    def test_reuses_copy_until_the_object_changes(self, s3_bucket):
+        save_index(_index(MAIZE))
+        similarity.reset_cache()
+        first = load_index()
+        assert load_index() is first  # fresh: no S3 call
+        assert load_index(max_age=0) is first  # ETag unchanged: not re-downloaded
+
+        s3 = boto3.client("s3", region_name="eu-central-1")
+        s3.put_object(Bucket="test-files-bucket", Key=INDEX_KEY, Body=_index(MAIZE, FISH).dumps())
+        assert len(load_index(max_age=0)) == 2
+
+    def test_find_similar_is_best_effort(self, mock_dynamodb):
+        similarity.reset_cache()  # no bucket: the lookup fails and is swallowed
+        assert find_similar(MAIZE) == []
+
+
+class TestBuildScript:
+    def test_indexes_active_submissions(self, s3_bucket, capsys):
+        import importlib.util
+        from shared.db import put_submission
+
+        path = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "build_similarity_index.py")
+        spec = importlib.util.spec_from_file_location("build_similarity_index", path)
+        cli = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(cli)
+
+        for i, study in enumerate((MAIZE, MAIZE_REWORDED)):
+            put_submission({**study, "submissionId": f"sub-{i}", "version": 1, "status": "active",
+                            "userId": "u", "createdAt": f"2025-01-0{i + 1}"})
+        assert cli.main([]) == 0
+        assert "2 studies indexed" in capsys.readouterr().out
+        similarity.reset_cache()
+        assert [s["submissionId"] for s in load_index().similar_to("sub-0")] == ["sub-1"]
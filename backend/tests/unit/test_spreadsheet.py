@@ -0,0 +1,143 @@
+"""Tests for shared.spreadsheet — CSV/XLSX row readers and row conversion."""
+
+import io
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+import pytest
+from shared.spreadsheet import (
+    iter_csv_rows, iter_xlsx_rows, row_to_submission, SpreadsheetError,
+)
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+
+def _col(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def build_xlsx(rows, shared_strings_xml=None):
+    """Build a minimal single-sheet XLSX: strings go to the shared table, numbers inline."""
+    shared = []
+    sheet_rows = []
+    for r, row in enumerate(rows, start=1):
+        cells = []
+        for c, value in enumerate(row):
+            ref = f"{_col(c)}{r}"
+            if value is None:
+                continue
+            if isinstance(value, (int, float)):
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            else:
+                shared.append(value)
+                cells.append(f'<c r="{ref}" t="s"><v>{len(shared) - 1}</v></c>')
+        sheet_rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("xl/workbook.xml", (
+            f'<workbook xmlns="{_MAIN_NS}" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Studies" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ))
+        z.writestr("xl/_rels/workbook.xml.rels", (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+            '</Relationships>'
+        ))
+        z.writestr("xl/sharedStrings.xml", shared_strings_xml or (
+            f'<sst xmlns="{_MAIN_NS}">'
+            + "".join(f"<si><t>{escape(s)}</t></si>" for s in shared)
+            + "</sst>"
+        ))
+        z.writestr("xl/worksheets/sheet1.xml", (
+            f'<worksheet xmlns="{_MAIN_NS}"><sheetData>{"".join(sheet_rows)}</sheetData></worksheet>'
+        ))
+    buf.seek(0)
+    return buf
+
+
+class TestIterCsvRows:
+    def test_yields_numbered_rows(self):
+        lines = [b"\xef\xbb\xbfstudyId,studyTitle\r\n", b"S-1,First\r\n", b"S-2,Second\r\n"]
+        rows = list(iter_csv_rows(lines))
+        assert rows == [(2, {"studyId": "S-1", "studyTitle": "First"}),
+                        (3, {"studyId": "S-2", "studyTitle": "Second"})]
+
+    def test_handles_quoted_multiline_cells(self):
+        lines = [b"studyId,keyResearchQuestions\n", b'S-1,"line one\n', b'line two"\n', b"S-2,q\n"]
+        rows = list(iter_csv_rows(lines))
+        assert rows[0][1]["keyResearchQuestions"] == "line one\nline two"
+        assert rows[1][0] == 3
+
+
+class TestIterXlsxRows:
+    def test_reads_columns_beyond_z(self):
+        header = [f"col{i}" for i in range(30)]
+        buf = build_xlsx([header, list(range(30))])
+        (_, row), = iter_xlsx_rows(buf)
+        assert row["col29"] == "29"
+
+    def test_reads_shared_strings_and_numbers(self):
+        buf = build_xlsx([["studyId", "sampleSize"], ["S-1", 120], ["S-2", None]])
+        rows = list(iter_xlsx_rows(buf))
+        assert rows == [(2, {"studyId": "S-1", "sampleSize": "120"}),
+                        (3, {"studyId": "S-2", "sampleSize": ""})]
+
+    def test_rejects_malformed_sheet_xml(self):
+        buf = build_xlsx([["studyId"], ["S-1"]], shared_strings_xml="<sst><si>")
+        with pytest.raises(SpreadsheetError):
+            list(iter_xlsx_rows(buf))
+
+    def test_rejects_non_zip(self):
+        with pytest.raises(SpreadsheetError):
+            list(iter_xlsx_rows(io.BytesIO(b"not a workbook")))
+
+
+class TestRowToSubmission:
+    def test_converts_typed_columns(self):
+        data = row_to_submission({
+            "studyId": " S-1 ",
+            "studyCountries": "KE; TZ ;",
+            "sampleSize": "120",
+            "totalCostUSD": "250,000.50",
+            "startDate": "45658",
+            "expectedEndDate": "2026-06-30",
+            "proposalAvailable": "Yes",
+            "proposalAvailable.link": "https://example.com/p",
+            "manuscriptDeveloped": "no",
+        })
+        assert data == {
+            "studyId": "S-1",
+            "studyCountries": ["KE", "TZ"],
+            "sampleSize": 120,
+            "totalCostUSD": Decimal("250000.50"),
+            "startDate": "2025-01-01",
+            "expectedEndDate": "2026-06-30",
+            "proposalAvailable": {"answer": "yes", "link": "https://example.com/p"},
+            "manuscriptDeveloped": {"answer": "no"},
+        }
+
+    def test_omits_blank_and_unknown_columns(self):
+        assert row_to_submission({"studyTitle": "  ", "notAField": "x"}) == {}
+
+    def test_passes_through_unconvertible_values(self):
+        data = row_to_submission({"sampleSize": "about 100", "totalCostUSD": "nan"})
+        assert data == {"sampleSize": "about 100", "totalCostUSD": "nan"}
+
+    @pytest.mark.parametrize("cell", ["nan", "inf", "20240115", "1e10"])
+    def test_passes_through_impossible_date_serials(self, cell):
+        from shared.validator import validate_submission, ValidationError
+
+        data = row_to_submission({"startDate": cell})
+        assert data == {"startDate": cell}
+        with pytest.raises(ValidationError) as exc:
+            validate_submission(data)
+        assert {"field": "startDate", "message": "startDate must be a valid date (YYYY-MM-DD)"} in exc.value.errors
@@ -0,0 +1,213 @@
+"""shared.db behaves the same on the DynamoDB and SQLite stores."""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from shared import db
+from shared.db import (
+    ConditionFailedError,
+    StudyIdTakenError,
+    archive_version,
+    get_draft,
+    get_latest_active_version,
+    get_study_id_claim,
+    get_suggestions,
+    get_version,
+    get_version_history,
+    get_version_timeline,
+    get_versions,
+    list_all_submissions,
+    list_user_submissions,
+    put_draft,
+    put_new_submission,
+    put_new_submissions,
+    put_next_version,
+    restore_version,
+)
+from shared.sqlite_store import SQLiteStore
+
+
+@pytest.fixture(params=["dynamodb", "sqlite"])
+def backend(request):
+    if request.param == "dynamodb":
+        request.getfixturevalue("mock_drafts_dynamodb")
+    else:
+        request.getfixturevalue("sqlite_store")
+    return request.param
+
+
+def _submission(submission_id, study_id, version=1, user_id="user-1", created_at="2025-01-01T00:00:00Z", **fields):
+    return {
+        "submissionId": submission_id, "version": version, "studyId": study_id, "status": "active",
+        "userId": user_id, "createdAt": created_at, "studyTitle": f"{submission_id} v{version}",
+        "totalCostUSD": Decimal("1250.5"), **fields,
+    }
+
+
+class TestSubmissions:
+    def test_new_submission_and_claim(self, backend):
+        put_new_submission(_submission("sub-1", "A-1"))
+        item = get_latest_active_version("sub-1")
+        assert item["version"] == 1 and isinstance(item["version"], Decimal)
+        assert item["totalCostUSD"] == Decimal("1250.5")
+        assert get_study_id_claim(" a-1 ")["ownerSubmissionId"] == "sub-1"
+
+        with pytest.raises(StudyIdTakenError) as e:
+            put_new_submission(_submission("sub-2", "a-1"))
+        assert e.value.owner == "sub-1"
+        assert get_latest_active_version("sub-2") is None
+
+    def test_next_version_moves_claim(self, backend):
+        current = put_new_submission(_submission("sub-1", "A-1"))
+        put_new_submission(_submission("sub-2", "B-1"))
+        with pytest.raises(StudyIdTakenError):
+            put_next_version(current, _submission("sub-1", "B-1", version=2))
+        assert get_version("sub-1", 1)["status"] == "active"
+        assert get_version("sub-1", 2) is None
+
+        put_next_version(current, _submission("sub-1", "C-1", version=2))
+        assert [int(v["version"]) for v in get_version_history("sub-1")] == [2, 1]
+        assert get_version("sub-1", 1)["status"] == "superseded"
+        assert get_study_id_claim("A-1") is None
+        assert get_study_id_claim("C-1")["ownerSubmissionId"] == "sub-1"
+
+    def test_listings_use_the_sparse_indexes(self, backend):
+        put_new_submission(_submission("sub-1", "A-1", created_at="2025-01-01T00:00:00Z"))
+        put_new_submission(_submission("sub-2", "A-2", created_at="2025-03-01T00:00:00Z"))
+        put_new_submission(_submission("sub-3", "A-3", user_id="user-2"))
+        archive_version("sub-3", 1)
+
+        mine = list_user_submissions("user-1")
+        assert [s["submissionId"] for s in mine] == ["sub-2", "sub-1"]
+        assert {s["submissionId"] for s in list_all_submissions()} == {"sub-1", "sub-2"}
+        assert [s["submissionId"] for s in list_all_submissions("archived")] == ["sub-3"]
+
+    def test_iter_submissions_reads_every_page(self, backend):
+        for i in range(5):
+            put_new_submission(_submission(f"sub-{i}", f"A-{i}", created_at=f"2025-01-0{i + 1}T00:00:00Z"))
+        archive_version("sub-4", 1)
+        ids = [item["submissionId"] for item in db.iter_all_submissions("active", page_size=2)]
+        assert sorted(ids) == ["sub-0", "sub-1", "sub-2", "sub-3"]
+
+    def test_archive_and_restore(self, backend):
+        put_new_submission(_submission("sub-1", "A-1"))
+        archive_version("sub-1", 1)
+        with pytest.raises(ConditionFailedError) as e:
+            archive_version("sub-1", 1)
+        assert e.value.item["status"] == "archived"
+
+        put_new_submission(_submission("sub-2", "A-1"))
+        with pytest.raises(StudyIdTakenError):
+            restore_version("sub-1", 1)
+        assert get_version("sub-1", 1)["status"] == "archived"
+
+    def test_archive_and_restore_move_the_claim(self, backend):
+        put_new_submission(_submission("sub-1", "A-1"))
+        item = archive_version("sub-1", 1)
+        assert item["status"] == "archived" and item["updatedAt"]
+        assert get_study_id_claim("A-1") is None
+        assert restore_version("sub-1", 1)["status"] == "active"
+        assert get_study_id_claim("A-1")["ownerSubmissionId"] == "sub-1"
+        with pytest.raises(ConditionFailedError) as e:
+            restore_version("sub-1", 9)
+        assert e.value.item is None
+
+    def test_archive_leaves_another_submissions_claim(self, backend):
+        db.get_store().put_submission(_submission("sub-1", "A-1"))
+        put_new_submission(_submission("sub-2", "A-1"))
+        archive_version("sub-1", 1)
+        assert get_version("sub-1", 1)["status"] == "archived"
+        assert get_study_id_claim("A-1")["ownerSubmissionId"] == "sub-2"
+
+    def test_timeline_pages(self, backend):
+        current = put_new_submission(_submission("sub-1", "A-1"))
+        for version in (2, 3, 4, 5):
+            current = put_next_version(current, _submission("sub-1", "A-1", version=version))
+        versions, start = [], None
+        while True:
+            page, start = get_version_timeline("sub-1", 2, start)
+            assert all("studyTitle" not in item for item in page)
+            versions += [int(item["version"]) for item in page]
+            if not start:
+                break
+        assert versions == [5, 4, 3, 2, 1]
+        assert set(get_versions("sub-1", [1, 3, 9])) == {1, 3}
+
+    def test_import_reports_taken_study_ids(self, backend):
+        put_new_submission(_submission("sub-0", "A-1"))
+        taken, unprocessed = put_new_submissions([_submission("sub-1", "A-1"), _submission("sub-2", "A-2")])
+        assert [(item["submissionId"], owner) for item, owner in taken] == [("sub-1", "sub-0")]
+        assert unprocessed == []
+        assert get_latest_active_version("sub-2") is not None
+
+
+class TestSuggestionsAndDrafts:
+    def test_suggestion_counts(self, backend):
+        put_new_submission(_submission("sub-1", "A-1", leadCenter="CIMMYT"))
+        current = put_new_submission(_submission("sub-2", "A-2", leadCenter=" cimmyt"))
+        put_next_version(current, _submission("sub-2", "A-2", version=2, leadCenter="CIP"))
+        assert get_suggestions("leadCenter", "c") == [
+            {"value": "CIMMYT", "count": 1}, {"value": "CIP", "count": 1},
+        ]
+        archive_version("sub-1", 1)
+        assert get_suggestions("leadCenter", "ci") == [{"value": "CIP", "count": 1}]
+
+    def test_suggestion_reads_are_capped(self, backend, monkeypatch):
+        db.record_suggestions(added=[{"fundingSource": v} for v in ("ADB", "AfDB", "AfDB", "AGRA", "AGRA", "AGRA")])
+        monkeypatch.setattr(db, "SUGGESTIONS_MAX_READ", 2)
+        assert get_suggestions("fundingSource", "a") == [{"value": "AfDB", "count": 2}, {"value": "ADB", "count": 1}]
+        monkeypatch.setattr(db, "SUGGESTIONS_MAX_READ", 3)
+        assert get_suggestions("fundingSource", "a", limit=1) == [{"value": "AGRA", "count": 3}]
+
+    def test_draft_revisions(self, backend):
+        first = put_draft("user-1", "new", {"studyTitle": "A"}, 0)
+        with pytest.raises(ConditionFailedError):
+            put_draft("user-1", "new", {"studyTitle": "B"}, 0)
+        put_draft("user-1", "new", {"studyTitle": "B"}, first["revision"])
+        with pytest.raises(ConditionFailedError) as e:
+            put_draft("user-1", "new", {"studyTitle": "C"}, first["revision"])
+        assert e.value.item["data"] == {"studyTitle": "B"}
+        assert get_draft("user-1", "new")["revision"] == 2
+
+
+class TestSQLiteStore:
+    def test_file_persists(self, tmp_path):
+        path = str(tmp_path / "meliaf.sqlite3")
+        store = SQLiteStore(path)
+        store.put_new_submission(_submission("sub-1", "A-1"))
+        store.close()
+        assert SQLiteStore(path).get_study_id_claim("A-1")["ownerSubmissionId"] == "sub-1"
+
+    def test_selected_by_environment(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+        monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "db.sqlite3"))
+        previous = db.set_store(None)
+        try:
+            store = db.get_store()
+            assert isinstance(store, SQLiteStore) and store.path.endswith("db.sqlite3")
+        finally:
+            db.set_store(previous)
+
+    def test_handlers_run_on_sqlite(self, sqlite_store, api_gw_event, valid_submission_body):
+        from create_submission.app import lambda_handler as create
+        from list_submissions.app import lambda_handler as list_mine
+
+        api_gw_event.update(httpMethod="POST", body=json.dumps(valid_submission_body))
+        assert create(api_gw_event, None)["statusCode"] == 201
+        api_gw_event.update(httpMethod="GET", body=None)
+        body = json.loads(list_mine(api_gw_event, None)["body"])
+        assert body["count"] == 1
+
+
+class TestInterface:
+    def test_incomplete_store_fails_at_construction(self):
+        from shared.store import Store
+
+        class Partial(Store):
+            def put_submission(self, item):
+                pass
+
+        with pytest.raises(TypeError, match="abstract"):
+            Partial()
@@ -0,0 +1,113 @@
+"""Tests for the AWS call span logs (shared/tracing.py) and the call details from shared/aws.py."""
+
+import io
+import json
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+from shared import aws, tracing
+
+THROTTLED = b'{"__type":"com.amazonaws.dynamodb.v20120810#ProvisionedThroughputExceededException"}'
+
+
+def _spans(capsys):
+    lines = capsys.readouterr().out.splitlines()
+    return [json.loads(line) for line in lines if line.startswith('{"span"')]
+
+
+class _Raw(io.BytesIO):
+    def stream(self, **kwargs):
+        yield self.read()
+
+
+@pytest.fixture
+def calls():
+    recorded = []
+    aws.observe_calls(recorded.append)
+    yield recorded
+    aws._observers.remove(recorded.append)
+
+
+class TestCallDetails:
+    def test_resource_and_sizes(self, mock_dynamodb, calls):
+        client = aws.session().client("dynamodb")
+        client.transact_write_items(TransactItems=[
+            {"Put": {"TableName": "test-submissions", "Item": {"submissionId": {"S": "a"}, "version": {"N": "1"}}}},
+            {"Put": {"TableName": "test-suggestions", "Item": {"field": {"S": "f"}, "valueKey": {"S": "v"}}}},
+        ])
+        client.get_item(TableName="test-submissions", Key={"submissionId": {"S": "a"}, "version": {"N": "1"}})
+        transact, get = calls
+        assert transact["resource"] == "test-submissions,test-suggestions"
+        assert get["resource"] == "test-submissions"
+        assert get["request_bytes"] > 0 and get["response_bytes"] > 0
+        assert (get["retries"], get["throttles"]) == (0, 0)
+
+    def test_throttled_attempts_are_counted(self, mock_dynamodb, calls):
+        client = aws.session().client("dynamodb")
+        attempts = []
+
+        def throttle_twice(request, **kwargs):
+            attempts.append(request)
+            if len(attempts) <= 2:
+                return AWSResponse(request.url, 400, {}, _Raw(THROTTLED))
+            return None
+
+        client.meta.events.register("before-send.dynamodb.GetItem", throttle_twice)
+        client.get_item(TableName="test-submissions", Key={"submissionId": {"S": "a"}, "version": {"N": "1"}})
+        [call] = calls
+        assert (call["retries"], call["throttles"], call["status"]) == (2, 2, 200)
+
+
+class TestSpans:
+    def test_correlation_id(self):
+        assert tracing.correlation_id({"requestContext": {"requestId": "api-1"}}, None) == "api-1"
+        context = type("Context", (), {"aws_request_id": "lambda-1"})()
+        assert tracing.correlation_id({"Records": []}, context) == "lambda-1"
+        assert tracing.correlation_id(None) is None
+
+    def test_handler_calls_are_logged_as_spans(
+        self, mock_dynamodb, api_gw_event, valid_submission_body, capsys, monkeypatch,
+    ):
+        from create_submission.app import lambda_handler
+
+        monkeypatch.setenv("TRACE_AWS_CALLS", "true")
+        api_gw_event.update(
+            httpMethod="POST", resource="/submissions", body=json.dumps(valid_submission_body),
+            requestContext={"requestId": "api-req-7"},
+        )
+        lambda_handler(api_gw_event, None)
+        out = capsys.readouterr().out
+        spans = [json.loads(line) for line in out.splitlines() if line.startswith('{"span"')]
+        [metrics_line] = [json.loads(line) for line in out.splitlines() if '"_aws"' in line]
+
+        assert spans and {s["correlationId"] for s in spans} == {"api-req-7"}
+        assert metrics_line["correlationId"] == "api-req-7"
+        assert {s["route"] for s in spans} == {"POST /submissions"}
+        transact = next(s for s in spans if s["operation"] == "TransactWriteItems")
+        assert transact["resource"] == "test-submissions"
+        offsets = [s["offsetMs"] for s in spans]
+        assert offsets == sorted(offsets)
+
+    def test_off_by_default(self, mock_dynamodb, api_gw_event, capsys, monkeypatch):
+        from list_submissions.app import lambda_handler
+
+        monkeypatch.delenv("TRACE_AWS_CALLS", raising=False)
+        api_gw_event.update(resource="/submissions")
+        lambda_handler(api_gw_event, None)
+        assert _spans(capsys) == []
+
+    def test_cognito_calls_are_traced(self, capsys, monkeypatch):
+        from moto import mock_aws
+        import confirm_signup.app as confirm_signup
+
+        monkeypatch.setenv("TRACE_AWS_CALLS", "true")
+        monkeypatch.setattr(confirm_signup, "cognito", None)
+        with mock_aws():
+            confirm_signup.lambda_handler({
+                "queryStringParameters": {"code": "123456", "email": "jane@cgiar.org"},
+                "requestContext": {"requestId": "url-req-1"},
+            }, None)
+        [span] = [s for s in _spans(capsys) if s["operation"] == "ConfirmSignUp"]
+        assert (span["service"], span["correlationId"]) == ("cognito-idp", "url-req-1")
+        assert span["function"] == "confirm_signup"
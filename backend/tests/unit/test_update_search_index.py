@@ -0,0 +1,91 @@
+"""Tests for the update_search_index DynamoDB stream consumer."""
+
+import os
+from unittest.mock import patch
+
+import boto3
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+from shared import search
+from update_search_index.app import lambda_handler
+
+os.environ["FILES_BUCKET"] = "test-files-bucket"
+
+_serializer = TypeSerializer()
+
+
+def _record(item, event_name="MODIFY"):
+    image = {k: _serializer.serialize(v) for k, v in item.items()}
+    return {"eventName": event_name, "dynamodb": {"NewImage": image}}
+
+
+def _version(submission_id, status, title, version=1):
+    return {"submissionId": submission_id, "version": version, "status": status,
+            "studyId": submission_id.upper(), "studyTitle": title}
+
+
+def _stored_index():
+    search.reset_cache()
+    return search.load_index()
+
+
+def _hits(query):
+    return [r["submissionId"] for r in _stored_index().search(query)]
+
+
+class TestUpdateSearchIndex:
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_dynamodb):
+        boto3.client("s3", region_name="eu-central-1").create_bucket(
+            Bucket="test-files-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        search.reset_cache()
+        yield
+        search.reset_cache()
+
+    def test_new_versions_replace_and_archive_removes(self):
+        result = lambda_handler({"Records": [
+            _record(_version("sub-1", "active", "Maize adoption in Kenya"), "INSERT"),
+            _record(_version("sub-2", "active", "Maize markets"), "INSERT"),
+        ]}, None)
+        assert result == {"changed": 2, "pending": 2, "compacted": False}
+        assert sorted(_hits("maize")) == ["sub-1", "sub-2"]
+
+        lambda_handler({"Records": [
+            _record(_version("sub-2", "superseded", "Maize markets")),
+            _record(_version("sub-2", "active", "Fish farming", version=2), "INSERT"),
+            _record(_version("sub-1", "archived", "Maize adoption in Kenya")),
+        ]}, None)
+        assert _hits("maize") == []
+        assert _hits("fish") == ["sub-2"]
+
+    def test_compacts_large_deltas_into_the_base(self):
+        with patch("update_search_index.app.COMPACT_AT", 2):
+            result = lambda_handler({"Records": [
+                _record(_version("sub-1", "active", "Maize adoption"), "INSERT"),
+                _record(_version("sub-2", "active", "Rice extension"), "INSERT"),
+            ]}, None)
+        assert result == {"changed": 2, "pending": 0, "compacted": True}
+        index = _stored_index()
+        assert index.base.n_docs == 2 and len(index.delta) == 0
+        assert [r["submissionId"] for r in index.search("rice")] == ["sub-2"]
+
+        # Archiving a base document is recorded in the delta
+        result = lambda_handler({"Records": [
+            _record(_version("sub-2", "archived", "Rice extension")),
+        ]}, None)
+        assert result["pending"] == 1
+        assert _hits("rice") == []
+
+    def test_ignores_claims_removals_unknown_archives_and_no_op_batches(self):
+        claim = {"submissionId": "STUDYID#X", "version": 0, "studyId": "X", "ownerSubmissionId": "sub-1"}
+        result = lambda_handler({"Records": [
+            _record(claim, "INSERT"),
+            {"eventName": "REMOVE", "dynamodb": {}},
+            _record(_version("sub-9", "archived", "Never indexed")),
+        ]}, None)
+        assert result == {"changed": 0, "pending": 0, "compacted": False}
+        s3 = boto3.client("s3", region_name="eu-central-1")
+        assert s3.list_objects_v2(Bucket="test-files-bucket").get("KeyCount") == 0
@@ -0,0 +1,73 @@
+"""Tests for the update_similarity_index DynamoDB stream consumer."""
+
+import os
+
+import boto3
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+from shared import similarity
+from update_similarity_index.app import lambda_handler
+
+os.environ["FILES_BUCKET"] = "test-files-bucket"
+
+_serializer = TypeSerializer()
+
+
+def _record(item, event_name="MODIFY"):
+    image = {k: _serializer.serialize(v) for k, v in item.items()}
+    return {"eventName": event_name, "dynamodb": {"NewImage": image}}
+
+
+def _version(submission_id, status, title, version=1):
+    return {"submissionId": submission_id, "version": version, "status": status,
+            "studyId": submission_id.upper(), "studyTitle": title, "studyCountries": ["KE"]}
+
+
+def _stored_index():
+    similarity.reset_cache()
+    return similarity.load_index()
+
+
+class TestUpdateSimilarityIndex:
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_dynamodb):
+        boto3.client("s3", region_name="eu-central-1").create_bucket(
+            Bucket="test-files-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        similarity.reset_cache()
+        yield
+        similarity.reset_cache()
+
+    def test_indexes_active_versions_and_persists(self):
+        result = lambda_handler({"Records": [
+            _record(_version("sub-1", "active", "Maize adoption in Kenya"), "INSERT"),
+            _record(_version("sub-2", "active", "Maize adoption, Kenya"), "INSERT"),
+        ]}, None)
+        assert result == {"changed": 2, "indexed": 2}
+        assert [s["submissionId"] for s in _stored_index().similar_to("sub-1")] == ["sub-2"]
+
+    def test_new_version_replaces_and_archive_removes(self):
+        lambda_handler({"Records": [
+            _record(_version("sub-1", "active", "Maize adoption in Kenya"), "INSERT"),
+            _record(_version("sub-2", "active", "Maize adoption, Kenya"), "INSERT"),
+        ]}, None)
+        lambda_handler({"Records": [
+            _record(_version("sub-2", "superseded", "Maize adoption, Kenya")),
+            _record(_version("sub-2", "active", "Fish farming in Bangladesh", version=2), "INSERT"),
+            _record(_version("sub-1", "archived", "Maize adoption in Kenya")),
+        ]}, None)
+        index = _stored_index()
+        assert "sub-1" not in index
+        assert index.similar_to("sub-2") == []
+
+    def test_ignores_claims_removals_and_no_op_batches(self):
+        claim = {"submissionId": "STUDYID#X", "version": 0, "studyId": "X", "ownerSubmissionId": "sub-1"}
+        result = lambda_handler({"Records": [
+            _record(claim, "INSERT"),
+            {"eventName": "REMOVE", "dynamodb": {}},
+        ]}, None)
+        assert result == {"changed": 0, "indexed": 0}
+        s3 = boto3.client("s3", region_name="eu-central-1")
+        assert s3.list_objects_v2(Bucket="test-files-bucket").get("KeyCount") == 0
@@ -1,6 +1,7 @@
 import json
 from create_submission.app import lambda_handler as create_handler
 from update_submission.app import lambda_handler as update_handler
+from shared.db import get_study_id_claim, get_version_history
 
 
 def _create_submission(api_gw_event, valid_submission_body):
@@ -36,3 +37,74 @@ class TestUpdateSubmission:
         api_gw_event["body"] = json.dumps({"studyTitle": "Only title"})
         response = update_handler(api_gw_event, None)
         assert response["statusCode"] == 400
+
+
+class TestUpdateSubmissionNoOp:
+    def test_identical_body_keeps_current_version(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        from shared.db import get_version_history
+        sub_id = _create_submission(api_gw_event, valid_submission_body)
+
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        reordered = {**valid_submission_body, "otherCenters": list(reversed(valid_submission_body["otherCenters"]))}
+        api_gw_event["body"] = json.dumps(reordered)
+        response = update_handler(api_gw_event, None)
+
+        assert response["statusCode"] == 200
+        body = json.loads(response["body"])
+        assert body["version"] == 1
+        assert body["unchanged"] is True
+        history = get_version_history(sub_id)
+        assert [(h["version"], h["status"]) for h in history] == [(1, "active")]
+
+    def test_stores_hash_on_new_version(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        from shared.content_hash import content_hash
+        from shared.db import get_latest_active_version
+        sub_id = _create_submission(api_gw_event, valid_submission_body)
+        assert get_latest_active_version(sub_id)["contentHash"]
+
+        changed = {**valid_submission_body, "studyTitle": "Changed"}
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["body"] = json.dumps(changed)
+        update_handler(api_gw_event, None)
+        latest = get_latest_active_version(sub_id)
+        assert latest["version"] == 2
+        assert latest["contentHash"] == content_hash(latest)
+
+    def test_detects_no_op_on_versions_without_stored_hash(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        from shared.db import put_submission
+        put_submission({
+            **valid_submission_body, "submissionId": "legacy", "version": 1, "status": "active",
+            "studyRegions": [],  # as normalize_geography leaves a national study with no countries
+            "userId": "u", "modifiedBy": "u", "createdAt": "2025-01-01", "updatedAt": "2025-01-01",
+        })
+        api_gw_event["pathParameters"] = {"id": "legacy"}
+        api_gw_event["body"] = json.dumps(valid_submission_body)
+        body = json.loads(update_handler(api_gw_event, None)["body"])
+        assert body["unchanged"] is True
+
+
+class TestUpdateSubmissionStudyId:
+    def test_changing_study_id_moves_the_claim(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_submission(api_gw_event, valid_submission_body)
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["body"] = json.dumps({**valid_submission_body, "studyId": "TEST-009"})
+        response = update_handler(api_gw_event, None)
+
+        assert response["statusCode"] == 200
+        assert get_study_id_claim("TEST-001") is None
+        assert get_study_id_claim("TEST-009")["ownerSubmissionId"] == sub_id
+        statuses = {int(v["version"]): v["status"] for v in get_version_history(sub_id)}
+        assert statuses == {1: "superseded", 2: "active"}
+
+    def test_taken_study_id_conflicts_and_writes_nothing(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        sub_id = _create_submission(api_gw_event, valid_submission_body)
+        other_id = _create_submission(api_gw_event, {**valid_submission_body, "studyId": "TEST-002"})
+
+        api_gw_event["pathParameters"] = {"id": sub_id}
+        api_gw_event["body"] = json.dumps({**valid_submission_body, "studyId": "TEST-002"})
+        response = update_handler(api_gw_event, None)
+
+        assert response["statusCode"] == 409
+        assert other_id in json.loads(response["body"])["error"]
+        assert [v["status"] for v in get_version_history(sub_id)] == ["active"]
+        assert get_study_id_claim("TEST-001")["ownerSubmissionId"] == sub_id
@@ -0,0 +1,87 @@
+"""Tests for scripts/validate_spreadsheet.py — the offline import pre-check."""
+
+import csv
+import importlib.util
+import json
+import os
+
+import pytest
+
+from tests.unit.test_spreadsheet import build_xlsx
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "scripts", "validate_spreadsheet.py"
+)
+
+
+@pytest.fixture(scope="module")
+def cli():
+    spec = importlib.util.spec_from_file_location("validate_spreadsheet", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _row(body):
+    row = {}
+    for key, value in body.items():
+        if isinstance(value, list):
+            row[key] = ";".join(value)
+        elif isinstance(value, dict):
+            row[key] = value["answer"]
+            if "link" in value:
+                row[f"{key}.link"] = value["link"]
+        else:
+            row[key] = value
+    return row
+
+
+def _write_csv(path, rows):
+    columns = sorted({key for row in rows for key in row})
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class TestValidateSpreadsheet:
+    def test_valid_csv_exits_zero(self, cli, tmp_path, valid_submission_body, capsys):
+        path = tmp_path / "studies.csv"
+        _write_csv(path, [_row(valid_submission_body)])
+        assert cli.main([str(path)]) == 0
+        assert "1 row(s) checked, 0 invalid" in capsys.readouterr().out
+
+    def test_reports_invalid_rows_with_row_numbers(self, cli, tmp_path, valid_submission_body, capsys):
+        path = tmp_path / "studies.csv"
+        bad = {**valid_submission_body, "studyId": "BAD-1", "timing": "never"}
+        _write_csv(path, [_row(valid_submission_body), _row(bad)])
+        assert cli.main([str(path), "--json"]) == 1
+        report = json.loads(capsys.readouterr().out)
+        assert report["rows"] == 2
+        assert report["invalid"] == 1
+        assert report["errors"][0]["row"] == 3
+        assert report["errors"][0]["studyId"] == "BAD-1"
+        assert [e["field"] for e in report["errors"][0]["errors"]] == ["timing"]
+
+    def test_reports_study_ids_repeated_in_the_file(self, cli, tmp_path, valid_submission_body):
+        path = tmp_path / "studies.csv"
+        rows = [valid_submission_body, {**valid_submission_body, "studyId": "BAD-1", "timing": "never"},
+                {**valid_submission_body, "studyId": " test-001"}]
+        _write_csv(path, [_row(body) for body in rows])
+        report = cli.check_file(str(path))
+        assert [r["row"] for r in report if r["errors"]] == [3, 4]
+        assert report[2]["errors"] == [{"field": "studyId", "message": "Duplicate studyId (also on row 2)"}]
+
+    def test_reads_xlsx(self, cli, tmp_path, valid_submission_body):
+        row = _row(valid_submission_body)
+        columns = list(row)
+        path = tmp_path / "studies.xlsx"
+        path.write_bytes(build_xlsx([columns, [row[c] for c in columns]]).getvalue())
+        report = cli.check_file(str(path))
+        assert report == [{"row": 2, "studyId": "TEST-001", "errors": []}]
+
+    def test_unsupported_file_exits_two(self, cli, tmp_path, capsys):
+        path = tmp_path / "studies.txt"
+        path.write_text("hello")
+        assert cli.main([str(path)]) == 2
+        assert "Unsupported file type" in capsys.readouterr().err
@@ -0,0 +1,50 @@
+"""Tests for validate_submissions Lambda handler."""
+
+import json
+
+from validate_submissions.app import lambda_handler, MAX_RECORDS
+
+
+def _call(api_gw_event, payload):
+    api_gw_event["httpMethod"] = "POST"
+    api_gw_event["body"] = payload if isinstance(payload, str) else json.dumps(payload)
+    response = lambda_handler(api_gw_event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+class TestValidateSubmissions:
+    def test_reports_each_record(self, api_gw_event, valid_submission_body):
+        bad = {**valid_submission_body, "studyId": "BAD-1", "timing": "never"}
+        status, body = _call(api_gw_event, {"submissions": [valid_submission_body, bad]})
+        assert status == 200
+        assert body["valid"] == 1
+        assert body["invalid"] == 1
+        assert body["results"][0] == {"index": 0, "studyId": "TEST-001", "valid": True, "errors": []}
+        assert body["results"][1]["studyId"] == "BAD-1"
+        assert body["results"][1]["valid"] is False
+        assert [e["field"] for e in body["results"][1]["errors"]] == ["timing"]
+
+    def test_non_object_record(self, api_gw_event):
+        status, body = _call(api_gw_event, {"submissions": [42]})
+        assert status == 200
+        assert body["results"][0]["studyId"] is None
+        assert body["results"][0]["valid"] is False
+
+    def test_writes_nothing(self, mock_dynamodb, api_gw_event, valid_submission_body):
+        from shared.db import list_all_submissions
+        _call(api_gw_event, {"submissions": [valid_submission_body]})
+        assert list_all_submissions() == []
+
+    def test_requires_non_empty_array(self, api_gw_event):
+        assert _call(api_gw_event, {"submissions": []})[0] == 400
+        assert _call(api_gw_event, {"submissions": {}})[0] == 400
+        assert _call(api_gw_event, {})[0] == 400
+        assert _call(api_gw_event, [])[0] == 400
+
+    def test_rejects_oversized_batch(self, api_gw_event, valid_submission_body):
+        status, body = _call(api_gw_event, {"submissions": [valid_submission_body] * (MAX_RECORDS + 1)})
+        assert status == 400
+        assert str(MAX_RECORDS) in body["error"]
+
+    def test_invalid_json(self, api_gw_event):
+        assert _call(api_gw_event, "{not json")[0] == 400
@@ -0,0 +1,80 @@
+"""Tests for shared.validation_spec and the generated frontend copy of it."""
+
+import importlib.util
+import os
+
+import pytest
+from shared.validation_spec import RULES
+from shared.validator import compile_rules, _COMPILERS
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "scripts", "generate_validation_spec.py"
+)
+
+
+def _load_generator():
+    spec = importlib.util.spec_from_file_location("generate_validation_spec", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestRules:
+    def test_every_rule_kind_has_a_compiler(self):
+        assert {rule["rule"] for rule in RULES} <= set(_COMPILERS)
+
+    def test_every_rule_has_a_section(self):
+        assert all(rule["section"] in "ABCDEF" for rule in RULES)
+
+    def test_unknown_rule_kind_fails_at_compile_time(self):
+        with pytest.raises(KeyError):
+            compile_rules([{"section": "A", "field": "x", "rule": "nope", "required": True}])
+
+    def test_enum_message_built_once_and_reused(self):
+        check, = compile_rules([{"section": "B", "field": "timing", "rule": "enum",
+                                 "required": True, "values": {"b", "a"}}])
+        first, second = [], []
+        check({"timing": "x"}, first)
+        check({"timing": "y"}, second)
+        assert first == second == [{"field": "timing", "message": "timing must be one of: a, b"}]
+        # Callers get their own dicts, not the prebuilt one
+        assert first[0] is not second[0]
+
+    def test_enum_rejects_unhashable_value(self):
+        check, = compile_rules([{"section": "B", "field": "timing", "rule": "enum",
+                                 "required": True, "values": {"a"}}])
+        errors = []
+        check({"timing": ["a"]}, errors)
+        assert errors[0]["message"] == "timing must be one of: a"
+
+    @pytest.mark.parametrize("rule, params, bad", [
+        ("email", {"max": 255}, "not-an-email"),
+        ("date", {}, "15/01/2024"),
+        ("enum_array", {"values": ("a", "b"), "min_items": 1}, ["c"]),
+        ("positive_int", {}, 0),
+    ])
+    def test_required_flag_is_honoured(self, rule, params, bad):
+        def errors(required, data):
+            check, = compile_rules([{"section": "A", "field": "x", "rule": rule, "required": required, **params}])
+            found = []
+            check(data, found)
+            return [e["message"] for e in found]
+
+        assert errors(False, {}) == []
+        assert errors(True, {}) and "x" in errors(True, {})[0]
+        assert errors(False, {"x": bad}) == errors(True, {"x": bad}) != []
+
+
+class TestGeneratedTypeScript:
+    def test_generated_file_is_up_to_date(self):
+        generator = _load_generator()
+        with open(generator.OUTPUT_PATH, encoding="utf-8") as f:
+            assert f.read() == generator.render(), (
+                "src/lib/validationSpec.generated.ts is stale; "
+                "run python scripts/generate_validation_spec.py"
+            )
+
+    def test_generated_file_covers_every_field_rule(self):
+        rendered = _load_generator().render()
+        for rule in RULES:
+            assert f"{rule['field']}:" in rendered or f"field: '{rule['field']}'" in rendered
@@ -1,5 +1,8 @@
 import pytest
-from shared.validator import validate_submission, ValidationError
+from shared.validator import (
+    validate_submission, validate_many, validate_sections, ValidationError,
+    PARALLEL_THRESHOLD, SECTION_FIELDS, FIELD_SECTIONS,
+)
 
 
 class TestValidatorRequiredFields:
@@ -15,6 +18,7 @@ class TestValidatorRequiredFields:
         assert "studyId" in required_fields
         assert "studyTitle" in required_fields
         assert "contactEmail" in required_fields
+        assert "totalCostUSD" in required_fields
         assert "studyType" in required_fields
 
     def test_missing_single_field(self, valid_submission_body):
@@ -133,6 +137,33 @@ class TestValidatorRegionsCountries:
         assert "studySubnational" in fields
 
 
+class TestValidatorGeographyCodes:
+    def test_known_codes_pass(self, valid_submission_body):
+        valid_submission_body["studyRegions"] = ["ESA"]
+        valid_submission_body["studyCountries"] = ["KE"]
+        valid_submission_body["studySubnational"] = ["KE-01"]
+        validate_submission(valid_submission_body)
+
+    @pytest.mark.parametrize("field,value", [
+        ("studyRegions", ["ESA", "MARS"]),
+        ("studyCountries", ["KE", "XX"]),
+        ("studySubnational", ["KE-01", "KE-99"]),
+    ])
+    def test_unknown_codes_rejected(self, valid_submission_body, field, value):
+        valid_submission_body[field] = value
+        with pytest.raises(ValidationError) as exc_info:
+            validate_submission(valid_submission_body)
+        assert exc_info.value.errors == [
+            {"field": field, "message": f"{field} contains unknown codes: {value[1]}"},
+        ]
+
+    def test_reports_at_most_five_codes(self, valid_submission_body):
+        valid_submission_body["studyCountries"] = [f"Q{i}" for i in range(8)]
+        with pytest.raises(ValidationError) as exc_info:
+            validate_submission(valid_submission_body)
+        assert exc_info.value.errors[0]["message"].endswith("Q0, Q1, Q2, Q3, Q4")
+
+
 class TestValidatorStringLengths:
     def test_study_title_too_long(self, valid_submission_body):
         valid_submission_body["studyTitle"] = "x" * 501
@@ -141,6 +172,14 @@ class TestValidatorStringLengths:
         fields = [e["field"] for e in exc_info.value.errors]
         assert "studyTitle" in fields
 
+    def test_contact_email_too_long(self, valid_submission_body):
+        valid_submission_body["contactEmail"] = "a" * 250 + "@b.com"
+        with pytest.raises(ValidationError) as exc_info:
+            validate_submission(valid_submission_body)
+        assert exc_info.value.errors == [
+            {"field": "contactEmail", "message": "contactEmail must be at most 255 characters"},
+        ]
+
 
 class TestValidatorFormatValidation:
     def test_malformed_email_rejected(self, valid_submission_body):
@@ -186,3 +225,79 @@ class TestValidatorFormatValidation:
             validate_submission(valid_submission_body)
         fields = [e["field"] for e in exc_info.value.errors]
         assert "preAnalysisPlan.link" in fields
+
+
+class TestValidateMany:
+    def test_returns_error_list_per_record_without_raising(self, valid_submission_body):
+        records = [valid_submission_body, {**valid_submission_body, "studyType": "bogus"}, {}]
+        results = validate_many(records)
+        assert len(results) == 3
+        assert results[0] == []
+        assert [e["field"] for e in results[1]] == ["studyType"]
+        assert any(e["field"] == "studyId" for e in results[2])
+
+    def test_matches_validate_submission_errors(self, valid_submission_body):
+        bad = {**valid_submission_body, "contactEmail": "nope", "funded": "partial", "fundingSource": ""}
+        with pytest.raises(ValidationError) as exc_info:
+            validate_submission(bad)
+        assert validate_many([bad]) == [exc_info.value.errors]
+
+    def test_non_object_record_is_reported(self):
+        assert validate_many(["oops"]) == [[{"field": None, "message": "Submission must be a JSON object"}]]
+
+    def test_empty_batch(self):
+        assert validate_many([]) == []
+
+    def test_process_pool_preserves_order(self, valid_submission_body):
+        invalid = {**valid_submission_body, "timing": "never"}
+        records = [invalid if i % 7 == 0 else valid_submission_body for i in range(PARALLEL_THRESHOLD)]
+        results = validate_many(records, workers=2)
+        assert results == validate_many(records)
+        assert [bool(errors) for errors in results] == [i % 7 == 0 for i in range(PARALLEL_THRESHOLD)]
+
+    def test_falls_back_to_serial_when_processes_unavailable(self, valid_submission_body):
+        from unittest.mock import patch
+        records = [valid_submission_body] * PARALLEL_THRESHOLD
+        with patch("concurrent.futures.ProcessPoolExecutor", side_effect=OSError("no /dev/shm")):
+            assert validate_many(records, workers=4) == [[]] * PARALLEL_THRESHOLD
+
+
+class TestValidateSections:
+    def test_only_checks_requested_sections(self, valid_submission_body):
+        body = {**valid_submission_body, "studyTitle": "", "timing": "never"}
+        with pytest.raises(ValidationError) as exc_info:
+            validate_sections(body, {"B"})
+        assert [e["field"] for e in exc_info.value.errors] == ["timing"]
+
+    def test_valid_section_passes_despite_errors_elsewhere(self, valid_submission_body):
+        body = {**valid_submission_body, "studyTitle": ""}
+        assert validate_sections(body, {"F"}) == body
+
+    def test_section_c_rechecked_when_classification_changes(self, valid_submission_body):
+        body = {**valid_submission_body, "sampleSize": -5}
+        assert validate_sections(body, {"A"}) == body
+        with pytest.raises(ValidationError) as exc_info:
+            validate_sections(body, {"B"})
+        assert [e["field"] for e in exc_info.value.errors] == ["sampleSize"]
+
+    def test_cross_field_rules_follow_their_fields(self, valid_submission_body):
+        body = {**valid_submission_body, "startDate": "2027-01-01", "fundingSource": ""}
+        with pytest.raises(ValidationError) as exc_info:
+            validate_sections(body, {"D"})
+        assert exc_info.value.errors == [
+            {"field": "expectedEndDate", "message": "End date must be on or after start date"},
+        ]
+        with pytest.raises(ValidationError) as exc_info:
+            validate_sections(body, {"E"})
+        assert [e["field"] for e in exc_info.value.errors] == ["fundingSource"]
+
+    def test_all_sections_match_full_validation(self):
+        with pytest.raises(ValidationError) as full:
+            validate_submission({})
+        with pytest.raises(ValidationError) as scoped:
+            validate_sections({}, SECTION_FIELDS)
+        assert scoped.value.errors == full.value.errors
+
+    def test_field_sections_cover_every_section(self):
+        assert set(FIELD_SECTIONS.values()) == set("ABCDEF")
+        assert FIELD_SECTIONS["fundingSource"] == "E"
@@ -164,6 +164,12 @@ export function StudyForm({ mode = 'create', submissionId, initialData }: StudyF
       } else {
         const result = await submitStudy(cleaned);
         clearDraft();
+        if (result.similar?.length) {
+          toast({
+            title: 'Possible duplicate study',
+            description: `Similar to: ${result.similar.map(s => `${s.studyId} — ${s.studyTitle}`).join('; ')}`,
+          });
+        }
         // Upload any queued files now that we have a submissionId
         if (fileUploadRef.current?.hasPendingFiles()) {
           await fileUploadRef.current.uploadPendingFiles(result.submissionId);
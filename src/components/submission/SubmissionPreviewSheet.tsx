@@ -94,7 +94,7 @@ export function SubmissionPreviewSheet({
   });
 
   const archiveMutation = useMutation({
-    mutationFn: () => deleteSubmission(submissionId!),
+    mutationFn: () => deleteSubmission(submissionId!, data?.version),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['submissions'] });
       toast({ title: 'Submission archived', description: 'The submission has been moved to your archive.' });
@@ -107,7 +107,7 @@ export function SubmissionPreviewSheet({
   });
 
   const restoreMutation = useMutation({
-    mutationFn: () => restoreSubmission(submissionId!),
+    mutationFn: () => restoreSubmission(submissionId!, data?.version),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['submissions'] });
       toast({ title: 'Submission restored', description: 'The submission has been restored to your active submissions.' });
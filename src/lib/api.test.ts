@@ -15,6 +15,11 @@ import {
   listSubmissions,
   getSubmissionHistory,
   updateSubmission,
+  patchSubmission,
+  getDraft,
+  saveDraft,
+  deleteDraft,
+  submitDraft,
   deleteSubmission,
   restoreSubmission,
   listAllSubmissions,
@@ -109,6 +114,43 @@ describe('updateSubmission()', () => {
   });
 });
 
+describe('patchSubmission()', () => {
+  it('PATCHes only the changed fields to /submissions/{id}', async () => {
+    mockFetch.mockResolvedValueOnce(mockOkResponse({ submissionId: 'x', version: 3, sections: ['A'], message: 'Updated' }));
+    await patchSubmission('x', { studyTitle: 'New Title' });
+    const [url, opts] = mockFetch.mock.calls[0];
+    expect(url).toContain('/submissions/x');
+    expect(opts.method).toBe('PATCH');
+    expect(JSON.parse(opts.body)).toEqual({ studyTitle: 'New Title' });
+  });
+});
+
+describe('drafts', () => {
+  it('PUTs the draft with its base revision', async () => {
+    mockFetch.mockResolvedValueOnce(mockOkResponse({ draftKey: 'new', revision: 3, updatedAt: 'now' }));
+    const result = await saveDraft('new', { studyTitle: 'WIP', startDate: new Date('2025-01-15T00:00:00Z') }, 2);
+    const [url, opts] = mockFetch.mock.calls[0];
+    expect(url).toContain('/drafts/new');
+    expect(opts.method).toBe('PUT');
+    expect(JSON.parse(opts.body)).toEqual({ data: { studyTitle: 'WIP', startDate: '2025-01-15' }, revision: 2 });
+    expect(result.revision).toBe(3);
+  });
+
+  it('GETs, DELETEs and submits by key', async () => {
+    mockFetch
+      .mockResolvedValueOnce(mockOkResponse({ draftKey: 'x', revision: 1, updatedAt: 'now', data: {} }))
+      .mockResolvedValueOnce(mockOkResponse({ draftKey: 'x', message: 'Draft discarded' }))
+      .mockResolvedValueOnce(mockOkResponse({ submissionId: 'x', version: 2, message: 'ok' }));
+    await getDraft('x');
+    await deleteDraft('x');
+    await submitDraft('x');
+    expect(mockFetch.mock.calls[0][0]).toContain('/drafts/x');
+    expect(mockFetch.mock.calls[1][1].method).toBe('DELETE');
+    expect(mockFetch.mock.calls[2][0]).toContain('/drafts/x/submit');
+    expect(mockFetch.mock.calls[2][1].method).toBe('POST');
+  });
+});
+
 describe('deleteSubmission()', () => {
   it('DELETEs /submissions/{id}', async () => {
     mockFetch.mockResolvedValueOnce(mockOkResponse({ submissionId: 'x', version: 3, message: 'Deleted' }));
@@ -117,6 +159,13 @@ describe('deleteSubmission()', () => {
     expect(url).toContain('/submissions/x');
     expect(opts.method).toBe('DELETE');
   });
+
+  it('sends expectedVersion when known', async () => {
+    mockFetch.mockResolvedValueOnce(mockOkResponse({ submissionId: 'x', version: 3, message: 'Deleted' }));
+    await deleteSubmission('x', 3);
+    const [url] = mockFetch.mock.calls[0];
+    expect(url).toContain('/submissions/x?expectedVersion=3');
+  });
 });
 
 describe('restoreSubmission()', () => {
@@ -127,6 +176,13 @@ describe('restoreSubmission()', () => {
     expect(url).toContain('/submissions/x/restore');
     expect(opts.method).toBe('POST');
   });
+
+  it('sends expectedVersion when known', async () => {
+    mockFetch.mockResolvedValueOnce(mockOkResponse({ submissionId: 'x', version: 4, message: 'Restored' }));
+    await restoreSubmission('x', 4);
+    const [url] = mockFetch.mock.calls[0];
+    expect(url).toContain('/submissions/x/restore?expectedVersion=4');
+  });
 });
 
 describe('getSubmissionHistory()', () => {
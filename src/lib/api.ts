@@ -49,10 +49,18 @@ async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
 
 // --- Submissions API ---
 
+export interface SimilarStudy {
+  submissionId: string;
+  studyId: string;
+  studyTitle: string;
+  score: number;
+}
+
 export interface CreateSubmissionResponse {
   submissionId: string;
   version: number;
   message: string;
+  similar?: SimilarStudy[];
 }
 
 export interface ListSubmissionsResponse {
@@ -113,6 +121,8 @@ export interface UpdateSubmissionResponse {
   submissionId: string;
   version: number;
   message: string;
+  /** True when the body matched the current version, so no new version was written. */
+  unchanged?: boolean;
 }
 
 export function updateSubmission(id: string, data: Record<string, unknown>): Promise<UpdateSubmissionResponse> {
@@ -122,14 +132,65 @@ export function updateSubmission(id: string, data: Record<string, unknown>): Pro
   });
 }
 
+export interface PatchSubmissionResponse extends UpdateSubmissionResponse {
+  sections: string[];
+}
+
+/** Send only the changed fields; the backend re-validates just the affected sections. `null` clears a field. */
+export function patchSubmission(id: string, changes: Record<string, unknown>): Promise<PatchSubmissionResponse> {
+  return request<PatchSubmissionResponse>(`/submissions/${id}`, {
+    method: 'PATCH',
+    body: JSON.stringify(serializeDates(changes)),
+  });
+}
+
+// --- Drafts API ---
+
+/** Draft key for a study that has not been submitted yet; edits use the submissionId. */
+export const NEW_DRAFT_KEY = 'new';
+
+export interface DraftResponse {
+  draftKey: string;
+  revision: number;
+  updatedAt: string;
+  data: Record<string, unknown>;
+}
+
+export type SaveDraftResponse = Omit<DraftResponse, 'data'>;
+
+export function getDraft(key: string): Promise<DraftResponse> {
+  return request<DraftResponse>(`/drafts/${key}`);
+}
+
+/** Overwrites the server draft if it is still at `revision` (0 for the first save); a 409 means another tab or device saved first. */
+export function saveDraft(key: string, data: Record<string, unknown>, revision: number): Promise<SaveDraftResponse> {
+  return request<SaveDraftResponse>(`/drafts/${key}`, {
+    method: 'PUT',
+    body: JSON.stringify({ data: serializeDates(data), revision }),
+  });
+}
+
+export function deleteDraft(key: string): Promise<{ draftKey: string; message: string }> {
+  return request<{ draftKey: string; message: string }>(`/drafts/${key}`, { method: 'DELETE' });
+}
+
+export function submitDraft(key: string): Promise<CreateSubmissionResponse> {
+  return request<CreateSubmissionResponse>(`/drafts/${key}/submit`, { method: 'POST' });
+}
+
 export interface DeleteSubmissionResponse {
   submissionId: string;
   version: number;
   message: string;
 }
 
-export function deleteSubmission(id: string): Promise<DeleteSubmissionResponse> {
-  return request<DeleteSubmissionResponse>(`/submissions/${id}`, {
+function expectedVersionQuery(expectedVersion?: number): string {
+  return expectedVersion ? `?${new URLSearchParams({ expectedVersion: String(expectedVersion) })}` : '';
+}
+
+/** Passing the version being archived lets the backend skip its lookup and reject stale archives with a 409. */
+export function deleteSubmission(id: string, expectedVersion?: number): Promise<DeleteSubmissionResponse> {
+  return request<DeleteSubmissionResponse>(`/submissions/${id}${expectedVersionQuery(expectedVersion)}`, {
     method: 'DELETE',
   });
 }
@@ -140,8 +201,8 @@ export interface RestoreSubmissionResponse {
   message: string;
 }
 
-export function restoreSubmission(id: string): Promise<RestoreSubmissionResponse> {
-  return request<RestoreSubmissionResponse>(`/submissions/${id}/restore`, {
+export function restoreSubmission(id: string, expectedVersion?: number): Promise<RestoreSubmissionResponse> {
+  return request<RestoreSubmissionResponse>(`/submissions/${id}/restore${expectedVersionQuery(expectedVersion)}`, {
     method: 'POST',
   });
 }
@@ -159,6 +220,97 @@ export function getSubmission(id: string): Promise<SubmissionItem> {
   });
 }
 
+export interface SimilarSubmissionsResponse {
+  submissionId: string;
+  similar: SimilarStudy[];
+  count: number;
+}
+
+export function getSimilarSubmissions(id: string, limit?: number): Promise<SimilarSubmissionsResponse> {
+  const query = limit === undefined ? '' : `?${new URLSearchParams({ limit: String(limit) })}`;
+  return request<SimilarSubmissionsResponse>(`/submissions/${id}/similar${query}`);
+}
+
+export interface SearchResult {
+  submissionId: string;
+  studyId: string;
+  studyTitle: string;
+  score: number;
+}
+
+export interface SearchSubmissionsResponse {
+  query: string;
+  results: SearchResult[];
+  count: number;
+}
+
+export function searchSubmissions(q: string, limit?: number): Promise<SearchSubmissionsResponse> {
+  const params = new URLSearchParams({ q });
+  if (limit !== undefined) params.set('limit', String(limit));
+  return request<SearchSubmissionsResponse>(`/submissions/search?${params}`);
+}
+
+export interface StudyIdLookupResponse {
+  studyId: string;
+  submissionId: string;
+}
+
+export function getSubmissionByStudyId(studyId: string): Promise<StudyIdLookupResponse> {
+  return request<StudyIdLookupResponse>(`/submissions/by-study-id/${encodeURIComponent(studyId)}`);
+}
+
+// --- Suggestions API ---
+
+export type SuggestField =
+  | 'leadCenter'
+  | 'commissioningSource'
+  | 'fundingSource'
+  | 'unitOfAnalysis'
+  | 'dataCollectionMethods';
+
+export interface Suggestion {
+  value: string;
+  count: number;
+}
+
+export interface SuggestionsResponse {
+  field: SuggestField;
+  prefix: string;
+  suggestions: Suggestion[];
+}
+
+/** Values already used by active submissions that start with `prefix`, most used first. */
+export function getSuggestions(field: SuggestField, prefix: string, limit?: number): Promise<SuggestionsResponse> {
+  const params = new URLSearchParams({ prefix });
+  if (limit !== undefined) params.set('limit', String(limit));
+  return request<SuggestionsResponse>(`/suggest/${field}?${params}`);
+}
+
+// --- Reference Data API ---
+
+export type ReferenceDataset = 'subnational' | 'w3-bilateral';
+
+export interface ReferenceEntry {
+  value: string;
+  label: string;
+  /** Country code for subnational units, lead center for projects. */
+  group: string;
+}
+
+export interface ReferenceDataResponse {
+  dataset: ReferenceDataset;
+  query: string;
+  results: ReferenceEntry[];
+  count: number;
+}
+
+/** Code-prefix and fuzzy name search; responses are HTTP-cacheable, so repeated keystrokes are cheap. */
+export function searchReferenceData(dataset: ReferenceDataset, q: string, limit?: number): Promise<ReferenceDataResponse> {
+  const params = new URLSearchParams({ q });
+  if (limit !== undefined) params.set('limit', String(limit));
+  return request<ReferenceDataResponse>(`/reference/${dataset}?${params}`);
+}
+
 // --- File Upload API ---
 
 export interface UploadUrlResponse {
@@ -1,5 +1,20 @@
 import { describe, it, expect } from 'vitest';
+import {
+  STUDY_TYPE_OPTIONS,
+  TIMING_OPTIONS,
+  ANALYTICAL_SCOPE_OPTIONS,
+  GEOGRAPHIC_SCOPE_OPTIONS,
+  RESULT_LEVEL_OPTIONS,
+  CAUSALITY_MODE_OPTIONS,
+  METHOD_CLASS_OPTIONS,
+  STATUS_OPTIONS,
+  FUNDED_OPTIONS,
+  YES_NO_NA_OPTIONS,
+  PRIMARY_USER_OPTIONS,
+  PRIMARY_INDICATOR_GROUPS,
+} from '@/types';
 import { studyFormSchema, shouldShowResearchDetails } from './formSchema';
+import { FIELD_RULES } from './validationSpec.generated';
 
 // ---------------------------------------------------------------------------
 // Helpers — build a valid base input so we can override individual fields
@@ -60,6 +75,34 @@ describe('studyFormSchema — valid baseline', () => {
   });
 });
 
+// ---------------------------------------------------------------------------
+// Form options offer exactly the values the generated spec accepts
+// ---------------------------------------------------------------------------
+describe('option lists match the validation spec', () => {
+  const optionLists: [keyof typeof FIELD_RULES, readonly { value: string }[]][] = [
+    ['studyType', STUDY_TYPE_OPTIONS],
+    ['timing', TIMING_OPTIONS],
+    ['analyticalScope', ANALYTICAL_SCOPE_OPTIONS],
+    ['geographicScope', GEOGRAPHIC_SCOPE_OPTIONS],
+    ['resultLevel', RESULT_LEVEL_OPTIONS],
+    ['causalityMode', CAUSALITY_MODE_OPTIONS],
+    ['methodClass', METHOD_CLASS_OPTIONS],
+    ['dataCollectionStatus', STATUS_OPTIONS],
+    ['analysisStatus', STATUS_OPTIONS],
+    ['funded', FUNDED_OPTIONS],
+    ['powerCalculation', YES_NO_NA_OPTIONS],
+    ['intendedPrimaryUser', PRIMARY_USER_OPTIONS],
+    ['primaryIndicator', PRIMARY_INDICATOR_GROUPS.flatMap((g) => g.options)],
+  ];
+
+  for (const [field, options] of optionLists) {
+    it(`${field} options match FIELD_RULES`, () => {
+      const rule = FIELD_RULES[field] as { values: readonly string[] };
+      expect(options.map((o) => o.value).sort()).toEqual([...rule.values].sort());
+    });
+  }
+});
+
 // ---------------------------------------------------------------------------
 // Section A — field constraints
 // ---------------------------------------------------------------------------
@@ -235,7 +278,7 @@ describe('Section D — date validation', () => {
     );
     const dateIssue = issues.find((i) => i.path.join('.') === 'expectedEndDate');
     expect(dateIssue).toBeDefined();
-    expect(dateIssue?.message).toBe('End date must be after start date');
+    expect(dateIssue?.message).toBe('End date must be on or after start date');
   });
 });
 
@@ -256,7 +299,7 @@ describe('Section E — funding source validation', () => {
       validInput({ funded: 'partial', fundingSource: '' }),
       'fundingSource',
     );
-    expect(err).toBeDefined();
+    expect(err?.message).toBe('Required when funded is yes or partial');
   });
 
   it('does not require fundingSource when funded=no', () => {
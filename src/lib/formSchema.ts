@@ -1,4 +1,10 @@
 import { z } from 'zod';
+import {
+  CROSS_FIELD_RULES,
+  FIELD_RULES,
+  SECTION_C_CAUSALITY_MODES,
+  SECTION_C_METHOD_CLASSES,
+} from '@/lib/validationSpec.generated';
 
 // Reusable schema for Yes/No with optional link
 const yesNoWithLinkSchema = z.object({
@@ -33,94 +39,67 @@ const yesNoWithRequiredLinkSchema = z.object({
   path: ['link'],
 });
 
+type CrossFieldRule = (typeof CROSS_FIELD_RULES)[number];
+
+function crossFieldRuleHolds(rule: CrossFieldRule, data: Record<string, unknown>): boolean {
+  switch (rule.rule) {
+    case 'date_order': {
+      const start = data[rule.after];
+      const end = data[rule.field];
+      return !(start instanceof Date && end instanceof Date) || end >= start;
+    }
+    case 'required_if': {
+      if (!(rule.values as readonly unknown[]).includes(data[rule.when])) return true;
+      const value = data[rule.field];
+      return typeof value === 'string' && value.trim().length > 0;
+    }
+  }
+}
+
 // Form validation schema
 export const studyFormSchema = z.object({
   // Section A - Basic Information (Mandatory)
-  studyId: z.string().trim().min(1, 'Study ID is required').max(50, 'Study ID must be less than 50 characters'),
-  studyTitle: z.string().trim().min(1, 'Study title is required').max(500, 'Title must be less than 500 characters'),
-  leadCenter: z.string().trim().min(1, 'Lead center is required').max(200, 'Lead center must be less than 200 characters'),
-  w3Bilateral: z.string().trim().max(500, 'W3/Bilateral project must be less than 500 characters').optional(),
-  contactName: z.string().trim().min(1, 'Contact name is required').max(100, 'Name must be less than 100 characters'),
-  contactEmail: z.string().trim().email('Invalid email address').max(255, 'Email must be less than 255 characters'),
+  studyId: z.string().trim().min(1, 'Study ID is required').max(FIELD_RULES.studyId.max, `Study ID must be less than ${FIELD_RULES.studyId.max} characters`),
+  studyTitle: z.string().trim().min(1, 'Study title is required').max(FIELD_RULES.studyTitle.max, `Title must be less than ${FIELD_RULES.studyTitle.max} characters`),
+  leadCenter: z.string().trim().min(1, 'Lead center is required').max(FIELD_RULES.leadCenter.max, `Lead center must be less than ${FIELD_RULES.leadCenter.max} characters`),
+  w3Bilateral: z.string().trim().max(FIELD_RULES.w3Bilateral.max, `W3/Bilateral project must be less than ${FIELD_RULES.w3Bilateral.max} characters`).optional(),
+  contactName: z.string().trim().min(1, 'Contact name is required').max(FIELD_RULES.contactName.max, `Name must be less than ${FIELD_RULES.contactName.max} characters`),
+  contactEmail: z.string().trim().email('Invalid email address').max(FIELD_RULES.contactEmail.max, `Email must be less than ${FIELD_RULES.contactEmail.max} characters`),
   otherCenters: z.array(z.string()).min(1, 'At least one other center is required'),
 
   // Section B - Study Classification (Mandatory)
-  studyType: z.enum([
-    'ex_ante_impact',
-    'foresight_futures',
-    'process_performance',
-    'causal_impact',
-    'adoption_diffusion',
-    'scaling_readiness',
-    'scaling_policy_tracing',
-    'institutional_policy_change',
-    'synthesis_strategic_learning',
-    'meliaf_method',
-  ], { required_error: 'Study type is required' }),
-  timing: z.enum(['t0_ex_ante', 't1_during', 't2_endline', 't3_ex_post'], { required_error: 'Timing is required' }),
-  analyticalScope: z.enum([
-    'innovation_technology',
-    'project_intervention',
-    'program_accelerator',
-    'portfolio_system',
-  ], { required_error: 'Analytical scope is required' }),
-  geographicScope: z.enum([
-    'global',
-    'regional',
-    'national',
-    'sub_national',
-    'site_specific',
-  ], { required_error: 'Geographic scope is required' }),
+  studyType: z.enum(FIELD_RULES.studyType.values, { required_error: 'Study type is required' }),
+  timing: z.enum(FIELD_RULES.timing.values, { required_error: 'Timing is required' }),
+  analyticalScope: z.enum(FIELD_RULES.analyticalScope.values, { required_error: 'Analytical scope is required' }),
+  geographicScope: z.enum(FIELD_RULES.geographicScope.values, { required_error: 'Geographic scope is required' }),
   studyRegions: z.array(z.string()).optional().default([]),
   studyCountries: z.array(z.string()).optional().default([]),
   studySubnational: z.array(z.string()).optional().default([]),
-  resultLevel: z.enum(['output', 'outcome', 'impact'], { required_error: 'Result level is required' }),
-  causalityMode: z.enum(['c0_descriptive', 'c1_contribution', 'c2_causal'], { required_error: 'Causality mode is required' }),
-  methodClass: z.enum([
-    'qualitative',
-    'quantitative',
-    'mixed',
-    'experimental_quasi',
-    'modeling_simulation',
-    'observational',
-    'evidence_synthesis',
-    'participatory',
-  ], { required_error: 'Method class is required' }),
-  primaryIndicator: z.enum([
-    'Poverty Reduction, Livelihoods and Jobs',
-    'Nutrition, Health and Food Security',
-    'Gender Equality, Youth and Social Inclusion',
-    'Climate Adaptation and Mitigation',
-    'Environmental Health and Biodiversity',
-    'Innovation Use',
-    'Policy Change',
-    'Other Outcome',
-    'Innovation Development',
-    'Capacity Sharing',
-    'Knowledge Products',
-    'Other Output',
-  ], { required_error: 'Primary indicator is required' }),
+  resultLevel: z.enum(FIELD_RULES.resultLevel.values, { required_error: 'Result level is required' }),
+  causalityMode: z.enum(FIELD_RULES.causalityMode.values, { required_error: 'Causality mode is required' }),
+  methodClass: z.enum(FIELD_RULES.methodClass.values, { required_error: 'Method class is required' }),
+  primaryIndicator: z.enum(FIELD_RULES.primaryIndicator.values, { required_error: 'Primary indicator is required' }),
 
   // Section C - Research Details (Conditional)
-  keyResearchQuestions: z.string().trim().max(2000, 'Research questions must be less than 2000 characters').optional(),
+  keyResearchQuestions: z.string().trim().max(FIELD_RULES.keyResearchQuestions.max, `Research questions must be less than ${FIELD_RULES.keyResearchQuestions.max} characters`).optional(),
   unitOfAnalysis: z.array(z.string()).default([]),
-  treatmentIntervention: z.string().trim().max(500, 'Treatment must be less than 500 characters').optional(),
+  treatmentIntervention: z.string().trim().max(FIELD_RULES.treatmentIntervention.max, `Treatment must be less than ${FIELD_RULES.treatmentIntervention.max} characters`).optional(),
   sampleSize: z.number().int().positive().optional().or(z.literal('')),
-  powerCalculation: z.enum(['yes', 'no', 'na']).optional(),
+  powerCalculation: z.enum(FIELD_RULES.powerCalculation.values).optional(),
   dataCollectionMethods: z.array(z.string()).default([]),
-  studyIndicators: z.string().trim().min(1, 'Study indicators are required').max(2000, 'Indicators must be less than 2000 characters'),
+  studyIndicators: z.string().trim().min(1, 'Study indicators are required').max(FIELD_RULES.studyIndicators.max, `Indicators must be less than ${FIELD_RULES.studyIndicators.max} characters`),
   preAnalysisPlan: yesNoWithRequiredLinkSchema.optional(),
   dataCollectionRounds: z.number().int().positive().optional().or(z.literal('')),
 
   // Section D - Timeline & Status (Mandatory)
   startDate: z.date({ required_error: 'Start date is required' }),
   expectedEndDate: z.date({ required_error: 'Expected end date is required' }),
-  dataCollectionStatus: z.enum(['planned', 'ongoing', 'complete'], { required_error: 'Data collection status is required' }),
-  analysisStatus: z.enum(['planned', 'ongoing', 'complete'], { required_error: 'Analysis status is required' }),
+  dataCollectionStatus: z.enum(FIELD_RULES.dataCollectionStatus.values, { required_error: 'Data collection status is required' }),
+  analysisStatus: z.enum(FIELD_RULES.analysisStatus.values, { required_error: 'Analysis status is required' }),
 
   // Section E - Funding & Resources (Mandatory)
-  funded: z.enum(['yes', 'no', 'partial'], { required_error: 'Funding status is required' }),
-  fundingSource: z.string().trim().max(200, 'Funding source must be less than 200 characters').optional(),
+  funded: z.enum(FIELD_RULES.funded.values, { required_error: 'Funding status is required' }),
+  fundingSource: z.string().trim().max(FIELD_RULES.fundingSource.max, `Funding source must be less than ${FIELD_RULES.fundingSource.max} characters`).optional(),
   totalCostUSD: z.number({ required_error: 'Total cost is required' }).positive('Total cost must be positive'),
   proposalAvailable: yesNoWithRequiredLinkSchema,
 
@@ -128,35 +107,15 @@ export const studyFormSchema = z.object({
   manuscriptDeveloped: yesNoWithRequiredLinkSchema,
   policyBriefDeveloped: yesNoWithRequiredLinkSchema,
   relatedToPastStudy: yesNoWithRequiredLinkSchema,
-  intendedPrimaryUser: z.array(z.enum([
-    'iaes',
-    'program',
-    'donor',
-    'board',
-    'comms',
-    'policy_makers',
-    'researchers',
-    'other',
-  ])).min(1, 'At least one primary user is required'),
-  commissioningSource: z.string().trim().min(1, 'Commissioning source is required').max(200, 'Commissioning source must be less than 200 characters'),
-}).refine((data) => {
-  // Validate end date is after start date
-  if (data.startDate && data.expectedEndDate) {
-    return data.expectedEndDate >= data.startDate;
-  }
-  return true;
-}, {
-  message: 'End date must be after start date',
-  path: ['expectedEndDate'],
-}).refine((data) => {
-  // Validate funding source is required when funded is 'yes' or 'partial'
-  if (data.funded === 'yes' || data.funded === 'partial') {
-    return data.fundingSource && data.fundingSource.trim().length > 0;
+  intendedPrimaryUser: z.array(z.enum(FIELD_RULES.intendedPrimaryUser.values)).min(1, 'At least one primary user is required'),
+  commissioningSource: z.string().trim().min(1, 'Commissioning source is required').max(FIELD_RULES.commissioningSource.max, `Commissioning source must be less than ${FIELD_RULES.commissioningSource.max} characters`),
+}).superRefine((data, ctx) => {
+  // Cross-field rules come from the backend spec, so both sides report the same errors
+  for (const rule of CROSS_FIELD_RULES) {
+    if (!crossFieldRuleHolds(rule, data)) {
+      ctx.addIssue({ code: z.ZodIssueCode.custom, message: rule.message, path: [rule.field] });
+    }
   }
-  return true;
-}, {
-  message: 'Funding source is required when funded',
-  path: ['fundingSource'],
 });
 
 export type StudyFormData = z.infer<typeof studyFormSchema>;
@@ -186,7 +145,7 @@ export const defaultFormValues: Partial<StudyFormData> = {
 
 // Helper to check if Section C should be visible
 export function shouldShowResearchDetails(causalityMode?: string, methodClass?: string): boolean {
-  const isCausal = causalityMode === 'c2_causal';
-  const isQuantitative = methodClass === 'quantitative' || methodClass === 'experimental_quasi';
+  const isCausal = (SECTION_C_CAUSALITY_MODES as readonly string[]).includes(causalityMode ?? '');
+  const isQuantitative = (SECTION_C_METHOD_CLASSES as readonly string[]).includes(methodClass ?? '');
   return isCausal || isQuantitative;
 }
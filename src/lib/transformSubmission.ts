@@ -9,6 +9,7 @@ const METADATA_KEYS = [
   'modifiedBy',
   'createdAt',
   'updatedAt',
+  'contentHash',
 ] as const;
 
 /**
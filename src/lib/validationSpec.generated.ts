@@ -0,0 +1,53 @@
+// AUTO-GENERATED by backend/scripts/generate_validation_spec.py from
+// backend/functions/shared/validation_spec.py — do not edit by hand.
+
+export const FIELD_RULES = {
+  studyId: { section: 'A', rule: 'string', required: true, max: 50 },
+  studyTitle: { section: 'A', rule: 'string', required: true, max: 500 },
+  leadCenter: { section: 'A', rule: 'string', required: true, max: 200 },
+  contactName: { section: 'A', rule: 'string', required: true, max: 100 },
+  contactEmail: { section: 'A', rule: 'email', required: true, max: 255 },
+  otherCenters: { section: 'A', rule: 'string_array', required: true, min_items: 1 },
+  w3Bilateral: { section: 'A', rule: 'string', required: false, max: 500 },
+  studyType: { section: 'B', rule: 'enum', required: true, values: ['adoption_diffusion', 'causal_impact', 'ex_ante_impact', 'foresight_futures', 'institutional_policy_change', 'meliaf_method', 'process_performance', 'scaling_policy_tracing', 'scaling_readiness', 'synthesis_strategic_learning'] },
+  timing: { section: 'B', rule: 'enum', required: true, values: ['t0_ex_ante', 't1_during', 't2_endline', 't3_ex_post'] },
+  analyticalScope: { section: 'B', rule: 'enum', required: true, values: ['innovation_technology', 'portfolio_system', 'program_accelerator', 'project_intervention'] },
+  geographicScope: { section: 'B', rule: 'enum', required: true, values: ['global', 'national', 'regional', 'site_specific', 'sub_national'] },
+  resultLevel: { section: 'B', rule: 'enum', required: true, values: ['impact', 'outcome', 'output'] },
+  causalityMode: { section: 'B', rule: 'enum', required: true, values: ['c0_descriptive', 'c1_contribution', 'c2_causal'] },
+  methodClass: { section: 'B', rule: 'enum', required: true, values: ['evidence_synthesis', 'experimental_quasi', 'mixed', 'modeling_simulation', 'observational', 'participatory', 'qualitative', 'quantitative'] },
+  primaryIndicator: { section: 'B', rule: 'enum', required: true, values: ['Capacity Sharing', 'Climate Adaptation and Mitigation', 'Environmental Health and Biodiversity', 'Gender Equality, Youth and Social Inclusion', 'Innovation Development', 'Innovation Use', 'Knowledge Products', 'Nutrition, Health and Food Security', 'Other Outcome', 'Other Output', 'Policy Change', 'Poverty Reduction, Livelihoods and Jobs'] },
+  studyRegions: { section: 'B', rule: 'string_array', required: false },
+  studyCountries: { section: 'B', rule: 'string_array', required: false },
+  studySubnational: { section: 'B', rule: 'string_array', required: false },
+  keyResearchQuestions: { section: 'C', rule: 'string', required: false, max: 2000 },
+  unitOfAnalysis: { section: 'C', rule: 'string_array', required: false },
+  treatmentIntervention: { section: 'C', rule: 'string', required: false, max: 500 },
+  sampleSize: { section: 'C', rule: 'positive_int', required: false },
+  powerCalculation: { section: 'C', rule: 'enum', required: false, values: ['na', 'no', 'yes'] },
+  dataCollectionMethods: { section: 'C', rule: 'string_array', required: false },
+  studyIndicators: { section: 'C', rule: 'string', required: true, max: 2000 },
+  preAnalysisPlan: { section: 'C', rule: 'yes_no_link', required: false },
+  dataCollectionRounds: { section: 'C', rule: 'positive_int', required: false },
+  startDate: { section: 'D', rule: 'date', required: true },
+  expectedEndDate: { section: 'D', rule: 'date', required: true },
+  dataCollectionStatus: { section: 'D', rule: 'enum', required: true, values: ['complete', 'ongoing', 'planned'] },
+  analysisStatus: { section: 'D', rule: 'enum', required: true, values: ['complete', 'ongoing', 'planned'] },
+  funded: { section: 'E', rule: 'enum', required: true, values: ['no', 'partial', 'yes'] },
+  fundingSource: { section: 'E', rule: 'string', required: false, max: 200 },
+  totalCostUSD: { section: 'E', rule: 'positive_number', required: true },
+  proposalAvailable: { section: 'E', rule: 'yes_no_link', required: true },
+  manuscriptDeveloped: { section: 'F', rule: 'yes_no_link', required: true },
+  policyBriefDeveloped: { section: 'F', rule: 'yes_no_link', required: true },
+  relatedToPastStudy: { section: 'F', rule: 'yes_no_link', required: true },
+  intendedPrimaryUser: { section: 'F', rule: 'enum_array', required: true, values: ['board', 'comms', 'donor', 'iaes', 'other', 'policy_makers', 'program', 'researchers'], min_items: 1 },
+  commissioningSource: { section: 'F', rule: 'string', required: true, max: 200 },
+} as const;
+
+export const CROSS_FIELD_RULES = [
+  { section: 'D', field: 'expectedEndDate', rule: 'date_order', after: 'startDate', message: 'End date must be on or after start date' },
+  { section: 'E', field: 'fundingSource', rule: 'required_if', when: 'funded', values: ['partial', 'yes'], message: 'Required when funded is yes or partial' },
+] as const;
+
+export const SECTION_C_CAUSALITY_MODES = ['c2_causal'] as const;
+export const SECTION_C_METHOD_CLASSES = ['experimental_quasi', 'quantitative'] as const;